@@ -325,6 +325,10 @@ def _apply_application_icon(app) -> None:
 
 
 def main() -> int:
+    # Startphasen messen; --startup-profile misst zusätzlich jeden Import
+    from model import startup_profile
+
+    startup_profile.begin(import_timing="--startup-profile" in sys.argv)
     # Logging initialisieren (vor allem anderen Code)
     from model.logging_config import setup_logging
     from model.app_paths import data_dir
@@ -429,6 +433,7 @@ def main() -> int:
         from utils.ui_usability import install_ui_usability
 
         _ui_usability_filter = install_ui_usability(app)
+        startup_profile.mark("qt_application")
 
         # Einstellungen laden
         from settings import Settings
@@ -460,6 +465,16 @@ def main() -> int:
                 "BM_I18N_DEBUG-Auswertung fehlgeschlagen: %s", e
             )
 
+        # Profiling für den Diagnosebericht (performance.json) – Einstellung
+        # oder Env: BM_PROFILE=1 python main.py
+        from model import profiling
+
+        profiling.set_enabled(
+            bool(settings.get("performance_profiling", False))
+            or os.environ.get("BM_PROFILE", "").strip() not in ("", "0", "false")
+        )
+        startup_profile.mark("settings")
+
         # UserModel früh laden – wird für Language-Check und Login-Flow benötigt
         from model.user_model import UserModel
 
@@ -583,7 +598,12 @@ def main() -> int:
                 # Verschlüsselte DB öffnen
                 try:
                     encrypted_session = EncryptedSession.open_with_key(
-                        str(active_user.db_path), db_key, active_user.salt
+                        str(active_user.db_path),
+                        db_key,
+                        active_user.salt,
+                        autosave_delay_ms=settings.get(
+                            "encrypted_autosave_delay_ms", 500
+                        ),
                     )
                     conn = encrypted_session.conn
                     logger.info(
@@ -659,7 +679,12 @@ def main() -> int:
                                 )
                         try:
                             encrypted_session = EncryptedSession.open_with_key(
-                                str(active_user.db_path), db_key, active_user.salt
+                                str(active_user.db_path),
+                                db_key,
+                                active_user.salt,
+                                autosave_delay_ms=settings.get(
+                                    "encrypted_autosave_delay_ms", 500
+                                ),
                             )
                             conn = encrypted_session.conn
                         except Exception as e:
@@ -686,6 +711,8 @@ def main() -> int:
                     conn = open_db(str(db_path))
                 break
 
+        startup_profile.mark("login_and_database")  # inkl. Warten auf Login
+
         # ── Migrations ──────────────────────────────
         if db_path:
             backup_dir = str(configured_backups_dir(settings.backup_directory))
@@ -704,6 +731,9 @@ def main() -> int:
                         import shutil
                         from datetime import datetime as _dt
 
+                        # Noch offene Journal-Frames in die Basis holen,
+                        # sonst fehlen sie in der Kopie.
+                        encrypted_session.save()
                         enc_src = Path(encrypted_session.enc_path)
                         if enc_src.exists():
                             backup_dir_p = configured_backups_dir(
@@ -752,10 +782,20 @@ def main() -> int:
             if encrypted_session:
                 encrypted_session.save()
 
+        startup_profile.mark("migrations")
+
         # ── MainWindow ──────────────────────────────
         from views.main_window import MainWindow
 
+        startup_profile.mark("main_window_import")
+        # Die Tab-Module lädt erst der Fensteraufbau (build_tabs), aber beim
+        # Start in jedem Fall: eigene Phase, damit main_window_build nur den
+        # Aufbau zeigt.
+        import views.main_window_startup  # noqa: F401
+
+        startup_profile.mark("tab_modules_import")
         win = MainWindow(conn, active_user=active_user, user_model=user_model)
+        startup_profile.mark("main_window_build")
         try:
             win.setWindowIcon(app.windowIcon())
         except Exception:
@@ -777,9 +817,18 @@ def main() -> int:
                 )
             )
 
-            # Auto-Save Timer (5 Minuten)
+            win.attach_save_status(encrypted_session)
+            # Der Rechendienst liest Kopien der In-Memory-DB; das Abbild, das
+            # die Session nach jedem Commit speichert, erspart ihm ein eigenes.
+            if getattr(win, "compute_service", None) is not None:
+                encrypted_session.add_image_listener(
+                    win.compute_service.service.offer_image
+                )
+
+            # Auto-Save Timer (5 Minuten): verdichtet das Journal im
+            # Hintergrund-Schreiber, der GUI-Thread kopiert nur das Abbild.
             save_timer = QTimer(win)
-            save_timer.timeout.connect(encrypted_session.save)
+            save_timer.timeout.connect(encrypted_session.save_in_background)
             save_timer.start(5 * 60 * 1000)
             win._save_timer = save_timer
 
@@ -811,6 +860,9 @@ def main() -> int:
             win.show_restored()
         else:
             win.show()
+        startup_profile.mark("show")
+        # Erster Event-Loop-Durchlauf nach show(): Ende der Startmessung
+        QTimer.singleShot(0, win, startup_profile.finish)
 
         # Setup-Assistent
         # WICHTIG: db_existed_before wurde VOR open_db() ermittelt — nach open_db()
@@ -0,0 +1,224 @@
+"""Rechenaufträge ausserhalb des GUI-Threads, mit eigener Lese-Connection.
+
+Cockpit und Übersicht rechneten ihre Aggregate im GUI-Thread: Budgetampel
+mit Überschreitungshistorie, Lernvorschläge, Topf-Status, KPI-Summen über
+mehrere Jahre. Solange das lief, stand die Oberfläche - auch wenn der Nutzer
+längst einen anderen Zeitraum gewählt hatte.
+
+:class:`ComputeService` nimmt solche Aufträge an und rechnet sie in einem
+kleinen Thread-Pool.
+
+  Lese-Connection  Aus einem :class:`model.database.ConnectionPool` neben
+                   der Haupt-Connection. Liegt die Datenbank in einer Datei,
+                   read-only daneben: Im WAL-Modus sieht sie jeden Commit,
+                   ohne den Schreiber zu blockieren. Läuft die Sitzung im
+                   Speicher (verschlüsselter Modus), rechnet der Thread auf
+                   einer Kopie. Deren Seitenabbild zieht die Sitzung nach
+                   jedem Commit ohnehin zum Speichern; :meth:`offer_image`
+                   übernimmt es. Nur was danach ungespeichert geändert
+                   wurde, zieht der GUI-Thread beim Einreichen selbst.
+  Kanäle           Ein Auftrag gehört zu einem Kanal (``"overview.kpis"``).
+                   Jeder neue Auftrag zählt die Generation des Kanals hoch;
+                   ein noch wartender älterer wird abgesagt, ein laufender per
+                   ``interrupt()`` abgebrochen. Was trotzdem fertig wird, aber
+                   nicht mehr zur aktuellen Generation gehört, wird verworfen.
+  Zustellung       Der Rückruf läuft im Arbeits-Thread. Die Qt-Seite
+                   (:mod:`views.compute_bridge`) reicht das Ergebnis per
+                   Signal in den GUI-Thread weiter.
+
+Aufträge lesen nur. Schreibversuche scheitern an der Lese-Connection - wer
+schreiben muss, tut das im GUI-Thread.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from model.database import ConnectionPool
+
+#: Zwei Threads: Cockpit und Übersicht können gleichzeitig rechnen, und der
+#: Abfrage-Cache (vier Connections) behält die Haupt-Connection.
+DEFAULT_WORKERS = 2
+
+
+@dataclass(frozen=True)
+class ComputeResult:
+    """Ergebnis eines Auftrags; ``error`` statt ``value``, wenn er scheiterte."""
+
+    channel: str
+    generation: int
+    value: Any = None
+    error: BaseException | None = None
+
+
+class ComputeService:
+    """Thread-Pool mit Lese-Connections und Kanälen je Ansicht."""
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        *,
+        max_workers: int = DEFAULT_WORKERS,
+    ) -> None:
+        self._conn = conn
+        workers = max(1, int(max_workers))
+        self._pool = ConnectionPool.for_connection(conn, max_readers=workers)
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="bm-compute"
+        )
+        # Reentrant: ``Future.cancel()`` ruft ``_finish`` sofort auf, und
+        # abgesagt wird unter der Sperre.
+        self._lock = threading.RLock()
+        self._generations: dict[str, int] = {}
+        self._pending: dict[str, Future[Any]] = {}
+        self._running: dict[str, tuple[int, sqlite3.Connection]] = {}
+        self._closed = False
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.interrupted = 0
+        self.dropped_stale = 0
+
+    @property
+    def mode(self) -> str:
+        """``"file"`` (Lese-Connection daneben) oder ``"memory"`` (Kopie)."""
+        return self._pool.mode
+
+    def offer_image(self, image: bytes) -> None:
+        """Seitenabbild des Schreibers für die Kopien (``add_image_listener``)."""
+        if not self._closed:
+            self._pool.offer(image)
+
+    def can_submit(self) -> bool:
+        """False nach :meth:`shutdown` und während einer offenen Transaktion.
+
+        Die Lese-Connection sähe nicht Festgeschriebenes nicht; wer dann
+        rechnen will, rechnet synchron auf der Haupt-Connection.
+        """
+        return not self._closed and not self._conn.in_transaction
+
+    # ── Aufträge ─────────────────────────────────────────────────────────
+    def submit(
+        self,
+        channel: str,
+        fn: Callable[[sqlite3.Connection], Any],
+        callback: Callable[[ComputeResult], None],
+    ) -> int:
+        """Rechnet ``fn(lese_connection)`` im Pool; liefert die Generation.
+
+        Nur aus dem Thread der Haupt-Connection aufrufen. ``callback`` läuft
+        im Arbeits-Thread und nur, wenn der Auftrag noch aktuell ist.
+        """
+        if not self.can_submit():
+            raise RuntimeError("Rechendienst nimmt gerade keine Aufträge an")
+        self._pool.publish()
+        with self._lock:
+            generation = self._generations.get(channel, 0) + 1
+            self._generations[channel] = generation
+            self._cancel_locked(channel)
+            future = self._executor.submit(self._run, channel, generation, fn)
+            self._pending[channel] = future
+            self.submitted += 1
+        future.add_done_callback(
+            lambda f: self._finish(f, channel, generation, callback)
+        )
+        return generation
+
+    def cancel(self, channel: str) -> None:
+        """Verwirft alles, was für ``channel`` wartet oder läuft."""
+        with self._lock:
+            self._generations[channel] = self._generations.get(channel, 0) + 1
+            self._cancel_locked(channel)
+
+    def is_current(self, channel: str, generation: int) -> bool:
+        with self._lock:
+            return not self._closed and self._generations.get(channel) == generation
+
+    def _cancel_locked(self, channel: str) -> None:
+        future = self._pending.pop(channel, None)
+        if future is not None and future.cancel():
+            self.cancelled += 1
+        running = self._running.get(channel)
+        if running is not None:
+            running[1].interrupt()
+            self.interrupted += 1
+
+    def _run(
+        self,
+        channel: str,
+        generation: int,
+        fn: Callable[[sqlite3.Connection], Any],
+    ) -> Any:
+        if not self.is_current(channel, generation):
+            raise CancelledError()
+        with self._pool.reader() as conn:
+            with self._lock:
+                self._running[channel] = (generation, conn)
+            try:
+                return fn(conn)
+            finally:
+                with self._lock:
+                    if self._running.get(channel, (0,))[0] == generation:
+                        del self._running[channel]
+
+    def _finish(
+        self,
+        future: Future[Any],
+        channel: str,
+        generation: int,
+        callback: Callable[[ComputeResult], None],
+    ) -> None:
+        with self._lock:
+            if self._pending.get(channel) is future:
+                del self._pending[channel]
+        if future.cancelled():
+            return
+        error = future.exception()
+        if isinstance(error, CancelledError) or not self.is_current(
+            channel, generation
+        ):
+            with self._lock:
+                self.dropped_stale += 1
+            return
+        with self._lock:
+            if error is None:
+                self.completed += 1
+            else:
+                self.failed += 1
+        if error is None:
+            callback(ComputeResult(channel, generation, future.result()))
+        else:
+            callback(ComputeResult(channel, generation, error=error))
+
+    # ── Lebensdauer ──────────────────────────────────────────────────────
+    def shutdown(self) -> None:
+        """Bricht alles ab, wartet auf laufende Aufträge, schliesst die Connections."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            for channel in list(self._pending) + list(self._running):
+                self._cancel_locked(channel)
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._pool.close()
+
+    def stats(self) -> dict[str, int | str]:
+        """Zähler für den Diagnosebericht."""
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "cancelled": self.cancelled,
+                "interrupted": self.interrupted,
+                "dropped_stale": self.dropped_stale,
+                "readers": int(self._pool.stats()["readers"]),
+                "snapshots": int(self._pool.stats()["snapshots"]),
+                "offered": int(self._pool.stats()["offered"]),
+            }
@@ -0,0 +1,599 @@
+"""Sicherungs-Repository: Datenbank-Schnappschüsse als deduplizierte Blöcke.
+
+Ein ``.bmr`` packt bei jeder Sicherung die ganze Datenbank neu ein. Bei
+häufigen Auto-Backups einer grossen Datenbank kostet das jedes Mal Zeit
+und Platz in voller Grösse, obwohl sich meist nur wenige Seiten geändert
+haben.
+
+Das Repository legt jeden Schnappschuss als Folge von Blöcken ab, jeder
+Block genau einmal unter seiner SHA-256 (``chunks/ab/abcd…``,
+zlib-komprimiert). Eine Sicherung selbst ist nur ein kleines Manifest
+(``snapshots/<id>.json``) mit der Blockliste und den Prüfsummen.
+
+  Konsistenz   Unverschlüsselte Datenbanken werden über die Online-Backup-API
+               von SQLite gelesen, nicht als Datei - auch noch nicht
+               zurückgeschriebene WAL-Seiten sind dabei.
+  Blöcke       SQLite ändert Seiten an Ort und Stelle, Bytes verschieben sich
+               nie. Feste, an Seitengrenzen ausgerichtete Blöcke finden
+               deshalb jede unveränderte Seite wieder; eine inhaltsdefinierte
+               Zerlegung (rollender Hash) brächte hier nichts ausser Laufzeit.
+  Chiffrat     Die ``.enc`` selbst taugt nicht als Quelle: Jedes Speichern
+               zieht eine neue Datei-Nonce, kein Byte wiederholt sich. Mit
+               ``db_key`` wird deshalb das entschlüsselte Seitenabbild
+               zerlegt und jeder Block für sich versiegelt (:class:`_Sealer`):
+               Name ist ein HMAC des Klartexts, Schlüssel wird daraus
+               abgeleitet. Gleiche Seiten ergeben so dieselbe Blockdatei,
+               ohne dass Klartext oder dessen ungeschützte Prüfsumme auf der
+               Platte liegen.
+  Reihenfolge  Erst die Blöcke, zuletzt atomar das Manifest. Ein Abbruch
+               hinterlässt höchstens verwaiste Blöcke, die :meth:`prune`
+               wegräumt - nie ein Manifest mit fehlenden Blöcken. Solange
+               eine Sicherung läuft, führt sie ihre Blöcke in
+               ``snapshots/<id>.pending``; :meth:`prune` lässt diese und alle
+               seit ihrem Beginn benutzten Blöcke stehen.
+
+Wiederherstellen und Prüfen lesen Block für Block; ``.bmr`` lässt sich aus
+jedem Schnappschuss weiterhin erzeugen (:meth:`BackupStore.export_bundle`).
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import io
+import json
+import logging
+import os
+import tempfile
+import time
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator, TextIO
+
+from model.encrypted_journal import discard_journal
+from model.restore_bundle import (
+    MAX_DB_BYTES,
+    MAX_SETTINGS_BYTES,
+    BundleIntegrityError,
+    _account_users_snapshot,
+    _fsync_directory,
+    _read_small_file,
+    _secure_bundle_file,
+    _sha256_bytes,
+    create_bundle,
+    sqlite_backup_copy,
+)
+
+logger = logging.getLogger(__name__)
+
+#: Unterordner des Sicherungsordners für das Repository.
+REPOSITORY_DIRNAME = "repository"
+FORMAT = "bm-chunks-v1"
+#: Seiten je Block; bei 4-KiB-Seiten 64 KiB.
+PAGES_PER_CHUNK = 16
+#: Blockgrösse für ``.enc``-Dateien ohne Schlüssel (keine Seitenstruktur).
+RAW_CHUNK_BYTES = 64 * 1024
+#: Blockformat verschlüsselter Schnappschüsse (Manifestfeld ``chunk_format``).
+SEALED_CHUNKS = "sealed-v1"
+#: Eine seit so vielen Sekunden unveränderte ``.pending`` gilt als abgebrochen.
+PENDING_STALE_SECONDS = 24 * 3600
+_SNAPSHOT_SUFFIX = ".json"
+_PENDING_SUFFIX = ".pending"
+_ID_CONTEXT = b"budgetmanager-repo-id-v1\x00"
+_SEAL_CONTEXT = b"budgetmanager-repo-seal-v1\x00"
+# Jeder Blockschlüssel versiegelt genau einen Klartext; eine feste Nonce
+# wiederholt sich deshalb nie unter demselben Schlüssel.
+_SEAL_NONCE = bytes(12)
+# Dateisysteme mit groben Zeitstempeln runden die mtime ab.
+_MTIME_SLACK = 2.0
+
+
+@dataclass(frozen=True)
+class SnapshotResult:
+    """Ergebnis von :meth:`BackupStore.snapshot_file`."""
+
+    snapshot_id: str
+    manifest_path: Path
+    size: int
+    chunks: int
+    new_chunks: int
+    new_bytes: int
+
+
+class _Sealer:
+    """Deterministische Blockverschlüsselung für verschlüsselte Datenbanken.
+
+    Blockname ist ``HMAC(id_key, Klartext)``, der Blockschlüssel
+    ``HMAC(seal_key, Blockname)``; beide Schlüssel hängen am db_key. Ein
+    anderes Konto erzeugt andere Namen, teilt also keine Blöcke.
+    """
+
+    def __init__(self, db_key: bytes):
+        raw = base64.urlsafe_b64decode(db_key)
+        self._id_key = hmac.new(raw, _ID_CONTEXT, hashlib.sha256).digest()
+        self._seal_key = hmac.new(raw, _SEAL_CONTEXT, hashlib.sha256).digest()
+
+    def chunk_id(self, data: bytes) -> str:
+        return hmac.new(self._id_key, data, hashlib.sha256).hexdigest()
+
+    def whole(self) -> Any:
+        """Laufende Prüfsumme über das ganze Abbild (``update``/``hexdigest``)."""
+        return hmac.new(self._id_key, digestmod=hashlib.sha256)
+
+    def _aead(self, chunk_id: str) -> Any:
+        from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+        key = hmac.new(self._seal_key, bytes.fromhex(chunk_id), hashlib.sha256)
+        return AESGCM(key.digest())
+
+    def seal(self, chunk_id: str, data: bytes) -> bytes:
+        packed = zlib.compress(data, 6)
+        sealed: bytes = self._aead(chunk_id).encrypt(
+            _SEAL_NONCE, packed, bytes.fromhex(chunk_id)
+        )
+        return sealed
+
+    def open(self, chunk_id: str, sealed: bytes) -> bytes:
+        from cryptography.exceptions import InvalidTag
+
+        try:
+            packed = self._aead(chunk_id).decrypt(
+                _SEAL_NONCE, sealed, bytes.fromhex(chunk_id)
+            )
+            data = zlib.decompress(packed)
+        except (InvalidTag, ValueError, zlib.error) as exc:
+            raise BundleIntegrityError(
+                f"Block {chunk_id[:12]} beschaedigt oder falscher Schluessel"
+            ) from exc
+        if not hmac.compare_digest(self.chunk_id(data), chunk_id):
+            raise BundleIntegrityError(f"Block {chunk_id[:12]} beschaedigt")
+        return data
+
+
+class BackupStore:
+    """Deduplizierendes Repository in einem Ordner."""
+
+    def __init__(self, root: Path | str):
+        self.root = Path(root)
+        self.chunk_dir = self.root / "chunks"
+        self.snapshot_dir = self.root / "snapshots"
+
+    # ── Schreiben ────────────────────────────────────────────────────────
+    def snapshot_file(
+        self,
+        source_db: Path | str,
+        *,
+        app: str,
+        app_version: str,
+        note: str = "",
+        settings_path: Path | None = None,
+        users_json_path: Path | None = None,
+        db_key: bytes | None = None,
+    ) -> SnapshotResult:
+        """Nimmt ``source_db`` (``.db`` oder ``.enc``) als Schnappschuss auf.
+
+        Eine ``.enc`` wird mit ``db_key`` samt Änderungsjournal entschlüsselt
+        und als versiegelte Seitenblöcke abgelegt. Ohne Schlüssel landen ihre
+        Dateibytes in den Blöcken - lesbar, aber ohne Deduplizierung.
+        """
+        source_db = Path(source_db)
+        if not source_db.exists():
+            raise FileNotFoundError(str(source_db))
+        if source_db.stat().st_size > MAX_DB_BYTES:
+            raise ValueError("Datenbank ist fuer ein Backup unplausibel gross")
+        encrypted = source_db.suffix.lower() == ".enc"
+        sealer = _Sealer(db_key) if encrypted and db_key is not None else None
+
+        self.chunk_dir.mkdir(parents=True, exist_ok=True)
+        self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+        manifest: dict[str, Any] = {
+            "format": FORMAT,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "app": app,
+            "app_version": app_version,
+            "note": note or "",
+            "db_file": "database.enc" if encrypted else "database.db",
+            "encryption": "enc" if encrypted else "db",
+            "source_db_name": source_db.name,
+        }
+        snapshot_id = self._new_snapshot_id()
+        with self._pending(snapshot_id) as pending:
+            if sealer is not None and db_key is not None:
+                from model.crypto import (
+                    decrypt_db_with_journal,
+                    read_salt_from_enc,
+                    serialize_db,
+                )
+
+                salt = read_salt_from_enc(source_db)
+                conn, _state = decrypt_db_with_journal(source_db, db_key)
+                try:
+                    image = serialize_db(conn)
+                finally:
+                    conn.close()
+                chunk_size = _page_size(image[:18]) * PAGES_PER_CHUNK
+                chunks, size, digest, new_chunks, new_bytes = self._store_stream(
+                    io.BytesIO(image), chunk_size, pending, sealer
+                )
+                del image
+                manifest.update(chunk_format=SEALED_CHUNKS, salt=salt.hex())
+            else:
+                with tempfile.TemporaryDirectory(dir=self.root) as tmp_dir:
+                    if encrypted:
+                        image_path = source_db
+                        chunk_size = RAW_CHUNK_BYTES
+                    else:
+                        image_path = Path(tmp_dir) / "snapshot.db"
+                        sqlite_backup_copy(source_db, image_path)
+                        with open(image_path, "rb") as f:
+                            chunk_size = _page_size(f.read(18)) * PAGES_PER_CHUNK
+                    with open(image_path, "rb") as stream:
+                        chunks, size, digest, new_chunks, new_bytes = (
+                            self._store_stream(stream, chunk_size, pending)
+                        )
+            manifest.update(
+                size=size,
+                sha256="" if sealer is not None else digest,
+                chunk_size=chunk_size,
+                chunks=chunks,
+            )
+            if sealer is not None:
+                manifest["hmac"] = digest
+
+            settings_bytes = (
+                _read_small_file(
+                    Path(settings_path), MAX_SETTINGS_BYTES, "settings.json"
+                )
+                if settings_path is not None and Path(settings_path).exists()
+                else None
+            )
+            users_bytes = (
+                _account_users_snapshot(Path(users_json_path), source_db)
+                if users_json_path is not None and Path(users_json_path).exists()
+                else None
+            )
+            for key, blob in (("settings", settings_bytes), ("users", users_bytes)):
+                manifest[f"{key}_sha256"] = (
+                    self._store_chunk(blob, pending)[0] if blob is not None else ""
+                )
+
+            path = self._write_manifest(snapshot_id, manifest)
+        logger.info(
+            "Repository-Sicherung %s: %d Blöcke, %d neu (%d Bytes)",
+            snapshot_id,
+            len(chunks),
+            new_chunks,
+            new_bytes,
+        )
+        return SnapshotResult(
+            snapshot_id, path, size, len(chunks), new_chunks, new_bytes
+        )
+
+    @contextmanager
+    def _pending(self, snapshot_id: str) -> Iterator[TextIO]:
+        """Vormerkung einer laufenden Sicherung; erste Zeile ist der Beginn."""
+        path = self.snapshot_dir / f"{snapshot_id}{_PENDING_SUFFIX}"
+        with open(path, "x", encoding="utf-8") as f:
+            f.write(f"{time.time():.3f}\n")
+            f.flush()
+            try:
+                yield f
+            finally:
+                f.close()
+                path.unlink(missing_ok=True)
+
+    def _store_stream(
+        self,
+        stream: BinaryIO,
+        chunk_size: int,
+        pending: TextIO,
+        sealer: _Sealer | None = None,
+    ) -> tuple[list[str], int, str, int, int]:
+        whole = sealer.whole() if sealer is not None else hashlib.sha256()
+        chunks: list[str] = []
+        size = new_chunks = new_bytes = 0
+        for block in iter(lambda: stream.read(chunk_size), b""):
+            whole.update(block)
+            size += len(block)
+            if size > MAX_DB_BYTES:
+                raise ValueError("Datenbank ist fuer ein Backup unplausibel gross")
+            digest, written = self._store_chunk(block, pending, sealer)
+            chunks.append(digest)
+            if written:
+                new_chunks += 1
+                new_bytes += written
+        return chunks, size, whole.hexdigest(), new_chunks, new_bytes
+
+    def _store_chunk(
+        self, data: bytes, pending: TextIO, sealer: _Sealer | None = None
+    ) -> tuple[str, int]:
+        """Legt ``data`` ab, falls noch nicht vorhanden; liefert (Name, Bytes).
+
+        Der Name steht in ``pending``, bevor nach dem Block gesehen wird; ein
+        vorhandener Block wird angefasst, damit :meth:`prune` ihn als frisch
+        benutzt erkennt.
+        """
+        digest = sealer.chunk_id(data) if sealer is not None else _sha256_bytes(data)
+        pending.write(digest + "\n")
+        pending.flush()
+        path = self._chunk_path(digest)
+        try:
+            os.utime(path)
+            return digest, 0
+        except FileNotFoundError:
+            pass
+        path.parent.mkdir(parents=True, exist_ok=True)
+        packed = (
+            sealer.seal(digest, data) if sealer is not None else zlib.compress(data, 6)
+        )
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            f.write(packed)
+            f.flush()
+            os.fsync(f.fileno())
+        _secure_bundle_file(tmp)
+        os.replace(tmp, path)
+        return digest, len(packed)
+
+    def _write_manifest(self, snapshot_id: str, manifest: dict[str, Any]) -> Path:
+        path = self.snapshot_dir / f"{snapshot_id}{_SNAPSHOT_SUFFIX}"
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        _secure_bundle_file(tmp)
+        os.replace(tmp, path)
+        _fsync_directory(self.snapshot_dir)
+        return path
+
+    def _new_snapshot_id(self) -> str:
+        base = datetime.now().strftime("%Y%m%d_%H%M%S")
+        candidate, n = base, 1
+        while any(
+            (self.snapshot_dir / f"{candidate}{suffix}").exists()
+            for suffix in (_SNAPSHOT_SUFFIX, _PENDING_SUFFIX)
+        ):
+            n += 1
+            candidate = f"{base}_{n}"
+        return candidate
+
+    def _chunk_path(self, digest: str) -> Path:
+        return self.chunk_dir / digest[:2] / digest
+
+    # ── Lesen ────────────────────────────────────────────────────────────
+    def list_snapshots(self) -> list[dict[str, Any]]:
+        """Manifeste aller Schnappschüsse, neueste zuerst (mit ``id``)."""
+        if not self.snapshot_dir.is_dir():
+            return []
+        out = []
+        for path in self.snapshot_dir.glob(f"*{_SNAPSHOT_SUFFIX}"):
+            try:
+                manifest = self.read_manifest(path.stem)
+            except BundleIntegrityError as exc:
+                logger.warning("Repository-Manifest %s unlesbar: %s", path.name, exc)
+                continue
+            out.append({"id": path.stem, **manifest})
+        out.sort(key=lambda m: (str(m.get("created_at", "")), m["id"]), reverse=True)
+        return out
+
+    def read_manifest(self, snapshot_id: str) -> dict[str, Any]:
+        path = self.snapshot_dir / f"{Path(snapshot_id).name}{_SNAPSHOT_SUFFIX}"
+        try:
+            with open(path, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as exc:
+            raise BundleIntegrityError(f"Sicherung {snapshot_id} unlesbar: {exc}")
+        if not isinstance(manifest, dict) or manifest.get("format") != FORMAT:
+            raise BundleIntegrityError(f"Sicherung {snapshot_id}: unbekanntes Format")
+        return manifest
+
+    def _read_chunk(self, digest: str, sealer: _Sealer | None = None) -> bytes:
+        try:
+            raw = self._chunk_path(digest).read_bytes()
+            if sealer is not None:
+                return sealer.open(digest, raw)
+            data = zlib.decompress(raw)
+        except (OSError, zlib.error) as exc:
+            raise BundleIntegrityError(f"Block {digest[:12]} fehlt: {exc}") from exc
+        if not hmac.compare_digest(_sha256_bytes(data), digest):
+            raise BundleIntegrityError(f"Block {digest[:12]} beschaedigt")
+        return data
+
+    @staticmethod
+    def _sealer_for(manifest: dict[str, Any], db_key: bytes | None) -> _Sealer | None:
+        if manifest.get("chunk_format") != SEALED_CHUNKS:
+            return None
+        if db_key is None:
+            raise ValueError("Verschluesselte Sicherung: Schluessel erforderlich")
+        return _Sealer(db_key)
+
+    def iter_database(
+        self, snapshot_id: str, *, db_key: bytes | None = None
+    ) -> Iterator[bytes]:
+        """Die Datenbank eines Schnappschusses Block für Block, geprüft.
+
+        Versiegelte Schnappschüsse liefern das Seitenabbild im Klartext und
+        brauchen den ``db_key`` des Kontos.
+        """
+        manifest = self.read_manifest(snapshot_id)
+        sealer = self._sealer_for(manifest, db_key)
+        whole = sealer.whole() if sealer is not None else hashlib.sha256()
+        for digest in manifest.get("chunks", []):
+            block = self._read_chunk(str(digest), sealer)
+            whole.update(block)
+            yield block
+        expected = manifest.get("hmac" if sealer is not None else "sha256")
+        if not hmac.compare_digest(whole.hexdigest(), str(expected)):
+            raise BundleIntegrityError(
+                "Pruefsumme stimmt nicht – Backup beschaedigt oder veraendert"
+            )
+
+    def verify(self, snapshot_id: str, *, db_key: bytes | None = None) -> None:
+        """Prüft Datenbank und Beilagen; wirft :class:`BundleIntegrityError`."""
+        manifest = self.read_manifest(snapshot_id)
+        for _block in self.iter_database(snapshot_id, db_key=db_key):
+            pass
+        for key in ("settings", "users"):
+            digest = str(manifest.get(f"{key}_sha256") or "")
+            if digest:
+                self._read_chunk(digest)
+
+    def restore(
+        self,
+        snapshot_id: str,
+        dest_path: Path | str,
+        *,
+        db_key: bytes | None = None,
+    ) -> Path:
+        """Schreibt die Datenbank nach ``dest_path`` - erst nach voller Prüfung.
+
+        Ein versiegelter Schnappschuss wird mit ``db_key`` und dem gesicherten
+        Salt wieder zu einer ``.enc``.
+        """
+        dest = Path(dest_path)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        manifest = self.read_manifest(snapshot_id)
+        if db_key is not None and manifest.get("chunk_format") == SEALED_CHUNKS:
+            from model.crypto import encrypt_image_to_file
+
+            image = b"".join(self.iter_database(snapshot_id, db_key=db_key))
+            encrypt_image_to_file(
+                image, dest, db_key, bytes.fromhex(str(manifest.get("salt") or ""))
+            )
+            discard_journal(dest)
+            _fsync_directory(dest.parent)
+            return dest
+        tmp = dest.with_name(dest.name + ".restore.tmp")
+        try:
+            with open(tmp, "wb") as f:
+                for block in self.iter_database(snapshot_id):
+                    f.write(block)
+                f.flush()
+                os.fsync(f.fileno())
+            _secure_bundle_file(tmp)
+            os.replace(tmp, dest)
+            if dest.suffix == ".enc":
+                discard_journal(dest)
+            _fsync_directory(dest.parent)
+        finally:
+            tmp.unlink(missing_ok=True)
+        return dest
+
+    def export_bundle(
+        self,
+        snapshot_id: str,
+        out_path: Path | str,
+        *,
+        db_key: bytes | None = None,
+    ) -> Path:
+        """Erzeugt aus einem Schnappschuss ein normales ``.bmr``."""
+        manifest = self.read_manifest(snapshot_id)
+        name = Path(str(manifest.get("source_db_name") or "")).name or (
+            "budgetmanager.enc" if manifest.get("encryption") == "enc" else "budget.db"
+        )
+        with tempfile.TemporaryDirectory(dir=self.root) as tmp_dir:
+            db = self.restore(snapshot_id, Path(tmp_dir) / name, db_key=db_key)
+            extras: dict[str, Path | None] = {}
+            for key in ("settings", "users"):
+                digest = str(manifest.get(f"{key}_sha256") or "")
+                path = Path(tmp_dir) / f"{key}.json" if digest else None
+                if path is not None:
+                    path.write_bytes(self._read_chunk(digest))
+                extras[key] = path
+            return create_bundle(
+                source_db=db,
+                out_path=Path(out_path),
+                app=str(manifest.get("app") or ""),
+                app_version=str(manifest.get("app_version") or ""),
+                note=str(manifest.get("note") or ""),
+                settings_path=extras["settings"],
+                users_json_path=extras["users"],
+            )
+
+    # ── Aufräumen ────────────────────────────────────────────────────────
+    def prune(self, keep: int) -> int:
+        """Behält die ``keep`` neuesten Schnappschüsse; liefert gelöschte Blöcke."""
+        snapshots = self.list_snapshots()
+        for old in snapshots[max(1, int(keep)) :]:
+            (self.snapshot_dir / f"{old['id']}{_SNAPSHOT_SUFFIX}").unlink(
+                missing_ok=True
+            )
+        return self._collect_garbage()
+
+    def delete_snapshot(self, snapshot_id: str) -> int:
+        """Entfernt einen Schnappschuss; liefert gelöschte Blöcke."""
+        path = self.snapshot_dir / f"{Path(snapshot_id).name}{_SNAPSHOT_SUFFIX}"
+        path.unlink(missing_ok=True)
+        return self._collect_garbage()
+
+    def _collect_garbage(self) -> int:
+        # Erst die laufenden Sicherungen, dann die Manifeste: Wird eine
+        # Sicherung dazwischen fertig, steht sie in einem von beiden.
+        live, since = self._pending_chunks()
+        for manifest in self.list_snapshots():
+            live.update(str(d) for d in manifest.get("chunks", []))
+            live.update(
+                str(manifest.get(f"{key}_sha256") or "")
+                for key in ("settings", "users")
+            )
+        removed = 0
+        if self.chunk_dir.is_dir():
+            for path in self.chunk_dir.glob("*/*"):
+                if path.name in live:
+                    continue
+                try:
+                    if since is not None and path.stat().st_mtime >= since:
+                        continue
+                    path.unlink()
+                except FileNotFoundError:
+                    continue
+                removed += 1
+        return removed
+
+    def _pending_chunks(self) -> tuple[set[str], float | None]:
+        """Blöcke laufender Sicherungen und der früheste Beginn einer davon."""
+        live: set[str] = set()
+        since: float | None = None
+        if not self.snapshot_dir.is_dir():
+            return live, since
+        now = time.time()
+        for marker in self.snapshot_dir.glob(f"*{_PENDING_SUFFIX}"):
+            try:
+                if now - marker.stat().st_mtime > PENDING_STALE_SECONDS:
+                    marker.unlink(missing_ok=True)
+                    continue
+                lines = marker.read_text(encoding="utf-8").splitlines()
+            except OSError:
+                continue
+            try:
+                started = float(lines[0]) - _MTIME_SLACK
+            except (IndexError, ValueError):
+                started = now - PENDING_STALE_SECONDS
+            since = started if since is None else min(since, started)
+            live.update(line.strip() for line in lines[1:] if line.strip())
+        return live, since
+
+    def stats(self) -> dict[str, int]:
+        """Anzahl Schnappschüsse und belegter Platz der Blöcke."""
+        sizes = (
+            [p.stat().st_size for p in self.chunk_dir.glob("*/*") if p.is_file()]
+            if self.chunk_dir.is_dir()
+            else []
+        )
+        return {
+            "snapshots": len(self.list_snapshots()),
+            "chunks": len(sizes),
+            "chunk_bytes": sum(sizes),
+        }
+
+
+def _page_size(header: bytes) -> int:
+    if len(header) < 18 or not header.startswith(b"SQLite format 3\x00"):
+        return RAW_CHUNK_BYTES // PAGES_PER_CHUNK
+    size = int.from_bytes(header[16:18], "big")
+    return 65536 if size == 1 else max(512, size)
@@ -0,0 +1,253 @@
+"""Bridge-Outboxen nur schreiben, wenn sich ihr Inhalt geändert hat.
+
+Nach jedem Voll-Refresh zieht das Hauptfenster die Outboxen für FPM nach
+(``sync_default_outboxes``). Das hiess jedes Mal: alle Ausgaben lesen, in
+Python nach Stichworten filtern und beide Dateien komplett neu schreiben -
+auch wenn sich nur ein Budgetbetrag geändert hatte.
+
+Jede Outbox führt jetzt einen Wasserstand aus den Tabellen, aus denen sie
+entsteht. Wie beim Änderungsbus zählen ``TEMP``-Trigger die Schreibzugriffe
+je Tabelle mit (``temp.outbox_versions``); dazu kommen ``data_version``
+(Commits anderer Connections), ``schema_version`` und die Epoche des
+Abfrage-Caches (Wiederherstellen). Steht der Wasserstand, wird nicht einmal
+gelesen.
+
+Hat er sich bewegt, entstehen die Datensätze neu und werden mit dem zuletzt
+geschriebenen Stand verglichen - beim ersten Lauf mit dem, was schon in der
+Datei steht. Nur wenn sich ein Datensatz tatsächlich unterscheidet, wird
+die Datei geschrieben, dann wie bisher atomar als Ganzes: Anhängen liesse
+bei einem Abbruch eine halbe Zeile stehen, die FPM nicht von einer ganzen
+unterscheiden kann.
+
+Der gemerkte Stand hält die Connection nicht fest - sie lässt sich nicht
+schwach referenzieren. Stattdessen bekommt jede Connection beim ersten
+Export eine Zufallskennung als ``TEMP``-View (``temp.outbox_owner``); eine
+andere oder neu geöffnete Connection hat sie nicht und liest die Datei neu.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import secrets
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Hashable, Iterable
+
+from model.query_cache import cache_epoch
+from utils.atomic_write import atomar_offen
+
+logger = logging.getLogger(__name__)
+
+#: Gemerkte Outbox-Stände; je Datei einer, ältere fallen heraus.
+MAX_OUTBOXES = 8
+
+_VERSION_DDL = """
+CREATE TEMP TABLE IF NOT EXISTS outbox_versions(
+    tbl TEXT PRIMARY KEY,
+    version INTEGER NOT NULL
+)
+"""
+
+
+@dataclass(frozen=True)
+class OutboxWrite:
+    """Ergebnis von :func:`write_outbox`."""
+
+    path: Path
+    count: int
+    #: ``"unchanged"`` (nichts geschrieben) oder ``"rewritten"``.
+    mode: str
+
+
+@dataclass
+class _OutboxState:
+    owner: int
+    watermark: Hashable | None
+    lines: dict[str, str]
+    file_stat: tuple[int, int]
+
+
+_states: OrderedDict[str, _OutboxState] = OrderedDict()
+_states_lock = threading.Lock()
+
+
+def _owner_token(conn: sqlite3.Connection, *, create: bool = True) -> int | None:
+    """Kennung der Connection für gemerkte Stände; ``None`` wenn (noch) keine.
+
+    Angelegt wird sie nur ausserhalb einer Transaktion, sonst nähme ein
+    ``ROLLBACK`` die View wieder mit.
+    """
+    try:
+        row = conn.execute("SELECT token FROM temp.outbox_owner").fetchone()
+    except sqlite3.OperationalError:
+        if not create or conn.in_transaction:
+            return None
+        token = secrets.randbits(62)
+        conn.execute(f"CREATE TEMP VIEW outbox_owner AS SELECT {token} AS token")
+        return token
+    return int(row[0])
+
+
+def table_watermark(conn: sqlite3.Connection, tables: Iterable[str]) -> Hashable | None:
+    """Datenstand der ``tables`` auf dieser Connection.
+
+    ``None`` heisst "unbekannt": Eine Transaktion ist offen, deren Rollback
+    die Zähler zurückdrehen würde. Fehlende Zähl-Trigger werden angelegt;
+    was der Aufrufer danach liest, ist damit erfasst. Wird eine Tabelle neu
+    angelegt, bewegt sich ``schema_version``.
+    """
+    tables = tuple(tables)
+    if conn.in_transaction:
+        return None
+    existing = {
+        str(row[0])
+        for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
+    }
+    conn.execute(_VERSION_DDL)
+    for table in tables:
+        if table not in existing:
+            continue
+        for event in ("INSERT", "UPDATE", "DELETE"):
+            name = f"trg_outbox_version_{table}_{event.lower()}"
+            if conn.execute(
+                "SELECT 1 FROM sqlite_temp_master WHERE type='trigger' AND name=?",
+                (name,),
+            ).fetchone():
+                continue
+            conn.execute(
+                f"CREATE TEMP TRIGGER {name} AFTER {event} ON main.{table} "
+                "FOR EACH ROW BEGIN "
+                "INSERT OR REPLACE INTO outbox_versions(tbl, version) VALUES "
+                f"('{table}', COALESCE((SELECT version FROM outbox_versions "
+                f"WHERE tbl = '{table}'), 0) + 1); END"
+            )
+    versions = {
+        str(row[0]): int(row[1])
+        for row in conn.execute("SELECT tbl, version FROM temp.outbox_versions")
+    }
+    data_version = conn.execute("PRAGMA data_version").fetchone()
+    schema_version = conn.execute("PRAGMA schema_version").fetchone()
+    return (
+        tuple(versions.get(t, 0) for t in tables),
+        int(data_version[0]) if data_version else 0,
+        int(schema_version[0]) if schema_version else 0,
+        cache_epoch(conn),
+    )
+
+
+def write_outbox(
+    conn: sqlite3.Connection,
+    out: Path,
+    *,
+    tables: Iterable[str],
+    manifest: Callable[[], dict[str, Any]],
+    records: Callable[[], Iterable[dict[str, Any]]],
+) -> OutboxWrite:
+    """Schreibt ``manifest`` plus ``records`` nach ``out`` - falls nötig.
+
+    ``records`` wird nur aufgerufen, wenn sich der Wasserstand der
+    ``tables`` bewegt hat; jeder Datensatz braucht eine ``external_id``.
+    """
+    key = str(out.resolve())
+    try:
+        watermark = table_watermark(conn, tables)
+    except sqlite3.Error as exc:
+        logger.debug("Outbox-Wasserstand nicht lesbar: %s", exc)
+        watermark = None
+
+    try:
+        owner = _owner_token(conn)
+    except sqlite3.Error as exc:
+        logger.debug("Outbox-Kennung nicht lesbar: %s", exc)
+        owner = None
+    with _states_lock:
+        state = _states.get(key)
+    if state is not None and state.owner != owner:
+        state = None
+    current_stat = _file_stat(out)
+    if (
+        state is not None
+        and watermark is not None
+        and state.watermark == watermark
+        and state.file_stat == current_stat
+    ):
+        return OutboxWrite(out, len(state.lines), "unchanged")
+
+    lines = {
+        str(record["external_id"]): json.dumps(
+            record, ensure_ascii=False, sort_keys=True
+        )
+        for record in records()
+    }
+    previous = (
+        state.lines
+        if state is not None and state.file_stat == current_stat
+        else _read_records(out)
+    )
+    mode = "unchanged"
+    if previous != lines:
+        with atomar_offen(out) as handle:
+            handle.write(
+                json.dumps(manifest(), ensure_ascii=False, sort_keys=True) + "\n"
+            )
+            for line in lines.values():
+                handle.write(line + "\n")
+        # Die Datei trägt Beträge und Sparziele - dieselben Rechte wie der Ordner.
+        from model.file_permissions import secure_file
+
+        secure_file(out)
+        current_stat = _file_stat(out)
+        mode = "rewritten"
+
+    if owner is not None:
+        with _states_lock:
+            _states[key] = _OutboxState(owner, watermark, lines, current_stat)
+            _states.move_to_end(key)
+            while len(_states) > MAX_OUTBOXES:
+                _states.popitem(last=False)
+    return OutboxWrite(out, len(lines), mode)
+
+
+def forget(conn: sqlite3.Connection) -> None:
+    """Vergisst die Outbox-Stände der Connection, als wäre sie neu geöffnet."""
+    try:
+        owner = _owner_token(conn, create=False)
+    except sqlite3.Error:
+        return
+    with _states_lock:
+        for key in [k for k, s in _states.items() if s.owner == owner]:
+            del _states[key]
+
+
+def _file_stat(path: Path) -> tuple[int, int]:
+    try:
+        st = path.stat()
+    except OSError:
+        return (-1, -1)
+    return (st.st_size, st.st_mtime_ns)
+
+
+def _read_records(path: Path) -> dict[str, str] | None:
+    """Datensatzzeilen einer bestehenden Outbox, ``None`` wenn unbrauchbar."""
+    try:
+        raw_lines = path.read_text(encoding="utf-8").splitlines()
+    except (OSError, UnicodeDecodeError):
+        return None
+    out: dict[str, str] = {}
+    for index, line in enumerate(raw_lines):
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(record, dict):
+            return None
+        if index == 0 and "manifest" in str(record.get("schema", "")):
+            continue
+        if "external_id" not in record:
+            return None
+        out[str(record["external_id"])] = line
+    return out
@@ -57,7 +57,17 @@ class BudgetModel:
 
     def _cleanup_reserved_categories(self):
         """Entfernt fehlerhafte reservierte Kategorien aus der Datenbank (einmalig beim Start)."""
+        # Erst nachsehen: Jedes Modell räumt beim Anlegen auf, und im Normalfall
+        # gibt es nichts zu löschen - dann weder Schreibtransaktion noch Commit
+        # (und keine Fehlermeldung auf den Lese-Connections der Hintergrund-
+        # Berechnung, siehe ``model.background_compute``).
+        ph = ",".join("?" * len(RESERVED_CATEGORY_NAMES))
         try:
+            if not self.conn.execute(
+                f"SELECT 1 FROM budget WHERE category IN ({ph}) LIMIT 1",  # nosec B608
+                RESERVED_CATEGORY_NAMES,
+            ).fetchone():
+                return
             for reserved_name in RESERVED_CATEGORY_NAMES:
                 self.conn.execute(
                     "DELETE FROM budget WHERE category = ?", (reserved_name,)
@@ -93,7 +103,6 @@ class BudgetModel:
             "ON CONFLICT(year,month,typ,category) DO UPDATE SET amount=excluded.amount",
             (int(year), int(month), typ, category, float(amount)),
         )
-        self.conn.commit()
 
         new = self.conn.execute(
             "SELECT * FROM budget WHERE year=? AND month=? AND typ=? AND category=?",
@@ -107,6 +116,7 @@ class BudgetModel:
             dict(old) if old else None,
             dict(new) if new else None,
         )
+        self.conn.commit()
 
     def get_amount(
         self,
@@ -183,13 +193,12 @@ class BudgetModel:
             "DELETE FROM budget WHERE year=? AND typ=? AND category=?",
             (int(year), typ, category),
         )
+        # Undo-Einträge im selben Commit
+        self.undo.record_operations(
+            "budget", "DELETE", [(dict(r), None) for r in rows], group_id=group
+        )
         self.conn.commit()
 
-        for r in rows:
-            self.undo.record_operation(
-                "budget", "DELETE", dict(r), None, group_id=group
-            )
-
     def delete_category_all_years(self, typ: str, category: str) -> None:
         rows = self.conn.execute(
             "SELECT * FROM budget WHERE typ=? AND category=?",
@@ -202,13 +211,12 @@ class BudgetModel:
             "DELETE FROM budget WHERE typ=? AND category=?",
             (typ, category),
         )
+        # Undo-Einträge im selben Commit
+        self.undo.record_operations(
+            "budget", "DELETE", [(dict(r), None) for r in rows], group_id=group
+        )
         self.conn.commit()
 
-        for r in rows:
-            self.undo.record_operation(
-                "budget", "DELETE", dict(r), None, group_id=group
-            )
-
     def rename_category(self, typ: str, old_name: str, new_name: str) -> None:
         """Legacy-Kompatibilität: Kategorie-Rename zentral delegieren.
 
@@ -245,15 +253,14 @@ class BudgetModel:
             "UPDATE budget SET category=? WHERE typ=? AND category=?",
             (new_name, typ, old_name),
         )
-        self.conn.commit()
-
+        changes = []
         for r in rows:
             old_dict = dict(r)
             new_dict = dict(r)
             new_dict["category"] = new_name
-            self.undo.record_operation(
-                "budget", "UPDATE", old_dict, new_dict, group_id=group
-            )
+            changes.append((old_dict, new_dict))
+        self.undo.record_operations("budget", "UPDATE", changes, group_id=group)
+        self.conn.commit()
 
     def sum_by_typ(self, year: int, month: int) -> dict[str, float]:
         cur = self.conn.execute(
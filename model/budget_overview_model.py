@@ -7,6 +7,7 @@ Version 0.3.2.0
 
 from __future__ import annotations
 import calendar
+import functools
 import logging
 
 logger = logging.getLogger(__name__)
@@ -24,7 +25,11 @@ from model.budget_learning import (
     tracking_series_text,
     KIND_IRREGULAR,
 )
+from model.carry_over_engine import load_monthly, load_yearly_by_category
 from model.date_ranges import month_bounds
+from model.monthly_totals import has_monthly_totals
+from model.period_snapshots import has_period_snapshots
+from model.query_cache import cached_query
 from utils.i18n import tr, trf, display_typ, db_typ_from_display
 
 from model.budget_suggestion_engine import BudgetSuggestionEngine
@@ -129,12 +134,56 @@ def _norm_typ(s: str) -> str:
     return _TYP_ALIASES.get(str(s or "").strip().lower(), str(s or "").strip())
 
 
+def _cached(method):
+    """Ergebnis über den Abfrage-Cache der Connection zwischenspeichern.
+
+    Teil des Schlüssels ist neben den Argumenten, ob aus ``monthly_totals``
+    gelesen wird - beide Wege sollen sich im Test vergleichen lassen.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        params = (
+            tuple(tuple(a) if isinstance(a, list) else a for a in args),
+            tuple(sorted(kwargs.items())),
+            self._use_totals(),
+        )
+        return cached_query(
+            self.conn,
+            method.__qualname__,
+            params,
+            lambda: method(self, *args, **kwargs),
+        )
+
+    return wrapper
+
+
 class BudgetOverviewModel:
     """Berechnet Budgetübersicht mit Monatsübertrag und Anpassungsvorschlägen."""
 
     def __init__(self, conn: sqlite3.Connection):
         self.conn = conn
         self._engine = BudgetSuggestionEngine(conn)
+        self._has_totals: bool | None = None
+        self._has_snapshots: bool | None = None
+
+    def _use_totals(self) -> bool:
+        """Summen aus ``monthly_totals`` lesen (Schema ab v19)?"""
+        if self._has_totals is None:
+            try:
+                self._has_totals = has_monthly_totals(self.conn)
+            except sqlite3.Error:
+                self._has_totals = False
+        return self._has_totals
+
+    def _use_snapshots(self) -> bool:
+        """Abgeschlossene Monate aus ``period_snapshots`` lesen (ab v22)?"""
+        if self._has_snapshots is None:
+            try:
+                self._has_snapshots = has_period_snapshots(self.conn)
+            except sqlite3.Error:
+                self._has_snapshots = False
+        return self._has_snapshots
 
     # ------------------------------------------------------------------
     # Kernmethode: Monatsweise Budget-Übersicht mit Carry-Over
@@ -178,31 +227,32 @@ class BudgetOverviewModel:
                 typ_db = db_typ_from_display(typ)
             except Exception:
                 typ_db = typ
-            # ── Übertrag aus Vorjahren berechnen (start_year..year-1) ──
-            carry_over = 0.0
-            if start_year < year:
-                for y in range(start_year, year):
-                    first_m = start_month if y == start_year else 1
-                    for m in range(first_m, 13):
-                        b = self._budget_sum(y, m, typ_db)
-                        a = self._actual_sum(y, m, typ_db)
-                        carry_over += rest_sign(typ_db, b, a)
-
-            # ── Aktuelles Jahr: Monat für Monat ──
-            for m in range(1, 13):
-                budget_total = self._budget_sum(year, m, typ_db)
-                actual_total = self._actual_sum(year, m, typ_db)
+            # Monate ab Januar des ersten Jahres; kumuliert wird ab start_month
+            # im Startjahr, liegt das Startjahr nach dem angezeigten, ab Januar.
+            from_year = min(start_year, year)
+            matrix = load_monthly(
+                self.conn,
+                typ_db,
+                from_year,
+                year,
+                use_totals=self._use_totals(),
+                use_snapshots=self._use_snapshots(),
+            )
+            budgets, actuals = matrix.totals()
+            start = start_month - 1 if start_year <= year else 0
+            cumulated = matrix.cumulative_rests(start)
 
+            for m in range(1, 13):
+                k = (year - from_year) * 12 + m - 1
+                budget_total, actual_total = budgets[k], actuals[k]
                 rest = rest_sign(typ_db, budget_total, actual_total)
 
-                # Kumulation: Im Startjahr erst ab start_month,
-                # in Folgejahren ab Januar (carry_over > 0 aus Vorjahren)
-                if year == start_year and m < start_month:
+                if k < start:
                     cumulative = rest
                     show_carry = 0.0
                 else:
-                    cumulative = rest + carry_over
-                    show_carry = carry_over
+                    cumulative = cumulated[k - start]
+                    show_carry = cumulated[k - start - 1] if k > start else 0.0
 
                 if m in months:
                     results.append(
@@ -218,12 +268,6 @@ class BudgetOverviewModel:
                         )
                     )
 
-                # Übertrag für nächsten Monat
-                if year == start_year and m < start_month:
-                    pass  # carry_over bleibt unverändert
-                else:
-                    carry_over = cumulative
-
         return results
 
     # ------------------------------------------------------------------
@@ -463,34 +507,37 @@ class BudgetOverviewModel:
                     except Exception as e:
                         logger.debug("_budget_by_category prev_year month=%s: %s", m, e)
 
-            for cat in sorted(all_cats):
-                # Einheitliche Engine-Parameter (wie Budgetwarnungen)
-                # WICHTIG: require_same_sign_ratio darf NICHT 1.0 sein, sonst blockiert
-                # ein einzelner Ausreisser-Monat den gesamten Vorschlag.
-                try:
-                    from settings import Settings
-
-                    sign_ratio = float(
-                        Settings().get("budget_suggestion_sign_ratio", 0.7) or 0.7
-                    )
-                except Exception:
-                    sign_ratio = 0.7
-                try:
-                    res = self._engine.compute_category_suggestion(
-                        typ=typ_db,
-                        category=cat,
-                        year=year,
-                        month=current_month,
-                        months_back=min_consecutive_months,
-                        alpha=0.8,
-                        min_abs_change=20.0,
-                        min_pct_change=0.05,
-                        round_to=10.0,
-                        require_same_sign_ratio=sign_ratio,
-                    )
-                except Exception:
-                    res = None
+            # Einheitliche Engine-Parameter (wie Budgetwarnungen)
+            # WICHTIG: require_same_sign_ratio darf NICHT 1.0 sein, sonst blockiert
+            # ein einzelner Ausreisser-Monat den gesamten Vorschlag.
+            try:
+                from settings import Settings
 
+                sign_ratio = float(
+                    Settings().get("budget_suggestion_sign_ratio", 0.7) or 0.7
+                )
+            except Exception:
+                sign_ratio = 0.7
+            # Alle Kategorien des Typs in einem Durchgang: Budget- und Ist-
+            # Matrix werden einmal geladen statt je Kategorie und Monat.
+            try:
+                results = self._engine.compute_suggestions(
+                    [(typ_db, cat) for cat in sorted(all_cats)],
+                    year=year,
+                    month=current_month,
+                    months_back=min_consecutive_months,
+                    alpha=0.8,
+                    min_abs_change=20.0,
+                    min_pct_change=0.05,
+                    round_to=10.0,
+                    require_same_sign_ratio=sign_ratio,
+                )
+            except sqlite3.Error as exc:
+                logger.warning("Budgetvorschläge %s: %s", typ_db, exc)
+                results = {}
+
+            for cat in sorted(all_cats):
+                res = results.get((typ_db, cat))
                 if not res:
                     continue
 
@@ -1663,13 +1710,15 @@ class BudgetOverviewModel:
             return 0.0
 
         # Kumulierten Rest des Vorjahres berechnen
-        total_rest = 0.0
-        for m in range(1, 13):
-            b = self._budget_sum(prev_year, m, typ)
-            a = self._actual_sum(prev_year, m, typ)
-            total_rest += rest_sign(typ, b, a)
-
-        return total_rest
+        matrix = load_monthly(
+            self.conn,
+            typ,
+            prev_year,
+            prev_year,
+            use_totals=self._use_totals(),
+            use_snapshots=self._use_snapshots(),
+        )
+        return sum(matrix.rests())
 
     def _latest_budget_month_before_or_at(
         self, year: int, month: int, typ: str
@@ -1728,17 +1777,25 @@ class BudgetOverviewModel:
 
     def _actual_sum(self, year: int, month: int, typ: str) -> float:
         """Summe aller Tracking-Einträge für Jahr/Monat/Typ."""
-        start, end = month_bounds(year, month)
-        row = self.conn.execute(
-            "SELECT COALESCE(SUM(amount), 0) FROM tracking "
-            "WHERE date >= ? AND date < ? AND typ=?",
-            (start, end, typ),
-        ).fetchone()
+        if self._use_totals():
+            row = self.conn.execute(
+                "SELECT COALESCE(SUM(actual), 0) FROM monthly_totals "
+                "WHERE year=? AND month=? AND typ=?",
+                (year, month, typ),
+            ).fetchone()
+        else:
+            start, end = month_bounds(year, month)
+            row = self.conn.execute(
+                "SELECT COALESCE(SUM(amount), 0) FROM tracking "
+                "WHERE date >= ? AND date < ? AND typ=?",
+                (start, end, typ),
+            ).fetchone()
         val = float(row[0]) if row else 0.0
         if typ == TYP_EXPENSES:
             return abs(val)
         return val
 
+    @_cached
     def _budget_by_category(self, year: int, month: int, typ: str) -> dict[str, float]:
         """Budget pro Kategorie."""
         cur = self.conn.execute(
@@ -1747,14 +1804,22 @@ class BudgetOverviewModel:
         )
         return {str(r[0]): float(r[1]) for r in cur.fetchall()}
 
+    @_cached
     def _actual_by_category(self, year: int, month: int, typ: str) -> dict[str, float]:
         """Ist-Werte pro Kategorie."""
-        start, end = month_bounds(year, month)
-        cur = self.conn.execute(
-            "SELECT category, SUM(amount) FROM tracking "
-            "WHERE date >= ? AND date < ? AND typ=? GROUP BY category",
-            (start, end, typ),
-        )
+        if self._use_totals():
+            cur = self.conn.execute(
+                "SELECT category, actual FROM monthly_totals "
+                "WHERE year=? AND month=? AND typ=? AND actual IS NOT NULL",
+                (year, month, typ),
+            )
+        else:
+            start, end = month_bounds(year, month)
+            cur = self.conn.execute(
+                "SELECT category, SUM(amount) FROM tracking "
+                "WHERE date >= ? AND date < ? AND typ=? GROUP BY category",
+                (start, end, typ),
+            )
         result = {}
         for r in cur.fetchall():
             val = float(r[1])
@@ -1778,6 +1843,7 @@ class BudgetOverviewModel:
         """
         return self._carry_over_by_category(year, month, typ, start_month, start_year)
 
+    @_cached
     def _carry_over_by_category(
         self,
         year: int,
@@ -1802,82 +1868,63 @@ class BudgetOverviewModel:
         if year == start_year and month <= start_month:
             return {}
 
-        carry: dict[str, float] = {}
-
-        # Vorjahre kumulieren (start_year bis year-1)
-        if start_year < year:
-            for y in range(start_year, year):
-                first_m = start_month if y == start_year else 1
-                carry = self._accumulate_carry_batch(carry, y, first_m, 12, typ)
-
-        # Aktuelles Jahr: von (start_month oder 1) bis month-1
-        first_m_this_year = start_month if year == start_year else 1
-        end_m = month - 1
-        if end_m >= first_m_this_year:
-            carry = self._accumulate_carry_batch(
-                carry, year, first_m_this_year, end_m, typ
-            )
+        # Fenster: ab start_month im Startjahr (liegt es nach dem aktuellen
+        # Jahr, ab Januar) bis einschliesslich Vormonat.
+        first = (start_year, start_month) if start_year <= year else (year, 1)
+        last = (year, month - 1) if month > 1 else (year - 1, 12)
+        if last < first:
+            return {}
+        matrix = load_yearly_by_category(
+            self.conn,
+            typ,
+            first,
+            last,
+            use_totals=self._use_totals(),
+            use_snapshots=self._use_snapshots(),
+        )
+        return matrix.rest_by_row()
 
-        return carry
+    def _range_totals(
+        self, year: int, from_month: int, to_month: int, typ: str, months=None
+    ) -> tuple[dict[str, float], dict[str, float]]:
+        """Budget und Ist pro Kategorie über Monate aus ``monthly_totals``.
 
-    def _accumulate_carry_batch(
-        self,
-        carry: dict[str, float],
-        year: int,
-        from_month: int,
-        to_month: int,
-        typ: str,
-    ) -> dict[str, float]:
-        """Batch-Version: kumuliert Budget-Rest pro Kategorie über einen Monatsbereich.
-        Verwendet nur 2 SQL-Queries statt 2 × Anzahl-Monate.
+        Nur Kategorien mit Budgetzeilen bzw. Buchungen erscheinen, wie bei
+        den Abfragen auf ``budget``/``tracking``.
         """
-        if from_month > to_month:
-            return carry
-
-        # Budget: alle Monate in einer Query
-        cur_b = self.conn.execute(
-            "SELECT category, SUM(amount) FROM budget "
-            "WHERE year=? AND month>=? AND month<=? AND typ=? "
-            "GROUP BY category",
-            (year, from_month, to_month, typ),
-        )
-        budget_totals = {str(r[0]): float(r[1]) for r in cur_b.fetchall()}
-
-        # Actual: alle Monate in einer Query
-        start_date = f"{year:04d}-{from_month:02d}-01"
-        last_day = calendar.monthrange(year, to_month)[1]
-        end_date = f"{year:04d}-{to_month:02d}-{last_day:02d}"
-        cur_a = self.conn.execute(
-            "SELECT category, SUM(amount) FROM tracking "
-            "WHERE date >= ? AND date <= ? AND typ=? "
-            "GROUP BY category",
-            (start_date, end_date, typ),
+        sql = (
+            "SELECT category, SUM(budget), SUM(actual) FROM monthly_totals "
+            "WHERE year=? AND month>=? AND month<=? AND typ=?"
         )
-        actual_totals = {}
-        for r in cur_a.fetchall():
-            val = float(r[1])
-            if typ == TYP_EXPENSES:
-                val = abs(val)
-            actual_totals[str(r[0])] = val
-
-        # Rest pro Kategorie berechnen und akkumulieren
-        all_cats = set(budget_totals.keys()) | set(actual_totals.keys())
-        for cat in all_cats:
-            b = budget_totals.get(cat, 0.0)
-            a = actual_totals.get(cat, 0.0)
-            rest = rest_sign(typ, b, a)
-            carry[cat] = carry.get(cat, 0.0) + rest
-
-        return carry
+        params: list = [year, from_month, to_month, typ]
+        if months is not None:
+            sql += f" AND month IN ({','.join('?' for _ in months)})"  # nosec B608
+            params.extend(months)
+        budget_totals: dict[str, float] = {}
+        actual_totals: dict[str, float] = {}
+        for cat, budget, actual in self.conn.execute(
+            sql + " GROUP BY category", params
+        ).fetchall():
+            if budget is not None:
+                budget_totals[str(cat)] = float(budget)
+            if actual is not None:
+                val = float(actual)
+                actual_totals[str(cat)] = abs(val) if typ == TYP_EXPENSES else val
+        return budget_totals, actual_totals
 
     # ──────── Öffentliche Aggregat-Methoden ────────
 
+    @_cached
     def budget_by_category_range(
         self, year: int, months: list[int], typ: str
     ) -> dict[str, float]:
         """Budget pro Kategorie, summiert über mehrere Monate (Batch-Query)."""
         if not months:
             return {}
+        if self._use_totals():
+            return self._range_totals(
+                year, min(months), max(months), typ, months=list(months)
+            )[0]
         placeholders = ",".join("?" for _ in months)
         cur = self.conn.execute(
             f"SELECT category, SUM(amount) FROM budget "  # nosec B608
@@ -1887,12 +1934,17 @@ class BudgetOverviewModel:
         )
         return {str(r[0]): float(r[1]) for r in cur.fetchall()}
 
+    @_cached
     def actual_by_category_range(
         self, year: int, months: list[int], typ: str
     ) -> dict[str, float]:
         """Ist-Werte pro Kategorie, summiert über mehrere Monate (Batch-Query)."""
         if not months:
             return {}
+        if self._use_totals():
+            return self._range_totals(
+                year, min(months), max(months), typ, months=list(months)
+            )[1]
         min_m, max_m = min(months), max(months)
         start_date = f"{year:04d}-{min_m:02d}-01"
         last_day = calendar.monthrange(year, max_m)[1]
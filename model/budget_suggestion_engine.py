@@ -58,6 +58,8 @@ from model.category_forecast_mode import (
     normalize_forecast_mode,
 )
 from model.date_ranges import month_bounds
+from model.monthly_totals import has_monthly_totals
+from model.profiling import profiled
 from model.typ_constants import (
     TYP_INCOME,
     TYP_EXPENSES,
@@ -67,10 +69,11 @@ from model.typ_constants import (
     rest_sign,
     ALL_TYPEN,
 )
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import date
 from statistics import median
-from typing import Optional, List, Tuple
+from typing import Iterable, Iterator, Optional, List, Tuple
 
 
 @dataclass
@@ -87,6 +90,28 @@ class SuggestionResult:
     delta: float  # suggested - current
 
 
+@dataclass
+class _Preload:
+    """Budget- und Ist-Matrix für :meth:`compute_suggestions`.
+
+    Schlüssel ``(year, month, typ, category)``; ``first``/``last`` sind
+    Monatsindizes (``year * 12 + month - 1``) des geladenen Horizonts.
+    Monate ausserhalb fragen weiter einzeln die DB.
+    """
+
+    first: int
+    last: int
+    budgets: dict[tuple[int, int, str, str], Optional[float]]
+    actuals: dict[tuple[int, int, str, str], float]
+    # (typ, name) -> (is_fix, is_recurring, forecast_mode); None = Spalten fehlen
+    categories: Optional[dict[tuple[str, str], tuple]]
+    has_forecast_mode: bool
+    not_before: Optional[date]
+
+    def covers(self, year: int, month: int) -> bool:
+        return self.first <= int(year) * 12 + int(month) - 1 <= self.last
+
+
 # Typen, deren Tracking-Beträge immer positiv interpretiert werden
 _ABS_TYPEN = {"ausgaben", "ersparnisse"}
 
@@ -99,6 +124,8 @@ class BudgetSuggestionEngine:
 
     def __init__(self, conn: sqlite3.Connection):
         self.conn = conn
+        self._has_totals: bool | None = None
+        self._preload: _Preload | None = None
 
     # ------------------------------------------------------------
     # Public API
@@ -416,6 +443,138 @@ class BudgetSuggestionEngine:
             delta=float(delta),
         )
 
+    @profiled("suggestions.compute")
+    def compute_suggestions(
+        self,
+        keys: Iterable[Tuple[str, str]],
+        year: int,
+        month: int,
+        **params,
+    ) -> dict[Tuple[str, str], Optional[SuggestionResult]]:
+        """:meth:`compute_category_suggestion` für viele Kategorien auf einmal.
+
+        Einzeln fragt jede Kategorie Budget und Ist Monat für Monat ab, über
+        bis zu 60 Monate - bei 150 Kategorien Zehntausende Abfragen. Hier
+        laden zwei gruppierte Abfragen die Budget- und die Ist-Matrix
+        (Kategorie × Monat) für den ganzen Horizont, eine weitere die
+        Kategorie-Flags; gerechnet wird danach nur noch im Speicher, mit
+        denselben Regeln und damit denselben Ergebnissen.
+
+        Args:
+            keys: ``(typ, category)``-Paare.
+            year/month: Zielmonat wie bei der Einzelberechnung.
+            params: weitere Parameter von :meth:`compute_category_suggestion`.
+
+        Returns:
+            ``{(typ, category): SuggestionResult | None}``. Scheitert eine
+            Kategorie an ihren Daten, steht dort ``None``.
+        """
+        wanted = list(dict.fromkeys((str(t), str(c)) for t, c in keys))
+        if not wanted:
+            return {}
+        months_back = int(params.get("months_back", 6))
+        # Weitester Blick zurück: Strähnen 60 Monate ab dem Vormonat, Fenster
+        # months_back * 3, letzte Budgetbasis 24 Monate.
+        horizon = max(60, months_back * 3, 24) + 1
+        results: dict[Tuple[str, str], Optional[SuggestionResult]] = {}
+        with self._preloaded({t for t, _c in wanted}, year, month, horizon):
+            for typ, category in wanted:
+                try:
+                    results[(typ, category)] = self.compute_category_suggestion(
+                        typ, category, year, month, **params
+                    )
+                except (sqlite3.Error, TypeError, ValueError) as exc:
+                    logger.debug("Vorschlag %s/%s: %s", typ, category, exc)
+                    results[(typ, category)] = None
+        return results
+
+    @contextmanager
+    def _preloaded(
+        self, typs: set[str], year: int, month: int, horizon: int
+    ) -> Iterator[None]:
+        last = int(year) * 12 + int(month) - 1
+        first = last - int(horizon)
+        typ_list = sorted(typs)
+        marks = ",".join("?" * len(typ_list))
+        budgets: dict[tuple[int, int, str, str], Optional[float]] = {}
+        for y, m, typ, cat, amount in self.conn.execute(
+            f"""
+            SELECT year, month, typ, category, amount FROM budget
+            WHERE year BETWEEN ? AND ? AND year * 12 + month - 1 BETWEEN ? AND ?
+              AND typ IN ({marks})
+            """,  # nosec B608
+            (first // 12, last // 12, first, last, *typ_list),
+        ):
+            try:
+                budgets[(y, m, typ, cat)] = None if amount is None else float(amount)
+            except (TypeError, ValueError):
+                budgets[(y, m, typ, cat)] = None
+        actuals: dict[tuple[int, int, str, str], float] = {}
+        for y, m, typ, cat, total in self._actual_rows(first, last, typ_list):
+            if total is not None:
+                actuals[(int(y), int(m), typ, cat)] = float(total)
+        categories, has_forecast_mode = self._category_rows()
+        self._preload = _Preload(
+            first,
+            last,
+            budgets,
+            actuals,
+            categories,
+            has_forecast_mode,
+            self._data_start_boundary(),
+        )
+        try:
+            yield
+        finally:
+            self._preload = None
+
+    def _actual_rows(self, first: int, last: int, typs: list[str]) -> list[tuple]:
+        marks = ",".join("?" * len(typs))
+        if self._uses_monthly_totals():
+            return self.conn.execute(
+                f"""
+                SELECT year, month, typ, category, actual FROM monthly_totals
+                WHERE year BETWEEN ? AND ? AND year * 12 + month - 1 BETWEEN ? AND ?
+                  AND typ IN ({marks})
+                """,  # nosec B608
+                (first // 12, last // 12, first, last, *typs),
+            ).fetchall()
+        start, _end = month_bounds(first // 12, first % 12 + 1)
+        _start, end = month_bounds(last // 12, last % 12 + 1)
+        return self.conn.execute(
+            f"""
+            SELECT CAST(substr(date, 1, 4) AS INTEGER),
+                   CAST(substr(date, 6, 2) AS INTEGER),
+                   typ, category, SUM(amount)
+            FROM tracking
+            WHERE date >= ? AND date < ? AND typ IN ({marks})
+            GROUP BY 1, 2, 3, 4
+            """,  # nosec B608
+            (start, end, *typs),
+        ).fetchall()
+
+    def _category_rows(self) -> tuple[Optional[dict[tuple[str, str], tuple]], bool]:
+        """Flags und Forecast-Modus aller Kategorien in einer Abfrage."""
+        try:
+            cols = {
+                row[1]
+                for row in self.conn.execute("PRAGMA table_info(categories)").fetchall()
+            }
+            if not {"typ", "name", "is_fix", "is_recurring"}.issubset(cols):
+                return None, "forecast_mode" in cols
+            mode = "forecast_mode" if "forecast_mode" in cols else "NULL"
+            rows = self.conn.execute(
+                f"SELECT typ, name, is_fix, is_recurring, {mode} FROM categories"  # nosec B608
+            ).fetchall()
+        except sqlite3.Error as exc:
+            logger.debug("Kategorie-Flags (Batch): %s", exc)
+            return None, False
+        out: dict[tuple[str, str], tuple] = {}
+        for typ, name, is_fix, is_recurring, forecast_mode in rows:
+            # Wie fetchone(): bei Duplikaten zählt die erste Zeile.
+            out.setdefault((typ, name), (is_fix, is_recurring, forecast_mode))
+        return out, "forecast_mode" in cols
+
     # ------------------------------------------------------------
     # Hilfsmethoden: 0-Buchungen-Reduktion
     # ------------------------------------------------------------
@@ -642,6 +801,14 @@ class BudgetSuggestionEngine:
         Bestandsdatenbanken oder Tests können ältere Schemas haben. Dann wird
         sicher auf (False, False) zurückgefallen.
         """
+        preload = self._preload
+        if preload is not None:
+            if preload.categories is None:
+                return (False, False)
+            found = preload.categories.get((typ, category))
+            if found is None:
+                return (False, False)
+            return (self._as_bool(found[0]), self._as_bool(found[1]))
         try:
             cols = {
                 row[1]
@@ -678,6 +845,13 @@ class BudgetSuggestionEngine:
         self, typ: str, category: str, is_fix: bool, is_recurring: bool
     ) -> str:
         """Liest den gespeicherten Forecast-Modus und wendet Auto-Defaults an."""
+        preload = self._preload
+        if preload is not None and preload.categories is not None:
+            stored = None
+            found = preload.categories.get((typ, category))
+            if preload.has_forecast_mode and found is not None:
+                stored = normalize_forecast_mode(found[2])
+            return effective_forecast_mode(stored, is_fix, is_recurring)
         try:
             cols = {
                 row[1]
@@ -770,6 +944,9 @@ class BudgetSuggestionEngine:
     def _get_budget_amount(
         self, year: int, month: int, typ: str, category: str
     ) -> Optional[float]:
+        preload = self._preload
+        if preload is not None and preload.covers(year, month):
+            return preload.budgets.get((year, month, typ, category))
         row = self.conn.execute(
             "SELECT amount FROM budget WHERE year=? AND month=? AND typ=? AND category=?",
             (year, month, typ, category),
@@ -798,18 +975,37 @@ class BudgetSuggestionEngine:
                 return float(amount)
         return None
 
+    def _uses_monthly_totals(self) -> bool:
+        if self._has_totals is None:
+            try:
+                self._has_totals = has_monthly_totals(self.conn)
+            except sqlite3.Error:
+                self._has_totals = False
+        return bool(self._has_totals)
+
     def _get_spent_amount(
         self, year: int, month: int, typ: str, category: str
     ) -> float:
-        start, end = month_bounds(year, month)
-
-        row = self.conn.execute(
-            """
-            SELECT COALESCE(SUM(amount), 0) FROM tracking
-            WHERE date >= ? AND date < ? AND typ = ? AND category = ?
-            """,
-            (start, end, typ, category),
-        ).fetchone()
+        preload = self._preload
+        if preload is not None and preload.covers(year, month):
+            val = preload.actuals.get((year, month, typ, category), 0.0)
+            return val if is_income(typ) else abs(val)
+        if self._uses_monthly_totals():
+            # Schema ab v19: ein Schlüsselzugriff statt einer Bereichssumme.
+            row = self.conn.execute(
+                "SELECT actual FROM monthly_totals "
+                "WHERE year=? AND month=? AND typ=? AND category=?",
+                (year, month, typ, category),
+            ).fetchone()
+        else:
+            start, end = month_bounds(year, month)
+            row = self.conn.execute(
+                """
+                SELECT COALESCE(SUM(amount), 0) FROM tracking
+                WHERE date >= ? AND date < ? AND typ = ? AND category = ?
+                """,
+                (start, end, typ, category),
+            ).fetchone()
         val = float(row[0]) if row and row[0] is not None else 0.0
         # Ausgaben UND Ersparnisse → abs, um negative DB-Werte abzufangen
         if not is_income(typ):
@@ -876,6 +1072,8 @@ class BudgetSuggestionEngine:
         Startmonat). Dann wird NICHT geklammert, damit die Langzeit-0-Reduktion
         (Budget gesetzt, nie gebucht) wie gewünscht weiter greifen kann.
         """
+        if self._preload is not None:
+            return self._preload.not_before
         bounds: List[Tuple[int, int]] = []
         fb = self._first_booking_month()
         if fb is not None:
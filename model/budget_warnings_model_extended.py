@@ -9,6 +9,7 @@ from datetime import date
 
 from model.budget_suggestion_engine import BudgetSuggestionEngine
 from model.date_ranges import month_bounds
+from model.profiling import profiled
 from model.typ_constants import (
     TYP_INCOME,
     TYP_EXPENSES,
@@ -139,6 +140,7 @@ class BudgetWarningsModelExtended:
             for row in cur.fetchall()
         ]
 
+    @profiled("warnings.check_extended")
     def check_warnings_extended(
         self, year: int, month: int, lookback_months: int = 6
     ) -> List[BudgetExceedance]:
@@ -211,6 +213,24 @@ class BudgetWarningsModelExtended:
         except Exception:
             sign_ratio = 0.7
 
+        # Vorschläge für alle Warnungen in einem Durchgang (eine Budget- und
+        # eine Ist-Matrix statt Abfragen je Kategorie und Monat).
+        try:
+            results = self._engine.compute_suggestions(
+                [(w.typ, w.category) for w in warnings],
+                year=year,
+                month=month,
+                months_back=lookback_months,
+                alpha=0.8,
+                min_abs_change=20.0,
+                min_pct_change=0.05,
+                round_to=10.0,
+                require_same_sign_ratio=sign_ratio,
+            )
+        except sqlite3.Error as exc:
+            logger.warning("Budgetvorschläge für Warnungen: %s", exc)
+            results = {}
+
         for warn in warnings:
             # Budget abrufen: Zielmonat bevorzugen, sonst letzte positive
             # Budgetbasis <= Zielmonat. Das hält Warnungen konsistent mit der
@@ -245,23 +265,8 @@ class BudgetWarningsModelExtended:
             # - Ein Eintrag wird angezeigt, wenn:
             #   a) percent_used >= threshold_percent (klassischer Warner) ODER
             #   b) ein valider Vorschlag existiert.
-            suggestion = None
-            try:
-                res = self._engine.compute_category_suggestion(
-                    typ=warn.typ,
-                    category=warn.category,
-                    year=year,
-                    month=month,
-                    months_back=lookback_months,
-                    alpha=0.8,
-                    min_abs_change=20.0,
-                    min_pct_change=0.05,
-                    round_to=10.0,
-                    require_same_sign_ratio=sign_ratio,
-                )
-                suggestion = res.suggested_budget if res else None
-            except Exception:
-                suggestion = None
+            res = results.get((str(warn.typ), str(warn.category)))
+            suggestion = res.suggested_budget if res else None
 
             if percent_used >= float(warn.threshold_percent) or suggestion is not None:
                 exceed_count = self._get_exceed_count(
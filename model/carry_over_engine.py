@@ -0,0 +1,332 @@
+"""Übertrag (Carry-over) über mehrere Jahre in einem Durchgang.
+
+Die Budgetübersicht rechnete den Übertrag in Python-Schleifen Monat für
+Monat und Jahr für Jahr, mit eigenen Abfragen je Schritt; eine kumulierte
+Ansicht über zehn Jahre kostete zehnmal so viel wie eine über ein Jahr.
+
+Hier wird Budget und Ist eines Typs für die ganze Spanne auf einmal geladen
+- aus ``monthly_totals`` eine gruppierte Abfrage, sonst je eine auf
+``budget`` und ``tracking`` - als Matrix Zeile × Periode:
+
+  :func:`load_monthly`             eine Zeile (alle Kategorien) × Monate;
+                                   Übertrag und kumulierter Rest sind die
+                                   Präfixsumme der Monatsreste.
+  :func:`load_yearly_by_category`  Kategorien × Kalenderjahre, je Jahr nur
+                                   der Teil im Übertragsfenster.
+
+Gruppiert wird in SQLite, nicht in Python: Die Zeilen je Kategorie und
+Monat einzeln zu holen kostet mehr als jede Rechnung darauf.
+
+Mit NumPy rechnet :class:`CarryMatrix` auf Arrays, ohne NumPy mit denselben
+Formeln in reinem Python. NumPy ist keine Abhängigkeit der App; das Ergebnis
+ist in beiden Fällen dasselbe (bis auf die Summationsreihenfolge im letzten
+Bit).
+
+Mit ``use_snapshots`` kommen die Zellen abgeschlossener Monate und Jahre
+ab Fensterbeginn aus ``period_snapshots`` (siehe
+:mod:`model.period_snapshots`); live gruppiert wird nur der Rest.
+
+Die Betragsregel der bisherigen Schleifen bleibt: Das Ist von Ausgaben zählt
+als Betrag, in der Monatsübersicht je Monat über alle Kategorien, im
+Übertrag je Kategorie und Kalenderjahr.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from typing import Any, Callable
+
+from model.period_snapshots import frozen_months, frozen_years
+from model.typ_constants import TYP_EXPENSES, is_income
+
+try:
+    import numpy as np
+except ImportError:  # NumPy ist optional
+    np = None  # type: ignore[assignment]
+
+
+class CarryMatrix:
+    """Budget und Ist eines Typs je Zeile und Periode.
+
+    ``actual`` hält die vorzeichenbehaftete Summe, ``seen`` markiert Zellen
+    mit Budgetzeile oder Buchung - der Übertrag listet wie bisher nur
+    Kategorien, die im Zeitraum vorkommen.
+    """
+
+    def __init__(
+        self,
+        typ: str,
+        rows: list[str],
+        periods: int,
+        budget: Any,
+        actual: Any,
+        seen: Any,
+    ):
+        self.typ = typ
+        self.rows = rows
+        self.periods = periods
+        self._budget = budget
+        self._actual = actual
+        self._seen = seen
+        self._income = is_income(typ)
+        self._absolute = typ == TYP_EXPENSES
+
+    def _rest(self, budget: Any, actual: Any) -> Any:
+        # rest_sign() für ganze Vektoren: positiv = gut / unter Budget.
+        return actual - budget if self._income else budget - actual
+
+    def totals(self) -> tuple[list[float], list[float]]:
+        """Budget- und Ist-Summe je Periode über alle Zeilen."""
+        if np is not None:
+            budget = self._budget.sum(axis=0)
+            actual = self._actual.sum(axis=0)
+            if self._absolute:
+                actual = np.abs(actual)
+            return budget.tolist(), actual.tolist()
+        budget_l = [0.0] * self.periods
+        actual_l = [0.0] * self.periods
+        for row_b, row_a in zip(self._budget, self._actual):
+            for k in range(self.periods):
+                budget_l[k] += row_b[k]
+                actual_l[k] += row_a[k]
+        if self._absolute:
+            actual_l = [abs(a) for a in actual_l]
+        return budget_l, actual_l
+
+    def rests(self) -> list[float]:
+        """Rest je Periode über alle Zeilen."""
+        budget, actual = self.totals()
+        return [self._rest(b, a) for b, a in zip(budget, actual)]
+
+    def cumulative_rests(self, start: int) -> list[float]:
+        """Laufender Rest ab Periode ``start`` (Präfixsumme der Reste).
+
+        ``result[k - start]`` ist der kumulierte Rest bis einschliesslich
+        Periode ``k``.
+        """
+        rests = self.rests()[start:]
+        if np is not None:
+            return np.cumsum(rests).tolist() if rests else []
+        out: list[float] = []
+        running = 0.0
+        for rest in rests:
+            running += rest
+            out.append(running)
+        return out
+
+    def rest_by_row(self) -> dict[str, float]:
+        """Summe der Periodenreste je Zeile, nur für Zeilen mit Daten."""
+        if np is not None:
+            actual = np.abs(self._actual) if self._absolute else self._actual
+            rest = np.where(self._seen, self._rest(self._budget, actual), 0.0)
+            total = rest.sum(axis=1)
+            present = self._seen.any(axis=1)
+            return {
+                row: float(total[i]) for i, row in enumerate(self.rows) if present[i]
+            }
+        result: dict[str, float] = {}
+        for i, row in enumerate(self.rows):
+            total = 0.0
+            present = False
+            for b, a, seen in zip(self._budget[i], self._actual[i], self._seen[i]):
+                if not seen:
+                    continue
+                present = True
+                total += self._rest(b, abs(a) if self._absolute else a)
+            if present:
+                result[row] = total
+        return result
+
+
+def load_monthly(
+    conn: sqlite3.Connection,
+    typ: str,
+    from_year: int,
+    to_year: int,
+    *,
+    use_totals: bool,
+    use_snapshots: bool = False,
+) -> CarryMatrix:
+    """Monatssummen eines Typs für ``from_year..to_year`` (eine Zeile).
+
+    Periode ``k`` ist der Monat ``(from_year + k // 12, k % 12 + 1)``.
+    """
+    first, last = (from_year, 1), (to_year, 12)
+    cells: list[tuple[Any, ...]] = []
+    if use_snapshots:
+        cells, first = frozen_months(conn, typ, first, last)
+    if first <= last:
+        cells += _cells(
+            conn,
+            typ,
+            first,
+            last,
+            use_totals=use_totals,
+            by_month=True,
+            by_category=False,
+        )
+    return _matrix(
+        typ,
+        cells,
+        12 * (to_year - from_year + 1),
+        lambda y, m: (y - from_year) * 12 + m - 1,
+    )
+
+
+def load_yearly_by_category(
+    conn: sqlite3.Connection,
+    typ: str,
+    first: tuple[int, int],
+    last: tuple[int, int],
+    *,
+    use_totals: bool,
+    use_snapshots: bool = False,
+) -> CarryMatrix:
+    """Kategorien × Kalenderjahre für das Fenster ``first..last`` (je inkl.).
+
+    Jede Spalte summiert nur die Monate des Jahres, die im Fenster liegen.
+    """
+    cells: list[tuple[Any, ...]] = []
+    live = first
+    if use_snapshots:
+        # Eingefroren sind nur ganze Jahre: ein angebrochenes Startjahr wird
+        # live summiert, die vollen Jahre danach kommen aus den Snapshots.
+        if live[1] != 1 and live[0] < last[0]:
+            cells = _cells(
+                conn,
+                typ,
+                live,
+                (live[0], 12),
+                use_totals=use_totals,
+                by_month=False,
+                by_category=True,
+            )
+            live = (live[0] + 1, 1)
+        if live[1] == 1:
+            full_years_end = last[0] if last[1] == 12 else last[0] - 1
+            frozen, next_year = frozen_years(conn, typ, live[0], full_years_end)
+            cells += frozen
+            live = (next_year, 1)
+    if live <= last:
+        cells += _cells(
+            conn,
+            typ,
+            live,
+            last,
+            use_totals=use_totals,
+            by_month=False,
+            by_category=True,
+        )
+    return _matrix(typ, cells, last[0] - first[0] + 1, lambda y, _m: y - first[0])
+
+
+def _cells(
+    conn: sqlite3.Connection,
+    typ: str,
+    first: tuple[int, int],
+    last: tuple[int, int],
+    *,
+    use_totals: bool,
+    by_month: bool,
+    by_category: bool,
+) -> list[tuple[Any, ...]]:
+    """``(year, month, category, budget, actual)`` je Gruppe im Fenster.
+
+    Ohne ``by_month`` ist ``month`` 0, ohne ``by_category`` ist ``category``
+    leer. ``budget``/``actual`` sind ``NULL``, wo es keine Zeilen gibt.
+    """
+    month = "month" if by_month else "0"
+    category = "category" if by_category else "''"
+    # Nur echte Spalten gruppieren: Ohne Konstanten folgt GROUP BY year, month
+    # dem Primärschlüssel von monthly_totals und braucht keinen Sortierbaum.
+    group = ", ".join(
+        ["year"]
+        + (["month"] if by_month else [])
+        + (["category"] if by_category else [])
+    )
+    lo = first[0] * 100 + first[1]
+    hi = last[0] * 100 + last[1]
+    if use_totals:
+        return conn.execute(
+            f"SELECT year, {month}, {category}, SUM(budget), SUM(actual) "  # nosec B608
+            "FROM monthly_totals WHERE typ=? AND year BETWEEN ? AND ? "
+            f"AND year * 100 + month BETWEEN ? AND ? GROUP BY {group}",
+            (typ, first[0], last[0], lo, hi),
+        ).fetchall()
+
+    cells = conn.execute(
+        f"SELECT year, {month}, {category}, SUM(amount), NULL "  # nosec B608
+        "FROM budget WHERE typ=? AND year BETWEEN ? AND ? "
+        f"AND year * 100 + month BETWEEN ? AND ? GROUP BY {group}",
+        (typ, first[0], last[0], lo, hi),
+    ).fetchall()
+    # Die Datumsgrenzen wählen die Buchungen wie month_bounds() aus;
+    # gruppiert wird nach dem Präfix "JJJJ-MM" bzw. "JJJJ". Jahr und Monat
+    # daraus liest Python - CAST und printf je Zeile kosteten mehr als die
+    # Abfragen, die sie ersetzen.
+    end_year, end_month = (last[0] + 1, 1) if last[1] == 12 else (last[0], last[1] + 1)
+    prefix = 7 if by_month else 4
+    cur = conn.execute(
+        f"SELECT substr(date, 1, {prefix}) AS period, {category}, SUM(amount) "  # nosec B608
+        "FROM tracking WHERE typ=? AND date >= ? AND date < ? "
+        f"GROUP BY period{', category' if by_category else ''}",
+        (
+            typ,
+            f"{first[0]:04d}-{first[1]:02d}-01",
+            f"{end_year:04d}-{end_month:02d}-01",
+        ),
+    )
+    for period, cat, amount in cur.fetchall():
+        try:
+            year = int(period[:4])
+            month_no = int(period[5:7]) if by_month else 0
+        except ValueError:
+            continue
+        if by_month and period[4] != "-":
+            continue
+        cells.append((year, month_no, cat, None, amount))
+    return cells
+
+
+def _matrix(
+    typ: str,
+    cells: list[tuple[Any, ...]],
+    periods: int,
+    column: Callable[[int, int], int],
+) -> CarryMatrix:
+    row_index: dict[str, int] = {}
+    rows: list[int] = []
+    cols: list[int] = []
+    budget_vals: list[float] = []
+    actual_vals: list[float] = []
+    for year, month, category, budget, actual in cells:
+        k = column(int(year), int(month))
+        if not 0 <= k < periods:
+            continue
+        rows.append(row_index.setdefault(str(category), len(row_index)))
+        cols.append(k)
+        budget_vals.append(float(budget) if budget is not None else 0.0)
+        actual_vals.append(float(actual) if actual is not None else 0.0)
+
+    names = list(row_index) or [""]
+    if np is not None:
+        shape = (len(names), periods)
+        budget_m = np.zeros(shape)
+        actual_m = np.zeros(shape)
+        seen_m = np.zeros(shape, dtype=bool)
+        # Ohne monthly_totals kommen Budget und Ist aus getrennten Zeilen
+        # derselben Zelle; add.at summiert statt zu überschreiben.
+        index = (np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp))
+        np.add.at(budget_m, index, budget_vals)
+        np.add.at(actual_m, index, actual_vals)
+        seen_m[index] = True
+        return CarryMatrix(typ, names, periods, budget_m, actual_m, seen_m)
+
+    budget_l = [[0.0] * periods for _ in names]
+    actual_l = [[0.0] * periods for _ in names]
+    seen_l = [[False] * periods for _ in names]
+    for i, k, b, a in zip(rows, cols, budget_vals, actual_vals):
+        budget_l[i][k] += b
+        actual_l[i][k] += a
+        seen_l[i][k] = True
+    return CarryMatrix(typ, names, periods, budget_l, actual_l, seen_l)
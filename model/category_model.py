@@ -9,6 +9,8 @@ from typing import List
 
 from model.undo_redo_model import UndoRedoModel
 from model.category_forecast_mode import FORECAST_MODE_AUTO, normalize_forecast_mode
+from model.category_tree import CategoryTree
+from model.query_cache import cached_query
 from model.typ_constants import ALL_TYPEN, TYP_SAVINGS
 
 """Kategorie-Datenmodell.
@@ -162,15 +164,22 @@ class CategoryModel:
         self.conn.commit()
 
     def list(self, typ: str | None = None) -> List[Category]:
-        if typ:
-            cur = self.conn.execute(
-                "SELECT * FROM categories WHERE typ=? ORDER BY sort_order, name COLLATE NOCASE",
-                (typ,),
-            )
-        else:
-            cur = self.conn.execute(
-                "SELECT * FROM categories ORDER BY typ, sort_order, name COLLATE NOCASE"
-            )
+        tree = self.tree()
+        return list(tree.of_typ(typ) if typ else tree.categories)
+
+    def tree(self) -> CategoryTree:
+        """Kategorienbaum aus einem SELECT, gemerkt bis zur nächsten Änderung."""
+        return cached_query(
+            self.conn,
+            "category_tree",
+            (),
+            lambda: CategoryTree(self._load_categories()),
+        )
+
+    def _load_categories(self) -> List[Category]:
+        cur = self.conn.execute(
+            "SELECT * FROM categories ORDER BY typ, sort_order, name COLLATE NOCASE"
+        )
         out = []
         for r in cur.fetchall():
             out.append(
@@ -347,6 +356,11 @@ class CategoryModel:
 
         Returns: [(anzeige_text, echter_name), ...]
         """
+        return list(
+            self.tree().memo(("names_tree", typ), lambda: self._names_tree(typ))
+        )
+
+    def _names_tree(self, typ: str) -> List[tuple[str, str]]:
         items = self.list(typ)
         nodes = self.build_tree(items)
 
@@ -596,32 +610,7 @@ class CategoryModel:
         name = (name or "").strip()
         if not typ or not name:
             return []
-        if "parent_id" not in self._cols("categories"):
-            return [name] if include_self else []
-
-        row = self.conn.execute(
-            "SELECT id, name FROM categories WHERE typ=? AND name=?",
-            (typ, name),
-        ).fetchone()
-        if not row:
-            return [name] if include_self else []
-
-        out: List[str] = [str(row["name"])] if include_self else []
-        queue: List[int] = [int(row["id"])]
-        seen: set[int] = set(queue)
-        while queue:
-            parent_id = queue.pop(0)
-            for child in self.conn.execute(
-                "SELECT id, name FROM categories WHERE typ=? AND parent_id=? ORDER BY sort_order, name COLLATE NOCASE",
-                (typ, parent_id),
-            ).fetchall():
-                cid = int(child["id"])
-                if cid in seen:
-                    continue
-                seen.add(cid)
-                out.append(str(child["name"]))
-                queue.append(cid)
-        return out
+        return self.tree().descendant_names(typ, name, include_self=include_self)
 
     def display_with_parent(self, typ: str, name: str) -> str:
         """Gibt "Parent › Child" zurück, aber nur wenn die Kategorie einen Parent hat."""
@@ -630,19 +619,10 @@ class CategoryModel:
 
     def get_parent_name(self, typ: str, name: str) -> str | None:
         """Gibt den direkten Parent-Namen zurück (oder None wenn Root)."""
-        cols = self._cols("categories")
-        if "parent_id" not in cols:
-            return None
-        row = self.conn.execute(
-            "SELECT parent_id FROM categories WHERE typ=? AND name=?",
-            (typ, name),
-        ).fetchone()
-        if not row or row["parent_id"] is None:
-            return None
-        prow = self.conn.execute(
-            "SELECT name FROM categories WHERE id=?", (int(row["parent_id"]),)
-        ).fetchone()
-        return str(prow["name"]) if prow else None
+        tree = self.tree()
+        cat = tree.get(typ, name)
+        parent = tree.parent(cat) if cat is not None else None
+        return parent.name if parent is not None else None
 
     def exists(self, typ: str, name: str) -> bool:
         """True, wenn eine Kategorie mit Typ + Name existiert.
@@ -803,7 +783,6 @@ class CategoryModel:
                     normalize_forecast_mode(forecast_mode),
                 ),
             )
-        self.conn.commit()
         new_id = int(cur.lastrowid)
         row = self.conn.execute(
             "SELECT * FROM categories WHERE id=?", (new_id,)
@@ -811,6 +790,7 @@ class CategoryModel:
         self.undo.record_operation(
             "categories", "INSERT", None, dict(row) if row else None
         )
+        self.conn.commit()
         return new_id
 
     def update_flags(
@@ -858,7 +838,6 @@ class CategoryModel:
             f"UPDATE categories SET {', '.join(fields)} WHERE id=?",  # nosec B608
             params,
         )
-        self.conn.commit()
 
         new = self.conn.execute(
             "SELECT * FROM categories WHERE id=?", (int(cat_id),)
@@ -866,6 +845,7 @@ class CategoryModel:
         new_d = dict(new) if new else None
         if old_d != new_d:
             self.undo.record_operation("categories", "UPDATE", old_d, new_d)
+        self.conn.commit()
 
     def _table_exists(self, table: str) -> bool:
         try:
@@ -1047,12 +1027,12 @@ class CategoryModel:
                     (new_name, old_name),
                 )
 
-        self.undo.record_operation(
-            "categories",
-            "RENAME_CASCADE",
-            {"cat_id": cat_id, "typ": typ, "old_name": old_name},
-            {"cat_id": cat_id, "typ": typ, "new_name": new_name},
-        )
+            self.undo.record_operation(
+                "categories",
+                "RENAME_CASCADE",
+                {"cat_id": cat_id, "typ": typ, "old_name": old_name},
+                {"cat_id": cat_id, "typ": typ, "new_name": new_name},
+            )
 
     def _move_category_text_references(
         self, *, typ: str, old_name: str, target_name: str, target_id: int
@@ -1304,9 +1284,11 @@ class CategoryModel:
                 if old_d:
                     undo_rows.append(old_d)
 
-        for old_d in undo_rows:
-            self.undo.record_operation(
-                "categories", "DELETE_SAFE", old_d, None, group_id=group
+            self.undo.record_operations(
+                "categories",
+                "DELETE_SAFE",
+                [(old_d, None) for old_d in undo_rows],
+                group_id=group,
             )
 
         return {"deleted": deleted, "skipped": skipped, "action": data_action}
@@ -1326,59 +1308,11 @@ class CategoryModel:
 
     def get_by_id(self, cat_id: int) -> Category | None:
         """Einzelne Kategorie per ID (oder None)."""
-        r = self.conn.execute(
-            "SELECT * FROM categories WHERE id=?", (int(cat_id),)
-        ).fetchone()
-        if r is None:
-            return None
-        return Category(
-            int(r["id"]),
-            r["typ"],
-            r["name"],
-            (
-                int(r["parent_id"])
-                if "parent_id" in r.keys() and r["parent_id"] is not None
-                else None
-            ),
-            bool(r["is_fix"]),
-            bool(r["is_recurring"]),
-            int(r["recurring_day"] or 1),
-            (
-                int(r["funded_by_category_id"])
-                if "funded_by_category_id" in r.keys()
-                and r["funded_by_category_id"] is not None
-                else None
-            ),
-            (
-                int(r["sort_order"])
-                if "sort_order" in r.keys() and r["sort_order"] is not None
-                else 0
-            ),
-            normalize_forecast_mode(
-                r["forecast_mode"]
-                if "forecast_mode" in r.keys() and r["forecast_mode"] is not None
-                else FORECAST_MODE_AUTO
-            ),
-        )
+        return self.tree().by_id.get(int(cat_id))
 
     def _descendant_ids(self, cat_id: int) -> set[int]:
         """Alle Nachfahren-IDs (rekursiv) einer Kategorie."""
-        cols = self._cols("categories")
-        if "parent_id" not in cols:
-            return set()
-        result: set[int] = set()
-        frontier = [int(cat_id)]
-        while frontier:
-            current = frontier.pop()
-            rows = self.conn.execute(
-                "SELECT id FROM categories WHERE parent_id=?", (current,)
-            ).fetchall()
-            for r in rows:
-                cid = int(r["id"])
-                if cid not in result:
-                    result.add(cid)
-                    frontier.append(cid)
-        return result
+        return self.tree().descendant_ids(int(cat_id))
 
     def can_reparent(self, cat_id: int, new_parent_id: int | None) -> tuple[bool, str]:
         """Prüft, ob ``cat_id`` unter ``new_parent_id`` verschoben werden darf.
@@ -1431,7 +1365,6 @@ class CategoryModel:
             "UPDATE categories SET parent_id=? WHERE id=?",
             (None if new_parent_id is None else int(new_parent_id), int(cat_id)),
         )
-        self.conn.commit()
 
         new = self.conn.execute(
             "SELECT * FROM categories WHERE id=?", (int(cat_id),)
@@ -1439,6 +1372,7 @@ class CategoryModel:
         new_d = dict(new) if new else None
         if old_d != new_d:
             self.undo.record_operation("categories", "UPDATE", old_d, new_d)
+        self.conn.commit()
 
     def reset_defaults_flag(self) -> None:
         """
@@ -0,0 +1,134 @@
+"""Kategorienbaum im Speicher: Eltern, Kinder, Vorfahren, Nachfahren, Pfade.
+
+Die Hierarchie wurde überall Knoten für Knoten abgefragt:
+``descendant_names`` mit einem SELECT je Knoten, ``display_with_parent`` mit
+zwei SELECTs je Tabellenzeile, Budget-Tab und Übersicht mit eigenen
+rekursiven Läufen bei jedem Filterwechsel. :class:`CategoryTree` entsteht
+aus einem einzigen SELECT über ``categories`` und beantwortet danach alle
+Hierarchiefragen aus Dicts; abgeleitete Listen werden je Baum gemerkt.
+
+Der Baum ist unveränderlich und liegt im Abfrage-Cache der Connection
+(:mod:`model.query_cache`): Sobald irgendwer schreibt - auch Undo/Redo mit
+rohem SQL -, baut der nächste Zugriff ihn neu.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, Hashable, Iterable, TypeVar
+
+if TYPE_CHECKING:
+    from model.category_model import Category
+
+T = TypeVar("T")
+
+
+class CategoryTree:
+    """Unveränderlicher Index über alle Kategorien einer Datenbank."""
+
+    __slots__ = ("categories", "by_id", "by_key", "children", "_memo")
+
+    def __init__(self, categories: Iterable[Category]) -> None:
+        # Reihenfolge wie CategoryModel.list(): typ, sort_order, name.
+        self.categories: tuple[Category, ...] = tuple(categories)
+        self.by_id: dict[int, Category] = {c.id: c for c in self.categories}
+        self.by_key: dict[tuple[str, str], Category] = {
+            (c.typ, c.name): c for c in self.categories
+        }
+        self.children: dict[int, list[Category]] = {}
+        for c in self.categories:
+            if c.parent_id is not None and c.parent_id in self.by_id:
+                self.children.setdefault(c.parent_id, []).append(c)
+        self._memo: dict[Hashable, object] = {}
+
+    def __copy__(self) -> CategoryTree:
+        # Der Abfrage-Cache reicht flache Kopien heraus; unveränderlich
+        # genügt dieselbe Instanz (samt gemerkter Listen).
+        return self
+
+    def memo(self, key: Hashable, factory: Callable[[], T]) -> T:
+        """Merkt ``factory()`` für die Lebensdauer dieses Baums."""
+        try:
+            return self._memo[key]  # type: ignore[return-value]
+        except KeyError:
+            value = self._memo[key] = factory()
+            return value
+
+    def of_typ(self, typ: str) -> tuple[Category, ...]:
+        return self.memo(
+            ("of_typ", typ),
+            lambda: tuple(c for c in self.categories if c.typ == typ),
+        )
+
+    def get(self, typ: str, name: str) -> Category | None:
+        return self.by_key.get((typ, name))
+
+    def parent(self, cat: Category) -> Category | None:
+        return self.by_id.get(cat.parent_id) if cat.parent_id is not None else None
+
+    def ancestors(self, cat: Category) -> tuple[Category, ...]:
+        """Vorfahren, nächster zuerst (bricht bei Zyklen ab)."""
+        out: list[Category] = []
+        seen = {cat.id}
+        node = self.parent(cat)
+        while node is not None and node.id not in seen:
+            out.append(node)
+            seen.add(node.id)
+            node = self.parent(node)
+        return tuple(out)
+
+    def path(self, cat: Category) -> tuple[str, ...]:
+        """Namen von der Wurzel bis ``cat``."""
+        return tuple(a.name for a in reversed(self.ancestors(cat))) + (cat.name,)
+
+    def descendants(self, cat: Category) -> tuple[Category, ...]:
+        """Alle Nachfahren gleichen Typs in Breitensuche, ohne ``cat`` selbst."""
+
+        def build() -> tuple[Category, ...]:
+            out: list[Category] = []
+            queue = [cat.id]
+            seen = {cat.id}
+            while queue:
+                parent_id = queue.pop(0)
+                for child in self.children.get(parent_id, ()):
+                    if child.id in seen or child.typ != cat.typ:
+                        continue
+                    seen.add(child.id)
+                    out.append(child)
+                    queue.append(child.id)
+            return tuple(out)
+
+        return self.memo(("descendants", cat.id), build)
+
+    def descendant_ids(self, cat_id: int) -> set[int]:
+        """Alle Nachfahren-IDs über ``parent_id``, unabhängig vom Typ.
+
+        Für den Zyklenschutz beim Verschieben: hier zählt jede Kante.
+        """
+        result: set[int] = set()
+        frontier = [int(cat_id)]
+        while frontier:
+            for child in self.children.get(frontier.pop(), ()):
+                if child.id not in result:
+                    result.add(child.id)
+                    frontier.append(child.id)
+        return result
+
+    def descendant_names(
+        self, typ: str, name: str, *, include_self: bool = True
+    ) -> list[str]:
+        cat = self.get(typ, name)
+        if cat is None:
+            return [name] if include_self else []
+        names = [c.name for c in self.descendants(cat)]
+        return [cat.name, *names] if include_self else names
+
+    def subtree_names(self) -> dict[tuple[str, str], set[str]]:
+        """``{(typ, name): {name, *nachfahren}}`` für Hierarchiefilter."""
+        return self.memo(
+            "subtree_names",
+            lambda: {
+                key: {cat.name, *(c.name for c in self.descendants(cat))}
+                for key, cat in self.by_key.items()
+                if cat.name
+            },
+        )
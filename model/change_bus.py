@@ -0,0 +1,207 @@
+"""Änderungsbus: welche Tabellen und Monate sich seit dem letzten Blick geändert haben.
+
+Nach jeder Bearbeitung, jedem Undo und Redo lud das Hauptfenster Budget,
+Kategorien, Tracking und Übersicht neu - auch die gerade verdeckten Tabs.
+Bei grossen Datenbanken war das der Hauptgrund für Hänger nach dem
+Speichern.
+
+Wie bei ``monthly_totals`` und ``search_index`` melden nicht die Modelle
+ihre Änderungen, sondern Trigger: Undo/Redo, Importe und Reparaturen
+schreiben roh per SQL und würden sonst vorbeilaufen. Die Trigger sind
+``TEMP`` - sie gehören zur Verbindung, nicht zur Datei, und hinterlassen
+kein Schema. Jede Schreiboperation trägt ``(Tabelle, Jahr, Monat)`` in
+``temp.change_log`` ein (Jahr/Monat 0 für Tabellen ohne Monatsbezug);
+:meth:`ChangeBus.drain` liest und leert das Protokoll und verteilt das
+Ergebnis als :class:`DataChange` an die Abonnenten.
+
+Fehlen die Trigger (etwa weil ein Zurücksetzen die Tabellen neu angelegt
+hat), legt ``drain`` sie neu an und meldet vorsichtshalber "alles".
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+from dataclasses import dataclass, field
+from typing import Callable, Iterable
+
+logger = logging.getLogger(__name__)
+
+#: Beobachtete Tabellen -> Ausdrücke für (Jahr, Monat) je Zeile.
+WATCHED_TABLES: dict[str, tuple[str, str] | None] = {
+    "tracking": (
+        "CAST(substr({row}.date, 1, 4) AS INTEGER)",
+        "CAST(substr({row}.date, 6, 2) AS INTEGER)",
+    ),
+    "budget": ("{row}.year", "{row}.month"),
+    "categories": None,
+    "category_tags": None,
+    "tags": None,
+    "entry_tags": None,
+    "savings_goals": None,
+    "budget_warnings": None,
+    "recurring_transactions": None,
+    "favorites": None,
+    "suggestion_accepted": None,
+}
+
+_LOG_DDL = """
+CREATE TEMP TABLE IF NOT EXISTS change_log(
+    tbl TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    UNIQUE(tbl, year, month)
+)
+"""
+
+
+@dataclass(frozen=True)
+class DataChange:
+    """Geänderte Tabellen und Monate ``(Jahr, Monat)``.
+
+    ``everything`` steht für "unbekannt, alles neu laden" - etwa nach einem
+    ausdrücklichen Voll-Refresh oder wenn das Protokoll verloren ging.
+    """
+
+    tables: frozenset[str] = frozenset()
+    months: frozenset[tuple[int, int]] = frozenset()
+    everything: bool = False
+
+    @classmethod
+    def all(cls) -> DataChange:
+        return cls(everything=True)
+
+    def __bool__(self) -> bool:
+        return self.everything or bool(self.tables)
+
+    def touches(self, tables: Iterable[str]) -> bool:
+        """True, wenn eine der ``tables`` betroffen ist."""
+        return self.everything or not self.tables.isdisjoint(tables)
+
+    def touches_until(self, tables: Iterable[str], year: int, month: int = 12) -> bool:
+        """Wie :meth:`touches`, aber Monatsänderungen nur bis ``(year, month)``.
+
+        Für Ansichten, die einen Zeitraum samt Übertrag aus früheren Monaten
+        zeigen: Spätere Monate können sie nicht verändern.
+        """
+        wanted = set(tables)
+        if self.everything:
+            return True
+        if self.tables.isdisjoint(wanted):
+            return False
+        monthly = {t for t, m in WATCHED_TABLES.items() if m is not None}
+        if not (self.tables & wanted) <= monthly:
+            return True  # Tabelle ohne Monatsbezug betroffen
+        return any(ym <= (int(year), int(month)) for ym in self.months)
+
+    def merge(self, other: DataChange) -> DataChange:
+        return DataChange(
+            self.tables | other.tables,
+            self.months | other.months,
+            self.everything or other.everything,
+        )
+
+
+@dataclass
+class ChangeBus:
+    """Protokoll-Trigger auf einer Verbindung plus Abonnenten."""
+
+    conn: sqlite3.Connection
+    listeners: list[Callable[[DataChange], None]] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        self.install()
+
+    def install(self) -> bool:
+        """Legt Protokolltabelle und Trigger an; False, wenn es keine gab."""
+        existing = {
+            row[0]
+            for row in self.conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='table'"
+            )
+        }
+        self.conn.execute(_LOG_DDL)
+        complete = True
+        for table, month_expr in WATCHED_TABLES.items():
+            if table not in existing:
+                continue
+            for event, rows in (
+                ("INSERT", ("NEW",)),
+                ("DELETE", ("OLD",)),
+                ("UPDATE", ("OLD", "NEW")),
+            ):
+                name = f"trg_change_log_{table}_{event.lower()}"
+                if self._has_trigger(name):
+                    continue
+                complete = False
+                body = " ".join(_log_insert(table, month_expr, row) for row in rows)
+                self.conn.execute(
+                    f"CREATE TEMP TRIGGER {name} AFTER {event} ON main.{table} "
+                    f"FOR EACH ROW BEGIN {body} END"
+                )
+        return complete
+
+    def _has_trigger(self, name: str) -> bool:
+        row = self.conn.execute(
+            "SELECT 1 FROM sqlite_temp_master WHERE type='trigger' AND name=?",
+            (name,),
+        ).fetchone()
+        return row is not None
+
+    def drain(self) -> DataChange:
+        """Liest und leert das Protokoll."""
+        try:
+            was_open = self.conn.in_transaction
+            complete = self.install()
+            rows = self.conn.execute(
+                "SELECT tbl, year, month FROM temp.change_log"
+            ).fetchall()
+            if rows and was_open:
+                self.conn.execute("DELETE FROM temp.change_log")
+            elif rows:
+                # Für das DELETE öffnete sqlite3 implizit eine Transaktion;
+                # offen gelassen, umginge jede Abfrage bis zum nächsten Commit
+                # den Abfrage-Cache. Ein ``commit()`` hier löste im
+                # verschlüsselten Modus aber einen vollen Speicherlauf aus
+                # (``AutosaveConnection``), obwohl nur TEMP-Daten wegfallen.
+                # Deshalb ohne Transaktion: SQLite schliesst das DELETE selbst.
+                level = self.conn.isolation_level
+                self.conn.isolation_level = None
+                try:
+                    self.conn.execute("DELETE FROM temp.change_log")
+                finally:
+                    self.conn.isolation_level = level
+        except sqlite3.Error as exc:
+            logger.warning("Änderungsprotokoll nicht lesbar: %s", exc)
+            return DataChange.all()
+        if not complete:
+            logger.debug("Änderungs-Trigger fehlten, melde alles als geändert.")
+            return DataChange.all()
+        return DataChange(
+            frozenset(str(r[0]) for r in rows),
+            frozenset((int(r[1]), int(r[2])) for r in rows if int(r[1]) > 0),
+        )
+
+    def subscribe(self, listener: Callable[[DataChange], None]) -> None:
+        if listener not in self.listeners:
+            self.listeners.append(listener)
+
+    def publish(self, change: DataChange | None = None) -> DataChange:
+        """Verteilt ``change`` (oder den Inhalt des Protokolls) an alle Abonnenten."""
+        change = self.drain().merge(change) if change is not None else self.drain()
+        if change:
+            for listener in list(self.listeners):
+                listener(change)
+        return change
+
+
+def _log_insert(table: str, month_expr: tuple[str, str] | None, row: str) -> str:
+    if month_expr is None:
+        year, month = "0", "0"
+    else:
+        year = f"COALESCE({month_expr[0].format(row=row)}, 0)"
+        month = f"COALESCE({month_expr[1].format(row=row)}, 0)"
+    return (
+        "INSERT OR IGNORE INTO change_log(tbl, year, month) "
+        f"VALUES ('{table}', {year}, {month});"
+    )
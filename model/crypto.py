@@ -11,7 +11,18 @@ Der db_key wird je nach Sicherheitsstufe unterschiedlich geschützt:
 Restore-Key (nur PIN/PW): Der db_key als Hex-String — kann die .enc direkt
 entschlüsseln. Wird einmalig angezeigt, nie gespeichert.
 
-Dateiformat .enc:  [16 Bytes Salt][Fernet-Token]
+Dateiformat .enc:  [16 Bytes Salt][Blockcontainer]  (``model.crypto_stream``)
+        bis v2.2:  [16 Bytes Salt][Fernet-Token]       (wird nur noch gelesen)
+
+Klartext im Container bzw. Token (``PAYLOAD_V2_MAGIC`` unterscheidet die
+Fassungen):
+
+  v1  SQL-Dump aus ``iterdump()``, UTF-8. Wird nur noch gelesen.
+  v2  ``PAYLOAD_V2_MAGIC`` + 1 Byte Flags + Seitenabbild aus
+      ``Connection.serialize()``; Flag ``PAYLOAD_FLAG_ZLIB`` = zlib-komprimiert.
+
+Änderungen seit dem Snapshot stehen im Änderungsjournal daneben
+(siehe ``model.encrypted_journal``).
 """
 
 from __future__ import annotations
@@ -25,9 +36,10 @@ import hashlib
 import hmac
 import secrets
 import sqlite3
+import zlib
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Iterable, Iterator
 
 
 class CryptoUserError(ValueError):
@@ -211,6 +223,15 @@ def _secure_file(path) -> None:
         )
 
 
+PAYLOAD_V2_MAGIC = b"BMSQLITEIMAGE\x00\x02"
+PAYLOAD_FLAG_ZLIB = 0x01
+# Stufe 1: SQLite-Seiten bestehen zu grossen Teilen aus Freiraum und Text;
+# schon die schnellste Stufe halbiert sie meist, und Fernet hat dann weniger
+# zu verschlüsseln, als die Kompression gekostet hat.
+PAYLOAD_ZLIB_LEVEL = 1
+# Schrittweite beim Komprimieren; bestimmt, wie viel Klartext auf einmal
+# durch zlib und den Container läuft.
+_PAYLOAD_STEP = 256 * 1024
 PBKDF2_ITERATIONS = 600_000  # OWASP-2023-Empfehlung (PBKDF2-HMAC-SHA256)
 LEGACY_PBKDF2_ITERATIONS = (200_000,)
 SALT_LENGTH = 16
@@ -303,7 +324,7 @@ def unwrap_db_key_with_restore(wrapped_restore: bytes, restore_key: str) -> byte
     try:
         raw = bytes.fromhex(restore_key.strip().replace(" ", "").replace("-", ""))
         return base64.urlsafe_b64encode(raw)
-    except Exception:
+    except (ValueError, AttributeError):
         raise CryptoUserError(
             "account.ungueltiger_restorekey", "Ungültiger Restore-Key"
         )
@@ -460,25 +481,17 @@ def decrypt_bytes(token: bytes, db_key: bytes) -> bytes:
 # ── SQLite DB Encrypt / Decrypt ─────────────────────────────────
 
 
-def encrypt_db_to_file(
-    conn: sqlite3.Connection, enc_path: str | Path, db_key: bytes, salt: bytes
-) -> None:
-    """Dumpt SQLite-Connection und verschlüsselt auf Disk.
-
-    Dateiformat: [16 Bytes Salt][Fernet-Token]
-    """
-    dump_lines = list(conn.iterdump())
-    dump_sql = "\n".join(dump_lines).encode("utf-8")
-
-    encrypted = encrypt_bytes(dump_sql, db_key)
-
+def _write_enc_file(enc_path: str | Path, parts: Iterable[bytes]) -> bytes:
+    """Schreibt die Datei stückweise und atomar; liefert ihren SHA-256."""
     enc_path = Path(enc_path)
     enc_path.parent.mkdir(parents=True, exist_ok=True)
     tmp_path = enc_path.with_suffix(".tmp")
+    fingerprint = hashlib.sha256()
     try:
         with open(tmp_path, "wb") as f:
-            f.write(salt)
-            f.write(encrypted)
+            for part in parts:
+                f.write(part)
+                fingerprint.update(part)
             f.flush()
             os.fsync(f.fileno())
         # SICHERHEIT (v2.2.11): Rechte vor dem Umbenennen setzen, damit die
@@ -490,39 +503,254 @@ def encrypt_db_to_file(
         if tmp_path.exists():
             tmp_path.unlink(missing_ok=True)
         raise
+    return fingerprint.digest()
 
 
-def decrypt_db_from_file(enc_path: str | Path, db_key: bytes) -> sqlite3.Connection:
-    """Entschlüsselt .enc-Datei in In-Memory-SQLite-DB.
+def serialize_db(conn: sqlite3.Connection) -> bytes:
+    """Seitenabbild einer DB, wie es ``deserialize()`` wieder annimmt.
 
-    Returns: sqlite3.Connection auf :memory: DB
-    Raises: FileNotFoundError, ValueError
+    Eine DB ohne eine einzige Seite kann SQLite nicht serialisieren; sie wird
+    als ``b""`` abgebildet. Abbilder einer WAL-Datei tragen im Kopf die
+    WAL-Kennung und liessen sich im RAM nicht mehr öffnen - sie werden auf
+    den Rollback-Modus zurückgesetzt.
     """
-    enc_path = Path(enc_path)
-    if not enc_path.exists():
-        raise FileNotFoundError(f"Nicht gefunden: {enc_path}")
+    try:
+        image = conn.serialize()
+    except sqlite3.OperationalError:
+        if conn.execute("PRAGMA page_count").fetchone()[0]:
+            raise
+        return b""
+    if image[18:20] == b"\x02\x02":
+        patched = bytearray(image)
+        patched[18:20] = b"\x01\x01"
+        return bytes(patched)
+    return image
+
+
+def iter_image_payload(image: bytes, *, compress: bool = True) -> Iterator[bytes]:
+    """Verpackt ein Seitenabbild als v2-Klartext, Stück für Stück.
+
+    Komprimiert wird in Blöcken; neben dem Abbild liegt nie eine zweite,
+    komprimierte Gesamtkopie im Speicher.
+    """
+    if not compress:
+        yield PAYLOAD_V2_MAGIC + b"\x00"
+        view = memoryview(image)
+        for start in range(0, len(view), _PAYLOAD_STEP):
+            yield bytes(view[start : start + _PAYLOAD_STEP])
+        return
+    yield PAYLOAD_V2_MAGIC + bytes([PAYLOAD_FLAG_ZLIB])
+    packer = zlib.compressobj(PAYLOAD_ZLIB_LEVEL)
+    view = memoryview(image)
+    for start in range(0, len(view), _PAYLOAD_STEP):
+        chunk = packer.compress(view[start : start + _PAYLOAD_STEP])
+        if chunk:
+            yield chunk
+    yield packer.flush()
+
+
+def encode_image_payload(image: bytes, *, compress: bool = True) -> bytes:
+    """Verpackt ein Seitenabbild als v2-Klartext."""
+    return b"".join(iter_image_payload(image, compress=compress))
+
+
+def decode_payload_stream(
+    chunks: Iterable[bytes],
+) -> tuple[bytearray | None, str]:
+    """Liest v1 und v2 aus einem stückweise gelieferten Klartext.
+
+    Das Abbild wächst direkt in einem Puffer; der komprimierte Klartext liegt
+    nie am Stück im Speicher.
+
+    Returns: ``(image, "")`` für v2, ``(None, dump_sql)`` für den alten Dump.
+    """
+    corrupt = CryptoUserError(
+        "crypto.corrupt_payload", "Korrupte Datei: Abbild unlesbar"
+    )
+    header = len(PAYLOAD_V2_MAGIC)
+    it = iter(chunks)
+    head = bytearray()
+    for chunk in it:
+        head += chunk
+        if len(head) > header:
+            break
+    if not head.startswith(PAYLOAD_V2_MAGIC):
+        for chunk in it:
+            head += chunk
+        return None, head.decode("utf-8")
+    if len(head) <= header:
+        raise corrupt
+    flags = head[header]
+    if flags & ~PAYLOAD_FLAG_ZLIB:
+        raise CryptoUserError(
+            "crypto.unknown_payload_flags",
+            "Datei aus einer neueren Version — bitte BudgetManager aktualisieren",
+        )
+    first = bytes(head[header + 1 :])
+    del head
+    image = bytearray()
+    if not flags & PAYLOAD_FLAG_ZLIB:
+        image += first
+        for chunk in it:
+            image += chunk
+        return image, ""
+    unpacker = zlib.decompressobj()
+    try:
+        image += unpacker.decompress(first)
+        for chunk in it:
+            image += unpacker.decompress(chunk)
+        image += unpacker.flush()
+    except zlib.error:
+        raise corrupt
+    if not unpacker.eof:
+        raise corrupt
+    return image, ""
 
-    with open(enc_path, "rb") as f:
+
+def decode_payload(payload: bytes) -> tuple[bytes | None, str]:
+    """Liest v1 und v2.
+
+    Returns: ``(image, "")`` für v2, ``(None, dump_sql)`` für den alten Dump.
+    """
+    image, dump_sql = decode_payload_stream([payload])
+    return (bytes(image) if image is not None else None), dump_sql
+
+
+def encrypt_db_to_file(
+    conn: sqlite3.Connection,
+    enc_path: str | Path,
+    db_key: bytes,
+    salt: bytes,
+    *,
+    compress: bool = True,
+) -> None:
+    """Verschlüsselt das Seitenabbild der Connection auf Disk (Format v2).
+
+    Dateiformat: [16 Bytes Salt][Blockcontainer]
+
+    Die Datei enthält danach die ganze DB; ein vorhandenes Änderungsjournal
+    gehört zum alten Stand und wird gelöscht.
+    """
+    from model.encrypted_journal import discard_journal
+
+    encrypt_image_to_file(serialize_db(conn), enc_path, db_key, salt, compress=compress)
+    discard_journal(enc_path)
+
+
+def encrypt_image_to_file(
+    image: bytes,
+    enc_path: str | Path,
+    db_key: bytes,
+    salt: bytes,
+    *,
+    compress: bool = True,
+) -> bytes:
+    """Verschlüsselt ein Seitenabbild (``serialize_db``) auf Disk.
+
+    Klartext und Chiffrat laufen blockweise durch; neben dem Abbild hält das
+    nur einen Block im Speicher.
+
+    Returns: SHA-256 der geschriebenen Datei - der Fingerabdruck, an den das
+    Änderungsjournal gebunden wird.
+    """
+    _ensure_crypto()
+    from model.crypto_stream import encrypt_stream
+
+    plain = iter_image_payload(image, compress=compress)
+    return _write_enc_file(enc_path, encrypt_stream(plain, db_key, salt))
+
+
+def _connect_memory_db(
+    *, image: bytes | bytearray | None = None, dump_sql: str = ""
+) -> sqlite3.Connection:
+    """Baut die In-Memory-DB aus Seitenabbild oder SQL-Dump auf."""
+    conn = sqlite3.connect(":memory:", factory=AutosaveConnection)
+    conn.row_factory = sqlite3.Row
+    if image:
+        conn.deserialize(image)
+    elif dump_sql:
+        conn.executescript(dump_sql)
+    conn.execute("PRAGMA foreign_keys = ON;")
+    conn.execute("PRAGMA busy_timeout = 10000;")
+    return conn
+
+
+def _read_enc_file(
+    enc_path: Path, db_key: bytes
+) -> tuple[bytearray | None, str, bytes]:
+    """Liest Container oder altes Fernet-Token.
+
+    Returns: ``(image, dump_sql, sha256_der_datei)``
+    """
+    _ensure_crypto()
+    from model.crypto_stream import STREAM_MAGIC, HashingReader, decrypt_stream
+
+    with open(enc_path, "rb") as raw:
+        f = HashingReader(raw)
         salt = f.read(SALT_LENGTH)
         if len(salt) < SALT_LENGTH:
             raise CryptoUserError(
                 "crypto.corrupt_salt_short", "Korrupte Datei: Salt zu kurz"
             )
-        token = f.read()
+        magic = f.read(len(STREAM_MAGIC))
+        if magic == STREAM_MAGIC:
+            image, dump_sql = decode_payload_stream(
+                decrypt_stream(f, db_key, salt, magic)
+            )
+            return image, dump_sql, f.digest.digest()
+        # Alte Datei: hinter dem Salt steht ein Fernet-Token (``gAAAAA…``).
+        token = magic + f.read()
 
     try:
-        dump_sql = decrypt_bytes(token, db_key).decode("utf-8")
+        payload = decrypt_bytes(token, db_key)
     except Exception:
         raise CryptoUserError(
             "crypto.decrypt_failed_wrong_key",
             "Entschlüsselung fehlgeschlagen — falscher Schlüssel",
         )
+    del token
+    image, dump_sql = decode_payload_stream([payload])
+    return image, dump_sql, f.digest.digest()
 
-    conn = sqlite3.connect(":memory:", factory=AutosaveConnection)
-    conn.row_factory = sqlite3.Row
-    conn.executescript(dump_sql)
-    conn.execute("PRAGMA foreign_keys = ON;")
-    conn.execute("PRAGMA busy_timeout = 10000;")
+
+def decrypt_db_with_journal(
+    enc_path: str | Path, db_key: bytes, *, with_hashes: bool = False
+):
+    """Entschlüsselt .enc-Datei samt Änderungsjournal in eine In-Memory-DB.
+
+    Returns: ``(connection, journal_state)``; der Stand ist ``None``, wenn
+    kein zur Basis passendes Journal existiert.
+    Raises: FileNotFoundError, ValueError
+    """
+    enc_path = Path(enc_path)
+    if not enc_path.exists():
+        raise FileNotFoundError(f"Nicht gefunden: {enc_path}")
+
+    image, dump_sql, fingerprint = _read_enc_file(enc_path, db_key)
+    if image is None:
+        return _connect_memory_db(dump_sql=dump_sql), None
+
+    from model.encrypted_journal import replay_journal
+
+    image, state = replay_journal(
+        image,
+        enc_path,
+        db_key,
+        fingerprint,
+        with_hashes=with_hashes,
+    )
+    return _connect_memory_db(image=image), state
+
+
+def decrypt_db_from_file(enc_path: str | Path, db_key: bytes) -> sqlite3.Connection:
+    """Entschlüsselt .enc-Datei in In-Memory-SQLite-DB.
+
+    Ein passendes Änderungsjournal wird dabei eingespielt.
+
+    Returns: sqlite3.Connection auf :memory: DB
+    Raises: FileNotFoundError, ValueError
+    """
+    conn, _state = decrypt_db_with_journal(enc_path, db_key)
     return conn
 
 
@@ -0,0 +1,168 @@
+"""Verschlüsselungscontainer der ``.enc``-Datei in Blöcken.
+
+Bis hierher war die ``.enc`` ``[Salt][Fernet-Token]``. Fernet verschlüsselt
+nur am Stück: Beim Speichern lagen Klartext, Chiffrat und dessen base64-Form
+gleichzeitig im Speicher, beim Laden dasselbe rückwärts - mit einer
+mehrjährigen DB auf einem Laptop mit wenig RAM ein Vielfaches der DB-Grösse.
+
+Der Container zerlegt den Klartext in Blöcke zu ``STREAM_CHUNK_SIZE`` und
+versiegelt jeden einzeln mit AES-GCM::
+
+  [16 Bytes Salt][Magic][1 Byte Version][1 Byte Flags][4 Bytes Blockgrösse]
+  [16 Bytes Datei-Nonce] [Block 0 + 16 Bytes Tag] [Block 1 + Tag] ...
+
+Der Schlüssel je Datei wird per HMAC-SHA256 aus dem db_key und der zufälligen
+Datei-Nonce abgeleitet; Nonces wiederholen sich deshalb nie, auch nicht
+zwischen zwei Speichervorgängen. Die Block-Nonce ist die laufende Nummer plus
+ein Schluss-Byte, der Kopf samt Salt ist zusätzlich authentifiziert. Damit
+fallen vertauschte, fehlende oder abgeschnittene Blöcke genauso auf wie ein
+geänderter Kopf.
+
+Alte Dateien erkennt ``model.crypto`` beim Laden daran, dass hinter dem Salt
+kein Magic steht (ein Fernet-Token beginnt mit ``gAAAAA``). Sie bleiben
+lesbar; geschrieben wird nur noch der Container, beim nächsten vollständigen
+Speichern ist die Datei umgestellt.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import os
+import struct
+from typing import Iterable, Iterator, Protocol
+
+from model.crypto import CryptoUserError
+
+STREAM_MAGIC = b"BMSTREAM"
+STREAM_VERSION = 1
+STREAM_CHUNK_SIZE = 64 * 1024
+STREAM_TAG_SIZE = 16
+STREAM_NONCE_SIZE = 16
+# Obergrenze für die Blockgrösse aus einem fremden Kopf - sonst liesse sich
+# mit einer präparierten Datei beliebig viel Speicher anfordern.
+STREAM_MAX_CHUNK_SIZE = 16 * 1024 * 1024
+STREAM_KEY_CONTEXT = b"budgetmanager-enc-stream-v1\x00"
+
+_HEADER = struct.Struct(f">{len(STREAM_MAGIC)}sBBI{STREAM_NONCE_SIZE}s")
+
+
+class Readable(Protocol):
+    def read(self, size: int = -1, /) -> bytes: ...
+
+
+def _stream_key(db_key: bytes, file_nonce: bytes) -> bytes:
+    raw = base64.urlsafe_b64decode(db_key)
+    return hmac.new(raw, STREAM_KEY_CONTEXT + file_nonce, hashlib.sha256).digest()
+
+
+def _chunk_nonce(index: int, last: bool) -> bytes:
+    return index.to_bytes(11, "big") + (b"\x01" if last else b"\x00")
+
+
+def encrypt_stream(
+    plain: Iterable[bytes],
+    db_key: bytes,
+    salt: bytes,
+    *,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """Liefert die Datei stückweise: erst Salt und Kopf, dann je einen Block.
+
+    ``plain`` darf beliebig gestückelt sein; gepuffert wird höchstens ein
+    Block.
+    """
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+    file_nonce = os.urandom(STREAM_NONCE_SIZE)
+    header = salt + _HEADER.pack(
+        STREAM_MAGIC, STREAM_VERSION, 0, chunk_size, file_nonce
+    )
+    aead = AESGCM(_stream_key(db_key, file_nonce))
+    yield header
+
+    buffer = b""
+    index = 0
+    for piece in plain:
+        buffer = buffer + piece if buffer else piece
+        # Der letzte Block muss als solcher versiegelt werden; solange nicht
+        # feststeht, ob noch etwas kommt, bleibt ein voller Block im Puffer.
+        view = memoryview(buffer)
+        start = 0
+        while len(view) - start > chunk_size:
+            block = view[start : start + chunk_size]
+            yield aead.encrypt(_chunk_nonce(index, False), block, header)
+            start += chunk_size
+            index += 1
+        buffer = bytes(view[start:])
+        view.release()
+    yield aead.encrypt(_chunk_nonce(index, True), buffer, header)
+
+
+def decrypt_stream(
+    f: Readable, db_key: bytes, salt: bytes, magic: bytes
+) -> Iterator[bytes]:
+    """Entschlüsselt einen Container, dessen Salt und Magic schon gelesen sind.
+
+    Liefert den Klartext blockweise. Raises: CryptoUserError
+    """
+    from cryptography.exceptions import InvalidTag
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+    rest = f.read(_HEADER.size - len(STREAM_MAGIC))
+    if len(rest) != _HEADER.size - len(STREAM_MAGIC):
+        raise CryptoUserError(
+            "crypto.corrupt_payload", "Korrupte Datei: Abbild unlesbar"
+        )
+    header = salt + magic + rest
+    _magic, version, flags, chunk_size, file_nonce = _HEADER.unpack(header[len(salt) :])
+    if version != STREAM_VERSION or flags:
+        raise CryptoUserError(
+            "crypto.unknown_payload_flags",
+            "Datei aus einer neueren Version — bitte BudgetManager aktualisieren",
+        )
+    if not 0 < chunk_size <= STREAM_MAX_CHUNK_SIZE:
+        raise CryptoUserError(
+            "crypto.corrupt_payload", "Korrupte Datei: Abbild unlesbar"
+        )
+
+    aead = AESGCM(_stream_key(db_key, file_nonce))
+    sealed = chunk_size + STREAM_TAG_SIZE
+    index = 0
+    block = f.read(sealed)
+    while True:
+        # Ein voller Block kann der letzte sein; das entscheidet erst das
+        # nächste Byte.
+        following = f.read(sealed) if len(block) == sealed else b""
+        last = not following
+        try:
+            yield aead.decrypt(_chunk_nonce(index, last), block, header)
+        except InvalidTag:
+            # Schon der erste Block passt nicht: fast immer der falsche
+            # Schlüssel. Später ist die Datei beschädigt oder abgeschnitten.
+            if index == 0:
+                raise CryptoUserError(
+                    "crypto.decrypt_failed_wrong_key",
+                    "Entschlüsselung fehlgeschlagen — falscher Schlüssel",
+                )
+            raise CryptoUserError(
+                "crypto.corrupt_payload", "Korrupte Datei: Abbild unlesbar"
+            )
+        if last:
+            return
+        block = following
+        index += 1
+
+
+class HashingReader:
+    """Liest eine Datei und führt nebenher den SHA-256 über alles Gelesene."""
+
+    def __init__(self, f: Readable):
+        self._f = f
+        self.digest = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._f.read(size)
+        self.digest.update(data)
+        return data
@@ -29,7 +29,8 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 
-USER_DATA_FILE_GLOBS = ("*.enc",)
+# ``*.enc.journal``: Commits seit dem letzten Snapshot (model.encrypted_journal).
+USER_DATA_FILE_GLOBS = ("*.enc", "*.enc.journal")
 USER_DATA_FILE_NAMES = ("users.json", "budgetmanager.db")
 USER_DATA_DIR_NAMES = ("backups", "exports")
 
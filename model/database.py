@@ -4,9 +4,18 @@ import logging
 logger = logging.getLogger(__name__)
 import sqlite3
 import atexit
-from contextlib import contextmanager
+import threading
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Hashable, Iterator, Optional
+
+from model.profiling import (
+    attach as attach_profiling,
+    detach as detach_profiling,
+    enabled as profiling_enabled,
+    profiled,
+)
+from model.query_cache import forget as forget_query_cache
 
 
 def _configure_connection(conn: sqlite3.Connection, *, is_memory: bool = False) -> None:
@@ -27,21 +36,320 @@ def _configure_connection(conn: sqlite3.Connection, *, is_memory: bool = False)
     conn.execute("PRAGMA temp_store = MEMORY;")
 
 
+#: Vorbereitete Anweisungen je Connection. Cockpit, Übersicht und Filter
+#: wiederholen deutlich mehr verschiedene Abfragen als die 128 von sqlite3.
+STATEMENT_CACHE_SIZE = 256
+
+#: Lese-Connections eines :class:`ConnectionPool`, wenn nichts anderes gilt.
+DEFAULT_READERS = 4
+
+
 def open_db(path: str) -> sqlite3.Connection:
-    """Öffnet die Haupt-Datenbank mit row_factory und Pragmas."""
-    conn = sqlite3.connect(path, timeout=10.0)
+    """Öffnet die Haupt-Datenbank mit row_factory und Pragmas.
+
+    Bei eingeschaltetem Profiling wird die Connection gleich gemessen - auch
+    wenn sie erst nach einem Restore oder erneuten Login aufgeht.
+    """
+    conn = sqlite3.connect(path, timeout=10.0, cached_statements=STATEMENT_CACHE_SIZE)
     conn.row_factory = sqlite3.Row
     _configure_connection(conn)
+    if profiling_enabled():
+        attach_profiling(conn)
     return conn
 
 
 def open_db_raw(path: str) -> sqlite3.Connection:
     """Öffnet eine Datenbank ohne row_factory (für Management-Operationen)."""
-    conn = sqlite3.connect(path, timeout=10.0)
+    conn = sqlite3.connect(path, timeout=10.0, cached_statements=STATEMENT_CACHE_SIZE)
     _configure_connection(conn)
     return conn
 
 
+def _configure_readonly(conn: sqlite3.Connection) -> None:
+    """Pragmas einer Lese-Connection: ``query_only`` statt WAL-Umstellung.
+
+    ``journal_mode`` und ``synchronous`` gehören dem Schreiber; eine
+    Lese-Connection darf sie weder setzen noch braucht sie sie.
+    """
+    conn.execute("PRAGMA query_only = ON;")
+    conn.execute("PRAGMA busy_timeout = 10000;")
+    conn.execute("PRAGMA temp_store = MEMORY;")
+
+
+def open_db_readonly(
+    path: str, *, check_same_thread: bool = True
+) -> sqlite3.Connection:
+    """Öffnet ``path`` nur zum Lesen (``mode=ro`` und ``query_only``).
+
+    Im WAL-Modus liest sie neben dem Schreiber, ohne ihn zu blockieren, und
+    sieht jeden seiner Commits. Schreibversuche scheitern mit
+    ``sqlite3.OperationalError``.
+    """
+    conn = sqlite3.connect(
+        f"{Path(path).resolve().as_uri()}?mode=ro",
+        uri=True,
+        timeout=10.0,
+        check_same_thread=check_same_thread,
+        cached_statements=STATEMENT_CACHE_SIZE,
+    )
+    conn.row_factory = sqlite3.Row
+    _configure_readonly(conn)
+    return conn
+
+
+def clone_memory(
+    conn: sqlite3.Connection,
+    *,
+    image: bytes | None = None,
+    check_same_thread: bool = True,
+) -> sqlite3.Connection:
+    """Eigenständige In-Memory-Kopie von ``conn`` (z. B. der verschlüsselten DB).
+
+    ``image`` ist ein schon gezogenes Seitenabbild (``serialize_db``); sonst
+    wird ``conn`` jetzt serialisiert - dann im Thread von ``conn``.
+    """
+    if image is None:
+        from model.crypto import serialize_db
+
+        image = serialize_db(conn)
+    clone = sqlite3.connect(
+        ":memory:",
+        check_same_thread=check_same_thread,
+        cached_statements=STATEMENT_CACHE_SIZE,
+    )
+    if image:
+        clone.deserialize(image)
+    clone.row_factory = sqlite3.Row
+    _configure_connection(clone, is_memory=True)
+    return clone
+
+
+def database_file(conn: sqlite3.Connection) -> str:
+    """Dateipfad der ``main``-Datenbank, leer für ``:memory:``."""
+    for row in conn.execute("PRAGMA database_list"):
+        if str(row[1]) == "main":
+            return str(row[2] or "")
+    return ""
+
+
+class ConnectionPool:
+    """Ein Schreiber, mehrere Lese-Connections daneben.
+
+    Bisher teilten sich alle die eine Connection des Hauptfensters, und wer
+    ausserhalb lesen wollte (Hintergrundberechnung, Exporte, Statistik),
+    öffnete eine eigene und richtete jedes Mal die Pragmas neu ein. Der Pool
+    hält bis zu ``max_readers`` vorbereitete Lese-Connections und gibt sie
+    mit :meth:`reader` aus; sind alle unterwegs, wartet der nächste.
+
+    Liegt die Datenbank in einer Datei, sind die Leser ``mode=ro`` daneben.
+    Im Speicher (verschlüsselter Modus) lesen sie Kopien: :meth:`publish`
+    zieht im Thread des Schreibers ein neues Seitenabbild, aber nur, wenn
+    sich seit dem letzten etwas geändert hat, und ein Leser übernimmt es
+    beim nächsten Ausleihen. Zieht der Schreiber ohnehin eines (die
+    ``EncryptedSession`` nach jedem Commit), übernimmt :meth:`offer` es, und
+    :meth:`publish` hat nichts mehr zu tun.
+
+    Jeder Leser hat einen eigenen Abfrage-Cache ausserhalb des LRU von
+    ``model.query_cache`` (``pin``), der mit jedem neuen Abbild verfällt.
+
+    Lese-Connections dürfen den Thread wechseln, aber nur einer auf einmal
+    benutzt sie - genau das stellt :meth:`reader` sicher.
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        *,
+        writer: sqlite3.Connection | None = None,
+        max_readers: int = DEFAULT_READERS,
+    ) -> None:
+        if path:
+            self._path = str(path)
+        elif writer is not None:
+            self._path = database_file(writer)
+        else:
+            raise ValueError("ConnectionPool braucht einen Pfad oder einen Schreiber")
+        self._writer = writer
+        self._owns_writer = writer is None
+        self._max_readers = max(1, int(max_readers))
+        self._idle: list[sqlite3.Connection] = []
+        self._stamps: dict[int, Hashable] = {}
+        self._opened = 0
+        self._image: tuple[Hashable, bytes] | None = None
+        self._cond = threading.Condition()
+        self._closed = False
+        self.checkouts = 0
+        self.waits = 0
+        self.snapshots = 0
+        self.offered = 0
+
+    @classmethod
+    def for_connection(
+        cls, conn: sqlite3.Connection, *, max_readers: int = DEFAULT_READERS
+    ) -> "ConnectionPool":
+        """Pool neben einer schon offenen Connection, die Schreiber bleibt."""
+        return cls(writer=conn, max_readers=max_readers)
+
+    @property
+    def mode(self) -> str:
+        """``"file"`` (``mode=ro`` daneben) oder ``"memory"`` (Kopien)."""
+        return "file" if self._path else "memory"
+
+    @property
+    def writer(self) -> sqlite3.Connection:
+        """Die eine schreibende Connection; mit Pfad beim ersten Zugriff geöffnet."""
+        if self._writer is None:
+            self._writer = open_db(self._path)
+        return self._writer
+
+    def publish(self) -> bool:
+        """Neues Seitenabbild für die Kopien, falls sich etwas geändert hat.
+
+        Nur im Thread des Schreibers aufrufen; im Dateimodus ohne Wirkung.
+        Liefert True, wenn ein neues Abbild gezogen wurde.
+        """
+        if self.mode == "file":
+            return False
+        from model.crypto import serialize_db
+
+        stamp = self._stamp()
+        with self._cond:
+            if self._image is not None and self._image[0] == stamp:
+                return False
+        image = serialize_db(self.writer)
+        with self._cond:
+            self._image = (stamp, image)
+            self.snapshots += 1
+        return True
+
+    def offer(self, image: bytes) -> None:
+        """Übernimmt ein Seitenabbild, das der Schreiber ohnehin gezogen hat.
+
+        Im Thread des Schreibers und ohne offene Transaktion aufrufen, also
+        etwa direkt nach dem Commit; im Dateimodus ohne Wirkung.
+        """
+        if self.mode == "file" or self.writer.in_transaction:
+            return
+        stamp = self._stamp()
+        with self._cond:
+            if not self._closed:
+                self._image = (stamp, image)
+                self.offered += 1
+
+    def _stamp(self) -> Hashable:
+        from model.query_cache import cache_epoch
+
+        writer = self.writer
+        row = writer.execute("PRAGMA data_version").fetchone()
+        return (writer.total_changes, int(row[0]) if row else 0, cache_epoch(writer))
+
+    @contextmanager
+    def reader(self, timeout: float | None = None) -> Iterator[sqlite3.Connection]:
+        """Leiht eine Lese-Connection aus und nimmt sie danach zurück.
+
+        Eine offene Lesetransaktion wird beim Zurückgeben beendet, damit
+        der nächste Ausleiher den neuesten Stand sieht.
+        """
+        conn = self._checkout(timeout)
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            with self._cond:
+                if self._closed:
+                    forget_query_cache(conn)
+                    conn.close()
+                else:
+                    self._idle.append(conn)
+                    self._cond.notify()
+
+    def _checkout(self, timeout: float | None) -> sqlite3.Connection:
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise sqlite3.ProgrammingError("ConnectionPool ist geschlossen")
+                if self._idle:
+                    conn = self._idle.pop()
+                    break
+                if self._opened < self._max_readers:
+                    self._opened += 1
+                    conn = None
+                    break
+                self.waits += 1
+                if not self._cond.wait(timeout):
+                    raise TimeoutError("keine Lese-Connection frei")
+            self.checkouts += 1
+            image = self._image
+        if conn is None:
+            opened: sqlite3.Connection | None = None
+            try:
+                opened = self._open_reader(image)
+            finally:
+                if opened is None:
+                    with self._cond:
+                        self._opened -= 1
+                        self._cond.notify()
+            conn = opened
+        elif image is not None and self._stamps.get(id(conn)) != image[0]:
+            from model.query_cache import invalidate
+
+            if image[1]:
+                conn.deserialize(image[1])
+            # deserialize() zählt SQLite nicht als Änderung.
+            invalidate(conn)
+            self._stamps[id(conn)] = image[0]
+        return conn
+
+    def _open_reader(self, image: tuple[Hashable, bytes] | None) -> sqlite3.Connection:
+        from model.query_cache import pin
+
+        if self.mode == "file":
+            conn = open_db_readonly(self._path, check_same_thread=False)
+        elif image is None:
+            raise sqlite3.ProgrammingError(
+                "Kein Seitenabbild: publish() im Thread des Schreibers aufrufen"
+            )
+        else:
+            conn = clone_memory(self.writer, image=image[1], check_same_thread=False)
+            conn.execute("PRAGMA query_only = ON;")
+            self._stamps[id(conn)] = image[0]
+        pin(conn)
+        return conn
+
+    def close(self) -> None:
+        """Schliesst freie Leser sofort, ausgeliehene bei der Rückgabe."""
+        from model.query_cache import forget as forget_query_cache
+
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._image = None
+            self._cond.notify_all()
+        for conn in idle:
+            forget_query_cache(conn)
+            conn.close()
+        if self._owns_writer and self._writer is not None:
+            self._writer.close()
+            forget_query_cache(self._writer)
+            self._writer = None
+
+    def stats(self) -> dict[str, int | str]:
+        """Zähler für den Diagnosebericht."""
+        with self._cond:
+            return {
+                "mode": self.mode,
+                "readers": self._opened,
+                "idle": len(self._idle),
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "snapshots": self.snapshots,
+                "offered": self.offered,
+            }
+
+
 @contextmanager
 def db_transaction(conn: sqlite3.Connection):
     """Context Manager für atomare Datenbank-Transaktionen.
@@ -78,6 +386,16 @@ class EncryptedSession:
     Bietet save() zum verschlüsselten Speichern auf Disk.
     Registriert sich bei atexit für automatisches Speichern.
 
+    Commits landen als Seitendeltas im Änderungsjournal neben der ``.enc``
+    (siehe ``model.encrypted_journal``); jeder andere Anlass - Schliessen,
+    Timer, Backup - schreibt einen vollständigen Snapshot, damit die ``.enc``
+    allein wieder die ganze DB enthält.
+
+    Mit ``autosave_delay_ms > 0`` schreibt ein eigener Thread
+    (``model.encrypted_writer``): Der Commit kopiert nur das Seitenabbild,
+    Serien von Commits innerhalb des Zeitfensters werden ein Schreibvorgang.
+    Ohne Angabe wird wie bisher sofort und synchron gespeichert.
+
     Verwendung::
 
         session = EncryptedSession.open_with_key("user.enc", db_key, salt)
@@ -86,8 +404,17 @@ class EncryptedSession:
     """
 
     def __init__(
-        self, conn: sqlite3.Connection, enc_path: str, db_key: bytes, salt: bytes
+        self,
+        conn: sqlite3.Connection,
+        enc_path: str,
+        db_key: bytes,
+        salt: bytes,
+        journal_state=None,
+        *,
+        autosave_delay_ms: int | None = None,
     ):
+        from model.encrypted_journal import EncryptedJournal
+
         self.conn = conn
         # intern halten (damit wir später Properties anbieten können)
         self._enc_path = str(enc_path)
@@ -96,6 +423,17 @@ class EncryptedSession:
         self._closed = False
         self._frozen = False  # wenn True: keine Saves auf Disk (z.B. nach Restore)
         self._saving = False
+        self._journal = EncryptedJournal(enc_path, db_key, salt, journal_state)
+        self._writer = None
+        self._image_listeners: list[Callable[[bytes], None]] = []
+        if profiling_enabled():
+            attach_profiling(conn)
+        if autosave_delay_ms is not None and int(autosave_delay_ms) > 0:
+            from model.encrypted_writer import EncryptedWriter
+
+            self._writer = EncryptedWriter(
+                self._journal, latency_ms=int(autosave_delay_ms)
+            )
 
         # Im verschluesselten Modus ist die SQLite-DB im RAM.  Jeder erfolgreiche
         # conn.commit() muss deshalb direkt die .enc-Datei aktualisieren, sonst
@@ -111,37 +449,147 @@ class EncryptedSession:
 
     @classmethod
     def open_with_key(
-        cls, enc_path: str, db_key: bytes, salt: bytes
+        cls,
+        enc_path: str,
+        db_key: bytes,
+        salt: bytes,
+        *,
+        autosave_delay_ms: int | None = None,
     ) -> "EncryptedSession":
         """Öffnet eine verschlüsselte DB mit dem db_key."""
-        from model.crypto import decrypt_db_from_file
-
-        conn = decrypt_db_from_file(enc_path, db_key)
-        return cls(conn, enc_path, db_key, salt)
-
+        from model.crypto import decrypt_db_with_journal
+
+        conn, journal_state = decrypt_db_with_journal(
+            enc_path, db_key, with_hashes=True
+        )
+        return cls(
+            conn,
+            enc_path,
+            db_key,
+            salt,
+            journal_state,
+            autosave_delay_ms=autosave_delay_ms,
+        )
+
+    def _exclusive(self):
+        """Sperrt den Hintergrund-Schreiber für einen Schreibvorgang hier."""
+        if self._writer is None:
+            return nullcontext()
+        return self._writer.exclusive()
+
+    @profiled("encrypted_session.save")
     def save(self, *, reason: str = "manual") -> None:
-        """Speichert die In-Memory-DB verschlüsselt auf Disk."""
+        """Speichert die In-Memory-DB verschlüsselt auf Disk.
+
+        ``reason="commit"`` hängt nur die geänderten Seiten ans Journal an und
+        verdichtet erst, wenn das Journal zu gross wird; mit Hintergrund-
+        Schreiber wird der Snapshot nur übergeben. Alle anderen Anlässe
+        schreiben sofort einen vollständigen Snapshot.
+        """
         if self._closed or self._frozen or self._saving:
             return
         self._saving = True
         try:
-            from model.crypto import save_memory_db
-
-            save_memory_db(self.conn, self._enc_path, self._db_key, self._salt)
-            if reason == "commit":
-                logger.debug(
-                    "Verschlüsselte DB nach Commit gespeichert: %s",
-                    Path(self._enc_path).name,
-                )
+            from model.crypto import serialize_db
+
+            image = serialize_db(self.conn)
+            if reason == "commit" and self._writer is not None:
+                self._writer.submit(image)
             else:
-                logger.info(
-                    "Verschlüsselte DB gespeichert: %s", Path(self._enc_path).name
-                )
+                with self._exclusive():
+                    self._write_now(image, reason)
+            for listener in self._image_listeners:
+                listener(image)
         except Exception as e:
             logger.error("Fehler beim Speichern der verschlüsselten DB: %s", e)
         finally:
             self._saving = False
 
+    @profiled("encrypted_session.write")
+    def _write_now(self, image: bytes, reason: str) -> None:
+        if reason == "commit" and not self._journal.needs_compaction():
+            pages = self._journal.append(image)
+            logger.debug(
+                "Verschlüsselte DB nach Commit gespeichert: %s (%d Seiten)",
+                Path(self._enc_path).name,
+                pages,
+            )
+        elif reason == "commit":
+            self._journal.compact(image)
+            logger.debug(
+                "Verschlüsselte DB nach Commit verdichtet: %s",
+                Path(self._enc_path).name,
+            )
+        else:
+            self._journal.compact(image)
+            logger.info("Verschlüsselte DB gespeichert: %s", Path(self._enc_path).name)
+
+    def save_in_background(self) -> None:
+        """Periodischer Vollsnapshot (Timer), ohne den GUI-Thread zu blockieren.
+
+        Ohne Hintergrund-Schreiber identisch mit ``save()``. Ist das Journal
+        leer, gibt es nichts zu verdichten.
+        """
+        if self._writer is None:
+            self.save(reason="timer")
+            return
+        if self._closed or self._frozen:
+            return
+        state = self._journal.state
+        if state is not None and state.next_seq == 0:
+            return
+        try:
+            from model.crypto import serialize_db
+
+            self._writer.submit(serialize_db(self.conn), compact=True)
+        except sqlite3.Error as e:
+            logger.error("Fehler beim Speichern der verschlüsselten DB: %s", e)
+
+    def clone(self, *, check_same_thread: bool = True) -> sqlite3.Connection:
+        """Eigenständige In-Memory-Kopie des jetzigen Stands.
+
+        Für Leser, die nicht auf der Session-Connection arbeiten sollen
+        (Exporte, Berichte); was dort geschrieben wird, bleibt in der Kopie.
+        Mehrere Leser: ``ConnectionPool.for_connection(session.conn)``.
+        """
+        return clone_memory(self.conn, check_same_thread=check_same_thread)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wartet, bis alle übergebenen Snapshots auf der Platte sind."""
+        if self._writer is None:
+            return True
+        return self._writer.flush(timeout)
+
+    @property
+    def save_status(self) -> str:
+        """``idle``/``pending``/``saving``/``saved``/``error`` (siehe
+        ``model.encrypted_writer``); ohne Hintergrund-Schreiber ``idle``."""
+        if self._writer is None:
+            return "idle"
+        return self._writer.status
+
+    def add_save_status_listener(self, callback) -> bool:
+        """Meldet Statuswechsel des Hintergrund-Schreibers (aus dessen Thread).
+
+        Returns: ``False``, wenn synchron gespeichert wird.
+        """
+        if self._writer is None:
+            return False
+        self._writer.add_status_listener(callback)
+        return True
+
+    def add_image_listener(self, callback: Callable[[bytes], None]) -> None:
+        """Reicht jedes gespeicherte Seitenabbild weiter (im Thread von ``conn``).
+
+        Für Leser, die sonst selbst eines zögen - etwa
+        ``ConnectionPool.offer`` des Rechendienstes.
+        """
+        self._image_listeners.append(callback)
+
+    def _stop_writer(self) -> None:
+        if self._writer is not None:
+            self._writer.stop()
+
     def _save_after_commit(self, _reason: str = "commit") -> None:
         """Persistiert erfolgreiche DB-Commits sofort in die verschlüsselte Datei."""
         self.save(reason="commit")
@@ -150,22 +598,31 @@ class EncryptedSession:
         """Speichert (falls aktiv) und schliesst die Session."""
         if self._closed:
             return
+        self._stop_writer()
         # Wenn die Session eingefroren wurde (z.B. nach Restore),
         # speichern wir NICHT mehr auf Disk, schliessen aber die Connection sauber.
         if not self._frozen:
             self.save(reason="close")
+        detach_profiling(self.conn)
         try:
             self.conn.close()
         finally:
             self._closed = True
+            forget_query_cache(self.conn)
 
     def freeze(self) -> None:
         """Stoppt zukünftige Saves auf Disk.
 
         Wichtig nach einem Restore/Import, wenn wir die .enc Datei ersetzt haben,
         damit der Auto-Save nicht sofort wieder die alte In-Memory-DB darüber schreibt.
+        Der Journalstand gilt danach nicht mehr: Die ``.enc`` auf der Platte ist
+        nicht mehr die Basis, auf die sich die Seitenprüfsummen beziehen.
         """
         self._frozen = True
+        # Ein laufender Hintergrund-Schreibvorgang wird abgewartet, ein
+        # wartender verworfen - danach schreibt niemand mehr auf die .enc.
+        with self._exclusive():
+            self._journal.invalidate()
 
     def unfreeze(self) -> None:
         """Hebt freeze() wieder auf (z.B. wenn Restore abgebrochen wurde)."""
@@ -189,6 +646,7 @@ class EncryptedSession:
         """Wird bei App-Exit aufgerufen."""
         if not self._closed:
             try:
+                self._stop_writer()
                 self.save(reason="atexit")
             except Exception as e:
                 logger.error("atexit save failed: %s", e)
@@ -20,7 +20,7 @@ from typing import Any, Tuple, List
 
 logger = logging.getLogger(__name__)
 
-from model.database import open_db
+from model.database import open_db, open_db_readonly
 from model.restore_bundle import create_bundle
 from app_info import APP_NAME, APP_VERSION
 
@@ -44,6 +44,16 @@ class DatabaseManagementModel:
             return self._shared_conn
         return open_db(self.db_path)
 
+    def _get_read_conn(self) -> sqlite3.Connection:
+        """Wie ``_get_conn``, der Fallback aber nur lesend.
+
+        Statistik und SQL-Export schreiben nichts; eine ``mode=ro``-Connection
+        stellt weder den Journalmodus um noch wartet sie auf den Schreiber.
+        """
+        if self._shared_conn is not None:
+            return self._shared_conn
+        return open_db_readonly(self.db_path)
+
     def _close_if_own(self, conn: sqlite3.Connection) -> None:
         """Schließt die Connection nur, wenn sie nicht die geteilte ist."""
         if conn is not self._shared_conn:
@@ -180,6 +190,11 @@ class DatabaseManagementModel:
                     "sqlite_stat4",
                     "system_flags",  # Schema-Version & App-Flags – NIE löschen
                 }
+                # FTS5-Schattentabellen gehören dem Volltextindex; die Trigger
+                # leeren ihn mit den Quelltabellen.
+                from model.search_index import SHADOW_TABLES
+
+                _NEVER_DELETE |= SHADOW_TABLES
                 cursor.execute(
                     "SELECT name FROM sqlite_master WHERE type='table' ORDER BY name"
                 )
@@ -340,9 +355,27 @@ class DatabaseManagementModel:
                 cursor.execute("DELETE FROM redo_stack")
                 stats["cleared_redo_stack"] = cursor.rowcount
 
+            # 7. Monatssummen aus Budget und Buchungen neu aufbauen
+            if "monthly_totals" in _existing:
+                from model.monthly_totals import rebuild_monthly_totals
+
+                rebuild_monthly_totals(conn)
+
+            # 8. Eingefrorene Monatssummen aus den neuen Summen ableiten
+            if "period_snapshots" in _existing:
+                from model.period_snapshots import rebuild_period_snapshots
+
+                rebuild_period_snapshots(conn)
+
+            # 9. Volltextindex neu aufbauen
+            if "search_index" in _existing:
+                from model.search_index import rebuild_search_index
+
+                rebuild_search_index(conn)
+
             conn.commit()
 
-            # 7. VACUUM separat (kann nicht in Transaktion laufen)
+            # 10. VACUUM separat (kann nicht in Transaktion laufen)
             try:
                 cursor.execute("VACUUM")
             except sqlite3.OperationalError as e:
@@ -366,7 +399,7 @@ class DatabaseManagementModel:
             Dictionary mit Statistiken (Größe, Zählungen, Tabellen, Jahre).
         """
         try:
-            conn = self._get_conn()
+            conn = self._get_read_conn()
             cursor = conn.cursor()
 
             stats: dict = {}
@@ -451,7 +484,7 @@ class DatabaseManagementModel:
             (success, message)
         """
         try:
-            conn = self._get_conn()
+            conn = self._get_read_conn()
 
             with open(output_path, "w", encoding="utf-8") as f:
                 for line in conn.iterdump():
@@ -24,6 +24,9 @@ import zipfile
 
 from app_info import APP_NAME, APP_VERSION
 from model.app_paths import app_dir, data_dir, installation_marker_path, settings_path
+from model.profiling import performance_report
+from model.startup_profile import report as startup_report
+from model.query_cache import query_cache_stats
 
 LOG_FILENAME = "budgetmanager.log"
 CRASH_LOG_FILENAME = "budgetmanager_crash.log"
@@ -289,6 +292,16 @@ def _sanitize(value):
     return _mask_paths(value)
 
 
+def _settings_cache_stats() -> dict:
+    # settings.py liegt neben model/ und zieht beim Import die Cockpit-Presets;
+    # erst hier laden, damit Updater-/CLI-Pfade ohne sie auskommen.
+    try:
+        from settings import settings_cache_stats
+    except ImportError as exc:
+        return {"available": False, "reason": str(exc)}
+    return {"available": True, **settings_cache_stats()}
+
+
 def sanitized_settings() -> dict:
     return cast(dict, _sanitize(_read_json(settings_path())))
 
@@ -636,6 +649,34 @@ def create_diagnostic_report_zip(
         manifest.append(
             "ADDED database_health.json <- active connection (technical metadata only)"
         )
+        zf.writestr(
+            "query_cache.json",
+            json.dumps(
+                query_cache_stats(connection),
+                ensure_ascii=False,
+                indent=2,
+                sort_keys=True,
+            ),
+        )
+        manifest.append("ADDED query_cache.json <- query cache hit/miss counters")
+        zf.writestr(
+            "settings_cache.json",
+            json.dumps(_settings_cache_stats(), ensure_ascii=False, indent=2),
+        )
+        manifest.append("ADDED settings_cache.json <- settings disk reads/cache hits")
+        zf.writestr(
+            "performance.json",
+            json.dumps(
+                _sanitize({**performance_report(), "startup": startup_report()}),
+                ensure_ascii=False,
+                indent=2,
+                sort_keys=True,
+            ),
+        )
+        manifest.append(
+            "ADDED performance.json <- startup phases, opt-in profiling "
+            "(SQL shapes without literals)"
+        )
         zf.writestr(
             "README.txt",
             "BudgetManager Diagnosebericht. Enthält datensparsam bereinigte "
@@ -644,7 +685,8 @@ def create_diagnostic_report_zip(
             "keine Backups und keine Exportdaten. Die DB-Prüfung enthält nur "
             "technische Statuswerte und Zähler. Benutzerspezifische Home-Pfade "
             "werden als <home> maskiert. Freie Meldungstexte im App-Log werden "
-            "zum Schutz von Kategorien, Beträgen und Kommentaren entfernt.\n",
+            "zum Schutz von Kategorien, Beträgen und Kommentaren entfernt. "
+            "performance.json enthält SQL-Anweisungen nur ohne Werte.\n",
         )
         manifest.append("ADDED README.txt <- generated")
         if read_errors:
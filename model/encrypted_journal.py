@@ -0,0 +1,358 @@
+"""Inkrementelle Persistenz der verschlüsselten In-Memory-DB.
+
+Bis hierher schrieb jeder Commit im verschlüsselten Modus die komplette
+Datenbank neu: ``iterdump()`` über alle Tabellen, Fernet über den ganzen
+SQL-Text, ``fsync``. Mit ein paar Jahren Buchungen kostete eine einzelne
+Schnelleingabe mehrere hundert Millisekunden, und es wurde mit jeder Buchung
+mehr.
+
+Jetzt besteht die gespeicherte DB aus zwei Dateien:
+
+  ``<name>.enc``          Basis-Snapshot: das Seitenabbild der DB
+                          (``Connection.serialize()``), verschlüsselt.
+  ``<name>.enc.journal``  Änderungsjournal, nur angehängt:
+                          ``[Magic][SHA-256 der Basisdatei]`` und danach
+                          Frames ``[4 Bytes Länge][Fernet-Token]``.
+
+Ein Frame enthält genau die Seiten, die sich seit dem vorherigen Frame
+geändert haben, plus die neue Seitenzahl der DB. Ein Commit kostet damit
+Zeit im Verhältnis zu dem, was er geändert hat - nicht zur Grösse der DB.
+Wird das Journal im Verhältnis zur Basis zu gross, schreibt
+:meth:`EncryptedJournal.compact` einen neuen Snapshot und beginnt ein leeres
+Journal.
+
+Absturzsicherheit: Jedes Frame ist einzeln authentifiziert und trägt den
+Fingerabdruck der Basis und eine laufende Nummer. Ein halb geschriebenes
+letztes Frame wird beim Laden verworfen - verloren geht höchstens der
+letzte Commit, nie die Datei. Passt der Fingerabdruck nicht zur Basis
+(Absturz mitten in der Verdichtung, von Hand kopierte ``.enc``), wird
+das ganze Journal ignoriert: Es beschreibt dann eine andere Datenbank.
+Restore und Import löschen das Journal zusätzlich mit
+:func:`discard_journal` - eine byte-gleiche Sicherung hätte denselben
+Fingerabdruck.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import struct
+from dataclasses import dataclass, field
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_SUFFIX = ".journal"
+JOURNAL_MAGIC = b"BMJOURNAL1\n"
+FINGERPRINT_SIZE = 32
+
+# Verdichtung: ab dieser Journalgrösse lohnt sich ein neuer Snapshot, wenn das
+# Journal zugleich einen spürbaren Teil der Basis ausmacht. Kleine DBs werden
+# so nicht bei jedem zweiten Commit neu geschrieben, grosse nicht nie.
+COMPACT_MIN_BYTES = 4 * 1024 * 1024
+COMPACT_RATIO = 0.5
+COMPACT_MAX_FRAMES = 2000
+
+_LENGTH = struct.Struct(">I")
+_FRAME_HEADER = struct.Struct(f">{FINGERPRINT_SIZE}sIII")
+_PAGE_NO = struct.Struct(">I")
+
+
+class JournalError(ValueError):
+    """Das Journal passt nicht zur Basis oder ist beschädigt."""
+
+
+def journal_path_for(enc_path: str | Path) -> Path:
+    """Pfad des Änderungsjournals zu einer ``.enc``-Datei."""
+    enc_path = Path(enc_path)
+    return enc_path.with_name(enc_path.name + JOURNAL_SUFFIX)
+
+
+def discard_journal(enc_path: str | Path) -> None:
+    """Löscht das Journal, nachdem die ``.enc`` von aussen ersetzt wurde.
+
+    Für Restore und Import. Der Fingerabdruck im Journal schützt nur vor
+    einer *anderen* Basis: Ist die zurückgespielte Datei byte-gleich mit der
+    aktuellen Basis, würden die neueren Frames sonst beim nächsten Öffnen
+    wieder eingespielt und den Restore stillschweigend rückgängig machen.
+    """
+    journal_path = journal_path_for(enc_path)
+    journal_path.with_name(journal_path.name + ".tmp").unlink(missing_ok=True)
+    journal_path.unlink(missing_ok=True)
+
+
+def image_page_size(image: bytes | bytearray | memoryview) -> int:
+    """Seitengrösse aus dem SQLite-Dateikopf (Offset 16, Wert 1 = 65536)."""
+    if len(image) < 100:
+        return 0
+    value = int.from_bytes(bytes(image[16:18]), "big")
+    return 65536 if value == 1 else value
+
+
+def page_hashes(image: bytes | bytearray, page_size: int) -> list[bytes]:
+    """Kurze Prüfsumme je Seite; 16 Bytes BLAKE2b statt einer zweiten Kopie."""
+    view = memoryview(image)
+    return [
+        hashlib.blake2b(view[offset : offset + page_size], digest_size=16).digest()
+        for offset in range(0, len(image), page_size)
+    ]
+
+
+@dataclass
+class JournalState:
+    """Stand eines Journals nach Laden oder Schreiben."""
+
+    fingerprint: bytes
+    base_bytes: int
+    page_size: int
+    hashes: list[bytes] = field(default_factory=list)
+    next_seq: int = 0
+    journal_bytes: int = 0
+
+
+def _encode_frame(
+    fingerprint: bytes,
+    seq: int,
+    page_size: int,
+    page_count: int,
+    pages: list[tuple[int, memoryview]],
+) -> bytes:
+    parts = [_FRAME_HEADER.pack(fingerprint, seq, page_size, page_count)]
+    for page_no, data in pages:
+        parts.append(_PAGE_NO.pack(page_no))
+        parts.append(bytes(data))
+    return b"".join(parts)
+
+
+def _apply_frame(
+    image: bytearray, plain: bytes, fingerprint: bytes, expected_seq: int
+) -> int:
+    """Wendet ein entschlüsseltes Frame auf ``image`` an; liefert die Seitengrösse."""
+    if len(plain) < _FRAME_HEADER.size:
+        raise JournalError("Journal-Frame zu kurz")
+    frame_fp, seq, page_size, page_count = _FRAME_HEADER.unpack_from(plain, 0)
+    if frame_fp != fingerprint:
+        raise JournalError("Journal-Frame gehört zu einer anderen Basis")
+    if seq != expected_seq:
+        raise JournalError(f"Journal-Frame {seq} statt {expected_seq}")
+    if page_size <= 0:
+        raise JournalError("Journal-Frame ohne Seitengrösse")
+    record = _PAGE_NO.size + page_size
+    body = len(plain) - _FRAME_HEADER.size
+    if body % record:
+        raise JournalError("Journal-Frame mit angeschnittener Seite")
+    new_len = page_count * page_size
+    if new_len < len(image):
+        del image[new_len:]
+    elif new_len > len(image):
+        image.extend(bytes(new_len - len(image)))
+    offset = _FRAME_HEADER.size
+    view = memoryview(plain)
+    while offset < len(plain):
+        (page_no,) = _PAGE_NO.unpack_from(plain, offset)
+        offset += _PAGE_NO.size
+        if page_no >= page_count:
+            raise JournalError("Journal-Frame schreibt hinter das DB-Ende")
+        start = page_no * page_size
+        image[start : start + page_size] = view[offset : offset + page_size]
+        offset += page_size
+    return int(page_size)
+
+
+def replay_journal(
+    image: bytes | bytearray,
+    enc_path: str | Path,
+    db_key: bytes,
+    fingerprint: bytes,
+    *,
+    with_hashes: bool = False,
+) -> tuple[bytes | bytearray, JournalState | None]:
+    """Spielt das Journal zu ``enc_path`` auf das Basisabbild ``image`` ein.
+
+    Fehlt das Journal oder gehört es zu einer anderen Basis, kommt die Basis
+    unverändert und ohne Stand zurück. Ein beschädigtes Frame beendet das
+    Einspielen; alle Frames davor bleiben gültig. ``with_hashes`` füllt die
+    Seitenprüfsummen, die eine Session zum Weiterschreiben braucht; reine
+    Leser sparen sie sich.
+    """
+    from cryptography.fernet import InvalidToken
+
+    from model.crypto import decrypt_bytes
+
+    path = journal_path_for(enc_path)
+    try:
+        raw = path.read_bytes()
+    except FileNotFoundError:
+        return image, None
+
+    header = JOURNAL_MAGIC + fingerprint
+    if not raw.startswith(header):
+        logger.info("Journal %s gehört nicht zur Basis und wird ignoriert", path.name)
+        return image, None
+
+    state = JournalState(
+        fingerprint=fingerprint,
+        base_bytes=len(image),
+        page_size=image_page_size(image),
+    )
+    # Ein frisch geladenes Abbild ist schon ein Puffer und wird direkt
+    # fortgeschrieben - keine zweite Kopie in DB-Grösse.
+    work = image if isinstance(image, bytearray) else bytearray(image)
+    offset = len(header)
+    while offset + _LENGTH.size <= len(raw):
+        (length,) = _LENGTH.unpack_from(raw, offset)
+        end = offset + _LENGTH.size + length
+        if end > len(raw):
+            logger.warning("Journal %s endet mit halbem Frame", path.name)
+            break
+        token = raw[offset + _LENGTH.size : end]
+        try:
+            plain = decrypt_bytes(token, db_key)
+            state.page_size = _apply_frame(work, plain, fingerprint, state.next_seq)
+        except JournalError as fehler:
+            logger.warning("Journal %s: %s", path.name, fehler)
+            break
+        except InvalidToken:
+            logger.warning("Journal %s: Frame %d unlesbar", path.name, state.next_seq)
+            break
+        state.next_seq += 1
+        offset = end
+
+    # Alles hinter dem letzten gültigen Frame wird beim nächsten Anhängen
+    # abgeschnitten; sonst stünden neue Frames hinter dem Bruch und würden
+    # beim Laden nie erreicht.
+    state.journal_bytes = offset
+    result = work if state.next_seq else image
+    if with_hashes and state.page_size:
+        state.hashes = page_hashes(result, state.page_size)
+    return result, state
+
+
+class EncryptedJournal:
+    """Schreibt Snapshots und Änderungsframes einer In-Memory-DB.
+
+    Hält nur die Seitenprüfsummen des letzten geschriebenen Stands, keine
+    zweite Kopie der DB.
+    """
+
+    def __init__(
+        self,
+        enc_path: str | Path,
+        db_key: bytes,
+        salt: bytes,
+        state: JournalState | None = None,
+    ):
+        self._enc_path = Path(enc_path)
+        self._journal_path = journal_path_for(enc_path)
+        self._db_key = db_key
+        self._salt = salt
+        self._state = state
+
+    @property
+    def state(self) -> JournalState | None:
+        return self._state
+
+    @property
+    def journal_path(self) -> Path:
+        return self._journal_path
+
+    def invalidate(self) -> None:
+        """Vergisst den Stand; das nächste Speichern schreibt einen Snapshot."""
+        self._state = None
+
+    def needs_compaction(self) -> bool:
+        state = self._state
+        if state is None:
+            return True
+        if state.next_seq >= COMPACT_MAX_FRAMES:
+            return True
+        if state.journal_bytes < COMPACT_MIN_BYTES:
+            return False
+        return state.journal_bytes > state.base_bytes * COMPACT_RATIO
+
+    def compact(self, image: bytes) -> None:
+        """Schreibt ``image`` als neue Basis und beginnt ein leeres Journal.
+
+        Reihenfolge ist wichtig: erst die Basis atomar ersetzen, dann das
+        Journal. Stirbt der Prozess dazwischen, passt das alte Journal nicht
+        mehr zum neuen Fingerabdruck und wird ignoriert - die Basis enthält
+        ohnehin schon alles.
+        """
+        from model.crypto import encrypt_image_to_file
+
+        fingerprint = encrypt_image_to_file(
+            image, self._enc_path, self._db_key, self._salt
+        )
+        self._write_journal_header(fingerprint)
+        page_size = image_page_size(image)
+        self._state = JournalState(
+            fingerprint=fingerprint,
+            base_bytes=len(image),
+            page_size=page_size,
+            hashes=page_hashes(image, page_size) if page_size else [],
+            journal_bytes=len(JOURNAL_MAGIC) + len(fingerprint),
+        )
+
+    def append(self, image: bytes) -> int:
+        """Hängt die seit dem letzten Stand geänderten Seiten an.
+
+        Returns: Anzahl geschriebener Seiten; ``0`` wenn nichts geändert war.
+        Ohne gültigen Stand (erste Speicherung, geänderte Seitengrösse) wird
+        stattdessen verdichtet.
+        """
+        state = self._state
+        page_size = image_page_size(image)
+        if (
+            state is None
+            or not page_size
+            or page_size != state.page_size
+            or not self._journal_path.exists()
+        ):
+            self.compact(image)
+            return len(image) // page_size if page_size else 0
+
+        view = memoryview(image)
+        new_hashes = page_hashes(image, page_size)
+        if self._journal_path.stat().st_size != state.journal_bytes:
+            os.truncate(self._journal_path, state.journal_bytes)
+        old_hashes = state.hashes
+        changed: list[tuple[int, memoryview]] = []
+        for page_no, digest in enumerate(new_hashes):
+            if page_no >= len(old_hashes) or old_hashes[page_no] != digest:
+                offset = page_no * page_size
+                changed.append((page_no, view[offset : offset + page_size]))
+        if not changed and len(new_hashes) == len(old_hashes):
+            return 0
+
+        plain = _encode_frame(
+            state.fingerprint, state.next_seq, page_size, len(new_hashes), changed
+        )
+        from model.crypto import encrypt_bytes
+
+        token = encrypt_bytes(plain, self._db_key)
+        with open(self._journal_path, "ab") as f:
+            f.write(_LENGTH.pack(len(token)))
+            f.write(token)
+            f.flush()
+            os.fsync(f.fileno())
+        state.hashes = new_hashes
+        state.next_seq += 1
+        state.journal_bytes += _LENGTH.size + len(token)
+        return len(changed)
+
+    def _write_journal_header(self, fingerprint: bytes) -> None:
+        from model.crypto import _secure_file
+
+        tmp_path = self._journal_path.with_name(self._journal_path.name + ".tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(JOURNAL_MAGIC)
+                f.write(fingerprint)
+                f.flush()
+                os.fsync(f.fileno())
+            _secure_file(tmp_path)
+            os.replace(str(tmp_path), str(self._journal_path))
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+            raise
@@ -0,0 +1,260 @@
+"""Hintergrund-Schreiber für die verschlüsselte Session.
+
+Auch mit Änderungsjournal lief das Speichern nach jedem Commit auf dem
+GUI-Thread: Seiten prüfen, verschlüsseln, ``fsync``. Bei schnellem Tippen im
+Budgetraster stockte die Oberfläche bei jeder Zelle.
+
+Jetzt nimmt der GUI-Thread nach dem Commit nur noch einen Snapshot - eine
+Bytekopie des Seitenabbilds, konsistent, weil direkt nach dem Commit keine
+Transaktion offen ist - und reicht ihn an diesen Thread weiter. Der wartet
+ein kurzes Zeitfenster ab und schreibt dann nur den jüngsten Snapshot; eine
+Serie von Commits wird so zu einem Schreibvorgang. ``flush()`` wartet, bis
+alles auf der Platte ist, und läuft beim Schliessen und bei ``atexit``.
+
+Der Thread kennt nur das :class:`~model.encrypted_journal.EncryptedJournal`;
+alle Zugriffe darauf laufen unter einer Sperre. Jeder Snapshot trägt eine
+laufende Generation; was älter ist als das zuletzt Geschriebene, wird
+verworfen. Sonst könnte ein vollständiger Snapshot vom GUI-Thread (Backup,
+Schliessen) von einem älteren Frame aus dem Thread überholt werden.
+
+Ein Schreibfehler beendet den Thread nicht; er landet im Log und im Status
+``error``. Stirbt der Thread trotzdem, schreibt :meth:`EncryptedWriter.submit`
+synchron im aufrufenden Thread weiter, und :meth:`EncryptedWriter.flush`
+meldet ``False``.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from model.encrypted_journal import EncryptedJournal
+from model.profiling import profiled
+
+logger = logging.getLogger(__name__)
+
+STATUS_IDLE = "idle"
+STATUS_PENDING = "pending"
+STATUS_SAVING = "saving"
+STATUS_SAVED = "saved"
+STATUS_ERROR = "error"
+
+DEFAULT_LATENCY_MS = 500
+
+
+class EncryptedWriter:
+    """Schreibt Snapshots einer Session gebündelt in einem eigenen Thread."""
+
+    def __init__(
+        self, journal: EncryptedJournal, *, latency_ms: int = DEFAULT_LATENCY_MS
+    ):
+        self._journal = journal
+        self._latency = max(0, int(latency_ms)) / 1000.0
+        self._io_lock = threading.RLock()
+        self._cond = threading.Condition()
+        self._generation = 0
+        self._written_generation = 0
+        self._pending_generation = 0
+        self._pending: bytes | None = None
+        self._pending_compact = False
+        self._pending_since = 0.0
+        self._busy = False
+        self._flush_requested = False
+        self._stopping = False
+        self._lost = False
+        self._status = STATUS_IDLE
+        self._listeners: list[Callable[[str], None]] = []
+        self._thread = threading.Thread(
+            target=self._run, name="EncryptedWriter", daemon=True
+        )
+        self._thread.start()
+
+    # ── Status ──────────────────────────────────────────────────
+
+    @property
+    def status(self) -> str:
+        return self._status
+
+    @property
+    def alive(self) -> bool:
+        return self._thread.is_alive()
+
+    def _thread_lost(self) -> bool:
+        """``True``, wenn der Thread unerwartet beendet ist (nicht über stop())."""
+        if self._stopping or self._thread.is_alive():
+            return False
+        if not self._lost:
+            self._lost = True
+            logger.error(
+                "Schreib-Thread der verschlüsselten DB ausgefallen - "
+                "es wird synchron gespeichert."
+            )
+            self._set_status(STATUS_ERROR)
+        return True
+
+    def add_status_listener(self, callback: Callable[[str], None]) -> None:
+        """Meldet Statuswechsel. Aufruf aus dem Schreib-Thread - Qt-Code muss
+        über ein Signal in den GUI-Thread wechseln."""
+        self._listeners.append(callback)
+
+    def _set_status(self, status: str) -> None:
+        if status == self._status:
+            return
+        self._status = status
+        for callback in list(self._listeners):
+            try:
+                callback(status)
+            except (RuntimeError, TypeError) as fehler:
+                # Ein zerstörtes Qt-Objekt meldet RuntimeError; der Schreiber
+                # muss trotzdem weiterlaufen.
+                logger.debug("Speicherstatus-Empfänger ausgefallen: %s", fehler)
+
+    # ── Aufträge ────────────────────────────────────────────────
+
+    def submit(self, image: bytes, *, compact: bool = False) -> None:
+        """Übergibt einen Snapshot; ein noch wartender wird ersetzt.
+
+        Ist der Thread ausgefallen, wird sofort im aufrufenden Thread
+        geschrieben - sonst nähme die Session Commits an, die erst beim
+        Schliessen (oder nie) auf die Platte kämen.
+        """
+        if self._thread_lost():
+            with self._cond:
+                self._generation += 1
+                generation = self._generation
+                compact = compact or self._pending_compact
+                self._pending = None
+                self._pending_compact = False
+            self._write(image, compact, generation)
+            return
+        with self._cond:
+            if self._stopping:
+                return
+            if self._pending is None:
+                self._pending_since = time.monotonic()
+            self._generation += 1
+            self._pending_generation = self._generation
+            self._pending = image
+            self._pending_compact = self._pending_compact or compact
+            self._cond.notify_all()
+        self._set_status(STATUS_PENDING)
+
+    def discard_pending(self) -> None:
+        """Verwirft einen noch nicht geschriebenen Snapshot."""
+        with self._cond:
+            self._pending = None
+            self._pending_compact = False
+            self._cond.notify_all()
+
+    @contextmanager
+    def exclusive(self) -> Iterator[None]:
+        """Sperrt den Thread, während der Aufrufer selbst schreibt.
+
+        Was bis dahin eingereicht war, ist danach überholt und wird nicht
+        mehr geschrieben.
+        """
+        with self._io_lock:
+            with self._cond:
+                self._generation += 1
+                generation = self._generation
+                self._pending = None
+                self._pending_compact = False
+                self._cond.notify_all()
+            yield
+            self._written_generation = max(self._written_generation, generation)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Schreibt wartende Snapshots sofort und wartet darauf.
+
+        Returns: ``False``, wenn ``timeout`` abgelaufen ist, der letzte
+        Schreibvorgang fehlgeschlagen oder der Thread ausgefallen ist.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._flush_requested = True
+            self._cond.notify_all()
+            while (self._pending is not None or self._busy) and self.alive:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            self._flush_requested = False
+            leftover = None
+            if self._pending is not None and not self.alive:
+                leftover = (self._pending, self._pending_compact, self._generation)
+                self._pending = None
+                self._pending_compact = False
+        if self._thread_lost():
+            if leftover is not None:
+                self._write(*leftover)
+            return False
+        return self._status != STATUS_ERROR
+
+    def stop(self, timeout: float | None = None) -> bool:
+        """Schreibt Wartendes und beendet den Thread."""
+        done = self.flush(timeout)
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        return done
+
+    # ── Thread ──────────────────────────────────────────────────
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._pending is None and not self._stopping:
+                    self._cond.wait()
+                if self._pending is None:
+                    return
+                # Zeitfenster abwarten: weitere Commits ersetzen den Snapshot.
+                while not self._flush_requested and not self._stopping:
+                    remaining = self._pending_since + self._latency - time.monotonic()
+                    if remaining <= 0 or self._pending is None:
+                        break
+                    self._cond.wait(remaining)
+                image, compact = self._pending, self._pending_compact
+                generation = self._pending_generation
+                self._pending = None
+                self._pending_compact = False
+                if image is None:
+                    self._cond.notify_all()
+                    continue
+                self._busy = True
+            try:
+                self._write(image, compact, generation)
+            finally:
+                # Auch wenn der Thread an einem unerwarteten Fehler stirbt,
+                # darf flush() nicht ewig auf ihn warten.
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    @profiled("encrypted_writer.write")
+    def _write(self, image: bytes, compact: bool, generation: int) -> None:
+        try:
+            self._set_status(STATUS_SAVING)
+            with self._io_lock:
+                if generation > self._written_generation:
+                    if compact or self._journal.needs_compaction():
+                        self._journal.compact(image)
+                    else:
+                        self._journal.append(image)
+                    self._written_generation = generation
+        except Exception as fehler:
+            # Breit gefangen: Der Thread soll an keinem Fehler sterben, der
+            # nächste Commit versucht es wieder.
+            logger.error(
+                "Verschlüsselte DB im Hintergrund nicht gespeichert: %s",
+                fehler,
+                exc_info=not isinstance(fehler, (OSError, ValueError)),
+            )
+            self._set_status(STATUS_ERROR)
+            return
+        with self._cond:
+            waiting = self._pending is not None
+        self._set_status(STATUS_PENDING if waiting else STATUS_SAVED)
@@ -14,15 +14,17 @@ import math
 import os
 import re
 import sqlite3
+import threading
 from dataclasses import dataclass, replace
-from utils.atomic_write import atomar_offen
 from datetime import date, datetime, timezone
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Any, BinaryIO, Iterable
 
+from model.bridge_outbox import write_outbox
 from model.category_model import CategoryModel
 from model.database import db_transaction
-from model.tracking_model import TrackingModel
+from model.query_cache import cached_query
+from model.tracking_model import NewTrackingEntry, TrackingModel
 from model.typ_constants import TYP_EXPENSES
 from utils.money import get_currency
 
@@ -82,6 +84,9 @@ class ApplyResult:
 class BridgeExportResult:
     path: Path
     count: int
+    #: ``"unchanged"``, wenn die Datei schon aktuell war und nicht
+    #: geschrieben wurde; sonst ``"rewritten"``.
+    mode: str = "rewritten"
 
 
 def default_bridge_dir() -> Path:
@@ -221,6 +226,84 @@ def _state_rows(conn: sqlite3.Connection) -> dict[str, sqlite3.Row]:
     return {str(row["external_id"]): row for row in rows}
 
 
+@dataclass
+class _InboxFile:
+    """Was von einer Brückendatei schon gelesen ist.
+
+    ``offset`` steht hinter der letzten vollständigen Zeile;
+    ``prefix_digest`` ist die Prüfsumme aller Bytes davor. Ist die Datei
+    gewachsen und sind Identität und diese Bytes noch dieselben, hat die
+    andere Seite nur angehängt. Ein Vergleich nur der letzten Bytes übersah
+    Änderungen weiter vorn in gleicher Länge (``12.5`` → ``13.5``).
+    """
+
+    identity: tuple[int, int]
+    offset: int
+    mtime_ns: int
+    prefix_digest: str
+    line_no: int
+    records: dict[str, ImportRecord]
+    # Geparste Datensätze je Zeilentext: Schreibt FPM seine Datei atomar neu,
+    # sind die meisten Zeilen dieselben wie vorher.
+    by_line: dict[str, ImportRecord | None]
+
+
+_inbox_index: dict[str, _InboxFile] = {}
+_inbox_lock = threading.Lock()
+_UNPARSED = object()
+
+
+def _prefix_hash(handle: BinaryIO, end: int) -> Any:
+    """SHA-256 der ersten ``end`` Bytes; das Objekt lässt sich fortschreiben."""
+    digest = hashlib.sha256()
+    handle.seek(0)
+    remaining = end
+    while remaining > 0:
+        block = handle.read(min(remaining, 1 << 20))
+        if not block:
+            break
+        digest.update(block)
+        remaining -= len(block)
+    return digest
+
+
+def _parse_lines(
+    chunk: bytes,
+    line_no: int,
+    known: dict[str, ImportRecord | None],
+    seen: dict[str, ImportRecord | None],
+    into: dict[str, ImportRecord],
+) -> int:
+    """Parst die Zeilen in ``chunk`` nach ``into``; liefert die letzte Zeilennummer.
+
+    Bekannte Zeilen kommen aus ``known``; jede gelesene landet in ``seen``.
+    """
+    for raw_line in chunk.splitlines():
+        line_no += 1
+        if len(raw_line) > MAX_LINE_BYTES:
+            raise LifePlannerImportError(f"Zeile {line_no} ist zu groß.")
+        line = raw_line.decode("utf-8").strip()
+        if not line:
+            continue
+        record = known.get(line, _UNPARSED)
+        if record is _UNPARSED:
+            try:
+                raw = json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise LifePlannerImportError(
+                    f"Ungültige JSONL-Zeile {line_no}: {exc.msg}."
+                ) from exc
+            record = _parse_record(raw, line_no) if isinstance(raw, dict) else None
+        seen[line] = record if isinstance(record, ImportRecord) else None
+        if isinstance(record, ImportRecord):
+            into[record.external_id] = record
+            if len(into) > MAX_RECORDS:
+                raise LifePlannerImportError(
+                    "Die Bridge-Datei enthält zu viele Einträge."
+                )
+    return line_no
+
+
 def _einlesen(src: Path, parsed: dict[str, ImportRecord]) -> None:
     """Liest eine Brückendatei in ``parsed`` ein - nach Kennung, nicht als Liste.
 
@@ -230,53 +313,116 @@ def _einlesen(src: Path, parsed: dict[str, ImportRecord]) -> None:
     Eine fehlende Datei ist kein Fehler: Die andere Seite hat dann noch nichts
     geschrieben. Alles andere schon - eine Brücke, die auf ein Verzeichnis
     oder auf 20 MB zeigt, soll auffallen und nicht stumm nichts liefern.
+
+    Gelesen wird über einen Index je Datei: Unveränderte Dateien werden gar
+    nicht, angehängte nur ab der letzten gelesenen Zeile geparst. Der Badge
+    im Hauptfenster fragt nach jeder Änderung nach - bei 50 000 Einträgen
+    war das jedes Mal ein vollständiger Durchlauf.
     """
     if not src.exists():
+        with _inbox_lock:
+            _inbox_index.pop(str(src), None)
         return
     if not src.is_file():
         raise LifePlannerImportError("Der Bridge-Pfad ist keine Datei.")
-    if src.stat().st_size > MAX_FILE_BYTES:
-        raise LifePlannerImportError("Die Bridge-Datei ist größer als 20 MB.")
-
-    with src.open("r", encoding="utf-8") as handle:
-        for line_no, raw_line in enumerate(handle, start=1):
-            if len(raw_line.encode("utf-8")) > MAX_LINE_BYTES:
-                raise LifePlannerImportError(f"Zeile {line_no} ist zu groß.")
-            line = raw_line.strip()
-            if not line:
-                continue
-            try:
-                raw = json.loads(line)
-            except json.JSONDecodeError as exc:
-                raise LifePlannerImportError(
-                    f"Ungültige JSONL-Zeile {line_no}: {exc.msg}."
-                ) from exc
-            if not isinstance(raw, dict):
-                continue
-            record = _parse_record(raw, line_no)
-            if record is not None:
-                parsed[record.external_id] = record
-            if len(parsed) > MAX_RECORDS:
-                raise LifePlannerImportError(
-                    "Die Bridge-Datei enthält zu viele Einträge."
-                )
+
+    with src.open("rb") as handle:
+        st = os.fstat(handle.fileno())
+        if st.st_size > MAX_FILE_BYTES:
+            raise LifePlannerImportError("Die Bridge-Datei ist größer als 20 MB.")
+        identity = (st.st_dev, st.st_ino)
+        with _inbox_lock:
+            entry = _inbox_index.get(str(src))
+        if (
+            entry is not None
+            and entry.identity == identity
+            and entry.offset == st.st_size
+            and entry.mtime_ns == st.st_mtime_ns
+        ):
+            parsed.update(entry.records)
+            return
+
+        # Angehängt nur, wenn die Datei gewachsen ist und alles bisher
+        # Gelesene unverändert dasteht. Hashen ist billig gegen Parsen.
+        prefix = (
+            _prefix_hash(handle, entry.offset)
+            if entry is not None
+            and entry.identity == identity
+            and 0 < entry.offset < st.st_size
+            else None
+        )
+        known: dict[str, ImportRecord | None] = (
+            entry.by_line if entry is not None else {}
+        )
+        if (
+            entry is not None
+            and prefix is not None
+            and prefix.hexdigest() == entry.prefix_digest
+        ):
+            start, line_no = entry.offset, entry.line_no
+            records = dict(entry.records)
+            seen = dict(known)
+        else:
+            # Neu geschrieben: alles lesen, aber nur behalten, was noch dasteht.
+            prefix = hashlib.sha256()
+            start, line_no, records, seen = 0, 0, {}, {}
+        handle.seek(start)
+        data = handle.read(st.st_size - start)
+        # Eine Zeile ohne Zeilenende kann noch im Schreiben sein: Sie zählt
+        # mit, der Index rückt aber nur bis zur letzten vollständigen vor.
+        cut = data.rfind(b"\n") + 1
+        line_no = _parse_lines(data[:cut], line_no, known, seen, records)
+        offset = start + cut
+        prefix.update(data[:cut])
+        tail: dict[str, ImportRecord] = {}
+        _parse_lines(data[cut:], line_no, known, {}, tail)
+        fresh = _InboxFile(
+            identity=identity,
+            offset=offset,
+            mtime_ns=st.st_mtime_ns,
+            prefix_digest=prefix.hexdigest(),
+            line_no=line_no,
+            records=records,
+            by_line=seen,
+        )
+    with _inbox_lock:
+        _inbox_index[str(src)] = fresh
+    parsed.update(records)
+    parsed.update(tail)
+    if len(parsed) > MAX_RECORDS:
+        raise LifePlannerImportError("Die Bridge-Datei enthält zu viele Einträge.")
+
+
+def _bridge_sources(path: str | Path | None) -> list[Path]:
+    if path is not None:
+        return [Path(path)]
+    # Aus jeder bekannten Brücke, die aktive zuletzt: Wer den BudgetManager
+    # mal eigenständig und mal im LifePlanner startet, sieht sonst je nach
+    # Startart nur die Hälfte der offenen Buchungen.
+    return [o / BRIDGE_FILE for o in alle_bridge_dirs()]
 
 
 def load_import_records(
     conn: sqlite3.Connection, path: str | Path | None = None
 ) -> list[ImportRecord]:
-    if path is not None:
-        quellen = [Path(path)]
-    else:
-        # Aus jeder bekannten Brücke, die aktive zuletzt: Wer den
-        # BudgetManager mal eigenständig und mal im LifePlanner startet, sieht
-        # sonst je nach Startart nur die Hälfte der offenen Buchungen.
-        quellen = [o / BRIDGE_FILE for o in alle_bridge_dirs()]
     parsed: dict[str, ImportRecord] = {}
-    for src in quellen:
+    for src in _bridge_sources(path):
         _einlesen(src, parsed)
 
     states = _state_rows(conn)
+    # Welche importierten Buchungen es noch gibt, in einer Abfrage statt
+    # einer je Datensatz.
+    existing_tracking = (
+        {
+            int(row[0])
+            for row in conn.execute(
+                "SELECT t.id FROM tracking t "
+                "JOIN lifeplanner_import_state s ON s.tracking_id = t.id"
+            )
+        }
+        if states
+        else set()
+    )
     result: list[ImportRecord] = []
     for record in parsed.values():
         state = states.get(record.external_id)
@@ -289,12 +435,7 @@ def load_import_records(
             tracking_id = (
                 int(state["tracking_id"]) if state["tracking_id"] is not None else None
             )
-            tracking_exists = bool(
-                tracking_id
-                and conn.execute(
-                    "SELECT 1 FROM tracking WHERE id=?", (tracking_id,)
-                ).fetchone()
-            )
+            tracking_exists = bool(tracking_id and tracking_id in existing_tracking)
             if previous == "imported" and same and tracking_exists:
                 status = "imported"
             elif previous == "rejected" and same:
@@ -307,10 +448,29 @@ def load_import_records(
     return sorted(result, key=lambda r: (r.booking_date, r.external_id), reverse=True)
 
 
+def _file_signature(path: Path) -> tuple[str, int, int, int, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (str(path), st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+
+
 def pending_count(conn: sqlite3.Connection, path: str | Path | None = None) -> int:
-    return sum(
-        r.status in {"pending", "changed", "orphaned"}
-        for r in load_import_records(conn, path)
+    """Offene Einträge für den Badge.
+
+    Gemerkt, bis sich eine der Brückendateien oder die Datenbank ändert -
+    der Badge fragt nach jedem Refresh.
+    """
+    sources = _bridge_sources(path)
+    return cached_query(
+        conn,
+        "lifeplanner_pending_count",
+        tuple(_file_signature(src) for src in sources),
+        lambda: sum(
+            r.status in {"pending", "changed", "orphaned"}
+            for r in load_import_records(conn, path)
+        ),
     )
 
 
@@ -438,15 +598,43 @@ def _validate_draft(conn: sqlite3.Connection, draft: ImportDraft) -> ImportDraft
     return replace(draft, category=category, details=draft.details.strip()[:2000])
 
 
-def apply_import(
+_STATE_UPSERT_SQL = """
+    INSERT INTO lifeplanner_import_state
+        (external_id, source, payload_hash, status, tracking_id,
+         processed_at, source_payload, imported_payload)
+    VALUES(?,?,?,?,?,?,?,?)
+    ON CONFLICT(external_id) DO UPDATE SET
+        source=excluded.source,
+        payload_hash=excluded.payload_hash,
+        status='imported',
+        tracking_id=excluded.tracking_id,
+        processed_at=excluded.processed_at,
+        source_payload=excluded.source_payload,
+        imported_payload=excluded.imported_payload
+"""
+
+
+@dataclass(frozen=True)
+class _PreparedImport:
+    record: ImportRecord
+    draft: ImportDraft
+    #: Tracking-ID of an earlier import that still exists; ``None`` books anew.
+    update_id: int | None
+    imported_payload: str
+
+    @property
+    def updated(self) -> bool:
+        return self.update_id is not None
+
+
+def _prepare_import(
     conn: sqlite3.Connection, record: ImportRecord, draft: ImportDraft
-) -> ApplyResult:
+) -> _PreparedImport:
     if record.external_id != draft.external_id:
         raise LifePlannerImportError(
             "Import-ID und Bearbeitungsentwurf passen nicht zusammen."
         )
     draft = _validate_draft(conn, draft)
-    ensure_state_table(conn)
     state = conn.execute(
         "SELECT tracking_id, status FROM lifeplanner_import_state WHERE external_id=?",
         (record.external_id,),
@@ -456,13 +644,13 @@ def apply_import(
         if state and state["tracking_id"] is not None
         else None
     )
-    updated = bool(
-        previous_tracking_id
-        and conn.execute(
+    if (
+        previous_tracking_id is not None
+        and not conn.execute(
             "SELECT 1 FROM tracking WHERE id=?", (previous_tracking_id,)
         ).fetchone()
-    )
-    tracking = TrackingModel(conn)
+    ):
+        previous_tracking_id = None
     imported_payload = json.dumps(
         {
             "date": draft.booking_date.isoformat(),
@@ -476,54 +664,116 @@ def apply_import(
         ensure_ascii=False,
         sort_keys=True,
     )
+    return _PreparedImport(
+        record, draft, previous_tracking_id or None, imported_payload
+    )
+
+
+def _update_tracking(
+    tracking: TrackingModel, item: _PreparedImport, row_id: int
+) -> int:
+    tracking.update(
+        row_id,
+        item.draft.booking_date,
+        item.draft.typ,
+        item.draft.category,
+        float(item.draft.amount),
+        item.draft.details,
+    )
+    return row_id
+
+
+def _new_entry(item: _PreparedImport) -> NewTrackingEntry:
+    return NewTrackingEntry(
+        item.draft.booking_date,
+        item.draft.typ,
+        item.draft.category,
+        float(item.draft.amount),
+        item.draft.details,
+        source=f"lifeplanner:{item.record.source.lower()}",
+    )
+
+
+def _state_params(item: _PreparedImport, tracking_id: int, now: str) -> tuple:
+    return (
+        item.record.external_id,
+        item.record.source,
+        item.record.payload_hash,
+        "imported",
+        int(tracking_id),
+        now,
+        json.dumps(item.record.raw, ensure_ascii=False, sort_keys=True),
+        item.imported_payload,
+    )
+
+
+def apply_import(
+    conn: sqlite3.Connection, record: ImportRecord, draft: ImportDraft
+) -> ApplyResult:
+    ensure_state_table(conn)
+    item = _prepare_import(conn, record, draft)
+    tracking = TrackingModel(conn)
     now = datetime.now(timezone.utc).isoformat()
     with db_transaction(conn):
-        if updated:
-            tracking.update(
-                previous_tracking_id,
-                draft.booking_date,
-                draft.typ,
-                draft.category,
-                float(draft.amount),
-                draft.details,
-            )
-            tracking_id = previous_tracking_id
+        if item.update_id is not None:
+            tracking_id = _update_tracking(tracking, item, item.update_id)
         else:
             tracking_id = tracking.add(
-                draft.booking_date,
-                draft.typ,
-                draft.category,
-                float(draft.amount),
-                draft.details,
+                item.draft.booking_date,
+                item.draft.typ,
+                item.draft.category,
+                float(item.draft.amount),
+                item.draft.details,
                 source=f"lifeplanner:{record.source.lower()}",
             )
-        conn.execute(
-            """
-            INSERT INTO lifeplanner_import_state
-                (external_id, source, payload_hash, status, tracking_id,
-                 processed_at, source_payload, imported_payload)
-            VALUES(?,?,?,?,?,?,?,?)
-            ON CONFLICT(external_id) DO UPDATE SET
-                source=excluded.source,
-                payload_hash=excluded.payload_hash,
-                status='imported',
-                tracking_id=excluded.tracking_id,
-                processed_at=excluded.processed_at,
-                source_payload=excluded.source_payload,
-                imported_payload=excluded.imported_payload
-            """,
-            (
-                record.external_id,
-                record.source,
-                record.payload_hash,
-                "imported",
-                int(tracking_id),
-                now,
-                json.dumps(record.raw, ensure_ascii=False, sort_keys=True),
-                imported_payload,
-            ),
+        conn.execute(_STATE_UPSERT_SQL, _state_params(item, tracking_id, now))
+    return ApplyResult(record.external_id, int(tracking_id), item.updated)
+
+
+def apply_imports(
+    conn: sqlite3.Connection,
+    items: Iterable[tuple[ImportRecord, ImportDraft]],
+) -> list[ApplyResult]:
+    """Accept several records at once: all or nothing, in one transaction.
+
+    New bookings go through ``TrackingModel.add_many`` (one insert batch, one
+    undo group) and the audit rows through one ``executemany``; records that
+    update an earlier import are rewritten one by one. Any validation error
+    aborts before the first write - callers wanting per-record error messages
+    fall back to :func:`apply_import`.
+    """
+    ensure_state_table(conn)
+    prepared = [_prepare_import(conn, record, draft) for record, draft in items]
+    if not prepared:
+        return []
+    tracking = TrackingModel(conn)
+    now = datetime.now(timezone.utc).isoformat()
+    fresh = [item for item in prepared if not item.updated]
+    tracking_ids: dict[str, int] = {}
+    with db_transaction(conn):
+        for item in prepared:
+            if item.update_id is not None:
+                tracking_ids[item.record.external_id] = _update_tracking(
+                    tracking, item, item.update_id
+                )
+        new_ids = tracking.add_many(_new_entry(item) for item in fresh)
+        for item, tracking_id in zip(fresh, new_ids):
+            tracking_ids[item.record.external_id] = tracking_id
+        conn.executemany(
+            _STATE_UPSERT_SQL,
+            [
+                _state_params(item, tracking_ids[item.record.external_id], now)
+                for item in prepared
+            ],
         )
-    return ApplyResult(record.external_id, int(tracking_id), updated)
+    return [
+        ApplyResult(
+            item.record.external_id,
+            tracking_ids[item.record.external_id],
+            item.updated,
+        )
+        for item in prepared
+    ]
 
 
 def reject_import(conn: sqlite3.Connection, record: ImportRecord) -> None:
@@ -565,138 +815,136 @@ def records_by_id(records: Iterable[ImportRecord]) -> dict[str, ImportRecord]:
 
 
 # --- Bidirektionale Bridge-Exporte aus der verbindlichen v2.2.56-Basis ---
+#: Stichworte, an denen eine Ausgabe als FPM-Vorschlag erkannt wird.
+FPM_EXPENSE_KEYWORDS = (
+    "füller",
+    "fueller",
+    "fountain",
+    "tinte",
+    "ink",
+    "feder",
+    "nib",
+    "papier",
+    "paper",
+)
+# SQLites LIKE ignoriert Gross-/Kleinschreibung nur bei ASCII - "FÜLLER"
+# braucht ein eigenes Muster. Die Vorauswahl in SQL ist damit eine Obermenge;
+# entschieden wird wie bisher in Python, aber nur noch über diese Zeilen.
+_FPM_EXPENSE_LIKE = tuple(f"%{token}%" for token in FPM_EXPENSE_KEYWORDS) + (
+    "%fÜller%",
+)
+
+
+def _expense_proposal_records(conn) -> Iterable[dict[str, Any]]:
+    match = " OR ".join(["haystack LIKE ?"] * len(_FPM_EXPENSE_LIKE))
+    rows = conn.execute(
+        "SELECT id, date, category, amount, details FROM ("
+        "SELECT id, date, category, amount, details, "
+        "COALESCE(category, '') || ' ' || COALESCE(details, '') AS haystack "
+        f"FROM tracking WHERE typ=?) WHERE {match} ORDER BY date, id",
+        (TYP_EXPENSES, *_FPM_EXPENSE_LIKE),
+    )
+    for row in rows:
+        category = str(row[2] or "")
+        details = str(row[4] or "")
+        haystack = f"{category} {details}".lower()
+        if not any(token in haystack for token in FPM_EXPENSE_KEYWORDS):
+            continue
+        amount = round(abs(float(row[3] or 0.0)), 2)
+        if amount <= 0:
+            continue
+        yield {
+            "schema": "fpm.import.v1",
+            "operation": "upsert",
+            "external_id": f"budgetmanager:tracking:{int(row[0])}",
+            "source": "BudgetManager",
+            "date": str(row[1]),
+            "amount": amount,
+            "currency": "CHF",
+            "category_path": category,
+            "description": details.splitlines()[0] if details else category,
+            "notes": details,
+        }
+
+
 def export_fpm_expense_proposals(
     conn, path: str | Path | None = None
 ) -> BridgeExportResult:
+    """Ausgabenvorschläge für FPM; schreibt nur, wenn sich etwas geändert hat."""
     out = Path(path) if path is not None else default_fpm_outbox_path()
     out.parent.mkdir(parents=True, exist_ok=True)
+    written = write_outbox(
+        conn,
+        out,
+        tables=("tracking",),
+        manifest=lambda: {
+            "schema": "fpm.import.manifest.v1",
+            "source": "BudgetManager",
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "mode": "reviewable_bridge_import",
+        },
+        records=lambda: _expense_proposal_records(conn),
+    )
+    return BridgeExportResult(out, written.count, written.mode)
+
+
+def _savings_goal_records(conn) -> Iterable[dict[str, Any]]:
+    columns = {str(row[1]) for row in conn.execute("PRAGMA table_info(savings_goals)")}
+    if not columns:
+        return
+    contributed = (
+        "contributed_amount" if "contributed_amount" in columns else "current_amount"
+    )
+    withdrawn = "withdrawn_amount" if "withdrawn_amount" in columns else "0"
     rows = conn.execute(
-        "SELECT id, date, category, amount, details FROM tracking WHERE typ=? ORDER BY date, id",
-        (TYP_EXPENSES,),
+        f"SELECT id, name, target_amount, current_amount, deadline, category, notes, "
+        f"status, {contributed} AS contributed_amount, {withdrawn} AS withdrawn_amount "
+        "FROM savings_goals ORDER BY id"  # nosec B608 -- identifiers are fixed from audited allow-list
     ).fetchall()
-    count = 0
-    with atomar_offen(out) as handle:
-        handle.write(
-            json.dumps(
-                {
-                    "schema": "fpm.import.manifest.v1",
-                    "source": "BudgetManager",
-                    "created_at": datetime.now(timezone.utc).isoformat(),
-                    "mode": "reviewable_bridge_import",
-                },
-                ensure_ascii=False,
-                sort_keys=True,
-            )
-            + "\n"
-        )
-        for row in rows:
-            category = str(row[2] or "")
-            details = str(row[4] or "")
-            haystack = f"{category} {details}".lower()
-            if not any(
-                token in haystack
-                for token in (
-                    "füller",
-                    "fueller",
-                    "fountain",
-                    "tinte",
-                    "ink",
-                    "feder",
-                    "nib",
-                    "papier",
-                    "paper",
-                )
-            ):
-                continue
-            amount = round(abs(float(row[3] or 0.0)), 2)
-            if amount <= 0:
-                continue
-            record = {
-                "schema": "fpm.import.v1",
-                "operation": "upsert",
-                "external_id": f"budgetmanager:tracking:{int(row[0])}",
-                "source": "BudgetManager",
-                "date": str(row[1]),
-                "amount": amount,
-                "currency": "CHF",
-                "category_path": category,
-                "description": details.splitlines()[0] if details else category,
-                "notes": details,
-            }
-            handle.write(json.dumps(record, ensure_ascii=False, sort_keys=True) + "\n")
-            count += 1
-    # Die Datei trägt Beträge und Sparziele - dieselben Rechte wie der Ordner.
-    from model.file_permissions import secure_file
-
-    secure_file(out)
-    return BridgeExportResult(out, count)
+    for row in rows:
+        target = float(row[2] or 0.0)
+        stock = float(row[3] or 0.0)
+        contributed_value = float(row[8] or 0.0)
+        withdrawn_value = float(row[9] or 0.0)
+        yield {
+            "schema": "fpm.savings-goal.v1",
+            "external_id": f"budgetmanager:savings-goal:{int(row[0])}",
+            "source": "BudgetManager",
+            "item_type": "savings_goal",
+            "label": str(row[1] or ""),
+            "goal_name": str(row[1] or ""),
+            "status": str(row[7] or "sparend"),
+            "target_amount": round(target, 2),
+            "current_amount": round(stock, 2),
+            "contributed_amount": round(contributed_value, 2),
+            "withdrawn_amount": round(withdrawn_value, 2),
+            "remaining_amount": round(max(0.0, target - contributed_value), 2),
+            "progress_percent": round(
+                (contributed_value / target * 100.0) if target > 0 else 0.0, 2
+            ),
+            "currency": "CHF",
+            "deadline": str(row[4] or ""),
+            "category": str(row[5] or ""),
+            "notes": str(row[6] or ""),
+        }
 
 
 def export_savings_goals(conn, path: str | Path | None = None) -> BridgeExportResult:
+    """Sparziele für FPM; schreibt nur, wenn sich etwas geändert hat."""
     out = Path(path) if path is not None else default_savings_goals_path()
     out.parent.mkdir(parents=True, exist_ok=True)
-    columns = {str(row[1]) for row in conn.execute("PRAGMA table_info(savings_goals)")}
-    if not columns:
-        rows = []
-    else:
-        contributed = (
-            "contributed_amount"
-            if "contributed_amount" in columns
-            else "current_amount"
-        )
-        withdrawn = "withdrawn_amount" if "withdrawn_amount" in columns else "0"
-        rows = conn.execute(
-            f"SELECT id, name, target_amount, current_amount, deadline, category, notes, "
-            f"status, {contributed} AS contributed_amount, {withdrawn} AS withdrawn_amount "
-            "FROM savings_goals ORDER BY id"  # nosec B608 -- identifiers are fixed from audited allow-list
-        ).fetchall()
-    count = 0
-    with atomar_offen(out) as handle:
-        handle.write(
-            json.dumps(
-                {
-                    "schema": "fpm.savings-goals.manifest.v1",
-                    "source": "BudgetManager",
-                    "created_at": datetime.now(timezone.utc).isoformat(),
-                },
-                ensure_ascii=False,
-                sort_keys=True,
-            )
-            + "\n"
-        )
-        for row in rows:
-            target = float(row[2] or 0.0)
-            stock = float(row[3] or 0.0)
-            contributed_value = float(row[8] or 0.0)
-            withdrawn_value = float(row[9] or 0.0)
-            record = {
-                "schema": "fpm.savings-goal.v1",
-                "external_id": f"budgetmanager:savings-goal:{int(row[0])}",
-                "source": "BudgetManager",
-                "item_type": "savings_goal",
-                "label": str(row[1] or ""),
-                "goal_name": str(row[1] or ""),
-                "status": str(row[7] or "sparend"),
-                "target_amount": round(target, 2),
-                "current_amount": round(stock, 2),
-                "contributed_amount": round(contributed_value, 2),
-                "withdrawn_amount": round(withdrawn_value, 2),
-                "remaining_amount": round(max(0.0, target - contributed_value), 2),
-                "progress_percent": round(
-                    (contributed_value / target * 100.0) if target > 0 else 0.0, 2
-                ),
-                "currency": "CHF",
-                "deadline": str(row[4] or ""),
-                "category": str(row[5] or ""),
-                "notes": str(row[6] or ""),
-            }
-            handle.write(json.dumps(record, ensure_ascii=False, sort_keys=True) + "\n")
-            count += 1
-    # Die Datei trägt Beträge und Sparziele - dieselben Rechte wie der Ordner.
-    from model.file_permissions import secure_file
-
-    secure_file(out)
-    return BridgeExportResult(out, count)
+    written = write_outbox(
+        conn,
+        out,
+        tables=("savings_goals",),
+        manifest=lambda: {
+            "schema": "fpm.savings-goals.manifest.v1",
+            "source": "BudgetManager",
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        },
+        records=lambda: _savings_goal_records(conn),
+    )
+    return BridgeExportResult(out, written.count, written.mode)
 
 
 @dataclass(frozen=True)
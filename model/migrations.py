@@ -8,8 +8,10 @@ import shutil
 from pathlib import Path
 from datetime import datetime
 
+from model.profiling import profiled
+
 # Aktuelle Schema-Version
-CURRENT_VERSION = 18
+CURRENT_VERSION = 22
 
 
 def _cols(conn: sqlite3.Connection, table: str) -> set[str]:
@@ -119,6 +121,7 @@ def _migrate_v17_cleanup_orphaned_entry_tags(conn) -> None:
         pass
 
 
+@profiled("migrations.migrate_all")
 def migrate_all(
     conn: sqlite3.Connection, db_path: str = None, backup_dir: str = None
 ) -> dict:
@@ -233,6 +236,26 @@ def migrate_all(
             "v17→v18: Sparziel-Flussbestand, Teilfreigaben und Buchungsarten"
         )
 
+    if old_version < 19:
+        _migrate_v18_to_v19(conn)
+        migrations_applied.append("v18→v19: Monatssummen (monthly_totals) mit Triggern")
+
+    if old_version < 20:
+        _migrate_v19_to_v20(conn)
+        migrations_applied.append(
+            "v19→v20: Volltextindex (search_index, search_trigram, FTS5)"
+        )
+
+    if old_version < 21:
+        _migrate_v20_to_v21(conn)
+        migrations_applied.append("v20→v21: Undo-Gruppennummer (group_seq) mit Index")
+
+    if old_version < 22:
+        _migrate_v21_to_v22(conn)
+        migrations_applied.append(
+            "v21→v22: Eingefrorene Monatssummen (period_snapshots) mit Triggern"
+        )
+
     # Version setzen
     if migrations_applied:
         _set_db_version(conn, CURRENT_VERSION)
@@ -570,6 +593,55 @@ def _migrate_v17_to_v18(conn: sqlite3.Connection) -> None:
     conn.commit()
 
 
+def _migrate_v18_to_v19(conn: sqlite3.Connection) -> None:
+    """Migration v18 → v19: gepflegte Monatssummen für die Budgetübersicht.
+
+    Trigger auf ``tracking`` und ``budget`` halten ``monthly_totals`` aktuell;
+    siehe ``model.monthly_totals``.
+    """
+    from model.monthly_totals import install_monthly_totals
+
+    install_monthly_totals(conn)
+    conn.commit()
+
+
+def _migrate_v19_to_v20(conn: sqlite3.Connection) -> None:
+    """Migration v19 → v20: Volltextindex für Freitextfilter und Suche.
+
+    Legt ``search_index`` und den Trigramm-Index ``search_trigram`` für
+    Teilwörter an. Ohne FTS5 im SQLite der Plattform bleibt es beim
+    ``LIKE``; siehe ``model.search_index``.
+    """
+    from model.search_index import install_search_index
+
+    install_search_index(conn)
+    conn.commit()
+
+
+def _migrate_v20_to_v21(conn: sqlite3.Connection) -> None:
+    """Migration v20 → v21: fortlaufende Gruppennummer im Undo-Stapel.
+
+    Das Kürzen auf die letzten Gruppen wird ein Bereichs-DELETE über einen
+    Index; siehe ``model.undo_redo_model.install_undo_journal``.
+    """
+    from model.undo_redo_model import install_undo_journal
+
+    install_undo_journal(conn)
+    conn.commit()
+
+
+def _migrate_v21_to_v22(conn: sqlite3.Connection) -> None:
+    """Migration v21 → v22: eingefrorene Summen abgeschlossener Monate.
+
+    Bereits abgeschlossene Monate werden gleich eingefroren; siehe
+    ``model.period_snapshots``.
+    """
+    from model.period_snapshots import install_period_snapshots
+
+    install_period_snapshots(conn)
+    conn.commit()
+
+
 def get_migration_info(conn: sqlite3.Connection) -> dict:
     """
     Gibt Informationen über den Migrations-Status zurück.
@@ -600,6 +672,7 @@ def get_migration_info(conn: sqlite3.Connection) -> dict:
         "undo_stack",
         "theme_profiles",
         "recurring_transactions",
+        "monthly_totals",
     ]
 
     missing_tables = [
@@ -11,8 +11,9 @@ Rechnet den Monat ab: Einnahmen − Ausgaben − Ersparnisse.
   ZENTRALE REGEL: Fixkosten und wiederkehrende Kategorien werden NIEMALS als
   Kürzungskandidaten genannt.
 
-Der Abschluss wird pro Monat in ``system_flags`` vermerkt (rein informativ,
-Buchungen bleiben normale Tracking-Einträge und sind per Undo rückholbar).
+Der Abschluss wird pro Monat in ``system_flags`` vermerkt (Buchungen bleiben
+normale Tracking-Einträge und sind per Undo rückholbar). Dabei werden die
+Summen abgeschlossener Monate eingefroren (``model.period_snapshots``).
 """
 
 from __future__ import annotations
@@ -23,6 +24,7 @@ import sqlite3
 from dataclasses import dataclass, field
 from datetime import date
 
+from model.period_snapshots import freeze_closed_months, has_period_snapshots
 from model.typ_constants import (
     TYP_EXPENSES,
     TYP_INCOME,
@@ -284,4 +286,6 @@ class MonthCloseModel:
             "INSERT OR REPLACE INTO system_flags(key, value) VALUES(?, ?)",
             (f"{_FLAG_PREFIX}:{year:04d}-{month:02d}", "1"),
         )
+        if has_period_snapshots(self.conn):
+            freeze_closed_months(self.conn)
         self.conn.commit()
@@ -0,0 +1,178 @@
+"""Monatssummen als gepflegte Tabelle (``monthly_totals``).
+
+Die Budgetübersicht fragte Budget und Ist je (Typ, Monat) einzeln ab, bei
+Übertrag aus Vorjahren zusätzlich für jeden Monat jedes Vorjahres - pro
+Cockpit-Aktualisierung Hunderte ``SUM()`` über ``tracking``.
+
+``monthly_totals`` hält eine Zeile je (Jahr, Monat, Typ, Kategorie):
+
+  ``budget``  Summe der Budgetzeilen; ``NULL``, wenn es keine gibt.
+  ``actual``  Vorzeichenbehaftete Summe der Buchungen im Monat; ``NULL``,
+              wenn es keine gibt. ``abs()`` für Ausgaben machen die Leser
+              wie bisher selbst.
+
+``NULL`` statt 0 ist Absicht: Die Übersicht unterscheidet "Kategorie hat
+ein Budget von 0" von "Kategorie hat kein Budget".
+
+Gepflegt wird die Tabelle von Triggern auf ``tracking`` und ``budget``,
+nicht von den Schreibpfaden der Modelle - Undo/Redo, Importe, Restore und
+Reparaturen schreiben roh per SQL und würden sonst vorbeilaufen. Jeder
+Trigger rechnet die betroffene Gruppe aus der Basistabelle neu aus, statt
+Differenzen aufzuaddieren; die Summen bleiben damit genau so, wie ein
+frisches ``SUM()`` sie liefern würde, und es kann kein Rundungsfehler
+auflaufen. :func:`rebuild_monthly_totals` baut die Tabelle komplett neu.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+
+_TABLE_DDL = """
+CREATE TABLE IF NOT EXISTS monthly_totals(
+    year INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    typ TEXT NOT NULL,
+    category TEXT NOT NULL,
+    budget REAL,
+    actual REAL,
+    PRIMARY KEY(year, month, typ, category)
+) WITHOUT ROWID
+"""
+
+# Monatsgrenzen wie ``model.date_ranges.month_bounds``: [Monatserster,
+# Erster des Folgemonats). Ein Datum ausserhalb 1..12 ergibt einen leeren
+# Bereich; die Gruppe verschwindet dann wieder.
+_TRACKING_REFRESH = """
+    INSERT INTO monthly_totals(year, month, typ, category)
+    VALUES (
+        CAST(substr({row}.date, 1, 4) AS INTEGER),
+        CAST(substr({row}.date, 6, 2) AS INTEGER),
+        {row}.typ, {row}.category
+    )
+    ON CONFLICT(year, month, typ, category) DO NOTHING;
+    UPDATE monthly_totals SET actual = (
+        SELECT SUM(t.amount) FROM tracking t
+        WHERE t.typ = monthly_totals.typ
+          AND t.category = monthly_totals.category
+          AND t.date >= printf('%04d-%02d-01', monthly_totals.year,
+                               monthly_totals.month)
+          AND t.date < printf('%04d-%02d-01',
+                              monthly_totals.year + (monthly_totals.month = 12),
+                              monthly_totals.month % 12 + 1)
+    )
+    WHERE year = CAST(substr({row}.date, 1, 4) AS INTEGER)
+      AND month = CAST(substr({row}.date, 6, 2) AS INTEGER)
+      AND typ = {row}.typ AND category = {row}.category;
+"""
+
+_BUDGET_REFRESH = """
+    INSERT INTO monthly_totals(year, month, typ, category)
+    VALUES ({row}.year, {row}.month, {row}.typ, {row}.category)
+    ON CONFLICT(year, month, typ, category) DO NOTHING;
+    UPDATE monthly_totals SET budget = (
+        SELECT SUM(b.amount) FROM budget b
+        WHERE b.year = monthly_totals.year AND b.month = monthly_totals.month
+          AND b.typ = monthly_totals.typ AND b.category = monthly_totals.category
+    )
+    WHERE year = {row}.year AND month = {row}.month
+      AND typ = {row}.typ AND category = {row}.category;
+"""
+
+_TRACKING_PRUNE = """
+    DELETE FROM monthly_totals
+    WHERE year = CAST(substr({row}.date, 1, 4) AS INTEGER)
+      AND month = CAST(substr({row}.date, 6, 2) AS INTEGER)
+      AND typ = {row}.typ AND category = {row}.category
+      AND budget IS NULL AND actual IS NULL;
+"""
+
+_BUDGET_PRUNE = """
+    DELETE FROM monthly_totals
+    WHERE year = {row}.year AND month = {row}.month
+      AND typ = {row}.typ AND category = {row}.category
+      AND budget IS NULL AND actual IS NULL;
+"""
+
+
+def _refresh(template: str, prune: str, *rows: str) -> str:
+    return "".join(template.format(row=r) + prune.format(row=r) for r in rows)
+
+
+_TRIGGERS = {
+    "trg_monthly_totals_tracking_ins": (
+        "AFTER INSERT ON tracking",
+        _refresh(_TRACKING_REFRESH, _TRACKING_PRUNE, "NEW"),
+    ),
+    "trg_monthly_totals_tracking_del": (
+        "AFTER DELETE ON tracking",
+        _refresh(_TRACKING_REFRESH, _TRACKING_PRUNE, "OLD"),
+    ),
+    "trg_monthly_totals_tracking_upd": (
+        "AFTER UPDATE OF date, typ, category, amount ON tracking",
+        _refresh(_TRACKING_REFRESH, _TRACKING_PRUNE, "OLD", "NEW"),
+    ),
+    "trg_monthly_totals_budget_ins": (
+        "AFTER INSERT ON budget",
+        _refresh(_BUDGET_REFRESH, _BUDGET_PRUNE, "NEW"),
+    ),
+    "trg_monthly_totals_budget_del": (
+        "AFTER DELETE ON budget",
+        _refresh(_BUDGET_REFRESH, _BUDGET_PRUNE, "OLD"),
+    ),
+    "trg_monthly_totals_budget_upd": (
+        "AFTER UPDATE OF year, month, typ, category, amount ON budget",
+        _refresh(_BUDGET_REFRESH, _BUDGET_PRUNE, "OLD", "NEW"),
+    ),
+}
+
+
+def install_monthly_totals(conn: sqlite3.Connection) -> None:
+    """Legt Tabelle und Trigger an und füllt die Tabelle (idempotent)."""
+    conn.execute(_TABLE_DDL)
+    for name, (event, body) in _TRIGGERS.items():
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+        conn.execute(f"CREATE TRIGGER {name} {event} FOR EACH ROW BEGIN {body} END")
+    rebuild_monthly_totals(conn)
+
+
+def rebuild_monthly_totals(conn: sqlite3.Connection) -> int:
+    """Baut ``monthly_totals`` aus ``budget`` und ``tracking`` neu auf.
+
+    Returns: Anzahl Zeilen danach.
+    """
+    conn.execute("DELETE FROM monthly_totals")
+    conn.execute(
+        """
+        INSERT INTO monthly_totals(year, month, typ, category, budget)
+        SELECT year, month, typ, category, SUM(amount) FROM budget
+        GROUP BY year, month, typ, category
+        """
+    )
+    # Dieselbe Zuordnung wie in den Triggern: Ein Datum zählt zu dem Monat,
+    # dessen [Anfang, Folgemonat) es trifft.
+    conn.execute(
+        """
+        INSERT INTO monthly_totals(year, month, typ, category, actual)
+        SELECT y, m, typ, category, SUM(amount) FROM (
+            SELECT CAST(substr(date, 1, 4) AS INTEGER) AS y,
+                   CAST(substr(date, 6, 2) AS INTEGER) AS m,
+                   date, typ, category, amount
+            FROM tracking
+        )
+        WHERE date >= printf('%04d-%02d-01', y, m)
+          AND date < printf('%04d-%02d-01', y + (m = 12), m % 12 + 1)
+        GROUP BY y, m, typ, category
+        ON CONFLICT(year, month, typ, category) DO UPDATE SET actual = excluded.actual
+        """
+    )
+    row = conn.execute("SELECT COUNT(*) FROM monthly_totals").fetchone()
+    return int(row[0]) if row else 0
+
+
+def has_monthly_totals(conn: sqlite3.Connection) -> bool:
+    """True, wenn die DB die gepflegte Tabelle hat (Schema ab v19)."""
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='trigger' AND name=?",
+        ("trg_monthly_totals_tracking_ins",),
+    ).fetchone()
+    return row is not None
@@ -6,7 +6,49 @@ Hier liegt reine Datenlogik, damit sie ohne PySide6 testbar ist
 
 from __future__ import annotations
 
-from model.typ_constants import normalize_typ
+from model.tracking_model import TrackingColumns
+from model.typ_constants import (
+    TYP_EXPENSES,
+    TYP_INCOME,
+    TYP_SAVINGS,
+    normalize_typ,
+)
+
+
+def _absolute_sums(rows) -> dict[tuple[str, str], float]:
+    """Beträge (absolut) je (Typ, Kategorie) aus Zeilen oder Spalten."""
+    if isinstance(rows, TrackingColumns):
+        return rows.absolute_sums()
+    agg: dict[tuple[str, str], float] = {}
+    for r in rows:
+        key = (normalize_typ(str(getattr(r, "typ", ""))), getattr(r, "category", ""))
+        agg[key] = agg.get(key, 0.0) + abs(float(getattr(r, "amount", 0.0)))
+    return agg
+
+
+def typ_totals(rows) -> dict[str, float]:
+    """Ist-Summen je Typ für die KPI-Karten.
+
+    Ausgaben zählen als Betrag, Einkommen und Ersparnisse mit Vorzeichen.
+
+    Args:
+        rows: Buchungszeilen (``typ``, ``amount``) oder ``TrackingColumns``.
+
+    Returns:
+        ``{TYP_INCOME: …, TYP_EXPENSES: …, TYP_SAVINGS: …}``
+    """
+    totals = {TYP_INCOME: 0.0, TYP_EXPENSES: 0.0, TYP_SAVINGS: 0.0}
+    if isinstance(rows, TrackingColumns):
+        for (typ_db, _cat), value in rows.actual_sums().items():
+            if typ_db in totals:
+                totals[typ_db] += value
+        return totals
+    for r in rows:
+        typ_db = normalize_typ(str(getattr(r, "typ", "")))
+        if typ_db in totals:
+            amount = float(getattr(r, "amount", 0.0))
+            totals[typ_db] += abs(amount) if typ_db == TYP_EXPENSES else amount
+    return totals
 
 
 def aggregate_top_bookings(rows, top_n: int = 5) -> list[tuple[tuple[str, str], float]]:
@@ -16,7 +58,8 @@ def aggregate_top_bookings(rows, top_n: int = 5) -> list[tuple[tuple[str, str],
     werden zu EINER Summe zusammengefasst, statt einzeln gelistet zu werden.
 
     Args:
-        rows: Buchungszeilen mit Attributen ``typ``, ``category``, ``amount``.
+        rows: Buchungszeilen mit Attributen ``typ``, ``category``, ``amount``
+            oder ``TrackingColumns``.
         top_n: Anzahl der größten Einträge.
 
     Returns:
@@ -24,13 +67,12 @@ def aggregate_top_bookings(rows, top_n: int = 5) -> list[tuple[tuple[str, str],
         auf ``top_n`` begrenzt.
     """
     agg: dict[tuple[str, str], float] = {}
-    for r in rows:
-        typ_db = normalize_typ(str(getattr(r, "typ", "")))
-        cat = str(getattr(r, "category", "")).strip()
+    for (typ_db, category), value in _absolute_sums(rows).items():
+        cat = str(category).strip()
         if not cat:
             continue
         key = (typ_db, cat)
-        agg[key] = agg.get(key, 0.0) + abs(float(getattr(r, "amount", 0.0)))
+        agg[key] = agg.get(key, 0.0) + value
     return sorted(agg.items(), key=lambda kv: kv[1], reverse=True)[:top_n]
 
 
@@ -48,7 +90,8 @@ def aggregate_category_amounts(
     zusammengefasst, damit das Diagramm kurz bleibt.
 
     Args:
-        rows: Buchungszeilen mit Attributen ``typ``, ``category``, ``amount``.
+        rows: Buchungszeilen mit Attributen ``typ``, ``category``, ``amount``
+            oder ``TrackingColumns``.
         typ_filter: Optionaler DB-Typ (z.B. ``TYP_EXPENSES``).
         top_n: Anzahl der sichtbaren Hauptkategorien.
         other_label: Label für die zusammengefassten Restkategorien.
@@ -58,14 +101,13 @@ def aggregate_category_amounts(
     """
     wanted = normalize_typ(typ_filter) if typ_filter else None
     agg: dict[str, float] = {}
-    for r in rows:
-        typ_db = normalize_typ(str(getattr(r, "typ", "")))
+    for (typ_db, category), value in _absolute_sums(rows).items():
         if wanted and typ_db != wanted:
             continue
-        cat = str(getattr(r, "category", "")).strip()
+        cat = str(category).strip()
         if not cat:
             continue
-        agg[cat] = agg.get(cat, 0.0) + abs(float(getattr(r, "amount", 0.0)))
+        agg[cat] = agg.get(cat, 0.0) + value
 
     ranked = sorted(agg.items(), key=lambda kv: kv[1], reverse=True)
     if top_n <= 0 or len(ranked) <= top_n:
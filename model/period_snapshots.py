@@ -0,0 +1,283 @@
+"""Eingefrorene Summen abgeschlossener Monate (``period_snapshots``).
+
+Übersicht und Übertrag summierten bei jedem Aufruf die ganze Historie ab
+dem Startjahr neu, auch Monate, die der Monatsabschluss längst als fertig
+markiert hat. Beim Abschluss werden deren Summen jetzt eingefroren; die
+Leser in :mod:`model.carry_over_engine` nehmen sie ab Fensterbeginn,
+solange sie lückenlos sind, und summieren live erst ab dem ersten Monat
+danach.
+
+``period_snapshots`` hält je Typ zwei Arten von Zeilen:
+
+  ``month`` 1..12, ``category`` leer
+      Budget- und Ist-Summe des Monats über alle Kategorien.
+  ``month`` 0
+      Kalenderjahr, sobald alle zwölf Monate abgeschlossen sind: je
+      Kategorie mit Daten eine Zeile mit Jahressumme. Die Zeile mit leerer
+      Kategorie gibt es immer; sie markiert das Jahr als eingefroren (ohne
+      Summen, wenn es keine Buchungen ohne Kategorie gibt).
+
+``budget``/``actual`` sind dieselben Summen, die die gruppierten Abfragen
+auf ``monthly_totals`` liefern (``NULL``, wo es keine Zeilen gibt); den
+Übertrag rechnet :class:`~model.carry_over_engine.CarryMatrix` daraus mit
+denselben Regeln wie aus Live-Zellen.
+
+Trigger auf ``tracking`` und ``budget`` verwerfen die Zeilen von Monat und
+Jahr, in dem eine Änderung landet - nur für deren Typ. Eingefroren wird
+neu, sobald wieder ein Monat abgeschlossen wird
+(:func:`freeze_closed_months`).
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from typing import Any
+
+from model.typ_constants import ALL_TYPEN
+
+_CLOSED_PREFIX = "month_closed:"
+
+_TABLE_DDL = """
+CREATE TABLE IF NOT EXISTS period_snapshots(
+    typ TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    budget REAL,
+    actual REAL,
+    PRIMARY KEY(typ, year, month, category)
+) WITHOUT ROWID
+"""
+
+_TRACKING_DROP = """
+    DELETE FROM period_snapshots
+    WHERE typ = {row}.typ
+      AND year = CAST(substr({row}.date, 1, 4) AS INTEGER)
+      AND month IN (0, CAST(substr({row}.date, 6, 2) AS INTEGER));
+"""
+
+_BUDGET_DROP = """
+    DELETE FROM period_snapshots
+    WHERE typ = {row}.typ AND year = {row}.year AND month IN (0, {row}.month);
+"""
+
+
+def _drop(template: str, *rows: str) -> str:
+    return "".join(template.format(row=r) for r in rows)
+
+
+_TRIGGERS = {
+    "trg_period_snapshots_tracking_ins": (
+        "AFTER INSERT ON tracking",
+        _drop(_TRACKING_DROP, "NEW"),
+    ),
+    "trg_period_snapshots_tracking_del": (
+        "AFTER DELETE ON tracking",
+        _drop(_TRACKING_DROP, "OLD"),
+    ),
+    "trg_period_snapshots_tracking_upd": (
+        "AFTER UPDATE OF date, typ, category, amount ON tracking",
+        _drop(_TRACKING_DROP, "OLD", "NEW"),
+    ),
+    "trg_period_snapshots_budget_ins": (
+        "AFTER INSERT ON budget",
+        _drop(_BUDGET_DROP, "NEW"),
+    ),
+    "trg_period_snapshots_budget_del": (
+        "AFTER DELETE ON budget",
+        _drop(_BUDGET_DROP, "OLD"),
+    ),
+    "trg_period_snapshots_budget_upd": (
+        "AFTER UPDATE OF year, month, typ, category, amount ON budget",
+        _drop(_BUDGET_DROP, "OLD", "NEW"),
+    ),
+}
+
+
+def install_period_snapshots(conn: sqlite3.Connection) -> None:
+    """Legt Tabelle und Trigger an und friert abgeschlossene Monate ein.
+
+    Setzt ``monthly_totals`` voraus (Schema ab v19). Idempotent.
+    """
+    conn.execute(_TABLE_DDL)
+    for name, (event, body) in _TRIGGERS.items():
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+        conn.execute(f"CREATE TRIGGER {name} {event} FOR EACH ROW BEGIN {body} END")
+    rebuild_period_snapshots(conn)
+
+
+def has_period_snapshots(conn: sqlite3.Connection) -> bool:
+    """True, wenn die DB die Tabelle samt Triggern hat (Schema ab v22)."""
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='trigger' AND name=?",
+        ("trg_period_snapshots_tracking_ins",),
+    ).fetchone()
+    return row is not None
+
+
+def rebuild_period_snapshots(conn: sqlite3.Connection) -> int:
+    """Verwirft alle Zeilen und friert die abgeschlossenen Monate neu ein.
+
+    Returns: Anzahl eingefrorener Monate.
+    """
+    conn.execute("DELETE FROM period_snapshots")
+    return freeze_closed_months(conn)
+
+
+def closed_months(conn: sqlite3.Connection) -> list[tuple[int, int]]:
+    """Abgeschlossene Monate laut ``system_flags``, aufsteigend."""
+    out: list[tuple[int, int]] = []
+    for key, value in conn.execute(
+        "SELECT key, value FROM system_flags WHERE key LIKE ?",
+        (_CLOSED_PREFIX + "%",),
+    ).fetchall():
+        if str(value) != "1":
+            continue
+        try:
+            y_s, m_s = str(key)[len(_CLOSED_PREFIX) :].split("-", 1)
+            year, month = int(y_s), int(m_s)
+        except ValueError:
+            continue
+        if 1 <= month <= 12:
+            out.append((year, month))
+    return sorted(out)
+
+
+def freeze_closed_months(conn: sqlite3.Connection) -> int:
+    """Friert abgeschlossene Monate (und volle Jahre) ohne gültige Zeilen ein.
+
+    Läuft in der Transaktion des Aufrufers; committet nicht.
+
+    Returns: Anzahl neu eingefrorener Monate.
+    """
+    closed = closed_months(conn)
+    if not closed:
+        return 0
+    present = {
+        (str(typ), int(y), int(m))
+        for typ, y, m in conn.execute(
+            "SELECT typ, year, month FROM period_snapshots WHERE category = ''"
+        )
+    }
+    frozen = 0
+    months_per_year: dict[int, int] = {}
+    for year, month in closed:
+        months_per_year[year] = months_per_year.get(year, 0) + 1
+        if all((typ, year, month) in present for typ in ALL_TYPEN):
+            continue
+        _freeze_month(conn, year, month)
+        frozen += 1
+    for year, count in months_per_year.items():
+        if count == 12 and not all((typ, year, 0) in present for typ in ALL_TYPEN):
+            _freeze_year(conn, year)
+    return frozen
+
+
+def _freeze_month(conn: sqlite3.Connection, year: int, month: int) -> None:
+    conn.execute(
+        "DELETE FROM period_snapshots WHERE year = ? AND month = ?", (year, month)
+    )
+    conn.execute(
+        """
+        INSERT INTO period_snapshots(typ, year, month, category, budget, actual)
+        SELECT typ, year, month, '', SUM(budget), SUM(actual) FROM monthly_totals
+        WHERE year = ? AND month = ? GROUP BY typ
+        """,
+        (year, month),
+    )
+    # Typen ohne Daten im Monat: leere Zeile, damit der Monat als gedeckt gilt.
+    conn.executemany(
+        "INSERT OR IGNORE INTO period_snapshots(typ, year, month, category) "
+        "VALUES (?, ?, ?, '')",
+        [(typ, year, month) for typ in ALL_TYPEN],
+    )
+
+
+def _freeze_year(conn: sqlite3.Connection, year: int) -> None:
+    conn.execute("DELETE FROM period_snapshots WHERE year = ? AND month = 0", (year,))
+    conn.execute(
+        """
+        INSERT INTO period_snapshots(typ, year, month, category, budget, actual)
+        SELECT typ, year, 0, category, SUM(budget), SUM(actual) FROM monthly_totals
+        WHERE year = ? GROUP BY typ, category
+        """,
+        (year,),
+    )
+    conn.execute(
+        """
+        INSERT OR IGNORE INTO period_snapshots(typ, year, month, category)
+        SELECT DISTINCT typ, year, 0, '' FROM period_snapshots
+        WHERE year = ? AND month = 0
+        """,
+        (year,),
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO period_snapshots(typ, year, month, category) "
+        "VALUES (?, ?, 0, '')",
+        [(typ, year) for typ in ALL_TYPEN],
+    )
+
+
+def frozen_months(
+    conn: sqlite3.Connection,
+    typ: str,
+    first: tuple[int, int],
+    last: tuple[int, int],
+) -> tuple[list[tuple[Any, ...]], tuple[int, int]]:
+    """Eingefrorene Monatszellen ab ``first``, solange lückenlos.
+
+    Returns: ``(cells, next)`` - Zellen ``(year, month, '', budget, actual)``
+    wie von einer nach Monat gruppierten Abfrage und der erste Monat, den
+    sie nicht decken (liegt nach ``last``, wenn alles gedeckt ist).
+    """
+    cells: list[tuple[Any, ...]] = []
+    expected = first
+    for year, month, budget, actual in conn.execute(
+        "SELECT year, month, budget, actual FROM period_snapshots "
+        "WHERE typ = ? AND year BETWEEN ? AND ? AND month > 0 AND category = '' "
+        "ORDER BY year, month",
+        (typ, first[0], last[0]),
+    ):
+        key = (int(year), int(month))
+        if key < expected:
+            continue
+        if key != expected or key > last:
+            break
+        cells.append((key[0], key[1], "", budget, actual))
+        expected = (key[0] + 1, 1) if key[1] == 12 else (key[0], key[1] + 1)
+    return cells, expected
+
+
+def frozen_years(
+    conn: sqlite3.Connection,
+    typ: str,
+    first_year: int,
+    last_year: int,
+) -> tuple[list[tuple[Any, ...]], int]:
+    """Eingefrorene Jahreszellen je Kategorie ab ``first_year``, lückenlos.
+
+    Returns: ``(cells, next_year)`` - Zellen ``(year, 0, category, budget,
+    actual)`` wie von einer nach Jahr und Kategorie gruppierten Abfrage und
+    das erste Jahr, das sie nicht decken.
+    """
+    by_year: dict[int, list[tuple[Any, ...]]] = {}
+    marked: set[int] = set()
+    for year, category, budget, actual in conn.execute(
+        "SELECT year, category, budget, actual FROM period_snapshots "
+        "WHERE typ = ? AND year BETWEEN ? AND ? AND month = 0 "
+        "ORDER BY year, category",
+        (typ, first_year, last_year),
+    ):
+        if category == "":
+            marked.add(int(year))
+            if budget is None and actual is None:
+                continue  # nur die Marke
+        by_year.setdefault(int(year), []).append(
+            (int(year), 0, category, budget, actual)
+        )
+    cells: list[tuple[Any, ...]] = []
+    year = first_year
+    while year <= last_year and year in marked:
+        cells.extend(by_year.get(year, ()))
+        year += 1
+    return cells, year
@@ -0,0 +1,275 @@
+"""Opt-in-Profiling für Diagnoseberichte.
+
+Der Diagnosebericht zeigte Zustand (PRAGMAs, Cache-Zähler, Logs), aber
+nicht, wo die Zeit bleibt. Ist das Profiling eingeschaltet (Einstellung
+``performance_profiling`` oder Umgebungsvariable ``BM_PROFILE``), sammelt
+dieses Modul:
+
+  SQL-Anweisungen   über Trace- und Fortschritts-Callback einer Connection
+                    (:func:`attach`; ``open_db`` und ``EncryptedSession``
+                    melden ihre Connection beim Öffnen selbst an): Anzahl
+                    und kumulierte Zeit je Anweisungsform. Literale
+                    werden vor dem Zählen durch ``?`` ersetzt
+                    (:func:`normalize_sql`) - Kategorien, Beträge und
+                    Notizen landen nie im Bericht.
+  Einstiegspunkte   über :func:`profiled`: Anzahl, Summe und Maximum je
+                    Name (Tab-Refresh, Sicherung, Migration, Vorschläge).
+  Langsames         die letzten :data:`SLOW_RING_SIZE` Operationen und
+                    Anweisungen über den Schwellen, als Ringpuffer.
+
+:func:`performance_report` liefert alles als JSON-fähiges Dict für
+``performance.json`` im Diagnosebericht.
+
+Die SQL-Zeiten sind eine Näherung: SQLite meldet nur den Beginn einer
+Anweisung, gemessen wird bis zum letzten Fortschritts-Tick
+(alle :data:`PROGRESS_STEPS` VM-Schritte). Kurze Anweisungen ohne Tick
+werden gezählt, aber mit 0 ms. Trigger und interne Anweisungen meldet
+sqlite3 wie eigene Anweisungen; sie laufen als ``nested_steps`` der
+auslösenden Anweisung mit - dieselbe Anweisung mit denselben Werten zweimal
+direkt hintereinander zählt deshalb nur einmal. Ausgeschaltet kostet ein Einstiegspunkt
+eine einzige Abfrage eines Flags; Connections ohne :func:`attach` gar
+nichts.
+"""
+
+from __future__ import annotations
+
+import functools
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, TypeVar, cast
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+#: Operationen ab dieser Dauer kommen in den Ringpuffer.
+SLOW_OPERATION_MS = 250.0
+#: Anweisungen ab dieser (genäherten) Dauer kommen in den Ringpuffer.
+SLOW_STATEMENT_MS = 100.0
+SLOW_RING_SIZE = 50
+#: VM-Schritte zwischen zwei Fortschritts-Ticks.
+PROGRESS_STEPS = 1000
+#: Verschiedene Anweisungsformen; alles darüber zählt unter ``<other>``.
+MAX_STATEMENTS = 500
+MAX_SQL_CHARS = 240
+REPORT_TOP_STATEMENTS = 50
+
+_OTHER = "<other>"
+
+_lock = threading.Lock()
+_enabled = False
+_since: str | None = None
+_statements: dict[str, dict[str, float]] = {}
+_operations: dict[str, dict[str, float]] = {}
+_slow: deque[dict[str, Any]] = deque(maxlen=SLOW_RING_SIZE)
+_attached: set[int] = set()
+_local = threading.local()
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_BLOB_RE = re.compile(r"\b[xX]\?")
+_NUMBER_RE = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b")
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_sql(sql: str) -> str:
+    """Anweisungsform ohne Literale: ``WHERE year = 2024`` -> ``year = ?``.
+
+    Der Trace-Callback liefert SQL mit eingesetzten Parametern; ohne diesen
+    Schritt stünden Kategorienamen und Beträge im Bericht.
+    """
+    out = _STRING_RE.sub("?", sql)
+    out = _BLOB_RE.sub("?", out)
+    out = _NUMBER_RE.sub("?", out)
+    out = _IN_LIST_RE.sub("(?, ...)", out)
+    out = _SPACE_RE.sub(" ", out).strip()
+    if len(out) > MAX_SQL_CHARS:
+        out = out[: MAX_SQL_CHARS - 3] + "..."
+    return out
+
+
+def set_enabled(flag: bool) -> None:
+    """Schaltet das Sammeln ein oder aus; Einschalten setzt die Zähler zurück."""
+    global _enabled
+    flag = bool(flag)
+    if flag and not _enabled:
+        reset()
+    _enabled = flag
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def reset() -> None:
+    """Verwirft alle gesammelten Werte."""
+    global _since
+    with _lock:
+        _statements.clear()
+        _operations.clear()
+        _slow.clear()
+        _since = datetime.now().isoformat(timespec="seconds")
+
+
+def _push_slow(kind: str, name: str, ms: float) -> None:
+    _slow.append(
+        {
+            "kind": kind,
+            "name": name,
+            "ms": round(ms, 3),
+            "at": datetime.now().isoformat(timespec="seconds"),
+        }
+    )
+
+
+def _finish_statement() -> None:
+    key = getattr(_local, "statement", None)
+    if key is None:
+        return
+    _local.statement = None
+    _local.raw = None
+    ms = (_local.last_tick - _local.started) * 1000.0
+    with _lock:
+        entry = _statements.get(key)
+        if entry is None:  # reset() während der Anweisung
+            return
+        entry["total_ms"] += ms
+        entry["max_ms"] = max(entry["max_ms"], ms)
+        if ms >= SLOW_STATEMENT_MS:
+            _push_slow("sql", key, ms)
+
+
+def _on_statement(sql: str) -> None:
+    if not _enabled:
+        return
+    current = getattr(_local, "statement", None)
+    if current is not None and (sql.startswith("--") or sql == _local.raw):
+        # Trigger-Programme meldet sqlite3 mit dem SQL der auslösenden
+        # Anweisung, interne Anweisungen (FTS, PRAGMA) mit "--"; beides
+        # zählt zur Laufzeit der laufenden Anweisung, nicht als neuer Aufruf.
+        with _lock:
+            entry = _statements.get(current)
+            if entry is not None:
+                entry["nested_steps"] += 1
+        return
+    _finish_statement()
+    key = normalize_sql(sql)
+    with _lock:
+        if key not in _statements and len(_statements) >= MAX_STATEMENTS:
+            key = _OTHER
+        entry = _statements.setdefault(
+            key,
+            {
+                "count": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "vm_ticks": 0,
+                "nested_steps": 0,
+            },
+        )
+        entry["count"] += 1
+    now = time.perf_counter()
+    _local.raw = sql
+    _local.statement = key
+    _local.started = now
+    _local.last_tick = now
+
+
+def _on_progress() -> int:
+    key = getattr(_local, "statement", None)
+    if key is not None:
+        _local.last_tick = time.perf_counter()
+        with _lock:
+            entry = _statements.get(key)
+            if entry is not None:
+                entry["vm_ticks"] += 1
+    return 0  # nicht 0 hiesse: Anweisung abbrechen
+
+
+def attach(conn: sqlite3.Connection) -> None:
+    """Misst die Anweisungen der Connection.
+
+    Ersetzt einen vorhandenen Trace-Callback und Fortschritts-Handler der
+    Connection; :func:`detach` entfernt beide wieder.
+    """
+    conn.set_trace_callback(_on_statement)
+    conn.set_progress_handler(_on_progress, PROGRESS_STEPS)
+    with _lock:
+        _attached.add(id(conn))
+
+
+def detach(conn: sqlite3.Connection) -> None:
+    """Beendet die Messung der Connection."""
+    conn.set_trace_callback(None)
+    conn.set_progress_handler(None, 0)
+    _finish_statement()
+    with _lock:
+        _attached.discard(id(conn))
+
+
+def _record_operation(name: str, ms: float) -> None:
+    with _lock:
+        entry = _operations.setdefault(
+            name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0}
+        )
+        entry["count"] += 1
+        entry["total_ms"] += ms
+        entry["max_ms"] = max(entry["max_ms"], ms)
+        if ms >= SLOW_OPERATION_MS:
+            _push_slow("operation", name, ms)
+
+
+def profiled(name: str) -> Callable[[F], F]:
+    """Decorator: misst Aufrufe unter ``name``, solange das Profiling an ist."""
+
+    def decorate(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _enabled:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _record_operation(name, (time.perf_counter() - started) * 1000.0)
+
+        return cast(F, wrapper)
+
+    return decorate
+
+
+def _rounded(stats: dict[str, float]) -> dict[str, float]:
+    return {k: round(v, 3) if isinstance(v, float) else v for k, v in stats.items()}
+
+
+def performance_report() -> dict[str, Any]:
+    """Gesammelte Werte für ``performance.json`` (ohne Literale, ohne Pfade)."""
+    with _lock:
+        statements = sorted(
+            _statements.items(), key=lambda kv: (-kv[1]["total_ms"], kv[0])
+        )
+        return {
+            "enabled": _enabled,
+            "since": _since,
+            "attached_connections": len(_attached),
+            "thresholds_ms": {
+                "slow_operation": SLOW_OPERATION_MS,
+                "slow_statement": SLOW_STATEMENT_MS,
+            },
+            "sql_timing": "approximate (trace start to last progress tick)",
+            "statement_totals": {
+                "distinct": len(statements),
+                "count": sum(int(s["count"]) for _, s in statements),
+                "total_ms": round(sum(s["total_ms"] for _, s in statements), 3),
+            },
+            "statements": [
+                {"sql": sql, **_rounded(stats)}
+                for sql, stats in statements[:REPORT_TOP_STATEMENTS]
+            ],
+            "operations": {
+                name: _rounded(stats) for name, stats in sorted(_operations.items())
+            },
+            "slow": list(_slow),
+        }
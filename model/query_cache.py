@@ -0,0 +1,202 @@
+"""Ergebnis-Cache für Aggregatabfragen einer Sitzung.
+
+Wer zwischen Cockpit, Übersicht und Budget wechselt, liess dieselben
+Summen über unveränderte Daten immer wieder rechnen. Der Cache hält die
+Ergebnisse je Connection in einem begrenzten LRU, Schlüssel ist
+``(Abfrage, Parameter, Datenstand)``.
+
+Der Datenstand ist SQLites eigener Zähler, nicht einer, den die Modelle
+pflegen müssten:
+
+  ``total_changes``        jede Zeile, die diese Connection einfügt, ändert
+                           oder löscht - auch aus Triggern, Undo/Redo,
+                           Importen und rohem SQL ausserhalb der Modelle.
+  ``PRAGMA data_version``  Commits anderer Connections auf dieselbe Datei.
+  :func:`invalidate`       was SQLite nicht zählt: ``deserialize()``,
+                           ``DROP TABLE`` und Ähnliches.
+
+Während einer offenen Transaktion wird nicht gecacht: Ein ``ROLLBACK``
+nimmt Änderungen zurück, ohne einen der Zähler zu bewegen.
+
+Connections lassen sich weder schwach referenzieren noch mit Attributen
+versehen; das Register hält deshalb die letzten ``MAX_SESSIONS``
+Connections selbst fest und vergisst ältere. Connections, deren Besitzer
+sie ausdrücklich freigibt (Leser eines ``ConnectionPool``), stehen mit
+:func:`pin` in einem eigenen Register - sonst verdrängten zwei Leser des
+Rechendienstes den Cache der Haupt-Connection.
+"""
+
+from __future__ import annotations
+
+import copy
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, TypeVar, cast
+
+T = TypeVar("T")
+
+#: Ergebnisse je Connection. Die Aggregate sind kleine Dicts je Kategorie;
+#: 256 reichen für alle Tabs über mehrere Jahre.
+DEFAULT_MAX_ENTRIES = 256
+MAX_SESSIONS = 4
+
+
+class QueryCache:
+    """LRU-Cache für Abfrageergebnisse einer Connection."""
+
+    def __init__(
+        self, conn: sqlite3.Connection, max_entries: int = DEFAULT_MAX_ENTRIES
+    ):
+        self._conn = conn
+        self.max_entries = max(1, int(max_entries))
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bypassed = 0
+        self.invalidations = 0
+
+    def _generation(self) -> tuple[int, int, int]:
+        row = self._conn.execute("PRAGMA data_version").fetchone()
+        return self._conn.total_changes, int(row[0]) if row else 0, self._epoch
+
+    def get(self, query: str, params: tuple, compute: Callable[[], T]) -> T:
+        """Liefert das Ergebnis aus dem Cache oder rechnet es mit ``compute``.
+
+        Zurück kommt immer eine flache Kopie - Aufrufer dürfen das Ergebnis
+        verändern, ohne den Cache zu treffen.
+        """
+        if self._conn.in_transaction:
+            self.bypassed += 1
+            return compute()
+        key = (query, params, self._generation())
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cast(T, copy.copy(self._entries[key]))
+        value = compute()
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return copy.copy(value)
+
+    @property
+    def epoch(self) -> int:
+        return self._epoch
+
+    def invalidate(self) -> None:
+        """Verwirft alle Einträge (für Änderungen, die SQLite nicht zählt)."""
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+            self.invalidations += 1
+
+    def stats(self) -> dict[str, int | float]:
+        """Zähler für den Diagnosebericht."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "bypassed_in_transaction": self.bypassed,
+            "invalidations": self.invalidations,
+        }
+
+
+_registry: OrderedDict[int, tuple[sqlite3.Connection, QueryCache]] = OrderedDict()
+_pinned: dict[int, tuple[sqlite3.Connection, QueryCache]] = {}
+_registry_lock = threading.Lock()
+
+
+def _lookup(conn: sqlite3.Connection) -> QueryCache | None:
+    """Der vorhandene Cache der Connection; nur unter ``_registry_lock``."""
+    for register in (_pinned, _registry):
+        entry = register.get(id(conn))
+        if entry is not None and entry[0] is conn:
+            return entry[1]
+    return None
+
+
+def query_cache(conn: sqlite3.Connection) -> QueryCache:
+    """Der Cache der Connection; legt ihn beim ersten Zugriff an."""
+    with _registry_lock:
+        pinned = _pinned.get(id(conn))
+        if pinned is not None and pinned[0] is conn:
+            return pinned[1]
+        entry = _registry.get(id(conn))
+        if entry is not None and entry[0] is conn:
+            _registry.move_to_end(id(conn))
+            return entry[1]
+        cache = QueryCache(conn)
+        _registry[id(conn)] = (conn, cache)
+        while len(_registry) > MAX_SESSIONS:
+            _registry.popitem(last=False)
+        return cache
+
+
+def pin(conn: sqlite3.Connection) -> QueryCache:
+    """Cache ausserhalb des LRU; der Besitzer gibt ihn mit :func:`forget` frei."""
+    with _registry_lock:
+        entry = _pinned.get(id(conn))
+        if entry is not None and entry[0] is conn:
+            return entry[1]
+        cache = QueryCache(conn)
+        _pinned[id(conn)] = (conn, cache)
+        return cache
+
+
+def cached_query(
+    conn: sqlite3.Connection, query: str, params: tuple, compute: Callable[[], T]
+) -> T:
+    """Kurzform für ``query_cache(conn).get(...)``."""
+    return query_cache(conn).get(query, params, compute)
+
+
+def invalidate(conn: sqlite3.Connection) -> None:
+    """Verwirft den Cache der Connection, falls es einen gibt."""
+    with _registry_lock:
+        cache = _lookup(conn)
+    if cache is not None:
+        cache.invalidate()
+
+
+def forget(conn: sqlite3.Connection) -> None:
+    """Gibt den Cache einer geschlossenen Connection frei."""
+    with _registry_lock:
+        for register in (_pinned, _registry):
+            entry = register.get(id(conn))
+            if entry is not None and entry[0] is conn:
+                del register[id(conn)]
+
+
+def cache_epoch(conn: sqlite3.Connection) -> int:
+    """Wie oft :func:`invalidate` die Connection getroffen hat (0 ohne Cache).
+
+    Für eigene Datenstände neben dem Cache: Eine Änderung der Epoche heisst
+    "Inhalt ausgetauscht, ohne dass SQLite es gezählt hat".
+    """
+    with _registry_lock:
+        cache = _lookup(conn)
+    return 0 if cache is None else cache.epoch
+
+
+def query_cache_stats(conn: sqlite3.Connection | None) -> dict[str, Any]:
+    """Statistik für den Diagnosebericht; ohne Cache ``available: False``."""
+    if conn is None:
+        return {"available": False, "reason": "no_active_connection"}
+    with _registry_lock:
+        cache = _lookup(conn)
+    if cache is None:
+        return {"available": False, "reason": "no_queries_cached"}
+    return {"available": True, **cache.stats()}
@@ -22,6 +22,8 @@ import json
 import os
 import re
 import shutil
+import sqlite3
+import tempfile
 import zipfile
 from dataclasses import dataclass
 from datetime import datetime
@@ -78,14 +80,6 @@ def _secure_bundle_file(path: Path) -> None:
         )
 
 
-def _sha256_file(path: Path) -> str:
-    h = hashlib.sha256()
-    with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(1024 * 1024), b""):
-            h.update(chunk)
-    return h.hexdigest()
-
-
 def _sha256_bytes(data: bytes) -> str:
     return hashlib.sha256(data).hexdigest()
 
@@ -115,6 +109,7 @@ def atomic_copy_verified(
     Bei Schreibfehler, vollem Datenträger oder fehlenden Rechten bleibt eine
     bestehende Zieldatei unangetastet. Die temporäre Datei wird vor
     ``os.replace`` geflusht, gehasht und mit restriktiven Rechten versehen.
+    Bei einer ``.enc`` wird das Änderungsjournal des alten Stands gelöscht.
     """
     source = Path(source)
     destination = Path(destination)
@@ -156,12 +151,43 @@ def atomic_copy_verified(
         _secure_bundle_file(tmp)
         os.replace(str(tmp), str(destination))
         _secure_bundle_file(destination)
+        if destination.suffix == ".enc":
+            from model.encrypted_journal import discard_journal
+
+            discard_journal(destination)
         _fsync_directory(destination.parent)
         return destination
     finally:
         tmp.unlink(missing_ok=True)
 
 
+def sqlite_backup_copy(source_db: Path, dest: Path) -> Path:
+    """Kopiert eine SQLite-Datenbank über die Online-Backup-API nach ``dest``.
+
+    Liest durch SQLite statt Dateibytes: Seiten, die noch im ``-wal`` stehen,
+    sind dabei, halb geschriebene nicht - auch wenn die App die Datenbank
+    gerade offen hat.
+    """
+    src = sqlite3.connect(f"{Path(source_db).resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        dst = sqlite3.connect(str(dest))
+        try:
+            src.backup(dst)
+        finally:
+            dst.close()
+    finally:
+        src.close()
+    return dest
+
+
+def _has_pending_wal(source_db: Path) -> bool:
+    wal = source_db.with_name(source_db.name + "-wal")
+    try:
+        return wal.stat().st_size > 0
+    except OSError:
+        return False
+
+
 def _read_small_file(path: Path, limit: int, label: str) -> bytes:
     size = path.stat().st_size
     if size > limit:
@@ -374,35 +400,29 @@ def create_bundle(
     )
     has_users = users_bytes is not None
 
-    sha = _sha256_file(source_db)
-    manifest = BundleManifest(
-        created_at=datetime.now().isoformat(timespec="seconds"),
-        app=app,
-        app_version=app_version,
-        db_file=db_file,
-        encryption=enc,
-        sha256=sha,
-        source_db_name=source_db.name,
-        note=note or "",
-        has_settings=has_settings,
-        has_users=has_users,
-        settings_sha256=(
-            _sha256_bytes(settings_bytes) if settings_bytes is not None else ""
-        ),
-        users_sha256=_sha256_bytes(users_bytes) if users_bytes is not None else "",
-    )
-
     tmp = out_path.with_suffix(out_path.suffix + ".tmp")
     if tmp.exists():
         tmp.unlink(missing_ok=True)
 
+    snapshot_dir: tempfile.TemporaryDirectory[str] | None = None
+    image = source_db
+    if enc == "db" and _has_pending_wal(source_db):
+        # Die Datei allein ist ohne ihr -wal nicht der aktuelle Stand; ein
+        # Schnappschuss über SQLite nimmt beides konsistent mit.
+        snapshot_dir = tempfile.TemporaryDirectory(dir=out_path.parent)
+        image = sqlite_backup_copy(source_db, Path(snapshot_dir.name) / "snapshot.db")
+
     try:
         with zipfile.ZipFile(tmp, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-            zf.writestr(
-                "manifest.json",
-                json.dumps(manifest.__dict__, indent=2, ensure_ascii=False),
-            )
-            zf.write(source_db, arcname=db_file)
+            # Prüfsumme im selben Durchlauf wie das Einpacken - die DB wird
+            # nur einmal gelesen. Das Manifest kommt deshalb zuletzt ins ZIP.
+            digest = hashlib.sha256()
+            with open(image, "rb") as src, zf.open(
+                db_file, "w", force_zip64=True
+            ) as dst:
+                for chunk in iter(lambda: src.read(1024 * 1024), b""):
+                    digest.update(chunk)
+                    dst.write(chunk)
             if settings_bytes is not None:
                 zf.writestr("settings.json", settings_bytes)
                 logger.debug("Settings in Backup aufgenommen: %s", settings_file)
@@ -412,6 +432,28 @@ def create_bundle(
                     "Passender Konto-Eintrag aus users.json in Backup aufgenommen: %s",
                     users_file,
                 )
+            manifest = BundleManifest(
+                created_at=datetime.now().isoformat(timespec="seconds"),
+                app=app,
+                app_version=app_version,
+                db_file=db_file,
+                encryption=enc,
+                sha256=digest.hexdigest(),
+                source_db_name=source_db.name,
+                note=note or "",
+                has_settings=has_settings,
+                has_users=has_users,
+                settings_sha256=(
+                    _sha256_bytes(settings_bytes) if settings_bytes is not None else ""
+                ),
+                users_sha256=(
+                    _sha256_bytes(users_bytes) if users_bytes is not None else ""
+                ),
+            )
+            zf.writestr(
+                "manifest.json",
+                json.dumps(manifest.__dict__, indent=2, ensure_ascii=False),
+            )
 
         # Das gerade erzeugte Bundle vor der Installation selbst verifizieren.
         # So kann weder ein Teilarchiv noch ein fehlerhaftes Manifest als Backup
@@ -425,6 +467,8 @@ def create_bundle(
         _secure_bundle_file(out_path)
     finally:
         tmp.unlink(missing_ok=True)
+        if snapshot_dir is not None:
+            snapshot_dir.cleanup()
     logger.info(
         "Backup erstellt: %s (DB: %s, Settings: %s, Users: %s)",
         out_path.name,
@@ -381,7 +381,6 @@ class SavingsGoalsModel:
                     STATUS_SAVING,
                 ),
             )
-        self.conn.commit()
         goal_id = int(cur.lastrowid)
         try:
             row = self._snapshot(goal_id)
@@ -389,6 +388,7 @@ class SavingsGoalsModel:
                 self.undo.record_operation("savings_goals", "INSERT", None, dict(row))
         except Exception as exc:
             logger.debug("savings_goals create undo: %s", exc)
+        self.conn.commit()
         return goal_id
 
     def list_all(self) -> List[SavingsGoal]:
@@ -489,7 +489,6 @@ class SavingsGoalsModel:
             f"UPDATE savings_goals SET {', '.join(updates)} WHERE id=?",  # nosec B608
             params,
         )
-        self.conn.commit()
         try:
             new_row = self._snapshot(goal_id)
             if old_row and new_row:
@@ -498,6 +497,7 @@ class SavingsGoalsModel:
                 )
         except Exception as exc:
             logger.debug("savings_goals update undo: %s", exc)
+        self.conn.commit()
 
     def add_progress(self, goal_id: int, amount: float) -> None:
         """Manuelle Einzahlung bzw. Korrektur, niemals ein Bezug.
@@ -537,7 +537,6 @@ class SavingsGoalsModel:
     def delete(self, goal_id: int) -> None:
         old_row = self._snapshot(goal_id)
         self.conn.execute("DELETE FROM savings_goals WHERE id=?", (goal_id,))
-        self.conn.commit()
         try:
             if old_row:
                 self.undo.record_operation(
@@ -545,6 +544,7 @@ class SavingsGoalsModel:
                 )
         except Exception as exc:
             logger.debug("savings_goals delete undo: %s", exc)
+        self.conn.commit()
 
     def release_partial(self, goal_id: int, amount: float) -> Optional[SavingsGoal]:
         """Gibt einen Teilbetrag frei, ohne das Ziel zu beenden."""
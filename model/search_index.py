@@ -0,0 +1,372 @@
+"""Volltextindex für Buchungen, Kategorien, Tags und Sparziele (``search_index``).
+
+Der Freitextfilter der Tracking-Ansicht und die globale Suche (Strg+F)
+liefen als ``LIKE '%…%'`` über ``tracking.details`` und die Kategorienamen
+- bei jedem Tastendruck ein Durchlauf über die ganze Tabelle.
+
+``search_index`` ist eine FTS5-Tabelle mit einer Zeile je Quelle:
+
+  ``kind``   ``tracking`` / ``category`` / ``tag`` / ``savings_goal``
+  ``typ``    Typ der Buchung bzw. Kategorie, sonst leer
+  ``title``  Kategorie (Buchung) bzw. Name
+  ``body``   Details (Buchung), Aktionstext (Tag), Kategorie und Notizen
+             (Sparziel)
+
+Die ``rowid`` kodiert die Quelle: ``id * 8 + Art``. Die Trigger auf den
+vier Tabellen löschen und schreiben damit über den Schlüssel des Index,
+ohne ihn zu durchsuchen. Wie bei ``monthly_totals`` pflegen Trigger den
+Index und nicht die Modelle, damit Undo, Importe und Reparaturen ihn nicht
+umgehen; :func:`rebuild_search_index` baut ihn neu auf.
+
+Gesucht wird nach Wortanfängen ("mig" findet "Migros"), alle Wörter müssen
+vorkommen, sortiert nach ``bm25``. Damit Teilwörter wie beim früheren
+``LIKE`` weiter treffen ("gros" findet "Migros"), hält ``search_trigram``
+(Tokenizer ``trigram``) dieselben Texte; ein Wort ab drei Zeichen trifft
+dort auch mitten im Wort. Solche Treffer hängt :func:`search` hinter die
+nach Relevanz sortierten an. Ohne FTS5 im SQLite der Plattform gibt es
+keinen Index; :func:`search` und :func:`tracking_search_clause` fallen dann
+auf die bisherige ``LIKE``-Suche zurück. Ohne ``trigram`` (SQLite vor 3.34) bleibt es bei Wortanfängen.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import sqlite3
+from dataclasses import dataclass
+from typing import Iterable
+
+logger = logging.getLogger(__name__)
+
+KIND_TRACKING = "tracking"
+KIND_CATEGORY = "category"
+KIND_TAG = "tag"
+KIND_SAVINGS_GOAL = "savings_goal"
+
+#: Art -> Rest der ``rowid`` modulo 8.
+KINDS = {KIND_TRACKING: 0, KIND_CATEGORY: 1, KIND_TAG: 2, KIND_SAVINGS_GOAL: 3}
+
+#: Schattentabellen von FTS5; sie gehören dem Index und werden nie direkt
+#: beschrieben (etwa beim Zurücksetzen aller Tabellen).
+SHADOW_TABLES = frozenset(
+    f"{table}_{suffix}"
+    for table in ("search_index", "search_trigram")
+    for suffix in ("data", "idx", "content", "docsize", "config")
+)
+
+#: Kürzere Wörter trifft ``search_trigram`` nicht; sie bleiben Wortanfänge.
+TRIGRAM_MIN_CHARS = 3
+
+_TABLE_DDL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+    kind UNINDEXED,
+    typ UNINDEXED,
+    title,
+    body,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+)
+"""
+
+_TRIGRAM_DDL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS search_trigram USING fts5(
+    title,
+    body,
+    tokenize = 'trigram'
+)
+"""
+
+# Je Quelle: Tabelle, Spalten für (typ, title, body), überwachte Spalten.
+_SOURCES = {
+    KIND_TRACKING: (
+        "tracking",
+        "{row}.typ",
+        "{row}.category",
+        "COALESCE({row}.details, '')",
+        "typ, category, details",
+    ),
+    KIND_CATEGORY: ("categories", "{row}.typ", "{row}.name", "''", "typ, name"),
+    KIND_TAG: (
+        "tags",
+        "''",
+        "{row}.name",
+        "COALESCE({row}.action_text, '')",
+        "name, action_text",
+    ),
+    KIND_SAVINGS_GOAL: (
+        "savings_goals",
+        "''",
+        "{row}.name",
+        "TRIM(COALESCE({row}.category, '') || ' ' || COALESCE({row}.notes, ''))",
+        "name, category, notes",
+    ),
+}
+
+
+def _insert(kind: str, row: str, trigram: bool = False) -> str:
+    _table, typ, title, body, _watched = _SOURCES[kind]
+    rowid = f"{row}.id * 8 + {KINDS[kind]}"
+    title, body = title.format(row=row), body.format(row=row)
+    sql = (
+        "INSERT INTO search_index(rowid, kind, typ, title, body) VALUES ("
+        f"{rowid}, '{kind}', {typ.format(row=row)}, {title}, {body});"
+    )
+    if trigram:
+        sql += (
+            "INSERT INTO search_trigram(rowid, title, body) VALUES ("
+            f"{rowid}, {title}, {body});"
+        )
+    return sql
+
+
+def _delete(kind: str, row: str, trigram: bool = False) -> str:
+    where = f"WHERE rowid = {row}.id * 8 + {KINDS[kind]};"
+    sql = f"DELETE FROM search_index {where}"
+    if trigram:
+        sql += f"DELETE FROM search_trigram {where}"
+    return sql
+
+
+def _triggers(trigram: bool = False) -> dict[str, tuple[str, str]]:
+    triggers: dict[str, tuple[str, str]] = {}
+    for kind, (table, _typ, _title, _body, watched) in _SOURCES.items():
+        triggers[f"trg_search_index_{table}_ins"] = (
+            f"AFTER INSERT ON {table}",
+            _insert(kind, "NEW", trigram),
+        )
+        triggers[f"trg_search_index_{table}_del"] = (
+            f"AFTER DELETE ON {table}",
+            _delete(kind, "OLD", trigram),
+        )
+        triggers[f"trg_search_index_{table}_upd"] = (
+            f"AFTER UPDATE OF id, {watched} ON {table}",
+            _delete(kind, "OLD", trigram) + _insert(kind, "NEW", trigram),
+        )
+    return triggers
+
+
+def install_search_index(conn: sqlite3.Connection) -> bool:
+    """Legt Index und Trigger an und füllt den Index (idempotent).
+
+    Returns: ``False``, wenn SQLite ohne FTS5 gebaut ist - dann bleibt die
+    DB unverändert und die Suche beim ``LIKE``.
+    """
+    try:
+        conn.execute(_TABLE_DDL)
+    except sqlite3.OperationalError as exc:
+        logger.info("Volltextindex nicht verfügbar (FTS5 fehlt): %s", exc)
+        return False
+    try:
+        conn.execute(_TRIGRAM_DDL)
+        trigram = True
+    except sqlite3.OperationalError as exc:
+        logger.info("Teilwortsuche nicht verfügbar (trigram fehlt): %s", exc)
+        trigram = False
+    for name, (event, body) in _triggers(trigram).items():
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+        conn.execute(f"CREATE TRIGGER {name} {event} FOR EACH ROW BEGIN {body} END")
+    rebuild_search_index(conn)
+    return True
+
+
+def rebuild_search_index(conn: sqlite3.Connection) -> int:
+    """Baut ``search_index`` (und ``search_trigram``) aus den vier
+    Quelltabellen neu auf.
+
+    Returns: Anzahl Einträge danach.
+    """
+    conn.execute("DELETE FROM search_index")
+    for kind, (table, typ, title, body, _watched) in _SOURCES.items():
+        row = "src"
+        conn.execute(
+            "INSERT INTO search_index(rowid, kind, typ, title, body) "  # nosec B608
+            f"SELECT {row}.id * 8 + {KINDS[kind]}, '{kind}', "
+            f"{typ.format(row=row)}, {title.format(row=row)}, {body.format(row=row)} "
+            f"FROM {table} AS {row}"
+        )
+    if has_trigram_index(conn):
+        conn.execute("DELETE FROM search_trigram")
+        conn.execute(
+            "INSERT INTO search_trigram(rowid, title, body) "
+            "SELECT rowid, title, body FROM search_index"
+        )
+    found = conn.execute("SELECT COUNT(*) FROM search_index").fetchone()
+    return int(found[0]) if found else 0
+
+
+def has_search_index(conn: sqlite3.Connection) -> bool:
+    """True, wenn die DB den gepflegten Index hat (Schema ab v20 mit FTS5)."""
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='trigger' AND name=?",
+        ("trg_search_index_tracking_ins",),
+    ).fetchone()
+    return row is not None
+
+
+def has_trigram_index(conn: sqlite3.Connection) -> bool:
+    """True, wenn ``search_trigram`` existiert (FTS5 mit trigram-Tokenizer)."""
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='search_trigram'"
+    ).fetchone()
+    return row is not None
+
+
+def match_query(text: str) -> str | None:
+    """Übersetzt Suchtext in einen FTS5-Ausdruck: jedes Wort als Präfix.
+
+    Operatoren und Anführungszeichen des Nutzers werden nicht interpretiert.
+    ``None``, wenn der Text keine Wortzeichen enthält.
+    """
+    words = re.findall(r"\w+", str(text or "").lower())
+    if not words:
+        return None
+    return " ".join(f'"{w}"*' for w in words)
+
+
+def _words(text: str) -> list[str]:
+    return re.findall(r"\w+", str(text or "").lower())
+
+
+def _rowid_query(conn: sqlite3.Connection, text: str) -> tuple[str, list[object]]:
+    """``SELECT rowid`` aller Einträge, in denen jedes Wort vorkommt.
+
+    Je Wort trifft ein Wortanfang in ``search_index`` oder, ab
+    :data:`TRIGRAM_MIN_CHARS` Zeichen, ein Teilwort in ``search_trigram``.
+    """
+    trigram = has_trigram_index(conn)
+    selects: list[str] = []
+    params: list[object] = []
+    for word in _words(text):
+        select = "SELECT rowid FROM search_index WHERE search_index MATCH ?"
+        params.append(f'"{word}"*')
+        if trigram and len(word) >= TRIGRAM_MIN_CHARS:
+            select += (
+                " UNION SELECT rowid FROM search_trigram WHERE search_trigram MATCH ?"
+            )
+            params.append(f'"{word}"')
+        selects.append(select)
+    first, *rest = selects
+    sql = f"SELECT rowid FROM ({first})"
+    if rest:
+        sql += " WHERE " + " AND ".join(f"rowid IN ({sel})" for sel in rest)
+    return sql, params
+
+
+def tracking_search_clause(
+    conn: sqlite3.Connection, text: str
+) -> tuple[str, list[object]]:
+    """WHERE-Teil für ``tracking``: Suchtext in Details oder Kategorie."""
+    if match_query(text) is not None and has_search_index(conn):
+        rowids, params = _rowid_query(conn, text)
+        return (
+            f"id IN (SELECT rowid / 8 FROM ({rowids}) "
+            f"WHERE rowid % 8 = {KINDS[KIND_TRACKING]})",
+            params,
+        )
+    pattern = f"%{str(text).lower()}%"
+    return "(LOWER(details) LIKE ? OR LOWER(category) LIKE ?)", [pattern, pattern]
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    """Ein Treffer von :func:`search`; ``rank`` ist bm25 (kleiner = besser)."""
+
+    kind: str
+    ref_id: int
+    typ: str
+    title: str
+    body: str
+    rank: float = 0.0
+
+
+def search(
+    conn: sqlite3.Connection,
+    text: str,
+    kinds: Iterable[str] | None = None,
+    limit: int = 200,
+) -> list[SearchHit]:
+    """Treffer für ``text`` in den gewünschten Arten, beste zuerst.
+
+    Reine Teilworttreffer (nur über ``search_trigram``) folgen nach den
+    Wortanfängen, zuletzt angelegte zuerst, mit ``rank`` 0. Ohne Index (kein FTS5) dieselben Quellen per ``LIKE``, Buchungen dann
+    neueste zuerst.
+    """
+    wanted = [k for k in (kinds or KINDS) if k in KINDS]
+    if not wanted:
+        return []
+    limit = max(1, int(limit))
+    expression = match_query(text)
+    if expression is not None and has_search_index(conn):
+        placeholders = ",".join("?" * len(wanted))
+        cur = conn.execute(
+            "SELECT kind, rowid / 8, typ, title, body, rank "  # nosec B608
+            "FROM search_index WHERE search_index MATCH ? "
+            f"AND kind IN ({placeholders}) ORDER BY rank LIMIT ?",
+            (expression, *wanted, limit),
+        )
+        hits = [
+            SearchHit(
+                str(k), int(i), str(t or ""), str(ti or ""), str(b or ""), float(r)
+            )
+            for k, i, t, ti, b, r in cur.fetchall()
+        ]
+        if len(hits) < limit and has_trigram_index(conn):
+            hits.extend(_search_substrings(conn, str(text), wanted, hits, limit))
+        return hits
+    return _search_like(conn, str(text or ""), wanted, limit)
+
+
+def _search_substrings(
+    conn: sqlite3.Connection,
+    text: str,
+    kinds: list[str],
+    found: list[SearchHit],
+    limit: int,
+) -> list[SearchHit]:
+    rowids, params = _rowid_query(conn, text)
+    seen = {hit.ref_id * 8 + KINDS[hit.kind] for hit in found}
+    remainders = ",".join(str(KINDS[k]) for k in kinds)
+    cur = conn.execute(
+        "SELECT kind, rowid / 8, typ, title, body FROM search_index "  # nosec B608
+        f"WHERE rowid IN ({rowids}) AND rowid % 8 IN ({remainders}) "
+        "ORDER BY rowid DESC",
+        params,
+    )
+    hits: list[SearchHit] = []
+    for k, i, t, ti, b in cur:
+        if int(i) * 8 + KINDS[str(k)] in seen:
+            continue
+        hits.append(
+            SearchHit(str(k), int(i), str(t or ""), str(ti or ""), str(b or ""))
+        )
+        if len(found) + len(hits) >= limit:
+            break
+    return hits
+
+
+def _search_like(
+    conn: sqlite3.Connection, text: str, kinds: list[str], limit: int
+) -> list[SearchHit]:
+    pattern = f"%{text.lower()}%"
+    hits: list[SearchHit] = []
+    for kind in kinds:
+        table, typ, title, body, _watched = _SOURCES[kind]
+        row = "src"
+        order = " ORDER BY src.date DESC, src.id DESC" if kind == KIND_TRACKING else ""
+        try:
+            cur = conn.execute(
+                f"SELECT src.id, {typ.format(row=row)}, {title.format(row=row)}, "  # nosec B608
+                f"{body.format(row=row)} FROM {table} AS {row} "
+                f"WHERE LOWER({title.format(row=row)}) LIKE ? "
+                f"OR LOWER({body.format(row=row)}) LIKE ?{order} LIMIT ?",
+                (pattern, pattern, limit),
+            )
+        except sqlite3.OperationalError as exc:
+            # Ältere DBs ohne Tabelle oder Spalte (z. B. tags.action_text).
+            logger.debug("LIKE-Suche in %s: %s", table, exc)
+            continue
+        hits.extend(
+            SearchHit(kind, int(i), str(t or ""), str(ti or ""), str(b or ""))
+            for i, t, ti, b in cur.fetchall()
+        )
+    return hits[:limit]
@@ -0,0 +1,208 @@
+"""Startphasen und Importzeiten (``--startup-profile``).
+
+``main()`` setzt an den Phasengrenzen eine Marke (:func:`mark`): Qt,
+Einstellungen, Datenbank, Migration, Import des Hauptfensters, Import der
+Tab-Module, Aufbau des Hauptfensters, erster Event-Loop-Durchlauf nach
+``show()`` (:func:`finish`). Die Phasen
+kosten ein paar ``perf_counter()``-Aufrufe, laufen immer mit und landen im
+Log und in ``performance.json`` des Diagnoseberichts.
+
+Mit ``--startup-profile`` misst :class:`ImportTimer` zusätzlich jeden
+Erstimport wie ``python -X importtime`` (eigene und kumulierte Zeit je
+Modul); :func:`finish` schreibt dann beides nach
+``diagnostics/startup_profile.json`` und als Tabelle auf stderr.
+
+Das Modul ist Qt-frei und importiert beim Laden nur die Standardbibliothek,
+damit es vor allem anderen geladen werden kann.
+"""
+
+from __future__ import annotations
+
+import builtins
+import json
+import logging
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+REPORT_FILENAME = "startup_profile.json"
+REPORT_TOP_IMPORTS = 40
+
+_t0 = time.perf_counter()
+_last = _t0
+_phases: list[dict[str, Any]] = []
+_import_timer: ImportTimer | None = None
+_finished = False
+
+
+class ImportTimer:
+    """Misst Erstimporte über ``builtins.__import__``.
+
+    Gezählt wird nur im installierenden Thread und nur, was noch nicht in
+    ``sys.modules`` steht. Eigene Zeit ist die kumulierte Zeit abzüglich der
+    darin geschachtelten Erstimporte. ``importlib.import_module`` umgeht
+    ``__import__`` und fehlt deshalb.
+    """
+
+    def __init__(self) -> None:
+        self._original: Callable[..., Any] = builtins.__import__
+        self._active = False
+        self._thread = 0
+        self._stack: list[float] = []
+        self.records: dict[str, tuple[float, float]] = {}
+
+    def install(self) -> None:
+        if self._active:
+            return
+        self._original = builtins.__import__
+        self._thread = threading.get_ident()
+        self._active = True
+        builtins.__import__ = self._import
+
+    def uninstall(self) -> None:
+        # Wer ``__import__`` nach uns ersetzt hat, ruft uns weiter auf; der
+        # Wrapper bleibt deshalb als reine Durchreichung funktionsfähig.
+        self._active = False
+        if builtins.__import__ == self._import:
+            builtins.__import__ = self._original
+
+    def _import(
+        self,
+        name: str,
+        globals: Any = None,
+        locals: Any = None,
+        fromlist: Any = (),
+        level: int = 0,
+    ) -> Any:
+        original = self._original
+        if (
+            not self._active
+            or level
+            or name in sys.modules
+            or threading.get_ident() != self._thread
+        ):
+            return original(name, globals, locals, fromlist, level)
+        self._stack.append(0.0)
+        started = time.perf_counter()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            cumulative = time.perf_counter() - started
+            nested = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += cumulative
+            self.records[name] = (cumulative - nested, cumulative)
+
+    def slowest(self, limit: int = REPORT_TOP_IMPORTS) -> list[dict[str, Any]]:
+        """Die Erstimporte mit der grössten kumulierten Zeit."""
+        ranked = sorted(self.records.items(), key=lambda kv: -kv[1][1])
+        return [
+            {
+                "module": name,
+                "self_ms": round(own * 1000.0, 3),
+                "cumulative_ms": round(total * 1000.0, 3),
+            }
+            for name, (own, total) in ranked[:limit]
+        ]
+
+
+def begin(*, import_timing: bool = False) -> None:
+    """Startet die Zeitmessung neu; mit ``import_timing`` auch die Importe."""
+    global _t0, _last, _import_timer, _finished
+    _t0 = _last = time.perf_counter()
+    _phases.clear()
+    _finished = False
+    if _import_timer is not None:
+        _import_timer.uninstall()
+    _import_timer = ImportTimer() if import_timing else None
+    if _import_timer is not None:
+        _import_timer.install()
+
+
+def mark(name: str) -> None:
+    """Schliesst die Phase seit der letzten Marke unter ``name`` ab."""
+    global _last
+    now = time.perf_counter()
+    _phases.append(
+        {
+            "phase": name,
+            "start_ms": round((_last - _t0) * 1000.0, 3),
+            "ms": round((now - _last) * 1000.0, 3),
+        }
+    )
+    _last = now
+
+
+def phases() -> list[dict[str, Any]]:
+    """Die bisher abgeschlossenen Phasen."""
+    return [dict(p) for p in _phases]
+
+
+def report() -> dict[str, Any]:
+    """Phasen (und, falls gemessen, die langsamsten Importe) als Dict."""
+    data: dict[str, Any] = {
+        "total_ms": round((_last - _t0) * 1000.0, 3),
+        "phases": phases(),
+    }
+    if _import_timer is not None:
+        data["imports"] = {
+            "count": len(_import_timer.records),
+            "slowest": _import_timer.slowest(),
+        }
+    return data
+
+
+def format_report(data: dict[str, Any]) -> str:
+    """Textfassung für stderr, Importe im Format von ``-X importtime``."""
+    lines = [f"Start bis erster Event-Loop-Durchlauf: {data['total_ms']:.1f} ms"]
+    for p in data["phases"]:
+        lines.append(f"  {p['ms']:9.1f} ms  {p['phase']}")
+    imports = data.get("imports")
+    if imports:
+        lines.append(f"Erstimporte: {imports['count']} (langsamste zuerst)")
+        lines.append("   self [ms] | cumulative [ms] | module")
+        for row in imports["slowest"]:
+            lines.append(
+                f"  {row['self_ms']:9.1f} | {row['cumulative_ms']:15.1f} | "
+                f"{row['module']}"
+            )
+    return "\n".join(lines)
+
+
+def finish(name: str = "first_event_loop") -> dict[str, Any]:
+    """Letzte Marke setzen, Importmessung beenden, Bericht ausgeben.
+
+    Nur beim ersten Aufruf nach :func:`begin`; danach liefert die Funktion
+    nur noch den Bericht.
+    """
+    global _finished
+    if _finished:
+        return report()
+    _finished = True
+    mark(name)
+    data = report()
+    logger.info(
+        "Start: %.1f ms (%s)",
+        data["total_ms"],
+        ", ".join(f"{p['phase']} {p['ms']:.0f}" for p in data["phases"]),
+    )
+    if _import_timer is None:
+        return data
+    _import_timer.uninstall()
+    from model.diagnostics import diagnostics_dir
+
+    data["created_at"] = datetime.now().isoformat(timespec="seconds")
+    path: Path = diagnostics_dir() / REPORT_FILENAME
+    try:
+        path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    except OSError as exc:
+        logger.warning("Startprofil nicht geschrieben: %s", exc)
+    else:
+        data["path"] = str(path)
+    print(format_report(data), file=sys.stderr)
+    return data
@@ -176,6 +176,35 @@ class TagsModel:
 
     # ── Entry-Tag-Verknüpfungen (Tracking ↔ Tags) ────────────
 
+    def tag_names_for_entries(self, entry_ids: List[int]) -> dict[int, List[str]]:
+        """Tag-Namen je Eintrag für viele Einträge auf einmal.
+
+        Für die seitenweise geladene Tracking-Tabelle: eine Abfrage je Seite
+        statt einer je Zeile. Einträge ohne Tags fehlen im Ergebnis.
+        """
+        result: dict[int, List[str]] = {}
+        ids = [int(i) for i in entry_ids]
+        try:
+            # In Blöcken unter SQLites Parametergrenze.
+            for start in range(0, len(ids), 500):
+                chunk = ids[start : start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                cur = self.conn.execute(
+                    f"""
+                    SELECT et.entry_id, t.name
+                    FROM entry_tags et
+                    JOIN tags t ON t.id = et.tag_id
+                    WHERE et.entry_id IN ({placeholders})
+                    ORDER BY et.entry_id, t.name
+                    """,  # nosec B608
+                    chunk,
+                )
+                for entry_id, name in cur.fetchall():
+                    result.setdefault(int(entry_id), []).append(str(name))
+        except sqlite3.OperationalError:
+            return {}
+        return result
+
     def assign_to_entry(self, entry_id: int, tag_id: int) -> None:
         """Weist einen Tag einem Tracking-Eintrag zu."""
         try:
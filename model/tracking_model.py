@@ -4,8 +4,11 @@ import logging
 logger = logging.getLogger(__name__)
 import re
 import sqlite3
-from dataclasses import dataclass
+from array import array
+from dataclasses import FrozenInstanceError, dataclass
 from datetime import date, timedelta, datetime
+from itertools import repeat
+from typing import Iterable
 
 """Tracking-Datenmodell.
 
@@ -26,6 +29,7 @@ from model.typ_constants import (
 )
 from model.database import db_transaction
 from model.date_ranges import month_bounds, year_bounds
+from model.search_index import tracking_search_clause
 from model.savings_goals_model import (
     SavingsGoalBoundsError,
     ACTION_CORRECTION,
@@ -38,15 +42,52 @@ from model.savings_goals_model import (
 )
 
 
-@dataclass(frozen=True)
 class TrackingRow:
+    """Eine Buchung, unveränderlich.
+
+    Von Hand mit ``__slots__`` statt als Dataclass: Übersicht und Tabelle
+    halten zehntausende Zeilen, ohne ``__dict__`` braucht jede nur noch gut
+    die Hälfte. ``d`` darf ein ``date`` oder ein ISO-String aus der DB sein;
+    geparst wird erst beim ersten Zugriff - Summen und Suche lesen das Datum
+    meist gar nicht.
+    """
+
+    __slots__ = ("id", "_d", "typ", "category", "amount", "details", "source")
+
     id: int
-    d: date
+    _d: date | str
     typ: str
     category: str
     amount: float
     details: str
-    source: str = "manual"
+    source: str
+
+    def __init__(
+        self,
+        id: int,
+        d: date | str,
+        typ: str,
+        category: str,
+        amount: float,
+        details: str,
+        source: str = "manual",
+    ) -> None:
+        setter = object.__setattr__
+        setter(self, "id", id)
+        setter(self, "_d", d)
+        setter(self, "typ", typ)
+        setter(self, "category", category)
+        setter(self, "amount", amount)
+        setter(self, "details", details)
+        setter(self, "source", source)
+
+    @property
+    def d(self) -> date:
+        value = self._d
+        if isinstance(value, str):
+            value = _from_iso(value)
+            object.__setattr__(self, "_d", value)
+        return value
 
     # Aliases für Kompatibilität mit verschiedenen Code-Teilen
     @property
@@ -59,6 +100,145 @@ class TrackingRow:
         """Alias für details - für Kompatibilität"""
         return self.details
 
+    def _key(self) -> tuple:
+        return (
+            self.id,
+            self.d,
+            self.typ,
+            self.category,
+            self.amount,
+            self.details,
+            self.source,
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, TrackingRow) or other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __repr__(self) -> str:
+        return (
+            f"TrackingRow(id={self.id!r}, d={self.d!r}, typ={self.typ!r}, "
+            f"category={self.category!r}, amount={self.amount!r}, "
+            f"details={self.details!r}, source={self.source!r})"
+        )
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise FrozenInstanceError(f"cannot assign to field {name!r}")
+
+    def __delattr__(self, name: str) -> None:
+        raise FrozenInstanceError(f"cannot delete field {name!r}")
+
+    def __reduce__(self) -> tuple:
+        return (self.__class__, self._key())
+
+
+@dataclass(frozen=True)
+class TrackingPage:
+    """Eine Seite aus :meth:`TrackingModel.page_filtered`."""
+
+    rows: list[TrackingRow]
+    cursor: tuple[str, int] | None
+
+
+@dataclass(frozen=True)
+class TrackingTotal:
+    """Summe einer (Typ, Kategorie)-Gruppe aus :meth:`TrackingModel.totals_filtered`.
+
+    ``amount`` heisst wie bei :class:`TrackingRow`, damit
+    ``coverage_from_tracking_rows`` die Gruppen direkt auswerten kann.
+    """
+
+    typ: str
+    category: str
+    count: int
+    amount: float
+
+
+class TrackingColumns:
+    """Treffer von :meth:`TrackingModel.fetch_columns`, spaltenweise.
+
+    Für Summen und Diagramme reichen Typ, Kategorie, Betrag und Datum; dafür
+    je Buchung ein Objekt anzulegen kostet bei zehntausenden Zeilen mehr als
+    die Abfrage selbst. Hier liegt jede Spalte als ``array`` (acht Byte je
+    Wert), Typ und Kategorie als Code in :attr:`typs` / :attr:`categories`.
+
+    ``days`` sind ``date.toordinal()``, ``months`` ``Jahr * 12 + Monat - 1``.
+    """
+
+    __slots__ = (
+        "ids",
+        "days",
+        "months",
+        "amounts",
+        "typ_codes",
+        "category_codes",
+        "typs",
+        "categories",
+    )
+
+    def __init__(self) -> None:
+        self.ids = array("q")
+        self.days = array("l")
+        self.months = array("l")
+        self.amounts = array("d")
+        self.typ_codes = array("l")
+        self.category_codes = array("l")
+        self.typs: list[str] = []
+        self.categories: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _sums(self, absolute: list[bool], by_month: bool) -> dict[tuple, float]:
+        # Erst über die Codes summieren, Namen nur je Gruppe auflösen.
+        acc: dict[tuple[int, int, int], float] = {}
+        months = self.months if by_month else repeat(0)
+        for t, c, m, a in zip(
+            self.typ_codes, self.category_codes, months, self.amounts
+        ):
+            key = (t, c, m)
+            acc[key] = acc.get(key, 0.0) + (abs(a) if absolute[t] else a)
+        typs = [normalize_typ(t) for t in self.typs]
+        out: dict[tuple, float] = {}
+        for (t, c, m), total in acc.items():
+            name: tuple = (typs[t], self.categories[c])
+            key = name + (m // 12, m % 12 + 1) if by_month else name
+            out[key] = out.get(key, 0.0) + total
+        return out
+
+    def actual_sums(self, by_month: bool = False) -> dict[tuple, float]:
+        """Ist-Werte je ``(typ, category)`` wie in Übersicht und Budgettabelle:
+        Ausgaben als Betrag, Einkommen und Ersparnisse mit Vorzeichen.
+
+        Mit ``by_month`` je ``(typ, category, year, month)``.
+        """
+        absolute = [normalize_typ(t) == TYP_EXPENSES for t in self.typs]
+        return self._sums(absolute, by_month)
+
+    def absolute_sums(self) -> dict[tuple, float]:
+        """Summe der Beträge (absolut) je ``(typ, category)`` für Rankings."""
+        return self._sums([True] * len(self.typs), False)
+
+
+@dataclass(frozen=True)
+class NewTrackingEntry:
+    """Eine neue Buchung für :meth:`TrackingModel.add_many`.
+
+    Felder wie die Parameter von :meth:`TrackingModel.add`.
+    """
+
+    d: date | str
+    typ: str
+    category: str
+    amount: float
+    details: str = ""
+    source: str = "manual"
+    savings_action: str | None = None
+
 
 def _to_date_iso(d: date | str) -> str:
     if isinstance(d, date):
@@ -141,6 +321,21 @@ class TrackingModel:
         except sqlite3.OperationalError:
             return []
 
+    def _entry_tag_ids_since(self, after_id: int) -> dict[int, list[int]]:
+        """Tag-Belegung aller Buchungen mit ``id > after_id`` für Undo/Redo."""
+        out: dict[int, list[int]] = {}
+        try:
+            rows = self.conn.execute(
+                "SELECT entry_id, tag_id FROM entry_tags "
+                "WHERE entry_id > ? ORDER BY entry_id, tag_id",
+                (int(after_id),),
+            ).fetchall()
+        except sqlite3.OperationalError:
+            return out
+        for entry_id, tag_id in rows:
+            out.setdefault(int(entry_id), []).append(int(tag_id))
+        return out
+
     def _category_tag_ids(self, typ: str, category: str) -> set[int]:
         """Gibt die fest an einer Kategorie hinterlegten Tag-IDs zurück."""
         try:
@@ -205,6 +400,28 @@ class TrackingModel:
             int(entry_id), new_typ=str(typ), new_category=str(category)
         )
 
+    def _attach_category_fixed_tags_since(self, after_id: int) -> None:
+        """Heftet die festen Kategorie-Tags an alle Buchungen mit ``id > after_id``.
+
+        Massenvariante von :meth:`_apply_category_fixed_tags`: ein Join statt
+        einer Tag-Abfrage und Einfügungen je Buchung.
+        """
+        try:
+            self.conn.execute(
+                """
+                INSERT OR IGNORE INTO entry_tags(entry_id, tag_id)
+                SELECT t.id, ct.tag_id
+                FROM tracking t
+                JOIN categories c ON c.typ = t.typ AND c.name = t.category
+                JOIN category_tags ct ON ct.category_id = c.id
+                WHERE t.id > ?
+                """,
+                (int(after_id),),
+            )
+        except sqlite3.OperationalError:
+            # Alte/teilmigrierte DBs ohne Tag-Tabellen: Tracking darf nicht crashen.
+            return
+
     def add(
         self,
         d: date | str,
@@ -247,20 +464,100 @@ class TrackingModel:
             self._apply_category_fixed_tags(rid, typ, category)
             if typ == TYP_SAVINGS:
                 self._sync_savings(category, amount, action=action, add=True)
+            # Undo-Eintrag in derselben Transaktion: ein Commit für beides.
+            try:
+                row = self.conn.execute(
+                    "SELECT * FROM tracking WHERE id=?", (rid,)
+                ).fetchone()
+                if row:
+                    new_data = dict(row)
+                    new_data["_tag_ids"] = self._entry_tag_ids(rid)
+                    self.undo.record_operation("tracking", "INSERT", None, new_data)
+            except Exception as exc:
+                logger.warning(
+                    "Undo-Recording fehlgeschlagen nach INSERT (id=%s): %s", rid, exc
+                )
+        return rid
 
-        try:
-            row = self.conn.execute(
-                "SELECT * FROM tracking WHERE id=?", (rid,)
-            ).fetchone()
-            if row:
-                new_data = dict(row)
-                new_data["_tag_ids"] = self._entry_tag_ids(rid)
-                self.undo.record_operation("tracking", "INSERT", None, new_data)
-        except Exception as exc:
-            logger.warning(
-                "Undo-Recording fehlgeschlagen nach INSERT (id=%s): %s", rid, exc
+    def add_many(self, entries: Iterable[NewTrackingEntry]) -> list[int]:
+        """Bucht viele Einträge in einer Transaktion; liefert die IDs in Reihenfolge.
+
+        Gleiche Wirkung wie :meth:`add` je Eintrag, aber ohne dessen Kosten
+        pro Zeile: Beträge und Sparziel-Grenzen werden vorab für den ganzen
+        Stapel geprüft (Sparziele mit der Summe je Kategorie), die Zeilen per
+        ``executemany`` eingefügt, feste Kategorie-Tags mit einem Join
+        angeheftet und die Sparziele einmal je Kategorie fortgeschrieben.
+        Undo erhält eine einzige Gruppe - ein Undo nimmt den ganzen Import
+        zurück. Am Ende steht genau ein Commit, im verschlüsselten Modus also
+        eine Sicherung. Scheitert etwas, bleibt die Datenbank unverändert.
+        """
+        from utils.money import require_finite_amount
+
+        has_source = self._has_source_col()
+        has_action = self._has_savings_action_col()
+        columns = ["date", "typ", "category", "amount", "details"]
+        if has_source:
+            columns.append("source")
+        if has_action:
+            columns.append("savings_action")
+
+        rows: list[tuple[object, ...]] = []
+        savings: dict[str, list[float]] = {}
+        for entry in entries:
+            amount = require_finite_amount(entry.amount, field="Buchungsbetrag")
+            action = self._normalize_savings_action(
+                entry.typ, float(amount), entry.savings_action
             )
-        return rid
+            if entry.typ == TYP_SAVINGS:
+                self._accumulate_savings_change(
+                    savings, entry.category, float(amount), action, factor=1.0
+                )
+            values: list[object] = [
+                _to_date_iso(entry.d),
+                entry.typ,
+                entry.category,
+                float(amount),
+                entry.details or "",
+            ]
+            if has_source:
+                values.append((entry.source or "manual").strip() or "manual")
+            if has_action:
+                values.append(action)
+            rows.append(tuple(values))
+        if not rows:
+            return []
+        self._validate_savings_changes(savings)
+
+        placeholders = ",".join("?" for _ in columns)
+        with db_transaction(self.conn):
+            before = int(
+                self.conn.execute(
+                    "SELECT COALESCE(MAX(id), 0) FROM tracking"
+                ).fetchone()[0]
+            )
+            self.conn.executemany(
+                f"INSERT INTO tracking({','.join(columns)}) VALUES({placeholders})",  # nosec B608
+                rows,
+            )
+            cur = self.conn.execute(
+                "SELECT * FROM tracking WHERE id > ? ORDER BY id", (before,)
+            )
+            names = [str(col[0]) for col in cur.description]
+            inserted = [dict(zip(names, row)) for row in cur.fetchall()]
+            if len(inserted) != len(rows):
+                raise sqlite3.IntegrityError(
+                    f"add_many: {len(rows)} Zeilen eingefügt, {len(inserted)} gefunden"
+                )
+            self._attach_category_fixed_tags_since(before)
+            self._apply_savings_changes(savings)
+
+            tag_ids = self._entry_tag_ids_since(before)
+            for data in inserted:
+                data["_tag_ids"] = tag_ids.get(int(data["id"]), [])
+            self.undo.record_operations(
+                "tracking", "INSERT", [(None, data) for data in inserted]
+            )
+        return [int(data["id"]) for data in inserted]
 
     def update(
         self,
@@ -332,21 +629,20 @@ class TrackingModel:
                 self._apply_category_fixed_tags(int(row_id), typ, category)
             if typ == TYP_SAVINGS:
                 self._sync_savings(category, amount, action=new_action, add=True)
-
-        try:
-            new_full = self.conn.execute(
-                "SELECT * FROM tracking WHERE id=?", (int(row_id),)
-            ).fetchone()
-            if old_full and new_full:
-                old_data = dict(old_full)
-                old_data["_tag_ids"] = old_tag_ids
-                new_data = dict(new_full)
-                new_data["_tag_ids"] = self._entry_tag_ids(int(row_id))
-                self.undo.record_operation("tracking", "UPDATE", old_data, new_data)
-        except Exception as exc:
-            logger.warning(
-                "Undo-Recording fehlgeschlagen nach UPDATE (id=%s): %s", row_id, exc
-            )
+            try:
+                new_full = self.conn.execute(
+                    "SELECT * FROM tracking WHERE id=?", (int(row_id),)
+                ).fetchone()
+                if old_full and new_full:
+                    old_data = dict(old_full)
+                    old_data["_tag_ids"] = old_tag_ids
+                    new_data = dict(new_full)
+                    new_data["_tag_ids"] = self._entry_tag_ids(int(row_id))
+                    self.undo.record_operation("tracking", "UPDATE", old_data, new_data)
+            except Exception as exc:
+                logger.warning(
+                    "Undo-Recording fehlgeschlagen nach UPDATE (id=%s): %s", row_id, exc
+                )
 
     def delete(self, row_id: int) -> None:
         old_full = self.conn.execute(
@@ -380,16 +676,15 @@ class TrackingModel:
                 old_action = self._tracking_row_savings_action(old_full)
                 if old_typ == TYP_SAVINGS:
                     self._sync_savings(old_cat, old_amt, action=old_action, add=False)
-
-        try:
-            if old_full:
-                old_data = dict(old_full)
-                old_data["_tag_ids"] = old_tag_ids
-                self.undo.record_operation("tracking", "DELETE", old_data, None)
-        except Exception as exc:
-            logger.warning(
-                "Undo-Recording fehlgeschlagen nach DELETE (id=%s): %s", row_id, exc
-            )
+            try:
+                if old_full:
+                    old_data = dict(old_full)
+                    old_data["_tag_ids"] = old_tag_ids
+                    self.undo.record_operation("tracking", "DELETE", old_data, None)
+            except Exception as exc:
+                logger.warning(
+                    "Undo-Recording fehlgeschlagen nach DELETE (id=%s): %s", row_id, exc
+                )
 
     def exists_in_month(
         self, *, year: int, month: int, typ: str, category: str
@@ -425,7 +720,7 @@ class TrackingModel:
             out.append(
                 TrackingRow(
                     int(r["id"]),
-                    _from_iso(r["date"]),
+                    str(r["date"]),
                     str(r["typ"]),
                     str(r["category"]),
                     float(r["amount"]),
@@ -454,7 +749,7 @@ class TrackingModel:
             out.append(
                 TrackingRow(
                     int(r["id"]),
-                    _from_iso(r["date"]),
+                    str(r["date"]),
                     str(r["typ"]),
                     str(r["category"]),
                     float(r["amount"]),
@@ -491,6 +786,185 @@ class TrackingModel:
             year: Filter nach Jahr
             tag_id: Filter nach Tag (entry_tags JOIN)
         """
+        clause = self._filter_clause(
+            typ=typ,
+            category=category,
+            categories=categories,
+            date_from=date_from,
+            date_to=date_to,
+            min_amount=min_amount,
+            max_amount=max_amount,
+            search_text=search_text,
+            year=year,
+            tag_id=tag_id,
+        )
+        if clause is None:
+            return []
+        where_clause, params = clause
+
+        query = f"""
+            SELECT id, date, typ, category, amount, COALESCE(details,'') AS details,
+                   {self._source_select_expr()}
+            FROM tracking
+            WHERE {where_clause}
+            ORDER BY date DESC, id DESC
+        """  # nosec B608
+
+        cur = self.conn.execute(query, tuple(params))
+        return [self._row_from_db(r) for r in cur.fetchall()]
+
+    def page_filtered(
+        self,
+        after: tuple[str, int] | None = None,
+        limit: int = 500,
+        **filters,
+    ) -> TrackingPage:
+        """Eine Seite von :meth:`list_filtered`, fortgesetzt hinter ``after``.
+
+        Keyset statt OFFSET: Die Seite beginnt direkt hinter dem Schlüssel
+        ``(date, id)`` der letzten Zeile der vorigen Seite, jede Seite kostet
+        damit gleich viel - auch weit hinten in 100k Buchungen.
+        ``TrackingPage.cursor`` ist ``None``, wenn nichts mehr kommt.
+        """
+        clause = self._filter_clause(**filters)
+        if clause is None:
+            return TrackingPage([], None)
+        where_clause, params = clause
+        if after is not None:
+            where_clause += " AND (date, id) < (?, ?)"
+            params.extend([str(after[0]), int(after[1])])
+        limit = max(1, int(limit))
+        cur = self.conn.execute(
+            f"""
+            SELECT id, date, typ, category, amount, COALESCE(details,'') AS details,
+                   {self._source_select_expr()}
+            FROM tracking
+            WHERE {where_clause}
+            ORDER BY date DESC, id DESC
+            LIMIT ?
+            """,  # nosec B608
+            (*params, limit),
+        )
+        raw = cur.fetchall()
+        rows = [self._row_from_db(r) for r in raw]
+        cursor = None
+        if len(raw) == limit:
+            cursor = (str(raw[-1]["date"]), int(raw[-1]["id"]))
+        return TrackingPage(rows, cursor)
+
+    def totals_filtered(self, **filters) -> list[TrackingTotal]:
+        """Summen je (Typ, Kategorie) über alle Treffer von :meth:`list_filtered`.
+
+        Für Summenzeile und Deckungswarnung, ohne die Buchungen zu laden.
+        """
+        clause = self._filter_clause(**filters)
+        if clause is None:
+            return []
+        where_clause, params = clause
+        cur = self.conn.execute(
+            f"""
+            SELECT typ, category, COUNT(*), COALESCE(SUM(amount), 0)
+            FROM tracking WHERE {where_clause}
+            GROUP BY typ, category
+            """,  # nosec B608
+            tuple(params),
+        )
+        return [
+            TrackingTotal(str(typ), str(cat), int(n), float(total))
+            for typ, cat, n, total in cur.fetchall()
+        ]
+
+    def fetch_columns(self, **filters) -> TrackingColumns:
+        """Treffer von :meth:`list_filtered` als :class:`TrackingColumns`.
+
+        Ohne ``TrackingRow`` je Buchung: Datum und Monat rechnet SQLite, die
+        Zeilen kommen als rohe Tupel und gehen direkt in die Arrays.
+        """
+        cols = TrackingColumns()
+        clause = self._filter_clause(**filters)
+        if clause is None:
+            return cols
+        where_clause, params = clause
+        cur = self.conn.cursor()
+        cur.row_factory = None
+        cur.execute(
+            f"""
+            SELECT id,
+                   COALESCE(CAST(julianday(date) - 1721424.5 AS INTEGER), 0),
+                   CAST(substr(date, 1, 4) AS INTEGER) * 12
+                       + CAST(substr(date, 6, 2) AS INTEGER) - 1,
+                   COALESCE(amount, 0), typ, category
+            FROM tracking
+            WHERE {where_clause}
+            ORDER BY date DESC, id DESC
+            """,  # nosec B608
+            tuple(params),
+        )
+        typ_codes: dict[str, int] = {}
+        cat_codes: dict[str, int] = {}
+        for chunk in iter(lambda: cur.fetchmany(5000), []):
+            ids, days, months, amounts, typs, cats = zip(*chunk)
+            cols.ids.extend(ids)
+            cols.days.extend(days)
+            cols.months.extend(months)
+            cols.amounts.extend(map(float, amounts))
+            cols.typ_codes.extend(typ_codes.setdefault(t, len(typ_codes)) for t in typs)
+            cols.category_codes.extend(
+                cat_codes.setdefault(c, len(cat_codes)) for c in cats
+            )
+        cols.typs = list(typ_codes)
+        cols.categories = list(cat_codes)
+        return cols
+
+    def list_by_ids(self, ids: list[int]) -> list[TrackingRow]:
+        """Buchungen zu ``ids`` in derselben Reihenfolge (fehlende entfallen).
+
+        Für Suchtreffer, die nach Relevanz statt nach Datum sortiert sind.
+        """
+        wanted = [int(i) for i in ids]
+        found: dict[int, TrackingRow] = {}
+        for start in range(0, len(wanted), 500):
+            chunk = wanted[start : start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            cur = self.conn.execute(
+                f"""
+                SELECT id, date, typ, category, amount,
+                       COALESCE(details,'') AS details, {self._source_select_expr()}
+                FROM tracking WHERE id IN ({placeholders})
+                """,  # nosec B608
+                chunk,
+            )
+            for r in cur.fetchall():
+                row = self._row_from_db(r)
+                found[row.id] = row
+        return [found[i] for i in wanted if i in found]
+
+    @staticmethod
+    def _row_from_db(r) -> TrackingRow:
+        return TrackingRow(
+            int(r["id"]),
+            str(r["date"]),
+            str(r["typ"]),
+            str(r["category"]),
+            float(r["amount"]),
+            str(r["details"] or ""),
+            str(r["source"] or "manual"),
+        )
+
+    def _filter_clause(
+        self,
+        typ: str | None = None,
+        category: str | None = None,
+        categories: list[str] | None = None,
+        date_from: date | str | None = None,
+        date_to: date | str | None = None,
+        min_amount: float | None = None,
+        max_amount: float | None = None,
+        search_text: str | None = None,
+        year: int | None = None,
+        tag_id: int | None = None,
+    ) -> tuple[str, list[object]] | None:
+        """WHERE-Klausel der Filter; ``None``, wenn nichts passen kann."""
         where_parts: list[str] = []
         params: list[object] = []
 
@@ -502,7 +976,7 @@ class TrackingModel:
         if categories is not None and not category:
             categories = [str(c).strip() for c in categories if str(c).strip()]
             if not categories:
-                return []
+                return None
 
         if category:
             where_parts.append("category = ?")
@@ -529,10 +1003,10 @@ class TrackingModel:
             params.append(float(max_amount))
 
         if search_text:
-            where_parts.append("(LOWER(details) LIKE ? OR LOWER(category) LIKE ?)")
-            search_pattern = f"%{search_text.lower()}%"
-            params.append(search_pattern)
-            params.append(search_pattern)
+            # Volltextindex (Wortanfänge), ohne FTS5 wie bisher per LIKE.
+            search_sql, search_params = tracking_search_clause(self.conn, search_text)
+            where_parts.append(search_sql)
+            params.extend(search_params)
 
         if year is not None:
             start, end = year_bounds(year)
@@ -547,31 +1021,7 @@ class TrackingModel:
             )
             params.append(int(tag_id))
 
-        where_clause = " AND ".join(where_parts) if where_parts else "1=1"
-
-        query = f"""
-            SELECT id, date, typ, category, amount, COALESCE(details,'') AS details,
-                   {self._source_select_expr()}
-            FROM tracking
-            WHERE {where_clause}
-            ORDER BY date DESC, id DESC
-        """  # nosec B608
-
-        cur = self.conn.execute(query, tuple(params))
-        out: list[TrackingRow] = []
-        for r in cur.fetchall():
-            out.append(
-                TrackingRow(
-                    int(r["id"]),
-                    _from_iso(r["date"]),
-                    str(r["typ"]),
-                    str(r["category"]),
-                    float(r["amount"]),
-                    str(r["details"] or ""),
-                    str(r["source"] or "manual"),
-                )
-            )
-        return out
+        return (" AND ".join(where_parts) if where_parts else "1=1"), params
 
     def category_usage_counts(
         self, typ: str | None = None, *, manual_only: bool = False
@@ -736,7 +1186,7 @@ class TrackingModel:
             out.append(
                 TrackingRow(
                     int(r["id"]),
-                    _from_iso(r["date"]),
+                    str(r["date"]),
                     str(r["typ"]),
                     str(r["category"]),
                     float(r["amount"]),
@@ -972,28 +1422,36 @@ class TrackingModel:
         )
         changes = {str(category): [stock_delta, contribution_delta, withdrawal_delta]}
         self._validate_savings_changes(changes)
+        self._apply_savings_changes(changes)
 
+    def _apply_savings_changes(self, changes: dict[str, list[float]]) -> None:
+        """Schreibt bereits geprüfte Deltas je Kategorie in die aktiven Sparziele."""
         flow_cols = {"contributed_amount", "withdrawn_amount"}.issubset(
             self._cols("savings_goals")
         )
-        for goal in self._active_goal_rows(category):
-            goal_id = int(goal[0])
-            if flow_cols:
-                self.conn.execute(
-                    """
-                    UPDATE savings_goals
-                    SET current_amount=current_amount+?,
-                        contributed_amount=contributed_amount+?,
-                        withdrawn_amount=withdrawn_amount+?
-                    WHERE id=?
-                    """,
-                    (stock_delta, contribution_delta, withdrawal_delta, goal_id),
-                )
-            else:
-                self.conn.execute(
-                    "UPDATE savings_goals SET current_amount=current_amount+? WHERE id=?",
-                    (stock_delta, goal_id),
-                )
+        for category, (
+            stock_delta,
+            contribution_delta,
+            withdrawal_delta,
+        ) in changes.items():
+            for goal in self._active_goal_rows(category):
+                goal_id = int(goal[0])
+                if flow_cols:
+                    self.conn.execute(
+                        """
+                        UPDATE savings_goals
+                        SET current_amount=current_amount+?,
+                            contributed_amount=contributed_amount+?,
+                            withdrawn_amount=withdrawn_amount+?
+                        WHERE id=?
+                        """,
+                        (stock_delta, contribution_delta, withdrawal_delta, goal_id),
+                    )
+                else:
+                    self.conn.execute(
+                        "UPDATE savings_goals SET current_amount=current_amount+? WHERE id=?",
+                        (stock_delta, goal_id),
+                    )
 
     def validate_savings_goal_booking(
         self, category: str, amount: float, action: str | None = None
@@ -6,6 +6,7 @@ logger = logging.getLogger(__name__)
 import json
 import re
 import sqlite3
+from model.database import db_transaction
 from model.typ_constants import TYP_SAVINGS
 from dataclasses import dataclass
 from datetime import datetime
@@ -24,6 +25,70 @@ class UndoRow:
     new_data: Optional[dict]
 
 
+#: Spalten, die ``_post_recalc`` bei Tracking-Updates auf beiden Seiten braucht.
+_TRACKING_CONTEXT = ("typ", "category", "amount", "savings_action")
+
+
+def _compact(
+    table_name: str,
+    operation: str,
+    old_data: Optional[dict],
+    new_data: Optional[dict],
+) -> tuple[Optional[dict], Optional[dict]]:
+    """Kürzt ein UPDATE auf die geänderten Spalten (plus ``id``).
+
+    Undo schreibt ``old_data``, Redo ``new_data`` per ``UPDATE ... SET``
+    zurück; unveränderte Spalten haben in beiden Richtungen ohnehin den
+    richtigen Wert. Tracking behält Typ/Kategorie/Betrag/Sparart, weil die
+    Sparziel-Korrektur nach Undo/Redo beide Seiten vollständig braucht.
+    INSERT und DELETE bleiben vollständige Zeilen.
+    """
+    if operation.upper() != "UPDATE" or not old_data or not new_data:
+        return old_data, new_data
+    keep = {"id"}
+    if table_name == "tracking":
+        keep.update(_TRACKING_CONTEXT)
+    changed = {
+        key
+        for key in old_data.keys() | new_data.keys()
+        if key in keep
+        or key not in old_data
+        or key not in new_data
+        or old_data[key] != new_data[key]
+    }
+    return (
+        {k: v for k, v in old_data.items() if k in changed},
+        {k: v for k, v in new_data.items() if k in changed},
+    )
+
+
+def install_undo_journal(conn: sqlite3.Connection) -> None:
+    """Fortlaufende Gruppennummer ``group_seq`` mit Index im undo_stack.
+
+    Bestehende Gruppen werden in der Reihenfolge ihres ersten Eintrags
+    durchnummeriert; Zeilen ohne ``group_id`` erhalten 0 und fallen beim
+    nächsten Kürzen als erste weg.
+    """
+    cols = {str(r[1]) for r in conn.execute("PRAGMA table_info(undo_stack)")}
+    if not cols:
+        return
+    if "group_seq" not in cols:
+        conn.execute("ALTER TABLE undo_stack ADD COLUMN group_seq INTEGER")
+        if "group_id" in cols:
+            groups = conn.execute(
+                "SELECT group_id FROM undo_stack WHERE group_id IS NOT NULL "
+                "GROUP BY group_id ORDER BY MIN(id)"
+            ).fetchall()
+            conn.executemany(
+                "UPDATE undo_stack SET group_seq=? WHERE group_id=?",
+                [(seq, row[0]) for seq, row in enumerate(groups, start=1)],
+            )
+        conn.execute("UPDATE undo_stack SET group_seq=0 WHERE group_seq IS NULL")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_undo_group_seq ON undo_stack(group_seq)"
+    )
+
+
 class UndoRedoModel:
     """Technisch sauberes Undo/Redo für DB-Operationen.
 
@@ -71,6 +136,7 @@ class UndoRedoModel:
 
     def __init__(self, conn: sqlite3.Connection):
         self.conn = conn
+        self._stack_cols_cache: dict[str, set[str]] = {}
         self._ensure_tables()
 
     # ------------------------------------------------------------
@@ -98,75 +164,59 @@ class UndoRedoModel:
         """Speichert eine Operation im undo_stack.
 
         operation: INSERT | UPDATE | DELETE | RENAME_CASCADE
-        """
-        gid = group_id or self.new_group_id()
-        ts = datetime.now().isoformat(sep=" ", timespec="seconds")
-
-        if clear_redo:
-            try:
-                self.conn.execute("DELETE FROM redo_stack")
-            except Exception as e:
-                logger.debug("self.conn.execute('DELETE FROM redo_stack'): %s", e)
-
-        # Dynamisch prüfen welche Spalten existieren und entsprechend einfügen
-        cols = self._cols("undo_stack")
-
-        # Basis-Werte
-        values = []
-        col_names = []
 
-        # ts oder timestamp (oder beide)
-        if "ts" in cols:
-            col_names.append("ts")
-            values.append(ts)
-        if "timestamp" in cols:
-            col_names.append("timestamp")
-            values.append(ts)
+        Läuft in der Transaktion des Aufrufers, wenn eine offen ist - die
+        Änderung und ihr Undo-Eintrag werden dann mit einem Commit fest.
+        Sonst committet die Methode einmal selbst.
+        """
+        self.record_operations(
+            table_name,
+            operation,
+            [(old_data, new_data)],
+            group_id=group_id,
+            clear_redo=clear_redo,
+        )
 
-        # group_id (optional in alten DBs)
-        if "group_id" in cols:
-            col_names.append("group_id")
-            values.append(gid)
+    def record_operations(
+        self,
+        table_name: str,
+        operation: str,
+        changes: list[tuple[Optional[dict], Optional[dict]]],
+        *,
+        group_id: Optional[str] = None,
+        clear_redo: bool = True,
+    ) -> str:
+        """Speichert viele Operationen als eine Undo-Gruppe.
 
-        # Pflichtfelder
-        col_names.extend(["table_name", "operation", "old_data", "new_data"])
-        values.extend(
-            [
-                str(table_name),
-                str(operation),
-                (
-                    json.dumps(old_data, ensure_ascii=False)
-                    if old_data is not None
-                    else None
-                ),
+        ``changes`` enthält ``(old_data, new_data)``-Paare. Wie
+        :meth:`record_operation` in der Transaktion des Aufrufers, damit
+        Massenimporte mit einem einzigen Commit (und einer einzigen
+        verschlüsselten Sicherung) auskommen. Liefert die ``group_id``.
+        """
+        gid = group_id or self.new_group_id()
+        if not changes:
+            return gid
+        ts = datetime.now().isoformat(sep=" ", timespec="seconds")
+        with db_transaction(self.conn):
+            if clear_redo:
+                self._clear_redo()
+            seq, new_group = self._group_seq(gid)
+            col_sql, placeholders, head = self._insert_head("undo_stack", ts, gid, seq)
+            self.conn.executemany(
+                f"INSERT INTO undo_stack({col_sql}) VALUES({placeholders})",  # nosec B608
                 (
-                    json.dumps(new_data, ensure_ascii=False)
-                    if new_data is not None
-                    else None
+                    head
+                    + self._undo_payload(
+                        table_name,
+                        operation,
+                        *_compact(table_name, operation, old, new),
+                    )
+                    for old, new in changes
                 ),
-            ]
-        )
-
-        placeholders = ",".join(["?"] * len(col_names))
-        col_sql = ",".join(col_names)
-
-        self.conn.execute(
-            f"INSERT INTO undo_stack({col_sql}) VALUES({placeholders})",  # nosec B608
-            values,
-        )
-        self.conn.commit()
-
-        # Pruning: Älteste Einträge entfernen wenn Stack > MAX_UNDO_ENTRIES
-        try:
-            self.conn.execute(
-                "DELETE FROM undo_stack WHERE group_id NOT IN ("
-                "  SELECT DISTINCT group_id FROM undo_stack "
-                "  ORDER BY id DESC LIMIT ?"
-                ")",
-                (self.MAX_UNDO_ENTRIES,),
             )
-        except Exception as e:
-            logger.debug("undo_stack pruning: %s", e)
+            if new_group:
+                self._prune_undo_stack(seq)
+        return gid
 
     def undo(self) -> bool:
         """Undoes the last group. Returns True if something changed."""
@@ -233,6 +283,99 @@ class UndoRedoModel:
     # ------------------------------------------------------------
     # Internal
     # ------------------------------------------------------------
+    def _clear_redo(self) -> None:
+        # Erst nachsehen: Ein DELETE auf den meist leeren Redo-Stapel wäre
+        # trotzdem ein Schreibzugriff.
+        if self.conn.execute("SELECT 1 FROM redo_stack LIMIT 1").fetchone():
+            self.conn.execute("DELETE FROM redo_stack")
+
+    def _group_seq(self, gid: str) -> tuple[Optional[int], bool]:
+        """Laufnummer der Gruppe ``gid`` und ob sie neu ist.
+
+        Gruppen im undo_stack sind fortlaufend nummeriert: Eine neue Gruppe
+        erhält ``MAX(group_seq) + 1``, weitere Zeilen derselben Gruppe deren
+        Nummer. Beide Abfragen gehen über Indizes. Ohne ``group_seq``-Spalte
+        (nicht migrierte DB) ``None``.
+        """
+        if "group_seq" not in self._stack_cols("undo_stack"):
+            return None, True
+        row = self.conn.execute(
+            "SELECT group_seq FROM undo_stack WHERE group_id=? LIMIT 1", (gid,)
+        ).fetchone()
+        if row is not None and row[0] is not None:
+            return int(row[0]), False
+        top = self.conn.execute("SELECT MAX(group_seq) FROM undo_stack").fetchone()
+        return int(top[0] or 0) + 1, True
+
+    def _stack_cols(self, table: str) -> set[str]:
+        cols = self._stack_cols_cache.get(table)
+        if cols is None:
+            cols = self._stack_cols_cache[table] = self._cols(table)
+        return cols
+
+    def _insert_head(
+        self, table: str, ts: str, gid: str, seq: Optional[int] = None
+    ) -> tuple[str, str, list]:
+        """Spalten und Kopfwerte für Stack-INSERTs (alte DBs: ohne ts/group_id)."""
+        cols = self._stack_cols(table)
+        col_names: list[str] = []
+        head: list = []
+        # ts oder timestamp (oder beide)
+        if "ts" in cols:
+            col_names.append("ts")
+            head.append(ts)
+        if "timestamp" in cols:
+            col_names.append("timestamp")
+            head.append(ts)
+        # group_id (optional in alten DBs)
+        if "group_id" in cols:
+            col_names.append("group_id")
+            head.append(gid)
+        if seq is not None and "group_seq" in cols:
+            col_names.append("group_seq")
+            head.append(seq)
+        # Pflichtfelder
+        col_names.extend(["table_name", "operation", "old_data", "new_data"])
+        return ",".join(col_names), ",".join(["?"] * len(col_names)), head
+
+    @staticmethod
+    def _undo_payload(
+        table_name: str,
+        operation: str,
+        old_data: Optional[dict],
+        new_data: Optional[dict],
+    ) -> list:
+        return [
+            str(table_name),
+            str(operation),
+            json.dumps(old_data, ensure_ascii=False) if old_data is not None else None,
+            json.dumps(new_data, ensure_ascii=False) if new_data is not None else None,
+        ]
+
+    def _prune_undo_stack(self, newest_seq: Optional[int]) -> None:
+        """Hält höchstens ``MAX_UNDO_ENTRIES`` Gruppen.
+
+        Über den Index auf ``group_seq`` ein Bereichs-DELETE am unteren Ende
+        statt eines Scans über den ganzen Stapel bei jedem Eintrag.
+        """
+        if newest_seq is None:
+            # Nicht migrierte DB ohne group_seq: wie früher über group_id.
+            if "group_id" not in self._stack_cols("undo_stack"):
+                return
+            self.conn.execute(
+                "DELETE FROM undo_stack WHERE group_id NOT IN ("
+                "  SELECT DISTINCT group_id FROM undo_stack "
+                "  ORDER BY id DESC LIMIT ?"
+                ")",
+                (self.MAX_UNDO_ENTRIES,),
+            )
+            return
+        if newest_seq > self.MAX_UNDO_ENTRIES:
+            self.conn.execute(
+                "DELETE FROM undo_stack WHERE group_seq <= ?",
+                (newest_seq - self.MAX_UNDO_ENTRIES,),
+            )
+
     def _ensure_tables(self) -> None:
         # undo_stack exists since v4, but we ensure columns for safety
         self.conn.execute(
@@ -241,6 +384,7 @@ class UndoRedoModel:
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 ts TEXT NOT NULL,
                 group_id TEXT,
+                group_seq INTEGER,
                 table_name TEXT NOT NULL,
                 operation TEXT NOT NULL,
                 old_data TEXT,
@@ -288,6 +432,7 @@ class UndoRedoModel:
                     "ALTER TABLE undo_stack ADD COLUMN ts: Spalte bereits vorhanden"
                 )
 
+        install_undo_journal(self.conn)
         self.conn.commit()
 
     def _cols(self, table: str) -> set[str]:
@@ -360,51 +505,15 @@ class UndoRedoModel:
         # for redo→undo we must not clear redo stack
         ts = datetime.now().isoformat(sep=" ", timespec="seconds")
         if clear_redo:
-            try:
-                self.conn.execute("DELETE FROM redo_stack")
-            except Exception as e:
-                logger.debug("self.conn.execute('DELETE FROM redo_stack'): %s", e)
-
-        # Dynamisch prüfen welche Spalten existieren
-        cols = self._cols(target_table)
-
-        values = []
-        col_names = []
-
-        if "ts" in cols:
-            col_names.append("ts")
-            values.append(ts)
-        if "timestamp" in cols:
-            col_names.append("timestamp")
-            values.append(ts)
-        if "group_id" in cols:
-            col_names.append("group_id")
-            values.append(r.group_id)
-
-        col_names.extend(["table_name", "operation", "old_data", "new_data"])
-        values.extend(
-            [
-                r.table_name,
-                r.operation,
-                (
-                    json.dumps(r.old_data, ensure_ascii=False)
-                    if r.old_data is not None
-                    else None
-                ),
-                (
-                    json.dumps(r.new_data, ensure_ascii=False)
-                    if r.new_data is not None
-                    else None
-                ),
-            ]
+            self._clear_redo()
+        seq = self._group_seq(r.group_id)[0] if target_table == "undo_stack" else None
+        col_sql, placeholders, head = self._insert_head(
+            target_table, ts, r.group_id, seq
         )
-
-        placeholders = ",".join(["?"] * len(col_names))
-        col_sql = ",".join(col_names)
-
         self.conn.execute(
             f"INSERT INTO {target_table}({col_sql}) VALUES({placeholders})",  # nosec B608
-            values,
+            head
+            + self._undo_payload(r.table_name, r.operation, r.old_data, r.new_data),
         )
 
     def _apply_inverse(self, r: UndoRow) -> None:
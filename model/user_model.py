@@ -47,6 +47,7 @@ from model.crypto import (
     SALT_LENGTH,
     PBKDF2_ITERATIONS,
 )
+from model.encrypted_journal import journal_path_for
 
 USERS_FILE = "users.json"
 
@@ -394,6 +395,7 @@ class UserModel:
         if delete_db and user.db_path.exists():
             try:
                 user.db_path.unlink()
+                journal_path_for(user.db_path).unlink(missing_ok=True)
             except Exception as e:
                 logger.error(
                     "DB-Datei löschen fehlgeschlagen — Benutzer wird nicht entfernt: %s",
@@ -6,8 +6,154 @@ import json
 
 from utils.cockpit_presets import PRESETS as _COCKPIT_PRESETS
 import os
+import threading
+import time
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
+
+#: Rückruf bei Änderungen: bekommt die geänderten Schlüssel.
+SettingsListener = Callable[[frozenset], None]
+
+# Jünger als das ist eine Datei "frisch": Ihr Zeitstempel kann noch mit einem
+# zweiten Schreiben im selben Takt zusammenfallen (FAT: 2 s), sie wird deshalb
+# neu gelesen statt aus dem Speicher bedient. Ausgenommen ist der Stand, den
+# ``save()`` selbst geschrieben hat: ``os.replace`` gibt der Datei einen neuen
+# Inode, ein späteres atomares Schreiben fällt also auch im selben Takt auf.
+_RACY_NS = 2_000_000_000
+
+
+class _SettingsStore:
+    """Prozessweiter Speicher der geladenen Einstellungsdateien.
+
+    ``Settings()`` wird im Modellcode an vielen Stellen mitten in Schleifen
+    gebaut und las jedes Mal die Datei, legte sie über die Defaults und
+    normalisierte das Zahlformat. Der Speicher hält je Datei das Ergebnis
+    samt Zeitstempel und Grösse; neue Instanzen bekommen eine eigene Kopie,
+    solange sich die Datei nicht geändert hat. ``save()`` trägt den neuen
+    Stand selbst ein und meldet die geänderten Schlüssel an die Zuhörer.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        # Pfad -> (Stempel, flache Werte, verschachtelte Werte als JSON,
+        # selbst geschrieben)
+        self.entries: dict[str, tuple[tuple, dict[str, Any], dict[str, str], bool]] = {}
+        self.listeners: list[SettingsListener] = []
+        self.disk_reads = 0
+        self.cache_hits = 0
+        self.saves = 0
+
+    @staticmethod
+    def stamp(path: Path) -> tuple | None:
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def lookup(self, path: Path) -> dict[str, Any] | None:
+        stamp = self.stamp(path)
+        if stamp is None:
+            return None
+        racy = time.time_ns() - stamp[0] < _RACY_NS
+        with self.lock:
+            entry = self.entries.get(str(path))
+            if entry is None or entry[0] != stamp or (racy and not entry[3]):
+                return None
+            self.cache_hits += 1
+            _stamp, flat, nested, _own = entry
+        # Verschachtelte Werte (Listen, dicts) bekommt jede Instanz frisch,
+        # damit Änderungen an ihnen nicht in fremde Instanzen durchschlagen.
+        return {**flat, **{k: json.loads(v) for k, v in nested.items()}}
+
+    def remember(
+        self,
+        path: Path,
+        stamp: tuple | None,
+        values: dict[str, Any],
+        own: bool = False,
+    ):
+        """Trägt einen Stand ein; gibt den vorherigen zurück (oder ``None``).
+
+        ``own``: Stand stammt aus ``save()`` und gilt auch als frische Datei.
+        """
+        flat: dict[str, Any] = {}
+        nested: dict[str, str] = {}
+        for key, value in values.items():
+            if isinstance(value, (dict, list)):
+                nested[key] = json.dumps(value, ensure_ascii=False)
+            else:
+                flat[key] = value
+        with self.lock:
+            old = self.entries.get(str(path))
+            if stamp is None:
+                self.entries.pop(str(path), None)
+            else:
+                self.entries[str(path)] = (stamp, flat, nested, own)
+        if old is None:
+            return None
+        return {**old[1], **{k: json.loads(v) for k, v in old[2].items()}}
+
+    def notify(self, changed: frozenset) -> None:
+        if not changed:
+            return
+        with self.lock:
+            listeners = list(self.listeners)
+        for listener in listeners:
+            try:
+                listener(changed)
+            except (AttributeError, KeyError, RuntimeError, TypeError, ValueError):
+                # Ein Zuhörer (etwa ein gelöschtes Widget) darf Speichern nicht
+                # abbrechen.
+                logger.warning("Einstellungs-Zuhörer fehlgeschlagen", exc_info=True)
+
+
+_store = _SettingsStore()
+
+
+def _changed_keys(old: dict[str, Any] | None, new: dict[str, Any]) -> frozenset:
+    if old is None:
+        return frozenset(new)
+    return frozenset(
+        key for key in old.keys() | new.keys() if old.get(key) != new.get(key)
+    )
+
+
+def add_settings_listener(listener: SettingsListener) -> None:
+    """Meldet ``listener(changed_keys)`` für jede gespeicherte Änderung an.
+
+    Auch Änderungen von aussen (andere Instanz der App, Handbearbeitung)
+    werden gemeldet, sobald sie beim nächsten ``Settings()`` auffallen.
+    Gerufen wird im Thread, der speichert oder liest; Widgets melden sich
+    deshalb über ``views.settings_relay`` an.
+    """
+    with _store.lock:
+        if listener not in _store.listeners:
+            _store.listeners.append(listener)
+
+
+def remove_settings_listener(listener: SettingsListener) -> None:
+    with _store.lock:
+        if listener in _store.listeners:
+            _store.listeners.remove(listener)
+
+
+def settings_cache_stats() -> dict[str, int]:
+    """Zähler für den Diagnosebericht (Dateizugriffe, Treffer, Speichervorgänge)."""
+    with _store.lock:
+        return {
+            "disk_reads": _store.disk_reads,
+            "cache_hits": _store.cache_hits,
+            "saves": _store.saves,
+            "files": len(_store.entries),
+            "listeners": len(_store.listeners),
+        }
+
+
+def clear_settings_cache() -> None:
+    """Vergisst alle geladenen Stände (nächstes ``Settings()`` liest neu)."""
+    with _store.lock:
+        _store.entries.clear()
 
 
 class Settings:
@@ -18,7 +164,18 @@ class Settings:
 
         # Portable: Settings liegen im ./data/ Ordner neben dem Programm
         self.settings_file = Path(settings_file) if settings_file else settings_path()
+        cached = _store.lookup(self.settings_file)
+        if cached is not None:
+            self.settings = cached
+            return
+        stamp = _store.stamp(self.settings_file)
         self.settings = self._load()
+        if stamp is not None:
+            # Stempel von vor dem Lesen: Ändert sich die Datei währenddessen,
+            # passt er nicht mehr und der nächste Aufruf liest neu.
+            old = _store.remember(self.settings_file, stamp, self.settings)
+            if old is not None:
+                _store.notify(_changed_keys(old, self.settings))
 
     def _load(self) -> dict[str, Any]:
         """Lädt Einstellungen aus Datei.
@@ -33,6 +190,8 @@ class Settings:
         defaults = self._defaults()
         if self.settings_file.exists():
             try:
+                with _store.lock:
+                    _store.disk_reads += 1
                 with open(self.settings_file, "r", encoding="utf-8") as f:
                     loaded = json.load(f)
                 if isinstance(loaded, dict):
@@ -283,6 +442,18 @@ class Settings:
             "auto_backup_keep": 10,
             # AutoBackup: bei Überschreitung älteste Backups automatisch löschen?
             "backup_auto_delete": False,
+            # AutoBackup ins deduplizierende Repository (backups/repository)
+            # statt als vollständiges .bmr: nur geänderte Blöcke kosten Platz.
+            "auto_backup_repository": False,
+            # Budget-Ampel (Cockpit) und KPI-Daten (Übersicht) im Hintergrund
+            # auf einer Lese-Connection rechnen statt im GUI-Thread.
+            "background_compute": True,
+            # Laufzeiten von Tabs, Sicherung und SQL-Anweisungen sammeln und
+            # als performance.json in den Diagnosebericht legen (kostet Zeit).
+            "performance_profiling": False,
+            # Verschlüsselter Modus: Commits sammelt ein Hintergrund-Thread und
+            # schreibt sie nach so vielen ms gebündelt. 0 = sofort im GUI-Thread.
+            "encrypted_autosave_delay_ms": 500,
             # Design/Theme (V2)
             "active_design_profile": "V2 Hell – Neon Cyan",
             "last_design_profile_hell": "V2 Hell – Neon Cyan",
@@ -320,6 +491,16 @@ class Settings:
             )
         except Exception as e:
             logger.error("Fehler beim Speichern der Einstellungen: %s", e)
+            return
+        with _store.lock:
+            _store.saves += 1
+        old = _store.remember(
+            self.settings_file,
+            _store.stamp(self.settings_file),
+            self.settings,
+            own=True,
+        )
+        _store.notify(_changed_keys(old, self.settings))
 
     def get(self, key: str, default: Any = None) -> Any:
         """Holt einen Wert"""
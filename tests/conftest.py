@@ -40,3 +40,29 @@ def _bruecken_register_isolieren(tmp_path_factory, monkeypatch):
     ziel = tmp_path_factory.mktemp("bridge-registry") / "bridges.json"
     monkeypatch.setenv("FPM_SUITE_BRIDGE_REGISTRY", str(ziel))
     yield
+
+
+@pytest.fixture
+def schluessel():
+    """``(db_key, salt)`` für eine verschlüsselte Test-Datenbank."""
+    import model.crypto as crypto
+
+    return crypto.generate_db_key(), crypto.generate_salt()
+
+
+@pytest.fixture
+def ausgabe():
+    """Bucht eine Ausgabe am 2026-07-04 und committet."""
+    from model.typ_constants import TYP_EXPENSES
+
+    def buchen(
+        conn, betrag: float = -20.0, *, category: str = "Hobby", details: str = ""
+    ) -> None:
+        conn.execute(
+            "INSERT INTO tracking(date, typ, category, amount, details) "
+            "VALUES ('2026-07-04', ?, ?, ?, ?)",
+            (TYP_EXPENSES, category, betrag, details),
+        )
+        conn.commit()
+
+    return buchen
@@ -0,0 +1,221 @@
+"""Rechendienst für Cockpit und Übersicht (``model.background_compute``).
+
+Budget-Ampel und KPI-Daten rechneten im GUI-Thread. Jetzt rechnet ein
+kleiner Thread-Pool auf eigenen Lese-Connections; überholte Aufträge werden
+abgesagt oder verworfen, und die Qt-Seite stellt Ergebnisse im GUI-Thread zu.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from model.background_compute import ComputeResult, ComputeService
+from model import crypto
+from model.database import EncryptedSession, open_db
+from model.migrations import migrate_all
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def _summe(conn) -> float:
+    return float(
+        conn.execute("SELECT COALESCE(SUM(amount), 0) FROM tracking").fetchone()[0]
+    )
+
+
+class _Sammler:
+    def __init__(self) -> None:
+        self.ergebnisse: list[ComputeResult] = []
+        self.fertig = threading.Event()
+
+    def __call__(self, result: ComputeResult) -> None:
+        self.ergebnisse.append(result)
+        self.fertig.set()
+
+    def warten(self) -> ComputeResult:
+        assert self.fertig.wait(10)
+        self.fertig.clear()
+        return self.ergebnisse[-1]
+
+
+@pytest.fixture
+def datei_conn(tmp_path):
+    c = open_db(str(tmp_path / "budget.db"))
+    migrate_all(c)
+    c.commit()
+    yield c
+    c.close()
+
+
+@pytest.fixture
+def speicher_conn():
+    c = sqlite3.connect(":memory:")
+    c.row_factory = sqlite3.Row
+    migrate_all(c)
+    c.commit()
+    yield c
+    c.close()
+
+
+def test_lese_connection_sieht_jeden_commit_und_schreibt_nicht(datei_conn, ausgabe):
+    service = ComputeService(datei_conn)
+    sammler = _Sammler()
+    try:
+        assert service.mode == "file"
+        ausgabe(datei_conn)
+        service.submit("summe", _summe, sammler)
+        assert sammler.warten().value == -20.0
+
+        ausgabe(datei_conn, -5.0)
+        service.submit("summe", _summe, sammler)
+        assert sammler.warten().value == -25.0
+
+        service.submit("schreiben", lambda c: ausgabe(c), sammler)
+        assert isinstance(sammler.warten().error, sqlite3.OperationalError)
+        assert _summe(datei_conn) == -25.0
+    finally:
+        service.shutdown()
+
+
+def test_speicher_db_rechnet_auf_einer_kopie(speicher_conn, ausgabe):
+    service = ComputeService(speicher_conn)
+    sammler = _Sammler()
+    try:
+        assert service.mode == "memory"
+        ausgabe(speicher_conn)
+        service.submit("summe", _summe, sammler)
+        assert sammler.warten().value == -20.0
+
+        service.submit("summe", _summe, sammler)
+        sammler.warten()
+        assert service.stats()["snapshots"] == 1  # nichts geändert: keine Kopie
+
+        ausgabe(speicher_conn, -1.0)
+        service.submit("summe", _summe, sammler)
+        assert sammler.warten().value == -21.0
+    finally:
+        service.shutdown()
+
+
+def test_verschluesselte_sitzung_reicht_ihr_abbild_weiter(
+    tmp_path, schluessel, ausgabe
+):
+    db_key, salt = schluessel
+    enc = tmp_path / "budget.enc"
+    crypto.create_empty_encrypted_db(enc, db_key, salt).close()
+    session = EncryptedSession.open_with_key(str(enc), db_key, salt)
+    migrate_all(session.conn)
+    session.conn.commit()
+    service = ComputeService(session.conn)
+    session.add_image_listener(service.offer_image)
+    sammler = _Sammler()
+    try:
+        ausgabe(session.conn)
+        service.submit("summe", _summe, sammler)
+        assert sammler.warten().value == -20.0
+        # Kein zweites serialize_db im GUI-Thread: das Abbild kam vom Speichern.
+        assert service.stats()["snapshots"] == 0
+        assert service.stats()["offered"] >= 1
+    finally:
+        service.shutdown()
+        session.close()
+
+
+def test_neuer_auftrag_verdraengt_den_alten(datei_conn):
+    service = ComputeService(datei_conn, max_workers=1)
+    sammler = _Sammler()
+    gestartet = threading.Event()
+    freigabe = threading.Event()
+
+    def blockieren(conn):
+        gestartet.set()
+        freigabe.wait(10)
+        return "blockiert"
+
+    try:
+        service.submit("anderer", blockieren, sammler)
+        assert gestartet.wait(10)
+        service.submit("kpis", lambda c: "alt", sammler)  # wartet noch
+        neu = service.submit("kpis", lambda c: "neu", sammler)
+        freigabe.set()
+
+        deadline = time.monotonic() + 10
+        while len(sammler.ergebnisse) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        werte = {(r.channel, r.value) for r in sammler.ergebnisse}
+        assert werte == {("anderer", "blockiert"), ("kpis", "neu")}
+        assert service.is_current("kpis", neu)
+        assert service.stats()["cancelled"] == 1
+    finally:
+        service.shutdown()
+
+
+def test_laufende_abfrage_wird_abgebrochen(datei_conn):
+    service = ComputeService(datei_conn)
+    sammler = _Sammler()
+    gestartet = threading.Event()
+
+    def endlos(conn):
+        gestartet.set()
+        return conn.execute(
+            "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n) "
+            "SELECT COUNT(*) FROM n"
+        ).fetchone()
+
+    try:
+        service.submit("kpis", endlos, sammler)
+        assert gestartet.wait(10)
+        time.sleep(0.05)
+        service.submit("kpis", lambda c: "neu", sammler)
+        assert sammler.warten().value == "neu"
+        assert service.stats()["interrupted"] == 1
+        assert [r.value for r in sammler.ergebnisse] == ["neu"]
+    finally:
+        service.shutdown()
+
+
+def test_offene_transaktion_rechnet_synchron(datei_conn):
+    service = ComputeService(datei_conn)
+    try:
+        datei_conn.execute("DELETE FROM tracking")
+        assert not service.can_submit()
+        with pytest.raises(RuntimeError):
+            service.submit("summe", _summe, _Sammler())
+        datei_conn.rollback()
+        assert service.can_submit()
+    finally:
+        service.shutdown()
+    assert not service.can_submit()
+
+
+def test_qt_stellt_im_gui_thread_zu_und_faellt_sonst_zurueck(datei_conn, ausgabe):
+    pytest.importorskip("PySide6.QtWidgets", reason="PySide6 Widgets fehlen")
+    from PySide6.QtWidgets import QApplication
+
+    from views.compute_bridge import QtComputeService
+
+    app = QApplication.instance() or QApplication([])
+    bridge = QtComputeService(datei_conn)
+    erhalten: list[tuple[object, bool]] = []
+    ausgabe(datei_conn)
+    try:
+
+        def merken(wert):
+            erhalten.append(
+                (wert, threading.current_thread() is threading.main_thread())
+            )
+
+        assert bridge.submit("summe", _summe, merken)
+        deadline = time.monotonic() + 10
+        while not erhalten and time.monotonic() < deadline:
+            app.processEvents()
+            time.sleep(0.01)
+        assert erhalten == [(-20.0, True)]
+    finally:
+        bridge.shutdown()
+    assert not bridge.submit("summe", _summe, merken)
@@ -0,0 +1,267 @@
+"""Deduplizierendes Sicherungs-Repository (``model.backup_store``).
+
+Jedes Auto-Backup packte die ganze Datenbank neu ein. Das Repository legt
+nur noch Blöcke ab, die es nicht schon hat; eine Sicherung ist ein kleines
+Manifest.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import time
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from model.backup_store import PENDING_STALE_SECONDS, BackupStore
+from model.restore_bundle import BundleIntegrityError, create_bundle, verify_bundle
+
+
+def _make_db(path: Path, rows: int = 3000) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE tracking(id INTEGER PRIMARY KEY, details TEXT)")
+    conn.executemany(
+        "INSERT INTO tracking(details) VALUES (?)",
+        ((f"Eintrag {i} " + "x" * 200,) for i in range(rows)),
+    )
+    conn.commit()
+    return conn
+
+
+def _snapshot(store: BackupStore, db: Path):
+    return store.snapshot_file(db, app="BudgetManager", app_version="test")
+
+
+def test_zweite_sicherung_speichert_nur_geaenderte_bloecke(tmp_path):
+    db = tmp_path / "budget.db"
+    conn = _make_db(db)
+    store = BackupStore(tmp_path / "repo")
+
+    erste = _snapshot(store, db)
+    assert erste.new_chunks == erste.chunks > 4
+
+    conn.execute("UPDATE tracking SET details = 'geaendert' WHERE id = 1500")
+    conn.commit()
+    zweite = _snapshot(store, db)
+    conn.close()
+
+    assert zweite.snapshot_id != erste.snapshot_id
+    assert 0 < zweite.new_chunks <= 2
+    assert zweite.new_bytes < erste.new_bytes / 4
+    assert [s["id"] for s in store.list_snapshots()] == [
+        zweite.snapshot_id,
+        erste.snapshot_id,
+    ]
+
+
+def test_sicherung_nimmt_wal_inhalt_mit(tmp_path):
+    db = tmp_path / "budget.db"
+    conn = _make_db(db, rows=10)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA wal_autocheckpoint=0")
+    conn.execute("INSERT INTO tracking(details) VALUES ('nur im WAL')")
+    conn.commit()
+    assert Path(f"{db}-wal").stat().st_size > 0
+
+    store = BackupStore(tmp_path / "repo")
+    result = _snapshot(store, db)
+    restored = store.restore(result.snapshot_id, tmp_path / "restored.db")
+    conn.close()
+
+    check = sqlite3.connect(restored)
+    try:
+        assert check.execute(
+            "SELECT count(*) FROM tracking WHERE details = 'nur im WAL'"
+        ).fetchone() == (1,)
+    finally:
+        check.close()
+
+
+def test_create_bundle_nimmt_wal_inhalt_mit(tmp_path):
+    db = tmp_path / "budget.db"
+    conn = _make_db(db, rows=10)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA wal_autocheckpoint=0")
+    conn.execute("INSERT INTO tracking(details) VALUES ('nur im WAL')")
+    conn.commit()
+
+    bundle = create_bundle(
+        source_db=db, out_path=tmp_path / "b.bmr", app="BudgetManager", app_version="t"
+    )
+    conn.close()
+    verify_bundle(bundle)
+    with zipfile.ZipFile(bundle) as zf:
+        (tmp_path / "x.db").write_bytes(zf.read("database.db"))
+    check = sqlite3.connect(tmp_path / "x.db")
+    try:
+        assert check.execute("SELECT count(*) FROM tracking").fetchone() == (11,)
+    finally:
+        check.close()
+
+
+def test_beschaedigter_block_wird_erkannt(tmp_path):
+    db = tmp_path / "budget.db"
+    _make_db(db).close()
+    store = BackupStore(tmp_path / "repo")
+    result = _snapshot(store, db)
+    store.verify(result.snapshot_id)
+
+    chunk = next((tmp_path / "repo" / "chunks").glob("*/*"))
+    chunk.write_bytes(b"kaputt")
+    target = tmp_path / "restored.db"
+    target.write_bytes(b"bisheriger Stand")
+    with pytest.raises(BundleIntegrityError):
+        store.verify(result.snapshot_id)
+    with pytest.raises(BundleIntegrityError):
+        store.restore(result.snapshot_id, target)
+    assert target.read_bytes() == b"bisheriger Stand"
+
+
+def test_prune_raeumt_unbenutzte_bloecke_weg(tmp_path):
+    db = tmp_path / "budget.db"
+    conn = _make_db(db)
+    store = BackupStore(tmp_path / "repo")
+    for i in range(3):
+        conn.execute("UPDATE tracking SET details = ? WHERE id = 10", (f"v{i}",))
+        conn.commit()
+        _snapshot(store, db)
+    conn.close()
+    (tmp_path / "repo" / "chunks" / "00").mkdir(exist_ok=True)
+    (tmp_path / "repo" / "chunks" / "00" / ("0" * 64)).write_bytes(b"verwaist")
+
+    removed = store.prune(1)
+
+    assert removed >= 3
+    assert store.stats()["snapshots"] == 1
+    store.verify(store.list_snapshots()[0]["id"])
+
+
+def test_export_ergibt_gueltiges_bmr(tmp_path):
+    db = tmp_path / "budget.db"
+    _make_db(db, rows=50).close()
+    settings = tmp_path / "settings.json"
+    settings.write_text('{"theme": "dark"}', encoding="utf-8")
+    store = BackupStore(tmp_path / "repo")
+    result = store.snapshot_file(
+        db, app="BudgetManager", app_version="test", settings_path=settings
+    )
+
+    bundle = store.export_bundle(result.snapshot_id, tmp_path / "export.bmr")
+
+    verify_bundle(bundle)
+    with zipfile.ZipFile(bundle) as zf:
+        assert zf.read("settings.json") == settings.read_bytes()
+        (tmp_path / "x.db").write_bytes(zf.read("database.db"))
+    check = sqlite3.connect(tmp_path / "x.db")
+    try:
+        assert check.execute("SELECT count(*) FROM tracking").fetchone() == (50,)
+    finally:
+        check.close()
+
+
+def test_verschluesselte_sicherung_dedupliziert_seiten(tmp_path, schluessel):
+    from model.crypto import decrypt_db_from_file, encrypt_db_to_file
+
+    db_key, salt = schluessel
+    conn = _make_db(tmp_path / "plain.db")
+    enc = tmp_path / "user.enc"
+    encrypt_db_to_file(conn, enc, db_key, salt)
+    store = BackupStore(tmp_path / "repo")
+
+    def sichern():
+        return store.snapshot_file(
+            enc, app="BudgetManager", app_version="test", db_key=db_key
+        )
+
+    erste = sichern()
+    conn.execute("UPDATE tracking SET details = 'geaendert' WHERE id = 1500")
+    conn.commit()
+    encrypt_db_to_file(conn, enc, db_key, salt)  # neue Datei-Nonce, neue Bytes
+    zweite = sichern()
+    conn.close()
+
+    assert erste.new_chunks == erste.chunks > 4
+    assert 0 < zweite.new_chunks <= 2
+    for chunk in (tmp_path / "repo" / "chunks").glob("*/*"):
+        assert b"Eintrag" not in chunk.read_bytes()
+    with pytest.raises(ValueError):
+        store.verify(zweite.snapshot_id)
+    store.verify(zweite.snapshot_id, db_key=db_key)
+
+    restored = store.restore(zweite.snapshot_id, tmp_path / "back.enc", db_key=db_key)
+    assert restored.read_bytes()[:16] == salt
+    check = decrypt_db_from_file(restored, db_key)
+    try:
+        row = check.execute("SELECT details FROM tracking WHERE id = 1500").fetchone()
+        assert row[0] == "geaendert"
+    finally:
+        check.close()
+
+
+def test_prune_laesst_bloecke_laufender_sicherung_stehen(tmp_path):
+    db = tmp_path / "budget.db"
+    _make_db(db, rows=50).close()
+    store = BackupStore(tmp_path / "repo")
+    _snapshot(store, db)
+    verwaist = tmp_path / "repo" / "chunks" / "00" / ("0" * 64)
+    gemeldet = tmp_path / "repo" / "chunks" / "11" / ("1" * 64)
+    for chunk in (verwaist, gemeldet):
+        chunk.parent.mkdir(exist_ok=True)
+        chunk.write_bytes(b"noch ohne Manifest")
+        os.utime(chunk, (time.time() - 3600, time.time() - 3600))
+    laufend = store.snapshot_dir / "20260101_000000.pending"
+    laufend.write_text(f"{time.time():.3f}\n{gemeldet.name}\n", encoding="utf-8")
+
+    assert store.prune(5) == 1
+    assert gemeldet.exists() and not verwaist.exists()
+
+    alt = time.time() - PENDING_STALE_SECONDS - 60
+    os.utime(laufend, (alt, alt))
+    assert store.prune(5) == 1
+    assert not gemeldet.exists() and not laufend.exists()
+
+
+def test_dialog_zeigt_prueft_und_loescht_schnappschuesse(tmp_path, monkeypatch):
+    monkeypatch.setenv("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+
+    import views.backup_restore_dialog as dialog_modul
+
+    _app = QApplication.instance() or QApplication([])
+    db = tmp_path / "budget.db"
+    conn = _make_db(db, rows=50)
+    store = BackupStore(tmp_path / "backups" / "repository")
+    result = _snapshot(store, db)
+
+    class Einstellungen(dict):
+        backup_directory = str(tmp_path / "backups")
+
+        def set(self, key, value):
+            self[key] = value
+
+    einstellungen = Einstellungen(auto_backup_keep=10)
+    meldungen = []
+    monkeypatch.setattr(dialog_modul, "show_info", lambda *a: meldungen.append(a))
+    monkeypatch.setattr(
+        dialog_modul.QMessageBox, "question", lambda *a: dialog_modul.QMessageBox.Yes
+    )
+    dialog = dialog_modul.BackupRestoreDialog(None, conn, str(db), einstellungen)
+    try:
+        item = dialog.backup_list.item(0)
+        assert item.text().startswith(f"repository/{result.snapshot_id} ")
+
+        dialog.chk_repository.setChecked(True)
+        assert einstellungen["auto_backup_repository"] is True
+
+        dialog.verify_backup()
+        assert result.snapshot_id in meldungen[-1][2]
+
+        dialog.delete_backup()
+        assert store.list_snapshots() == []
+        assert store.stats()["chunks"] == 0
+        assert dialog.backup_list.count() == 0
+    finally:
+        dialog.deleteLater()
+        conn.close()
@@ -0,0 +1,145 @@
+"""Bridge-Outboxen mit Wasserstand (``model.bridge_outbox``).
+
+Nach jedem Voll-Refresh wurden beide Outboxen komplett neu gelesen und
+geschrieben. Jetzt bleibt die Datei liegen, solange sich die Tabellen, aus
+denen sie entsteht, nicht bewegt haben - und auch dann, wenn sich zwar die
+Tabelle, aber kein exportierter Datensatz geändert hat.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from model import bridge_outbox
+from model.lifeplanner_import_service import (
+    export_fpm_expense_proposals,
+    export_savings_goals,
+)
+from model.migrations import migrate_all
+from model.typ_constants import TYP_EXPENSES
+
+
+@pytest.fixture
+def conn(ausgabe):
+    c = sqlite3.connect(":memory:")
+    c.row_factory = sqlite3.Row
+    migrate_all(c)
+    ausgabe(c, category="Füller", details="Pilot Custom 823")
+    yield c
+    bridge_outbox.forget(c)
+    c.close()
+
+
+def _ids(path: Path) -> list[str]:
+    lines = path.read_text(encoding="utf-8").splitlines()
+    return [json.loads(line)["external_id"] for line in lines[1:]]
+
+
+def test_ohne_aenderung_wird_weder_gelesen_noch_geschrieben(conn, tmp_path):
+    out = tmp_path / "fpm.jsonl"
+    assert export_fpm_expense_proposals(conn, out).mode == "rewritten"
+    stand = out.stat().st_mtime_ns
+
+    # Budget ändert sich, tracking nicht: kein SELECT auf tracking.
+    conn.execute(
+        "INSERT INTO budget(year, month, typ, category, amount) "
+        "VALUES (2026, 7, ?, 'Füller', 50)",
+        (TYP_EXPENSES,),
+    )
+    conn.commit()
+    statements: list[str] = []
+    conn.set_trace_callback(statements.append)
+    try:
+        result = export_fpm_expense_proposals(conn, out)
+    finally:
+        conn.set_trace_callback(None)
+
+    assert (result.mode, result.count) == ("unchanged", 1)
+    assert not any("FROM tracking" in s for s in statements)
+    assert out.stat().st_mtime_ns == stand
+
+
+def test_nur_echte_aenderungen_schreiben_die_datei(conn, tmp_path, ausgabe):
+    out = tmp_path / "fpm.jsonl"
+    export_fpm_expense_proposals(conn, out)
+
+    ausgabe(conn, category="Lebensmittel", details="Brot")  # kein Stichwort
+    assert export_fpm_expense_proposals(conn, out).mode == "unchanged"
+
+    ausgabe(conn, category="Hobby", details="TINTE blau")
+    result = export_fpm_expense_proposals(conn, out)
+    assert (result.mode, result.count) == ("rewritten", 2)
+    assert len(_ids(out)) == 2
+
+    conn.execute("DELETE FROM tracking WHERE details = 'TINTE blau'")
+    conn.commit()
+    assert export_fpm_expense_proposals(conn, out).count == 1
+    assert _ids(out) == ["budgetmanager:tracking:1"]
+
+
+def test_vorauswahl_in_sql_verliert_keine_treffer(conn, tmp_path, ausgabe):
+    ausgabe(conn, category="FÜLLER", details="")
+    ausgabe(conn, category="Schreibwaren", details="Fountain Pen INK")
+    ausgabe(conn, category="Schreibwaren", details="Bleistift")
+    result = export_fpm_expense_proposals(conn, tmp_path / "fpm.jsonl")
+    assert result.count == 3
+
+
+def test_bestehende_datei_wird_beim_start_nicht_neu_geschrieben(conn, tmp_path):
+    out = tmp_path / "fpm.jsonl"
+    export_fpm_expense_proposals(conn, out)
+    bridge_outbox.forget(conn)  # wie nach einem Neustart
+
+    assert export_fpm_expense_proposals(conn, out).mode == "unchanged"
+
+    out.unlink()
+    assert export_fpm_expense_proposals(conn, out).mode == "rewritten"
+    assert out.exists()
+
+
+def test_offene_transaktion_wird_nicht_gemerkt(conn, tmp_path):
+    out = tmp_path / "fpm.jsonl"
+    export_fpm_expense_proposals(conn, out)
+    conn.execute("DELETE FROM tracking")
+    assert export_fpm_expense_proposals(conn, out).count == 0
+    conn.rollback()
+    assert export_fpm_expense_proposals(conn, out).count == 1
+
+
+def test_sparziele_folgen_ihrer_tabelle(conn, tmp_path, ausgabe):
+    out = tmp_path / "sparziele.jsonl"
+    assert export_savings_goals(conn, out).count == 0
+    conn.execute(
+        "INSERT INTO savings_goals(name, target_amount, current_amount, "
+        "created_date) VALUES ('Velo', 1000, 250, '2026-01-01')"
+    )
+    conn.commit()
+    result = export_savings_goals(conn, out)
+    assert (result.mode, result.count) == ("rewritten", 1)
+    ausgabe(conn, category="Füller", details="zweiter")
+    assert export_savings_goals(conn, out).mode == "unchanged"
+
+
+def test_andere_connection_erbt_keinen_gemerkten_stand(conn, tmp_path, ausgabe):
+    out = tmp_path / "fpm.jsonl"
+    export_fpm_expense_proposals(conn, out)
+    assert not any(
+        isinstance(wert, sqlite3.Connection)
+        for stand in bridge_outbox._states.values()
+        for wert in vars(stand).values()
+    )
+
+    zweite = sqlite3.connect(":memory:")
+    zweite.row_factory = sqlite3.Row
+    migrate_all(zweite)
+    ausgabe(zweite, category="Hobby", details="Tinte blau")
+    ausgabe(zweite, category="Hobby", details="Tinte rot")
+    try:
+        result = export_fpm_expense_proposals(zweite, out)
+    finally:
+        zweite.close()
+    assert (result.mode, result.count) == ("rewritten", 2)
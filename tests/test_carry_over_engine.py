@@ -0,0 +1,158 @@
+"""Übertrag über Jahre in einem Durchgang (``model.carry_over_engine``).
+
+Die Übersicht rechnete den Übertrag Monat für Monat mit eigenen Abfragen;
+jetzt kommt er aus einer Matrix, die je Typ am Stück geladen wird. Die
+Erwartungswerte hier rechnen die alten Schleifen nach.
+"""
+
+from __future__ import annotations
+
+import random
+import sqlite3
+
+import pytest
+
+import model.carry_over_engine as engine
+from model.budget_overview_model import BudgetOverviewModel
+from model.migrations import migrate_all
+from model.typ_constants import TYP_EXPENSES, TYP_INCOME, TYP_SAVINGS, rest_sign
+
+TYPEN = (TYP_EXPENSES, TYP_INCOME, TYP_SAVINGS)
+
+
+@pytest.fixture(params=["python", "numpy"])
+def rechenweg(request, monkeypatch):
+    if request.param == "numpy":
+        monkeypatch.setattr(engine, "np", pytest.importorskip("numpy"))
+    else:
+        monkeypatch.setattr(engine, "np", None)
+    return request.param
+
+
+@pytest.fixture
+def conn():
+    c = sqlite3.connect(":memory:")
+    migrate_all(c)
+    rnd = random.Random(5)
+    for _ in range(600):
+        y, m = rnd.randint(2019, 2025), rnd.randint(1, 12)
+        c.execute(
+            "INSERT INTO tracking(date, typ, category, amount) VALUES (?,?,?,?)",
+            (
+                f"{y}-{m:02d}-{rnd.randint(1, 28):02d}",
+                rnd.choice(TYPEN),
+                f"K{rnd.randint(1, 5)}",
+                round(rnd.uniform(-50, 250), 2),
+            ),
+        )
+        c.execute(
+            "INSERT OR REPLACE INTO budget(year, month, typ, category, amount) "
+            "VALUES (?,?,?,?,?)",
+            (y, m, rnd.choice(TYPEN), f"K{rnd.randint(1, 5)}", rnd.randint(0, 300)),
+        )
+    c.commit()
+    yield c
+    c.close()
+
+
+def _alter_uebertrag(model, year, month, typ, start_month, start_year):
+    """Der frühere Übertrag je Kategorie: ein Batch je Jahr."""
+    if year == start_year and month <= start_month:
+        return {}
+    fenster = [
+        (y, start_month if y == start_year else 1, 12) for y in range(start_year, year)
+    ]
+    erster = start_month if year == start_year else 1
+    if month - 1 >= erster:
+        fenster.append((year, erster, month - 1))
+    carry: dict[str, float] = {}
+    for y, von, bis in fenster:
+        monate = list(range(von, bis + 1))
+        budget = model.budget_by_category_range(y, monate, typ)
+        ist = model.actual_by_category_range(y, monate, typ)
+        for cat in set(budget) | set(ist):
+            rest = rest_sign(typ, budget.get(cat, 0.0), ist.get(cat, 0.0))
+            carry[cat] = carry.get(cat, 0.0) + rest
+    return carry
+
+
+def _alte_uebersicht(model, year, typ, start_month, start_year):
+    """Die frühere Monatsschleife mit Summen je Monat."""
+    carry = 0.0
+    for y in range(start_year, year):
+        for m in range(start_month if y == start_year else 1, 13):
+            carry += rest_sign(
+                typ, model.budget_sum(y, m, typ), model._actual_sum(y, m, typ)
+            )
+    zeilen = []
+    for m in range(1, 13):
+        b, a = model.budget_sum(year, m, typ), model._actual_sum(year, m, typ)
+        rest = rest_sign(typ, b, a)
+        if year == start_year and m < start_month:
+            zeilen.append((b, a, rest, 0.0, rest))
+            continue
+        zeilen.append((b, a, rest, carry, rest + carry))
+        carry += rest
+    return zeilen
+
+
+@pytest.mark.parametrize("totals", [True, False])
+def test_uebersicht_wie_die_alte_schleife(conn, rechenweg, totals):
+    model = BudgetOverviewModel(conn)
+    model._has_totals = totals
+    for year, start_month, start_year in (
+        (2025, 4, 2020),
+        (2023, 7, 2023),
+        (2022, 1, 2024),
+    ):
+        neu = model.get_monthly_overview(
+            year, start_month=start_month, start_year=start_year
+        )
+        for typ in TYPEN:
+            erwartet = _alte_uebersicht(model, year, typ, start_month, start_year)
+            zeilen = [
+                (
+                    r.budget_total,
+                    r.actual_total,
+                    r.rest,
+                    r.carry_over,
+                    r.cumulative_rest,
+                )
+                for r in neu
+                if r.typ == typ
+            ]
+            assert zeilen == [pytest.approx(z) for z in erwartet]
+
+
+@pytest.mark.parametrize("totals", [True, False])
+def test_uebertrag_je_kategorie_wie_die_alten_batches(conn, rechenweg, totals):
+    model = BudgetOverviewModel(conn)
+    model._has_totals = totals
+    for year, month, start_month, start_year in (
+        (2025, 6, 3, 2019),
+        (2024, 1, 1, 2022),
+        (2023, 9, 9, 2023),
+        (2023, 10, 9, 2023),
+        (2021, 5, 2, 2024),
+    ):
+        for typ in TYPEN:
+            assert model.carry_over_by_category(
+                year, month, typ, start_month, start_year
+            ) == pytest.approx(
+                _alter_uebertrag(model, year, month, typ, start_month, start_year)
+            )
+
+
+def test_zehn_jahre_kosten_so_viele_abfragen_wie_eines(conn):
+    model = BudgetOverviewModel(conn)
+    model.get_monthly_overview(2025)  # Schema-Prüfung vorab
+
+    def abfragen(**kwargs) -> int:
+        gesehen: list[str] = []
+        conn.set_trace_callback(gesehen.append)
+        model.get_monthly_overview(2025, **kwargs)
+        model.carry_over_by_category(2025, 6, TYP_EXPENSES, **kwargs)
+        conn.set_trace_callback(None)
+        return len(gesehen)
+
+    assert abfragen(start_year=2015) == abfragen(start_year=2025)
@@ -0,0 +1,136 @@
+"""Kategorienbaum aus einem SELECT (``CategoryModel.tree``).
+
+``descendant_names`` fragte je Knoten einmal, ``display_with_parent`` je
+Tabellenzeile zweimal. Jetzt beantwortet ein gemerkter Baum alle
+Hierarchiefragen, bis irgendwer in die Datenbank schreibt.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from model.category_model import CategoryModel
+from model.migrations import migrate_all
+from model.typ_constants import TYP_EXPENSES, TYP_INCOME
+
+
+@pytest.fixture
+def model():
+    c = sqlite3.connect(":memory:")
+    c.row_factory = sqlite3.Row
+    migrate_all(c)
+    m = CategoryModel(c)
+    m.upsert(TYP_EXPENSES, "Wohnen", False, False)
+    wohnen = m.get_by_id(_id(c, "Wohnen"))
+    assert wohnen is not None
+    m.upsert(TYP_EXPENSES, "Miete", True, True, parent_id=wohnen.id)
+    m.upsert(TYP_EXPENSES, "Nebenkosten", False, False, parent_id=wohnen.id)
+    m.upsert(TYP_EXPENSES, "Strom", False, False, parent_id=_id(c, "Nebenkosten"))
+    m.upsert(TYP_INCOME, "Lohn", False, False)
+    yield m
+    c.close()
+
+
+def _id(conn, name: str) -> int:
+    return int(
+        conn.execute("SELECT id FROM categories WHERE name=?", (name,)).fetchone()[0]
+    )
+
+
+def test_hierarchie_ohne_weitere_abfragen(model):
+    wohnen, strom_id = _id(model.conn, "Wohnen"), _id(model.conn, "Strom")
+    model.tree()
+    statements: list[str] = []
+    model.conn.set_trace_callback(statements.append)
+    try:
+        assert model.descendant_names(TYP_EXPENSES, "Wohnen") == [
+            "Wohnen",
+            "Miete",
+            "Nebenkosten",
+            "Strom",
+        ]
+        assert model.descendant_names(
+            TYP_EXPENSES, "Nebenkosten", include_self=False
+        ) == ["Strom"]
+        assert model.display_with_parent(TYP_EXPENSES, "Strom") == (
+            "Nebenkosten › Strom"
+        )
+        assert model.get_parent_name(TYP_EXPENSES, "Wohnen") is None
+        assert strom_id in model._descendant_ids(wohnen)
+        tree = model.tree()
+        strom = tree.get(TYP_EXPENSES, "Strom")
+        assert strom is not None
+        assert tree.path(strom) == ("Wohnen", "Nebenkosten", "Strom")
+    finally:
+        model.conn.set_trace_callback(None)
+    # Nur noch die Stempelabfrage des Caches, kein SELECT auf categories.
+    assert not any("FROM categories" in s for s in statements)
+
+
+def test_unbekannte_kategorie_wie_bisher(model):
+    assert model.descendant_names(TYP_EXPENSES, "Gibts nicht") == ["Gibts nicht"]
+    assert model.descendant_names(TYP_INCOME, "Miete") == ["Miete"]
+    assert model.get_parent_name(TYP_EXPENSES, "Gibts nicht") is None
+
+
+def test_aenderungen_bauen_den_baum_neu(model):
+    alt = model.tree()
+    model.rename_and_cascade(
+        _id(model.conn, "Strom"), typ=TYP_EXPENSES, old_name="Strom", new_name="Energie"
+    )
+    assert model.tree() is not alt
+    assert model.descendant_names(TYP_EXPENSES, "Nebenkosten") == [
+        "Nebenkosten",
+        "Energie",
+    ]
+
+    # Rohes SQL (wie Undo/Redo) wird ebenfalls bemerkt.
+    model.conn.execute("UPDATE categories SET parent_id=NULL WHERE name='Nebenkosten'")
+    model.conn.commit()
+    assert model.descendant_names(TYP_EXPENSES, "Wohnen") == ["Wohnen", "Miete"]
+
+    model.delete(TYP_EXPENSES, "Miete")
+    assert [c.name for c in model.list(TYP_EXPENSES)] == [
+        "Energie",
+        "Nebenkosten",
+        "Wohnen",
+    ]
+
+
+def test_namensliste_fuer_dropdowns_bleibt_kopie(model):
+    erste = model.list_names_tree(TYP_EXPENSES)
+    erste.clear()
+    assert model.list_names_tree(TYP_EXPENSES) == [
+        ("Wohnen", "Wohnen"),
+        ("  Wohnen › Miete", "Miete"),
+        ("  Wohnen › Nebenkosten", "Nebenkosten"),
+        ("    Nebenkosten › Strom", "Strom"),
+    ]
+
+
+def test_budget_tab_merkt_zeilen_je_baum(model, monkeypatch):
+    monkeypatch.setenv("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+
+    from views.tabs.budget_tab import BudgetTab
+
+    _app = QApplication.instance() or QApplication([])
+    tab = BudgetTab(model.conn, defer_load=True)
+    flat, totals, _buffer, _children = tab._build_tree_flat(
+        TYP_EXPENSES, {"Strom": {1: 40.0}, "Miete": {1: 1500.0}}
+    )
+    assert [r["name"] for r in flat] == ["Wohnen", "Miete", "Nebenkosten", "Strom"]
+    assert totals["Wohnen"][1] == 1540.0
+    gemerkt = tab._layouts[TYP_EXPENSES]
+    tab._build_tree_flat(TYP_EXPENSES, {})
+    assert tab._layouts[TYP_EXPENSES] is gemerkt
+    # Ansichtsdaten gehören nicht in den Baum.
+    assert not any("budget" in str(key) for key in model.tree()._memo)
+
+    model.upsert(
+        TYP_EXPENSES, "Heizung", False, False, parent_id=_id(model.conn, "Wohnen")
+    )
+    flat, *_ = tab._build_tree_flat(TYP_EXPENSES, {})
+    assert "Heizung" in [r["name"] for r in flat]
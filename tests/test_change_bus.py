@@ -0,0 +1,135 @@
+"""Änderungsbus und abhängigkeitsgesteuerter Tab-Refresh.
+
+Nach jedem Undo/Redo lud das Hauptfenster alle vier Datentabs neu. Jetzt
+protokollieren TEMP-Trigger Tabelle und Monat jeder Schreiboperation; nur
+der sichtbare Tab lädt sofort, und nur Tabs, deren Tabellen betroffen sind,
+werden als veraltet markiert.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+
+from model.change_bus import ChangeBus, DataChange
+from model.crypto import AutosaveConnection
+from model.migrations import migrate_all
+from model.typ_constants import TYP_EXPENSES
+from views.main_window import MainWindow
+from views.tabs.budget_tab import BudgetTab
+
+
+@pytest.fixture
+def conn():
+    c = sqlite3.connect(":memory:")
+    migrate_all(c)
+    c.execute(
+        "INSERT INTO tracking(date, typ, category, amount, details) "
+        "VALUES ('2025-03-04', ?, 'Essen', -10, '')",
+        (TYP_EXPENSES,),
+    )
+    c.commit()
+    yield c
+    c.close()
+
+
+def test_trigger_melden_tabellen_und_monate(conn):
+    bus = ChangeBus(conn)
+    assert bus.drain() == DataChange()
+
+    # Umbuchen in einen anderen Monat meldet alten und neuen Monat.
+    conn.execute("UPDATE tracking SET date = '2026-01-15' WHERE id = 1")
+    conn.execute(
+        "INSERT INTO budget(year, month, typ, category, amount) "
+        "VALUES (2025, 7, ?, 'Essen', 100)",
+        (TYP_EXPENSES,),
+    )
+    conn.execute("INSERT INTO tags(name, color) VALUES ('Ferien', '#fff')")
+    for _ in range(3):  # mehrfach dieselbe Zeile: ein Eintrag
+        conn.execute("UPDATE tracking SET amount = amount - 1 WHERE id = 1")
+    conn.commit()
+
+    change = bus.drain()
+    assert change.tables == {"tracking", "budget", "tags"}
+    assert change.months == {(2025, 3), (2026, 1), (2025, 7)}
+    assert not change.everything
+    assert not conn.in_transaction  # Leeren lässt keine Transaktion offen
+    assert bus.drain() == DataChange()  # geleert
+
+
+def test_rollback_hinterlaesst_keine_meldung(conn):
+    bus = ChangeBus(conn)
+    conn.execute("DELETE FROM tracking")
+    conn.rollback()
+    assert not bus.drain()
+
+
+def test_leeren_loest_keinen_speicherlauf_aus():
+    c = sqlite3.connect(":memory:", factory=AutosaveConnection)
+    migrate_all(c)
+    bus = ChangeBus(c)
+    gespeichert: list[str] = []
+    c.set_after_commit_callback(gespeichert.append)
+    c.execute("INSERT INTO tags(name, color) VALUES ('Ferien', '#fff')")
+    c.commit()
+
+    assert bus.drain().tables == {"tags"}
+    assert gespeichert == ["commit"]  # nur der Commit der Änderung selbst
+    assert not c.in_transaction
+    assert bus.drain() == DataChange()
+
+    # In einer offenen Transaktion bleibt sie offen und ungespeichert.
+    c.execute("DELETE FROM tags")
+    assert bus.drain().tables == {"tags"}
+    assert c.in_transaction and gespeichert == ["commit"]
+    c.close()
+
+
+def test_neu_angelegte_tabelle_meldet_alles(conn):
+    bus = ChangeBus(conn)
+    conn.execute("DROP TABLE tags")
+    conn.execute("CREATE TABLE tags(id INTEGER PRIMARY KEY, name TEXT)")
+    assert bus.drain().everything
+    conn.execute("INSERT INTO tags(name) VALUES ('x')")
+    assert bus.drain().tables == {"tags"}  # Trigger wieder da
+
+
+def test_abonnenten_bekommen_nur_echte_aenderungen(conn):
+    bus = ChangeBus(conn)
+    gemeldet: list[DataChange] = []
+    bus.subscribe(gemeldet.append)
+    bus.publish()
+    conn.execute("DELETE FROM tracking")
+    bus.publish()
+    assert [c.tables for c in gemeldet] == [{"tracking"}]
+
+
+def test_welche_tabs_betroffen_sind():
+    change = DataChange(frozenset({"tracking"}), frozenset({(2026, 2)}))
+    tracking = SimpleNamespace(DATA_DEPENDENCIES=frozenset({"tracking"}))
+    kategorien = SimpleNamespace(DATA_DEPENDENCIES=frozenset({"categories"}))
+    ohne_angaben = SimpleNamespace()
+    assert MainWindow._tab_affected(tracking, change)
+    assert not MainWindow._tab_affected(kategorien, change)
+    assert MainWindow._tab_affected(ohne_angaben, DataChange())
+    assert MainWindow._tab_affected(kategorien, DataChange.all())
+
+
+@pytest.mark.parametrize(
+    ("jahr", "change", "betroffen"),
+    [
+        (2025, DataChange(frozenset({"tracking"}), frozenset({(2026, 2)})), False),
+        (2026, DataChange(frozenset({"tracking"}), frozenset({(2026, 2)})), True),
+        (2027, DataChange(frozenset({"budget"}), frozenset({(2026, 12)})), True),
+        (2025, DataChange(frozenset({"categories"})), True),
+        (2025, DataChange(frozenset({"tags"})), False),
+    ],
+)
+def test_budget_tab_ignoriert_spaetere_jahre(jahr, change, betroffen):
+    tab = SimpleNamespace(
+        DATA_DEPENDENCIES=BudgetTab.DATA_DEPENDENCIES,
+        year_spin=SimpleNamespace(value=lambda: jahr),
+    )
+    assert BudgetTab.is_affected_by(tab, change) is betroffen
@@ -0,0 +1,191 @@
+"""Lese-Connections neben dem Schreiber (``model.database.ConnectionPool``).
+
+Wer ausserhalb der Connection des Hauptfensters lesen wollte, öffnete eine
+eigene und richtete jedes Mal die Pragmas neu ein. Der Pool hält vorbereitete
+Lese-Connections bereit - ``mode=ro`` neben einer Datei, Kopien neben der
+verschlüsselten In-Memory-DB.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+
+import pytest
+
+from model.database import (
+    ConnectionPool,
+    clone_memory,
+    open_db,
+    open_db_raw,
+    open_db_readonly,
+)
+from model.database_management_model import DatabaseManagementModel
+from model.migrations import migrate_all
+from model.query_cache import MAX_SESSIONS, cached_query, query_cache
+
+
+def _anzahl(conn) -> int:
+    return int(conn.execute("SELECT COUNT(*) FROM tracking").fetchone()[0])
+
+
+@pytest.fixture
+def db_pfad(tmp_path):
+    pfad = tmp_path / "budget.db"
+    conn = open_db(str(pfad))
+    migrate_all(conn)
+    conn.commit()
+    conn.close()
+    return pfad
+
+
+def test_lese_connection_ist_read_only_und_sieht_commits(db_pfad, ausgabe):
+    pool = ConnectionPool(str(db_pfad), max_readers=2)
+    try:
+        ausgabe(pool.writer)
+        with pool.reader() as leser:
+            assert leser.execute("PRAGMA query_only").fetchone()[0] == 1
+            assert _anzahl(leser) == 1
+            with pytest.raises(sqlite3.OperationalError):
+                leser.execute("DELETE FROM tracking")
+        ausgabe(pool.writer)
+        with pool.reader() as leser:
+            assert _anzahl(leser) == 2  # keine hängende Lesetransaktion
+        assert pool.stats()["readers"] == 1  # wiederverwendet
+    finally:
+        pool.close()
+
+
+def test_sind_alle_leser_unterwegs_wartet_der_naechste(db_pfad):
+    pool = ConnectionPool(str(db_pfad), max_readers=1)
+    freigegeben = threading.Event()
+    try:
+        with pool.reader():
+            with pytest.raises(TimeoutError):
+                with pool.reader(timeout=0.05):
+                    pass
+
+            def spaeter():
+                with pool.reader(timeout=5) as leser:
+                    _anzahl(leser)
+                freigegeben.set()
+
+            thread = threading.Thread(target=spaeter)
+            thread.start()
+        assert freigegeben.wait(5)
+        thread.join(5)
+        assert pool.stats()["waits"] >= 1
+    finally:
+        pool.close()
+
+
+def test_kopien_der_speicher_db_nur_nach_aenderung(db_pfad, ausgabe):
+    writer = open_db_raw(":memory:")
+    migrate_all(writer)
+    writer.commit()
+    pool = ConnectionPool.for_connection(writer)
+    try:
+        assert pool.mode == "memory"
+        with pytest.raises(sqlite3.ProgrammingError):
+            with pool.reader():
+                pass
+        assert pool.publish()
+        assert not pool.publish()  # nichts geändert
+        with pool.reader() as leser:
+            assert _anzahl(leser) == 0
+
+        ausgabe(writer)
+        assert pool.publish()
+        with pool.reader() as leser:
+            assert _anzahl(leser) == 1
+            with pytest.raises(sqlite3.OperationalError):
+                leser.execute("DELETE FROM tracking")
+    finally:
+        pool.close()
+    assert _anzahl(writer) == 1  # fremder Schreiber bleibt offen
+    writer.close()
+
+
+def test_angebotenes_abbild_erspart_eigene_kopie(ausgabe):
+    from model.crypto import serialize_db
+
+    writer = open_db_raw(":memory:")
+    migrate_all(writer)
+    ausgabe(writer)
+    pool = ConnectionPool.for_connection(writer)
+    try:
+        pool.offer(serialize_db(writer))  # wie die Session nach dem Commit
+        assert not pool.publish()
+        with pool.reader() as leser:
+            assert _anzahl(leser) == 1
+        assert (pool.stats()["offered"], pool.stats()["snapshots"]) == (1, 0)
+
+        ausgabe(writer)  # danach ungespeichert geändert: publish zieht selbst
+        assert pool.publish()
+    finally:
+        pool.close()
+        writer.close()
+
+
+def test_leser_verdraengen_den_cache_der_haupt_connection_nicht(ausgabe):
+    writer = open_db_raw(":memory:")
+    migrate_all(writer)
+    haupt = query_cache(writer)
+    pool = ConnectionPool.for_connection(writer, max_readers=MAX_SESSIONS)
+    try:
+        pool.publish()
+        leser = [pool._checkout(None) for _ in range(MAX_SESSIONS)]
+        for conn in leser:
+            assert cached_query(conn, "anzahl", (), lambda c=conn: _anzahl(c)) == 0
+        assert query_cache(writer) is haupt
+
+        # Neues Abbild: der Cache des Lesers darf nicht den alten Stand liefern.
+        for conn in leser:
+            pool._idle.append(conn)
+        ausgabe(writer)
+        pool.publish()
+        with pool.reader() as conn:
+            assert cached_query(conn, "anzahl", (), lambda: _anzahl(conn)) == 1
+    finally:
+        pool.close()
+        writer.close()
+
+
+def test_clone_ist_unabhaengig(ausgabe):
+    conn = sqlite3.connect(":memory:")
+    migrate_all(conn)
+    ausgabe(conn)
+    kopie = clone_memory(conn)
+    ausgabe(kopie)
+    assert (_anzahl(conn), _anzahl(kopie)) == (1, 2)
+    assert kopie.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+
+
+def test_geschlossener_pool_gibt_nichts_mehr_aus(db_pfad):
+    pool = ConnectionPool(str(db_pfad))
+    with pool.reader() as leser:
+        pool.close()
+        assert _anzahl(leser) == 0  # ausgeliehene bleibt bis zur Rückgabe
+    with pytest.raises(sqlite3.ProgrammingError):
+        leser.execute("SELECT 1")
+    with pytest.raises(sqlite3.ProgrammingError):
+        with pool.reader():
+            pass
+
+
+def test_statistik_ohne_geteilte_connection_liest_nur(tmp_path):
+    pfad = tmp_path / "alt.db"
+    conn = sqlite3.connect(str(pfad))
+    migrate_all(conn)
+    conn.commit()
+    conn.close()
+
+    stats = DatabaseManagementModel(str(pfad)).get_database_statistics()
+
+    assert "Fehler" not in stats
+    assert "tracking" in stats["tables"]
+    leser = open_db_readonly(str(pfad))
+    try:
+        assert leser.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    finally:
+        leser.close()
@@ -0,0 +1,98 @@
+"""``.enc`` v2: Seitenabbild statt SQL-Dump.
+
+Der alte Dump wurde beim Login per ``executescript`` Zeile für Zeile neu
+geparst, jeder Index neu aufgebaut. v2 speichert das Abbild aus
+``serialize()``, wahlweise zlib-komprimiert; der alte Dump bleibt lesbar.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+import model.crypto as crypto
+from model.crypto_stream import STREAM_MAGIC, decrypt_stream
+
+
+def _beispiel_db(conn: sqlite3.Connection) -> sqlite3.Connection:
+    conn.execute("CREATE TABLE tracking(id INTEGER PRIMARY KEY, betrag REAL)")
+    conn.execute("CREATE INDEX idx_betrag ON tracking(betrag)")
+    conn.executemany(
+        "INSERT INTO tracking(betrag) VALUES (?)", [(i / 3,) for i in range(500)]
+    )
+    conn.commit()
+    return conn
+
+
+def _klartext(enc, db_key) -> bytes:
+    with open(enc, "rb") as f:
+        salt = f.read(crypto.SALT_LENGTH)
+        magic = f.read(len(STREAM_MAGIC))
+        return b"".join(decrypt_stream(f, db_key, salt, magic))
+
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_abbild_kommt_unveraendert_zurueck(tmp_path, schluessel, compress):
+    db_key, salt = schluessel
+    enc = tmp_path / "konto.enc"
+    quelle = _beispiel_db(sqlite3.connect(":memory:"))
+    crypto.encrypt_db_to_file(quelle, enc, db_key, salt, compress=compress)
+
+    klartext = _klartext(enc, db_key)
+    assert klartext.startswith(crypto.PAYLOAD_V2_MAGIC)
+    flags = klartext[len(crypto.PAYLOAD_V2_MAGIC)]
+    assert bool(flags & crypto.PAYLOAD_FLAG_ZLIB) is compress
+
+    conn = crypto.decrypt_db_from_file(enc, db_key)
+    assert conn.serialize() == quelle.serialize()
+    assert conn.execute("SELECT COUNT(*) FROM tracking").fetchone()[0] == 500
+    conn.close()
+    quelle.close()
+
+
+def test_alter_dump_bleibt_lesbar(tmp_path, schluessel):
+    db_key, salt = schluessel
+    enc = tmp_path / "alt.enc"
+    quelle = _beispiel_db(sqlite3.connect(":memory:"))
+    dump = "\n".join(quelle.iterdump()).encode("utf-8")
+    enc.write_bytes(salt + crypto.encrypt_bytes(dump, db_key))
+
+    conn = crypto.decrypt_db_from_file(enc, db_key)
+    assert conn.execute("SELECT COUNT(*) FROM tracking").fetchone()[0] == 500
+    conn.close()
+
+
+def test_unbekannte_flags_werden_abgelehnt(tmp_path, schluessel):
+    db_key, salt = schluessel
+    enc = tmp_path / "neu.enc"
+    klartext = crypto.PAYLOAD_V2_MAGIC + b"\x80" + b"x"
+    enc.write_bytes(salt + crypto.encrypt_bytes(klartext, db_key))
+
+    with pytest.raises(crypto.CryptoUserError):
+        crypto.decrypt_db_from_file(enc, db_key)
+
+
+def test_leere_db_und_wal_datei(tmp_path, schluessel):
+    """SQLite serialisiert keine DB ohne Seiten, und ein WAL-Abbild liesse sich
+    im RAM nicht mehr öffnen."""
+    db_key, salt = schluessel
+    leer = tmp_path / "leer.enc"
+    conn = crypto.create_empty_encrypted_db(leer, db_key, salt)
+    conn.close()
+    wieder = crypto.decrypt_db_from_file(leer, db_key)
+    wieder.execute("CREATE TABLE t(x)")
+    wieder.close()
+
+    datei = sqlite3.connect(tmp_path / "wal.db")
+    datei.execute("PRAGMA journal_mode = WAL")
+    _beispiel_db(datei)
+    wal_enc = tmp_path / "wal.enc"
+    crypto.encrypt_db_to_file(datei, wal_enc, db_key, salt)
+    datei.close()
+
+    conn = crypto.decrypt_db_from_file(wal_enc, db_key)
+    assert conn.execute("SELECT COUNT(*) FROM tracking").fetchone()[0] == 500
+    conn.close()
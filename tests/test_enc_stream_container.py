@@ -0,0 +1,123 @@
+"""``.enc`` als Blockcontainer statt eines einzigen Fernet-Tokens.
+
+Fernet hielt Klartext, Chiffrat und base64 gleichzeitig im Speicher. Der
+Container versiegelt 64-KiB-Blöcke einzeln; alte Dateien bleiben lesbar und
+werden beim nächsten vollständigen Speichern umgestellt.
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import sqlite3
+import tracemalloc
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+import model.crypto as crypto
+from model.crypto_stream import (
+    STREAM_MAGIC,
+    STREAM_TAG_SIZE,
+    decrypt_stream,
+    encrypt_stream,
+)
+from model.database import EncryptedSession
+
+KOPF = crypto.SALT_LENGTH + 30  # Salt + Magic, Version, Flags, Grösse, Nonce
+
+
+def _container(klartext: bytes, schluessel, *, chunk_size: int = 64) -> bytes:
+    db_key, salt = schluessel
+    stuecke = [klartext[i : i + 7] for i in range(0, len(klartext), 7)]
+    return b"".join(encrypt_stream(stuecke, db_key, salt, chunk_size=chunk_size))
+
+
+def _lesen(daten: bytes, db_key: bytes) -> bytes:
+    f = io.BytesIO(daten)
+    salt = f.read(crypto.SALT_LENGTH)
+    magic = f.read(len(STREAM_MAGIC))
+    return b"".join(decrypt_stream(f, db_key, salt, magic))
+
+
+@pytest.mark.parametrize("laenge", [0, 1, 63, 64, 65, 128, 1000])
+def test_blockgrenzen(schluessel, laenge):
+    klartext = os.urandom(laenge)
+    daten = _container(klartext, schluessel)
+    # Ein voller letzter Block bleibt voll; nur leerer Klartext braucht einen
+    # leeren Schlussblock.
+    bloecke = max(1, -(-laenge // 64))
+    assert len(daten) == KOPF + laenge + bloecke * STREAM_TAG_SIZE
+    assert _lesen(daten, schluessel[0]) == klartext
+
+
+def test_manipulationen_fallen_auf(schluessel):
+    db_key, _salt = schluessel
+    daten = _container(os.urandom(300), schluessel)
+    block = 64 + STREAM_TAG_SIZE
+
+    abgeschnitten = daten[: KOPF + 2 * block]
+    vertauscht = (
+        daten[:KOPF]
+        + daten[KOPF + block : KOPF + 2 * block]
+        + daten[KOPF : KOPF + block]
+        + daten[KOPF + 2 * block :]
+    )
+    kopf = bytearray(daten)
+    kopf[3] ^= 1  # Salt gehört zum authentifizierten Kopf
+    for kaputt in (abgeschnitten, vertauscht, bytes(kopf)):
+        with pytest.raises(crypto.CryptoUserError):
+            _lesen(kaputt, db_key)
+
+    with pytest.raises(crypto.CryptoUserError) as fehler:
+        _lesen(daten, crypto.generate_db_key())
+    assert fehler.value.key == "crypto.decrypt_failed_wrong_key"
+
+
+def test_speichern_haelt_nur_bloecke_im_speicher(tmp_path, schluessel):
+    db_key, salt = schluessel
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE t(x)")
+    conn.executemany(
+        "INSERT INTO t VALUES (?)", [(os.urandom(2000),) for _ in range(2000)]
+    )
+    conn.commit()
+    abbild = crypto.serialize_db(conn)
+    enc = tmp_path / "gross.enc"
+
+    tracemalloc.start()
+    try:
+        crypto.encrypt_image_to_file(abbild, enc, db_key, salt, compress=False)
+        _aktuell, spitze = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert spitze < len(abbild) / 2
+    wieder = crypto.decrypt_db_from_file(enc, db_key)
+    assert wieder.serialize() == abbild
+    wieder.close()
+    conn.close()
+
+
+def test_alte_fernet_datei_wird_beim_speichern_umgestellt(tmp_path, schluessel):
+    db_key, salt = schluessel
+    quelle = sqlite3.connect(":memory:")
+    quelle.execute("CREATE TABLE tracking(id INTEGER PRIMARY KEY, text TEXT)")
+    quelle.execute("INSERT INTO tracking(text) VALUES ('alt')")
+    quelle.commit()
+    enc = tmp_path / "alt.enc"
+    klartext = crypto.encode_image_payload(crypto.serialize_db(quelle))
+    enc.write_bytes(salt + crypto.encrypt_bytes(klartext, db_key))
+    assert enc.read_bytes()[crypto.SALT_LENGTH :].startswith(b"gAAAAA")
+
+    session = EncryptedSession.open_with_key(str(enc), db_key, salt)
+    assert session.conn.execute("SELECT text FROM tracking").fetchone()[0] == "alt"
+    session.close()
+
+    daten = enc.read_bytes()
+    assert daten[: crypto.SALT_LENGTH] == salt
+    assert daten[crypto.SALT_LENGTH :].startswith(STREAM_MAGIC)
+    wieder = crypto.decrypt_db_from_file(enc, db_key)
+    assert wieder.execute("SELECT text FROM tracking").fetchone()[0] == "alt"
+    wieder.close()
@@ -0,0 +1,183 @@
+"""Verschlüsselte DB: Commits als Seitendeltas statt Vollspeicherung.
+
+Bis hierher lief bei jedem Commit ``iterdump()`` über die ganze DB, dann
+Fernet über den ganzen Text. Jetzt hängt ein Commit nur die geänderten
+Seiten an ``<name>.enc.journal`` an; ``close()`` und jeder andere Anlass
+verdichten wieder zu einem vollständigen Snapshot.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+import model.crypto as crypto
+from model.crypto_stream import STREAM_MAGIC
+from model.database import EncryptedSession
+from model.encrypted_journal import JOURNAL_MAGIC, journal_path_for
+from model.restore_bundle import atomic_copy_verified
+
+
+def _neue_session(enc: Path, schluessel) -> EncryptedSession:
+    db_key, salt = schluessel
+    conn = crypto.create_empty_encrypted_db(enc, db_key, salt)
+    conn.close()
+    session = EncryptedSession.open_with_key(str(enc), db_key, salt)
+    session.conn.execute(
+        "CREATE TABLE tracking(id INTEGER PRIMARY KEY, betrag REAL, text TEXT)"
+    )
+    session.conn.executemany(
+        "INSERT INTO tracking(betrag, text) VALUES (?, ?)",
+        [(float(i), os.urandom(100).hex()) for i in range(2000)],
+    )
+    session.conn.commit()
+    return session
+
+
+def _zeilen(enc: Path, db_key: bytes) -> int:
+    conn = crypto.decrypt_db_from_file(enc, db_key)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM tracking").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_commit_haengt_nur_geaenderte_seiten_an(tmp_path, schluessel):
+    enc = tmp_path / "konto.enc"
+    session = _neue_session(enc, schluessel)
+    basis = enc.stat().st_size
+    journal = journal_path_for(enc)
+    vorher = journal.stat().st_size
+
+    session.conn.execute("INSERT INTO tracking(betrag, text) VALUES (1.5, 'neu')")
+    session.conn.commit()
+
+    assert enc.stat().st_size == basis, "der Snapshot darf nicht neu entstehen"
+    zuwachs = journal.stat().st_size - vorher
+    assert 0 < zuwachs < basis / 10
+    assert _zeilen(enc, schluessel[0]) == 2001
+    session.close()
+
+
+def test_neue_session_schreibt_das_journal_weiter(tmp_path, schluessel):
+    enc = tmp_path / "konto.enc"
+    db_key, salt = schluessel
+    session = _neue_session(enc, schluessel)
+    session.conn.execute("DELETE FROM tracking WHERE id <= 10")
+    session.conn.commit()
+    # Absturz: kein close(), die Änderung steht nur im Journal.
+    session._closed = True
+    session.conn.close()
+
+    zweite = EncryptedSession.open_with_key(str(enc), db_key, salt)
+    assert zweite.conn.execute("SELECT COUNT(*) FROM tracking").fetchone()[0] == 1990
+    zweite.conn.execute("INSERT INTO tracking(betrag, text) VALUES (2.0, 'b')")
+    zweite.conn.commit()
+    zweite._closed = True
+    zweite.conn.close()
+
+    assert _zeilen(enc, db_key) == 1991
+
+
+def test_halbes_letztes_frame_kostet_nur_den_letzten_commit(tmp_path, schluessel):
+    enc = tmp_path / "konto.enc"
+    db_key, salt = schluessel
+    session = _neue_session(enc, schluessel)
+    session.conn.execute("INSERT INTO tracking(betrag, text) VALUES (1, 'a')")
+    session.conn.commit()
+    session.conn.execute("INSERT INTO tracking(betrag, text) VALUES (2, 'b')")
+    session.conn.commit()
+    session._closed = True
+    session.conn.close()
+
+    journal = journal_path_for(enc)
+    daten = journal.read_bytes()
+    journal.write_bytes(daten[:-7])
+
+    zweite = EncryptedSession.open_with_key(str(enc), db_key, salt)
+    assert zweite.conn.execute("SELECT COUNT(*) FROM tracking").fetchone()[0] == 2001
+    # Nach dem Bruch geht es weiter - der Rest wird abgeschnitten, nicht
+    # übersprungen.
+    zweite.conn.execute("INSERT INTO tracking(betrag, text) VALUES (3, 'c')")
+    zweite.conn.commit()
+    zweite._closed = True
+    zweite.conn.close()
+    assert _zeilen(enc, db_key) == 2002
+
+
+def test_close_verdichtet_zu_einem_snapshot(tmp_path, schluessel):
+    enc = tmp_path / "konto.enc"
+    session = _neue_session(enc, schluessel)
+    session.conn.execute("UPDATE tracking SET betrag = betrag + 1")
+    session.conn.commit()
+    session.close()
+
+    journal = journal_path_for(enc)
+    assert len(journal.read_bytes()) == len(JOURNAL_MAGIC) + 32
+    assert _zeilen(enc, schluessel[0]) == 2000
+
+
+def test_fremde_basis_macht_das_journal_ungueltig(tmp_path, schluessel):
+    """Absturz nach dem Schreiben der Basis, vor dem Journalkopf: das alte
+    Journal darf nichts mehr einspielen."""
+    enc = tmp_path / "konto.enc"
+    db_key, salt = schluessel
+    session = _neue_session(enc, schluessel)
+    session.conn.execute("INSERT INTO tracking(betrag, text) VALUES (9, 'alt')")
+    session.conn.commit()
+    session.freeze()
+    session.close()
+
+    ersatz = sqlite3.connect(":memory:")
+    ersatz.execute("CREATE TABLE tracking(id INTEGER PRIMARY KEY, betrag, text)")
+    ersatz.execute("INSERT INTO tracking(betrag, text) VALUES (1, 'restore')")
+    ersatz.commit()
+    crypto.encrypt_image_to_file(crypto.serialize_db(ersatz), enc, db_key, salt)
+    ersatz.close()
+
+    assert journal_path_for(enc).exists()
+    assert _zeilen(enc, db_key) == 1
+
+
+def test_restore_der_gleichen_basis_verwirft_das_journal(tmp_path, schluessel):
+    """Byte-gleiche Sicherung: der Fingerabdruck passt, die neueren Frames
+    dürfen den Restore trotzdem nicht überschreiben."""
+    enc = tmp_path / "konto.enc"
+    sicherung = tmp_path / "sicherung.enc"
+    db_key, salt = schluessel
+    session = _neue_session(enc, schluessel)
+    session.close()
+    sicherung.write_bytes(enc.read_bytes())
+
+    session = EncryptedSession.open_with_key(str(enc), db_key, salt)
+    session.conn.execute("DELETE FROM tracking WHERE id <= 100")
+    session.conn.commit()
+    session.freeze()
+    session.close()
+    assert _zeilen(enc, db_key) == 1900
+
+    atomic_copy_verified(sicherung, enc)
+
+    assert not journal_path_for(enc).exists()
+    assert _zeilen(enc, db_key) == 2000
+
+
+def test_alter_dump_wird_beim_ersten_commit_zum_abbild(tmp_path, schluessel):
+    enc = tmp_path / "konto.enc"
+    db_key, salt = schluessel
+    dump = "CREATE TABLE tracking(id INTEGER PRIMARY KEY, betrag, text);"
+    enc.write_bytes(salt + crypto.encrypt_bytes(dump.encode("utf-8"), db_key))
+
+    session = EncryptedSession.open_with_key(str(enc), db_key, salt)
+    session.conn.execute("INSERT INTO tracking(betrag, text) VALUES (1, 'a')")
+    session.conn.commit()
+    session._closed = True
+    session.conn.close()
+
+    assert enc.read_bytes()[crypto.SALT_LENGTH :].startswith(STREAM_MAGIC)
+    assert _zeilen(enc, db_key) == 1
@@ -0,0 +1,146 @@
+"""Verschlüsselte DB: Speichern nach Commit im Hintergrund-Thread.
+
+Der GUI-Thread kopiert nach dem Commit nur noch das Seitenabbild; eine Serie
+von Commits innerhalb des Zeitfensters wird ein Schreibvorgang im Thread.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+import model.crypto as crypto
+from model.database import EncryptedSession
+from model.encrypted_journal import JOURNAL_MAGIC, journal_path_for
+
+
+def _session(enc: Path, schluessel, *, delay_ms: int) -> EncryptedSession:
+    db_key, salt = schluessel
+    conn = crypto.create_empty_encrypted_db(enc, db_key, salt)
+    conn.close()
+    session = EncryptedSession.open_with_key(
+        str(enc), db_key, salt, autosave_delay_ms=delay_ms
+    )
+    session.conn.execute(
+        "CREATE TABLE tracking(id INTEGER PRIMARY KEY, betrag REAL, text TEXT)"
+    )
+    session.conn.executemany(
+        "INSERT INTO tracking(betrag, text) VALUES (?, ?)",
+        [(float(i), os.urandom(50).hex()) for i in range(500)],
+    )
+    session.conn.commit()
+    assert session.flush(5)
+    return session
+
+
+def _zeilen(enc: Path, db_key: bytes) -> int:
+    conn = crypto.decrypt_db_from_file(enc, db_key)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM tracking").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_commit_serie_wird_ein_schreibvorgang(tmp_path, schluessel):
+    enc = tmp_path / "konto.enc"
+    session = _session(enc, schluessel, delay_ms=60_000)
+    seq_vorher = session._journal.state.next_seq
+
+    for i in range(20):
+        session.conn.execute(
+            "INSERT INTO tracking(betrag, text) VALUES (?, 'serie')", (float(i),)
+        )
+        session.conn.commit()
+    assert session.save_status == "pending"
+    assert session._journal.state.next_seq == seq_vorher
+
+    assert session.flush(5)
+    assert session._journal.state.next_seq == seq_vorher + 1
+    assert session.save_status == "saved"
+    assert _zeilen(enc, schluessel[0]) == 520
+    session.close()
+
+
+def test_close_schreibt_wartende_commits(tmp_path, schluessel):
+    enc = tmp_path / "konto.enc"
+    session = _session(enc, schluessel, delay_ms=60_000)
+    session.conn.execute("DELETE FROM tracking WHERE id <= 100")
+    session.conn.commit()
+    session.close()
+
+    assert not session._writer.alive
+    assert len(journal_path_for(enc).read_bytes()) == len(JOURNAL_MAGIC) + 32
+    assert _zeilen(enc, schluessel[0]) == 400
+
+
+def test_alter_snapshot_ueberholt_keinen_vollsnapshot(tmp_path, schluessel):
+    """Ein Backup speichert synchron; ein vorher eingereichter, älterer
+    Commit-Snapshot darf danach nicht mehr geschrieben werden."""
+    enc = tmp_path / "konto.enc"
+    session = _session(enc, schluessel, delay_ms=60_000)
+    session.conn.execute("INSERT INTO tracking(betrag, text) VALUES (1, 'a')")
+    session.conn.commit()
+    session.conn.execute("INSERT INTO tracking(betrag, text) VALUES (2, 'b')")
+    session.save(reason="backup")
+
+    assert session.flush(5)
+    assert session._journal.state.next_seq == 0
+    assert _zeilen(enc, schluessel[0]) == 502
+    session.close()
+
+
+def test_freeze_verwirft_wartende_snapshots(tmp_path, schluessel):
+    enc = tmp_path / "konto.enc"
+    session = _session(enc, schluessel, delay_ms=60_000)
+    session.conn.execute("DELETE FROM tracking")
+    session.conn.commit()
+    session.freeze()
+    session.close()
+
+    assert _zeilen(enc, schluessel[0]) == 500
+
+
+def test_schreibfehler_beendet_den_thread_nicht(tmp_path, schluessel, monkeypatch):
+    enc = tmp_path / "konto.enc"
+    session = _session(enc, schluessel, delay_ms=60_000)
+
+    def kaputt(_image):
+        raise RuntimeError("unerwartet")
+
+    with monkeypatch.context() as m:
+        m.setattr(session._journal, "append", kaputt)
+        session.conn.execute("DELETE FROM tracking WHERE id <= 10")
+        session.conn.commit()
+        assert not session.flush(5)
+        assert session.save_status == "error"
+    assert session._writer.alive
+
+    session.conn.execute("DELETE FROM tracking WHERE id <= 20")
+    session.conn.commit()
+    assert session.flush(5)
+    assert session.save_status == "saved"
+    assert _zeilen(enc, schluessel[0]) == 480
+    session.close()
+
+
+def test_ausgefallener_thread_speichert_synchron(tmp_path, schluessel):
+    enc = tmp_path / "konto.enc"
+    session = _session(enc, schluessel, delay_ms=60_000)
+    status: list[str] = []
+    session.add_save_status_listener(status.append)
+    tot = threading.Thread(target=lambda: None)
+    tot.start()
+    tot.join()
+    session._writer._thread = tot  # wie nach einem Absturz im Thread
+
+    session.conn.execute("DELETE FROM tracking WHERE id <= 100")
+    session.conn.commit()
+    assert "error" in status
+    assert _zeilen(enc, schluessel[0]) == 400  # ohne flush() schon auf der Platte
+    assert not session.flush(5)
+    session.close()
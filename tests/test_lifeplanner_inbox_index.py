@@ -0,0 +1,188 @@
+"""Index über die LifePlanner-Inbox (``_einlesen``, ``pending_count``).
+
+Der Badge im Hauptfenster fragte nach jeder Änderung ``pending_count`` - und
+das las jede Brückendatei vollständig, parste jede Zeile und prüfte jede
+importierte Buchung mit einer eigenen Abfrage. Jetzt werden nur angehängte
+oder geänderte Zeilen geparst, und der Zähler bleibt stehen, bis sich Datei
+oder Datenbank ändern.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from model import lifeplanner_import_service as service
+from model.migrations import migrate_all
+from model.typ_constants import TYP_EXPENSES
+
+
+@pytest.fixture
+def conn():
+    c = sqlite3.connect(":memory:")
+    c.row_factory = sqlite3.Row
+    migrate_all(c)
+    yield c
+    c.close()
+
+
+@pytest.fixture
+def geparst(monkeypatch):
+    """Zählt, wie viele Zeilen tatsächlich geparst werden."""
+    aufrufe: list[int] = []
+    original = service._parse_record
+
+    def zaehlen(raw, line_no):
+        aufrufe.append(line_no)
+        return original(raw, line_no)
+
+    monkeypatch.setattr(service, "_parse_record", zaehlen)
+    return aufrufe
+
+
+def _zeile(nr: int, amount: float = 12.5) -> str:
+    return json.dumps(
+        {
+            "schema": service.SCHEMA,
+            "external_id": f"fpm:{nr}",
+            "date": "2026-05-01",
+            "amount": amount,
+            "currency": "CHF",
+            "description": f"Kauf {nr}",
+        }
+    )
+
+
+def _schreiben(pfad: Path, zeilen: list[str], modus: str = "w") -> None:
+    with pfad.open(modus, encoding="utf-8") as f:
+        f.write("".join(z + "\n" for z in zeilen))
+
+
+def test_angehaengte_zeilen_werden_allein_geparst(conn, tmp_path, geparst):
+    pfad = tmp_path / "inbox.jsonl"
+    _schreiben(pfad, [_zeile(i) for i in range(50)])
+    assert len(service.load_import_records(conn, pfad)) == 50
+    assert len(geparst) == 50
+
+    geparst.clear()
+    assert len(service.load_import_records(conn, pfad)) == 50
+    assert geparst == []  # unverändert: kein Parsen
+
+    _schreiben(pfad, [_zeile(50)], modus="a")
+    assert len(service.load_import_records(conn, pfad)) == 51
+    assert geparst == [51]  # Zeilennummer stimmt weiter
+
+
+def test_neu_geschriebene_datei_parst_nur_geaenderte_zeilen(conn, tmp_path, geparst):
+    pfad = tmp_path / "inbox.jsonl"
+    _schreiben(pfad, [_zeile(i) for i in range(20)])
+    service.load_import_records(conn, pfad)
+    geparst.clear()
+
+    neu = tmp_path / "inbox.tmp"
+    _schreiben(neu, [_zeile(i, 99.0 if i == 7 else 12.5) for i in range(1, 20)])
+    os.replace(neu, pfad)  # wie FPM: atomar ersetzt
+    records = service.records_by_id(service.load_import_records(conn, pfad))
+
+    assert len(geparst) == 1
+    assert "fpm:0" not in records
+    assert records["fpm:7"].amount == 99.0
+
+
+def test_gleich_lange_aenderung_an_ort_und_stelle_wird_gelesen(conn, tmp_path):
+    pfad = tmp_path / "inbox.jsonl"
+    _schreiben(pfad, [_zeile(i) for i in range(100)])  # weit über 4 KiB
+    service.load_import_records(conn, pfad)
+    stand = pfad.stat()
+
+    text = pfad.read_text(encoding="utf-8")
+    with pfad.open("r+", encoding="utf-8") as f:  # gleiche Datei, gleiche Länge
+        f.write(text.replace("12.5", "13.5", 1))
+    os.utime(pfad, ns=(stand.st_atime_ns, stand.st_mtime_ns + 1_000_000))
+    assert pfad.stat().st_size == stand.st_size
+
+    records = service.records_by_id(service.load_import_records(conn, pfad))
+    assert records["fpm:0"].amount == 13.5
+    assert records["fpm:1"].amount == 12.5
+
+
+def test_unvollstaendige_letzte_zeile_wird_spaeter_fertig_gelesen(conn, tmp_path):
+    pfad = tmp_path / "inbox.jsonl"
+    _schreiben(pfad, [_zeile(1)])
+    with pfad.open("a", encoding="utf-8") as f:
+        f.write(_zeile(2))  # noch ohne Zeilenende
+    assert len(service.load_import_records(conn, pfad)) == 2
+    with pfad.open("a", encoding="utf-8") as f:
+        f.write("\n" + _zeile(3) + "\n")
+    ids = {r.external_id for r in service.load_import_records(conn, pfad)}
+    assert ids == {"fpm:1", "fpm:2", "fpm:3"}
+
+
+def test_fehler_bleiben_bei_jedem_aufruf_sichtbar(conn, tmp_path):
+    pfad = tmp_path / "inbox.jsonl"
+    _schreiben(pfad, [_zeile(1), "{kaputt"])
+    for _ in range(2):
+        with pytest.raises(service.LifePlannerImportError, match="Zeile 2"):
+            service.load_import_records(conn, pfad)
+
+
+def test_importierte_buchungen_in_einer_abfrage_geprueft(conn, tmp_path):
+    pfad = tmp_path / "inbox.jsonl"
+    _schreiben(pfad, [_zeile(i) for i in range(5)])
+    service.ensure_state_table(conn)
+    for i in range(5):
+        cur = conn.execute(
+            "INSERT INTO tracking(date, typ, category, amount, details) "
+            "VALUES ('2026-05-01', ?, 'Hobby', -12.5, '')",
+            (TYP_EXPENSES,),
+        )
+        conn.execute(
+            "INSERT INTO lifeplanner_import_state(external_id, source, payload_hash, "
+            "status, tracking_id, processed_at, source_payload) "
+            "VALUES (?, 'LifePlanner', ?, 'imported', ?, '', '{}')",
+            (
+                f"fpm:{i}",
+                service._canonical_hash(json.loads(_zeile(i))),
+                cur.lastrowid,
+            ),
+        )
+    conn.execute("DELETE FROM tracking WHERE id = 3")
+    conn.commit()
+
+    statements: list[str] = []
+    conn.set_trace_callback(statements.append)
+    try:
+        records = service.records_by_id(service.load_import_records(conn, pfad))
+    finally:
+        conn.set_trace_callback(None)
+
+    assert sum("FROM tracking" in s for s in statements) == 1
+    assert records["fpm:2"].status == "orphaned"
+    assert {r.status for k, r in records.items() if k != "fpm:2"} == {"imported"}
+
+
+def test_badge_zaehler_bleibt_bis_zur_naechsten_aenderung(conn, tmp_path, monkeypatch):
+    pfad = tmp_path / "inbox.jsonl"
+    _schreiben(pfad, [_zeile(i) for i in range(3)])
+    laeufe: list[int] = []
+    original = service.load_import_records
+
+    def zaehlen(c, path=None):
+        laeufe.append(1)
+        return original(c, path)
+
+    monkeypatch.setattr(service, "load_import_records", zaehlen)
+
+    assert service.pending_count(conn, pfad) == 3
+    assert service.pending_count(conn, pfad) == 3
+    assert len(laeufe) == 1
+
+    _schreiben(pfad, [_zeile(3)], modus="a")
+    assert service.pending_count(conn, pfad) == 4
+
+    service.reject_import(conn, service.load_import_records(conn, pfad)[0])
+    assert service.pending_count(conn, pfad) == 3
@@ -0,0 +1,120 @@
+"""Gepflegte Monatssummen (``monthly_totals``, Schema v19).
+
+Die Budgetübersicht las Budget und Ist je (Typ, Monat) mit einem eigenen
+``SUM()``; Trigger halten jetzt eine Summentabelle aktuell, aus der die
+Übersicht mit einer Abfrage je Typ liest.
+"""
+
+from __future__ import annotations
+
+import random
+import sqlite3
+
+import pytest
+
+from model.budget_overview_model import BudgetOverviewModel
+from model.migrations import migrate_all
+from model.monthly_totals import rebuild_monthly_totals
+from model.typ_constants import TYP_EXPENSES, TYP_INCOME, TYP_SAVINGS
+
+TYPEN = (TYP_EXPENSES, TYP_INCOME, TYP_SAVINGS)
+
+
+@pytest.fixture
+def conn():
+    c = sqlite3.connect(":memory:")
+    migrate_all(c)
+    yield c
+    c.close()
+
+
+def _bestand(conn) -> list[tuple]:
+    return conn.execute(
+        "SELECT year, month, typ, category, round(budget, 6), round(actual, 6) "
+        "FROM monthly_totals ORDER BY 1, 2, 3, 4"
+    ).fetchall()
+
+
+def _zufallsdaten(conn, rnd: random.Random) -> None:
+    for _ in range(400):
+        y, m = rnd.randint(2023, 2025), rnd.randint(1, 12)
+        conn.execute(
+            "INSERT INTO tracking(date, typ, category, amount) VALUES (?,?,?,?)",
+            (
+                f"{y}-{m:02d}-{rnd.randint(1, 28):02d}",
+                rnd.choice(TYPEN),
+                f"K{rnd.randint(1, 6)}",
+                round(rnd.uniform(-200, 200), 2),
+            ),
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO budget(year, month, typ, category, amount) "
+            "VALUES (?,?,?,?,?)",
+            (y, m, rnd.choice(TYPEN), f"K{rnd.randint(1, 6)}", rnd.randint(0, 300)),
+        )
+    conn.commit()
+
+
+def test_trigger_halten_die_summen_wie_ein_neuaufbau(conn):
+    rnd = random.Random(7)
+    _zufallsdaten(conn, rnd)
+    conn.execute("UPDATE tracking SET date = '2024-03-15' WHERE id % 7 = 0")
+    conn.execute("UPDATE tracking SET category = 'K9' WHERE category = 'K2'")
+    conn.execute("UPDATE tracking SET amount = amount * 2 WHERE id % 5 = 0")
+    conn.execute("DELETE FROM tracking WHERE id % 3 = 0")
+    conn.execute("UPDATE OR IGNORE budget SET month = 1 WHERE id % 4 = 0")
+    conn.execute("DELETE FROM budget WHERE id % 6 = 0")
+    conn.commit()
+
+    gepflegt = _bestand(conn)
+    rebuild_monthly_totals(conn)
+    assert _bestand(conn) == gepflegt
+
+
+def test_leere_gruppen_verschwinden_und_budget_null_bleibt_erhalten(conn):
+    conn.execute(
+        "INSERT INTO tracking(date, typ, category, amount) "
+        "VALUES ('2025-02-03', ?, 'Miete', -900)",
+        (TYP_EXPENSES,),
+    )
+    conn.execute(
+        "INSERT INTO budget(year, month, typ, category, amount) "
+        "VALUES (2025, 2, ?, 'Essen', 0)",
+        (TYP_EXPENSES,),
+    )
+    conn.execute("DELETE FROM tracking")
+    assert _bestand(conn) == [(2025, 2, TYP_EXPENSES, "Essen", 0.0, None)]
+
+
+def test_uebersicht_liest_dasselbe_wie_ohne_tabelle(conn):
+    _zufallsdaten(conn, random.Random(11))
+    mit = BudgetOverviewModel(conn)
+    ohne = BudgetOverviewModel(conn)
+    ohne._has_totals = False
+
+    for args in ((2025, None, None, 1, 2023), (2024, None, [3, 4], 5, None)):
+        # Gleiche Summanden, andere Reihenfolge: höchstens Rundung im letzten Bit.
+        assert [vars(r) for r in mit.get_monthly_overview(*args)] == [
+            pytest.approx(vars(r)) for r in ohne.get_monthly_overview(*args)
+        ]
+    for typ in TYPEN:
+        assert mit.carry_over_by_category(2025, 6, typ, 3, 2023) == pytest.approx(
+            ohne.carry_over_by_category(2025, 6, typ, 3, 2023)
+        )
+        assert mit.actual_by_category_range(2024, [1, 3, 4], typ) == pytest.approx(
+            ohne.actual_by_category_range(2024, [1, 3, 4], typ)
+        )
+        assert mit.budget_by_category_range(2024, [2, 3], typ) == pytest.approx(
+            ohne.budget_by_category_range(2024, [2, 3], typ)
+        )
+
+
+def test_uebersicht_ueber_jahre_braucht_eine_abfrage_je_typ(conn):
+    _zufallsdaten(conn, random.Random(3))
+    abfragen: list[str] = []
+    conn.set_trace_callback(abfragen.append)
+    BudgetOverviewModel(conn).get_monthly_overview(2025, start_year=2023)
+    conn.set_trace_callback(None)
+
+    summen = [q for q in abfragen if "FROM monthly_totals" in q]
+    assert len(summen) == len(TYPEN)
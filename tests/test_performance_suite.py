@@ -0,0 +1,127 @@
+"""Benchmark-Suite (``tools/performance_release_gate.py``).
+
+Das Gate mass fünf Abfragen auf einer DB fester Grösse gegen handgesetzte
+Sekundengrenzen. Jetzt misst es Haushalte mehrerer Grössen über alle
+Szenarien, schreibt einen JSON-Verlauf und vergleicht statistisch mit einer
+gespeicherten Baseline.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+
+import pytest
+
+from tools import performance_release_gate as gate
+
+LANGSAM = [1.30, 1.32, 1.29, 1.35, 1.31]
+BASIS = [1.00, 1.02, 0.99, 1.01, 1.03]
+
+
+def test_deutliche_verlangsamung_ist_eine_regression():
+    result = gate.compare({"a": LANGSAM}, {"a": BASIS}, alpha=0.01, min_slowdown=0.2)
+    assert result["a"]["status"] == "regression"
+    assert result["a"]["p_value"] < 0.01
+
+
+def test_rauschen_und_kleine_verschiebungen_bestehen():
+    wackelig = [1.0, 1.4, 0.9, 1.2, 1.1]
+    leicht_langsamer = [v * 1.1 for v in BASIS]
+    result = gate.compare(
+        {"rauschen": wackelig, "klein": leicht_langsamer, "neu": [0.5]},
+        {"rauschen": BASIS, "klein": BASIS},
+        alpha=0.01,
+        min_slowdown=0.2,
+    )
+    assert result["rauschen"]["status"] == "ok"
+    assert result["klein"]["status"] == "ok"  # signifikant, aber unter 20 %
+    assert result["neu"]["status"] == "new"
+    schneller = gate.compare({"a": BASIS}, {"a": LANGSAM}, alpha=0.01, min_slowdown=0.2)
+    assert schneller["a"]["status"] == "faster"
+
+
+def _args(tmp_path, *scenarios: str) -> list[str]:
+    args = ["--profile", "klein", "--repeat", "5"]
+    for name in scenarios:
+        args += ["--scenario", name]
+    return args + [
+        "--json-out",
+        str(tmp_path / "gate.json"),
+        "--history",
+        str(tmp_path / "verlauf.jsonl"),
+        "--baseline",
+        str(tmp_path / "baseline.json"),
+    ]
+
+
+def test_zu_wenige_wiederholungen_werden_abgewiesen(tmp_path):
+    assert gate.min_p_value(4, 4) >= 0.01 > gate.min_p_value(5, 5)
+    args = _args(tmp_path, "database_quick_check")
+    args[args.index("--repeat") + 1] = "4"
+    with pytest.raises(SystemExit, match="mindestens 5"):
+        gate.main(args)
+    kurz = gate.compare({"a": LANGSAM}, {"a": BASIS[:2]}, alpha=0.01, min_slowdown=0.2)
+    assert kurz["a"]["status"] == "underpowered"
+
+
+def test_lauf_schreibt_verlauf_und_baseline(tmp_path):
+    # Grosszügige Schwelle: scheitern darf nur eine echte Verlangsamung.
+    args = _args(tmp_path, "tracking_add_throughput", "bridge_import")
+    args += ["--min-slowdown", "3"]
+
+    assert gate.main(args + ["--update-baseline"]) == 0
+    assert gate.main(args) == 0
+
+    verlauf = [
+        json.loads(line)
+        for line in (tmp_path / "verlauf.jsonl").read_text("utf-8").splitlines()
+    ]
+    assert len(verlauf) == 2
+    assert {c["status"] for c in verlauf[0]["comparison"].values()} == {"new"}
+    assert "baseline_median" in verlauf[1]["comparison"]["bridge_import"]
+    assert verlauf[1]["result_sizes"] == {
+        "tracking_add_throughput": gate.ADD_BATCH,
+        "bridge_import": gate.IMPORT_BATCH,
+    }
+    baseline = json.loads((tmp_path / "baseline.json").read_text("utf-8"))
+    assert len(baseline["samples_seconds"]["bridge_import"]) == 5
+
+
+def test_eingebaute_verlangsamung_laesst_das_gate_scheitern(tmp_path, monkeypatch):
+    args = _args(tmp_path, "bridge_export")
+    args[args.index("--repeat") + 1] = "7"  # übersteht auch einen Ausreisser
+    assert gate.main(args + ["--update-baseline"]) == 0
+    basis = json.loads((tmp_path / "baseline.json").read_text("utf-8"))
+    # Verzögerung relativ zur Baseline: bleibt auch unter Last deutlich.
+    pause = 0.02 + 2 * max(basis["samples_seconds"]["bridge_export"])
+
+    original = gate.export_savings_goals
+
+    def langsam(*a, **kw):
+        time.sleep(pause)
+        return original(*a, **kw)
+
+    monkeypatch.setattr(gate, "export_savings_goals", langsam)
+    assert gate.main(args) == 1
+    bericht = json.loads((tmp_path / "gate.json").read_text("utf-8"))
+    assert bericht["comparison"]["bridge_export"]["status"] == "regression"
+    assert not bericht["passed"]
+
+
+def test_fehlende_baseline_und_feste_grenzen_scheitern(tmp_path, capsys):
+    args = _args(tmp_path, "database_quick_check", "bridge_export")
+    assert gate.main(args) == 1
+    assert "keine Baseline" in capsys.readouterr().err
+    bericht = json.loads((tmp_path / "gate.json").read_text("utf-8"))
+    assert bericht["result_sizes"]["bridge_export"] > 0  # jeder Lauf schreibt
+
+    assert gate.main(args + ["--update-baseline"]) == 0
+    # Nur die feste Grenze prüfen - Lastschwankungen unter xdist sollen hier
+    # keine Regression gegen die frische Baseline auslösen.
+    assert gate.main(args + ["--min-slowdown", "3", "--max-quick-check", "0"]) == 1
+    bericht = json.loads((tmp_path / "gate.json").read_text("utf-8"))
+    assert (
+        f"database_quick_check: "
+        f"{bericht['timings_seconds']['database_quick_check']:.4f}s > 0.0000s"
+    ) in bericht["errors"]
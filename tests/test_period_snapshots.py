@@ -0,0 +1,163 @@
+"""Eingefrorene Summen abgeschlossener Monate (``period_snapshots``, Schema v22).
+
+Übersicht und Übertrag summierten die ganze Historie ab dem Startjahr bei
+jedem Aufruf neu. Abgeschlossene Monate werden jetzt beim Abschluss
+eingefroren, live summiert wird erst ab dem ersten offenen Monat; eine
+Änderung im Monat verwirft dessen Snapshot.
+"""
+
+from __future__ import annotations
+
+import random
+import sqlite3
+
+import pytest
+
+from model.budget_overview_model import BudgetOverviewModel
+from model.migrations import migrate_all
+from model.month_close_model import MonthCloseModel
+from model.period_snapshots import rebuild_period_snapshots
+from model.typ_constants import TYP_EXPENSES, TYP_INCOME, TYP_SAVINGS
+
+TYPEN = (TYP_EXPENSES, TYP_INCOME, TYP_SAVINGS)
+
+
+@pytest.fixture
+def conn():
+    c = sqlite3.connect(":memory:")
+    migrate_all(c)
+    rnd = random.Random(11)
+    for _ in range(600):
+        y, m = rnd.randint(2023, 2025), rnd.randint(1, 12)
+        c.execute(
+            "INSERT INTO tracking(date, typ, category, amount) VALUES (?,?,?,?)",
+            (
+                f"{y}-{m:02d}-{rnd.randint(1, 28):02d}",
+                rnd.choice(TYPEN),
+                f"K{rnd.randint(1, 6)}",
+                round(rnd.uniform(-200, 200), 2),
+            ),
+        )
+        c.execute(
+            "INSERT OR REPLACE INTO budget(year, month, typ, category, amount) "
+            "VALUES (?,?,?,?,?)",
+            (y, m, rnd.choice(TYPEN), f"K{rnd.randint(1, 6)}", rnd.randint(0, 300)),
+        )
+    c.commit()
+    yield c
+    c.close()
+
+
+def _schliessen(conn, monate) -> None:
+    model = MonthCloseModel(conn)
+    for y, m in monate:
+        model.mark_closed(y, m)
+
+
+def _live(conn) -> BudgetOverviewModel:
+    model = BudgetOverviewModel(conn)
+    model._has_snapshots = False
+    return model
+
+
+def _uebersicht(model, year: int) -> list[tuple]:
+    return [
+        (s.typ, s.month, s.budget_total, s.actual_total, s.carry_over)
+        for s in model.get_monthly_overview(year, start_month=3, start_year=2023)
+    ]
+
+
+def _uebertraege(model) -> list[dict[str, float]]:
+    return [
+        model._carry_over_by_category(2025, 5, typ, start_month=m, start_year=2023)
+        for typ in TYPEN
+        for m in (1, 4)
+    ]
+
+
+def _abfragen(conn, aufruf) -> list[str]:
+    statements: list[str] = []
+    conn.set_trace_callback(statements.append)
+    try:
+        aufruf()
+    finally:
+        conn.set_trace_callback(None)
+    return [s for s in statements if "FROM monthly_totals" in s]
+
+
+def test_snapshots_liefern_dieselben_zahlen_wie_live(conn):
+    _schliessen(conn, [(2023, m) for m in range(1, 13)] + [(2024, 1), (2024, 2)])
+    model = BudgetOverviewModel(conn)
+
+    for year in (2024, 2025):
+        for got, want in zip(_uebersicht(model, year), _uebersicht(_live(conn), year)):
+            assert got[:2] == want[:2]
+            assert got[2:] == pytest.approx(want[2:])
+    for got, want in zip(_uebertraege(model), _uebertraege(_live(conn))):
+        assert got == pytest.approx(want)
+
+
+def test_live_summiert_erst_ab_dem_ersten_offenen_monat(conn):
+    _schliessen(conn, [(y, m) for y in (2023, 2024) for m in range(1, 13)])
+    model = BudgetOverviewModel(conn)
+
+    abfragen = _abfragen(
+        conn,
+        lambda: model._carry_over_by_category(2025, 5, TYP_EXPENSES, 1, 2023),
+    )
+    assert abfragen and not any("2023" in s or "2024" in s for s in abfragen)
+
+    abfragen = _abfragen(
+        conn, lambda: model.get_monthly_overview(2025, start_month=1, start_year=2023)
+    )
+    assert abfragen and not any("2023" in s or "2024" in s for s in abfragen)
+
+
+def test_aenderung_verwirft_nur_den_betroffenen_monat(conn):
+    _schliessen(conn, [(2023, m) for m in range(1, 13)])
+
+    def gefroren(typ: str) -> set[int]:
+        return {
+            int(r[0])
+            for r in conn.execute(
+                "SELECT month FROM period_snapshots "
+                "WHERE typ=? AND year=2023 AND category=''",
+                (typ,),
+            )
+        }
+
+    assert gefroren(TYP_EXPENSES) == set(range(13))
+    conn.execute(
+        "INSERT INTO tracking(date, typ, category, amount) "
+        "VALUES ('2023-05-10', ?, 'K1', -999)",
+        (TYP_EXPENSES,),
+    )
+    conn.commit()
+
+    assert gefroren(TYP_EXPENSES) == set(range(13)) - {0, 5}
+    assert gefroren(TYP_INCOME) == set(range(13))
+    got = _uebertraege(BudgetOverviewModel(conn))
+    assert got == pytest.approx(_uebertraege(_live(conn)))
+
+    _schliessen(conn, [(2024, 1)])  # nächster Abschluss friert nach
+    assert gefroren(TYP_EXPENSES) == set(range(13))
+
+
+def test_neuaufbau_friert_bereits_abgeschlossene_monate_ein(conn):
+    conn.executemany(
+        "INSERT INTO system_flags(key, value) VALUES (?, '1')",
+        [(f"month_closed:2024-{m:02d}",) for m in (1, 2, 3)],
+    )
+
+    assert rebuild_period_snapshots(conn) == 3
+    row = conn.execute(
+        "SELECT budget, actual FROM period_snapshots "
+        "WHERE typ=? AND year=2024 AND month=2 AND category=''",
+        (TYP_EXPENSES,),
+    ).fetchone()
+    want = conn.execute(
+        "SELECT SUM(budget), SUM(actual) FROM monthly_totals "
+        "WHERE typ=? AND year=2024 AND month=2",
+        (TYP_EXPENSES,),
+    ).fetchone()
+    assert row == pytest.approx(want)
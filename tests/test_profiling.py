@@ -0,0 +1,138 @@
+"""Opt-in-Profiling für den Diagnosebericht (``model.profiling``).
+
+Der Diagnosebericht zeigte PRAGMAs und Logs, aber nicht, wo die Zeit
+bleibt. Eingeschaltet zählt das Profiling SQL-Anweisungen (ohne Literale)
+und die Laufzeit der Einstiegspunkte; ``performance.json`` legt beides in
+den Bericht.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import zipfile
+
+import pytest
+
+from model import crypto, diagnostics, profiling
+from model.database import EncryptedSession, open_db
+from model.migrations import migrate_all
+from model.tracking_model import TrackingModel
+from model.typ_constants import TYP_EXPENSES
+
+
+@pytest.fixture
+def profil():
+    profiling.set_enabled(True)
+    yield profiling
+    profiling.set_enabled(False)
+    profiling.reset()
+
+
+@pytest.fixture
+def conn():
+    c = sqlite3.connect(":memory:")
+    c.row_factory = sqlite3.Row
+    migrate_all(c)
+    c.commit()
+    yield c
+    c.close()
+
+
+def test_ausgeschaltet_wird_nichts_gesammelt(conn):
+    profiling.reset()
+    profiling.attach(conn)
+    try:
+        TrackingModel(conn).add("2026-07-01", TYP_EXPENSES, "Zahnarzt", -12.5)
+        migrate_all(conn)
+    finally:
+        profiling.detach(conn)
+
+    report = profiling.performance_report()
+    assert report["enabled"] is False
+    assert report["statements"] == [] and report["operations"] == {}
+
+
+def test_anweisungen_werden_ohne_werte_gezaehlt(conn, profil):
+    profil.attach(conn)
+    try:
+        tracking = TrackingModel(conn)
+        for betrag in (-12.5, -8.0, -31.25):
+            tracking.add("2026-07-01", TYP_EXPENSES, "Zahnarzt Müller", betrag, "Notiz")
+        conn.execute("SELECT * FROM tracking WHERE id IN (1, 2, 3)").fetchall()
+    finally:
+        profil.detach(conn)
+
+    report = profil.performance_report()
+    text = json.dumps(report, ensure_ascii=False)
+    assert "Zahnarzt" not in text and "Notiz" not in text
+    assert "12.5" not in text and "2026-07-01" not in text
+    inserts = [
+        s for s in report["statements"] if s["sql"].startswith("INSERT INTO tracking")
+    ]
+    assert len(inserts) == 1 and inserts[0]["count"] == 3
+    assert any("IN (?, ...)" in s["sql"] for s in report["statements"])
+    assert report["statement_totals"]["count"] >= 4
+    assert report["attached_connections"] == 0
+
+
+def test_einstiegspunkte_und_ringpuffer(profil, monkeypatch):
+    monkeypatch.setattr(profiling, "SLOW_OPERATION_MS", 0.0)
+
+    @profiling.profiled("test.op")
+    def arbeit(x: int) -> int:
+        return x * 2
+
+    assert arbeit(21) == 42
+    assert arbeit(1) == 2
+
+    report = profil.performance_report()
+    assert report["operations"]["test.op"]["count"] == 2
+    assert [e["name"] for e in report["slow"]] == ["test.op", "test.op"]
+    assert arbeit.__name__ == "arbeit"
+
+
+def test_neu_geoeffnete_connections_und_speichern_werden_gemessen(
+    profil, tmp_path, schluessel
+):
+    db_key, salt = schluessel
+    enc = tmp_path / "budget.enc"
+    crypto.create_empty_encrypted_db(enc, db_key, salt).close()
+
+    # Wie nach einem Restore oder erneuten Login: Session und Datei-DB gehen
+    # erst auf, wenn das Profiling längst läuft.
+    session = EncryptedSession.open_with_key(
+        str(enc), db_key, salt, autosave_delay_ms=1
+    )
+    datei = open_db(str(tmp_path / "budget.db"))
+    assert profil.performance_report()["attached_connections"] == 2
+    try:
+        session.conn.execute("CREATE TABLE t(x INTEGER)")
+        session.conn.execute("INSERT INTO t VALUES (1)")
+        session.conn.commit()  # geht an den Hintergrund-Schreiber
+        assert session.flush(5)
+        datei.execute("CREATE TABLE t(x INTEGER)")
+    finally:
+        session.close()
+        profil.detach(datei)
+        datei.close()
+
+    report = profil.performance_report()
+    assert report["attached_connections"] == 0
+    assert report["operations"]["encrypted_session.save"]["count"] >= 2
+    assert report["operations"]["encrypted_writer.write"]["count"] >= 1
+    assert report["operations"]["encrypted_session.write"]["count"] >= 1  # close
+    assert any(s["sql"].startswith("CREATE TABLE t") for s in report["statements"])
+
+
+def test_diagnosebericht_enthaelt_performance_json(conn, profil, tmp_path, monkeypatch):
+    monkeypatch.setenv("BUDGETMANAGER_APP_DIR", str(tmp_path))
+    migrate_all(conn)
+
+    report = diagnostics.create_diagnostic_report_zip(connection=conn)
+    with zipfile.ZipFile(report) as zf:
+        perf = json.loads(zf.read("performance.json"))
+        manifest = zf.read("MANIFEST.txt").decode("utf-8")
+    assert perf["enabled"] is True
+    assert perf["operations"]["migrations.migrate_all"]["count"] == 1
+    assert "ADDED performance.json" in manifest
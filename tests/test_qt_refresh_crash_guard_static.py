@@ -9,9 +9,7 @@ def test_budget_warning_refresh_is_deferred_after_dialog_exec():
     assert (
         "dlg.exec()\n        # Nicht synchron im QAction-/Dialog-Stack refreshen" in src
     )
-    assert (
-        'self._schedule_refresh_all_tabs(reason="budget warnings dialog closed")' in src
-    )
+    assert 'reason="budget warnings dialog closed", data_only=True' in src
 
 
 def test_budget_tab_load_blocks_signals_and_reentrant_rebuilds():
@@ -29,5 +27,6 @@ def test_adjustment_dialog_uses_scheduled_parent_refresh():
     assert "from PySide6.QtCore import Qt, QTimer" in src
     assert 'hasattr(parent, "_schedule_refresh_all_tabs")' in src
     assert (
-        'parent._schedule_refresh_all_tabs(reason="budget adjustment applied")' in src
+        'parent._schedule_refresh_all_tabs(reason="budget adjustment applied", data_only=True)'
+        in src
     )
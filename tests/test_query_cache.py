@@ -0,0 +1,159 @@
+"""Abfrage-Cache je Sitzung (``model.query_cache``).
+
+Tabwechsel liessen dieselben Summen über unveränderte Daten neu rechnen.
+Der Cache hängt am Datenstand, den SQLite selbst zählt - jede Schreibweise
+macht ihn ungültig, nicht nur die über die Modelle.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import zipfile
+
+import pytest
+
+from model import diagnostics
+from model.budget_overview_model import BudgetOverviewModel
+from model.migrations import migrate_all
+from model.query_cache import (
+    MAX_SESSIONS,
+    QueryCache,
+    forget,
+    invalidate,
+    pin,
+    query_cache,
+    query_cache_stats,
+)
+from model.tracking_model import TrackingModel
+from model.typ_constants import TYP_EXPENSES
+
+
+@pytest.fixture
+def conn():
+    c = sqlite3.connect(":memory:")
+    migrate_all(c)
+    c.execute(
+        "INSERT INTO budget(year, month, typ, category, amount) "
+        "VALUES (2026, 3, ?, 'Essen', 400)",
+        (TYP_EXPENSES,),
+    )
+    c.execute(
+        "INSERT INTO tracking(date, typ, category, amount) "
+        "VALUES ('2026-03-04', ?, 'Essen', 120)",
+        (TYP_EXPENSES,),
+    )
+    c.commit()
+    yield c
+    c.close()
+
+
+def _abfragen(conn, fn) -> tuple[object, int]:
+    gesehen: list[str] = []
+    conn.set_trace_callback(gesehen.append)
+    try:
+        ergebnis = fn()
+    finally:
+        conn.set_trace_callback(None)
+    return ergebnis, len([q for q in gesehen if "SUM(" in q.upper()])
+
+
+def test_wiederholter_tabwechsel_fragt_nicht_neu(conn):
+    monate = [1, 2, 3]
+    erst, n_erst = _abfragen(
+        conn,
+        lambda: BudgetOverviewModel(conn).actual_by_category_range(
+            2026, monate, TYP_EXPENSES
+        ),
+    )
+    # Ein neues Modell wie beim nächsten Tabwechsel: gleicher Cache.
+    dann, n_dann = _abfragen(
+        conn,
+        lambda: BudgetOverviewModel(conn).actual_by_category_range(
+            2026, monate, TYP_EXPENSES
+        ),
+    )
+    assert erst == dann == {"Essen": 120.0}
+    assert n_erst > 0 and n_dann == 0
+    assert query_cache(conn).hits >= 1
+
+
+def test_jeder_schreibweg_macht_den_cache_ungueltig(conn):
+    model = BudgetOverviewModel(conn)
+    lesen = lambda: model.actual_by_category_range(2026, [3], TYP_EXPENSES)
+    assert lesen() == {"Essen": 120.0}
+
+    TrackingModel(conn).add("2026-03-05", TYP_EXPENSES, "Essen", 30.0)
+    assert lesen() == {"Essen": 150.0}
+
+    # Rohes SQL ausserhalb der Modelle, wie Importe und Reparaturen.
+    conn.execute("UPDATE tracking SET amount = 10 WHERE amount = 30")
+    conn.commit()
+    assert lesen() == {"Essen": 130.0}
+
+
+def test_zurueckgerollte_aenderung_bleibt_nicht_haengen(conn):
+    model = BudgetOverviewModel(conn)
+    lesen = lambda: model.budget_by_category_range(2026, [3], TYP_EXPENSES)
+    conn.execute("UPDATE budget SET amount = 999")
+    assert lesen() == {"Essen": 999.0}  # in der Transaktion: am Cache vorbei
+    conn.rollback()
+    assert lesen() == {"Essen": 400.0}
+    assert query_cache(conn).bypassed == 1
+
+
+def test_ergebnis_ist_eine_kopie_und_invalidate_leert(conn):
+    model = BudgetOverviewModel(conn)
+    erst = model.budget_by_category_range(2026, [3], TYP_EXPENSES)
+    erst["Essen"] = -1.0
+    assert model.budget_by_category_range(2026, [3], TYP_EXPENSES) == {"Essen": 400.0}
+
+    invalidate(conn)
+    _ergebnis, n = _abfragen(
+        conn, lambda: model.budget_by_category_range(2026, [3], TYP_EXPENSES)
+    )
+    assert n == 1
+
+
+def test_lru_ist_begrenzt():
+    c = sqlite3.connect(":memory:")
+    cache = QueryCache(c, max_entries=3)
+    for i in range(5):
+        assert cache.get("q", (i,), lambda i=i: i * 2) == i * 2
+    assert cache.get("q", (4,), lambda: -1) == 8
+    assert cache.get("q", (0,), lambda: -1) == -1
+    stats = cache.stats()
+    assert stats["entries"] == 3
+    assert stats["evictions"] == 3
+    assert stats["hits"] == 1 and stats["misses"] == 6
+    c.close()
+
+
+def test_gepinnte_caches_verdraengen_niemanden():
+    haupt = sqlite3.connect(":memory:")
+    cache = query_cache(haupt)
+    leser = [sqlite3.connect(":memory:") for _ in range(MAX_SESSIONS)]
+    gepinnt = [pin(conn) for conn in leser]
+    assert [query_cache(conn) for conn in leser] == gepinnt
+    assert query_cache(haupt) is cache
+
+    for conn, alt in zip(leser, gepinnt):
+        forget(conn)
+        assert query_cache(conn) is not alt  # freigegeben: neuer LRU-Eintrag
+        forget(conn)
+        conn.close()
+    haupt.close()
+
+
+def test_diagnosebericht_enthaelt_trefferstatistik(conn, tmp_path, monkeypatch):
+    monkeypatch.setenv("BUDGETMANAGER_APP_DIR", str(tmp_path))
+    model = BudgetOverviewModel(conn)
+    for _ in range(3):
+        model.budget_by_category_range(2026, [3], TYP_EXPENSES)
+
+    report = diagnostics.create_diagnostic_report_zip(connection=conn)
+    with zipfile.ZipFile(report) as zf:
+        stats = json.loads(zf.read("query_cache.json"))
+    assert stats == query_cache_stats(conn)
+    assert stats["available"] is True
+    assert stats["hits"] == 2 and stats["misses"] == 1
@@ -154,9 +154,12 @@ def test_setup_reset_executes_directly():
 
 
 def test_tracking_table_uses_short_label_with_path_tooltip():
-    src = _src("views/tabs/tracking_tab.py")
-    assert "_cat_item.setToolTip(_cat_full)" in src
-    assert "QTableWidgetItem(_cat_name)" in src
+    # Seit dem seitenweise ladenden Tabellenmodell liefert das Modell
+    # Kurzlabel (DisplayRole) und vollen Pfad (ToolTipRole).
+    src = _src("views/tabs/tracking_table_model.py")
+    assert "return str(r.category)" in src
+    assert "role == Qt.ToolTipRole and col == COL_CATEGORY" in src
+    assert "display_with_parent(typ, category)" in src
 
 
 def test_quickadd_forces_choice_on_ambiguous_query():
@@ -194,8 +197,10 @@ def test_overview_has_tag_filter_wired():
     assert "tag_filter_combo" in src
     assert "overview.tag_filter_all" in src
     assert "tag_filter_combo.currentIndexChanged.connect" in src
-    assert "get_entries_in_range(date_from, date_to, tag_id=tag_id)" in src
     compact_src = "".join(src.split())
+    assert "fetch_columns(date_from=date_from,date_to=date_to,tag_id=tag_id)" in (
+        compact_src
+    )
     assert (
         "refresh_budget_overview(year,month_idx,self._cat_caches,tag_id=tag_id)"
         in compact_src
@@ -0,0 +1,181 @@
+"""Volltextindex für Freitextfilter und globale Suche (``search_index``, v20).
+
+Freitext lief als ``LIKE '%…%'`` über alle Buchungen, bei jedem Tastendruck.
+Jetzt hält ein FTS5-Index Buchungen, Kategorien, Tags und Sparziele; ohne
+FTS5 bleibt es beim ``LIKE``.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+import model.search_index as search_index
+from model.database_management_model import DatabaseManagementModel
+from model.migrations import migrate_all
+from model.search_index import (
+    KIND_CATEGORY,
+    KIND_SAVINGS_GOAL,
+    KIND_TAG,
+    KIND_TRACKING,
+    has_search_index,
+    has_trigram_index,
+    match_query,
+    rebuild_search_index,
+    search,
+)
+from model.tracking_model import TrackingModel
+from model.typ_constants import TYP_EXPENSES, TYP_INCOME
+
+
+@pytest.fixture
+def conn():
+    c = sqlite3.connect(":memory:")
+    c.row_factory = sqlite3.Row
+    migrate_all(c)
+    if not has_search_index(c):
+        pytest.skip("SQLite ohne FTS5")
+    rows = [
+        ("2026-01-03", TYP_EXPENSES, "Lebensmittel", -42.5, "Migros Wocheneinkauf"),
+        ("2026-01-09", TYP_EXPENSES, "Lebensmittel", -12.0, "Coop Brot"),
+        ("2026-01-12", TYP_EXPENSES, "Café", -6.5, "Kaffee mit Anna"),
+        ("2026-02-01", TYP_INCOME, "Lohn", 5200.0, "Lohn Januar"),
+        ("2026-02-04", TYP_EXPENSES, "Mobilität", -80.0, "Migrolino Tankstelle"),
+    ]
+    c.executemany(
+        "INSERT INTO tracking(date, typ, category, amount, details) "
+        "VALUES (?,?,?,?,?)",
+        rows,
+    )
+    c.commit()
+    yield c
+    c.close()
+
+
+def _bestand(conn) -> list[tuple]:
+    return [
+        tuple(r)
+        for r in conn.execute(
+            "SELECT rowid, kind, typ, title, body FROM search_index ORDER BY rowid"
+        )
+    ]
+
+
+def _trigramme(conn) -> list[tuple]:
+    return [
+        tuple(r)
+        for r in conn.execute(
+            "SELECT rowid, title, body FROM search_trigram ORDER BY rowid"
+        )
+    ]
+
+
+def test_trigger_halten_den_index_wie_ein_neuaufbau(conn):
+    conn.execute("UPDATE tracking SET details = 'Denner' WHERE id = 2")
+    conn.execute("UPDATE tracking SET category = 'Essen' WHERE id = 1")
+    conn.execute("DELETE FROM tracking WHERE id = 3")
+    conn.execute(
+        "INSERT INTO categories(typ, name) VALUES (?, 'Ferien Tessin')",
+        (TYP_EXPENSES,),
+    )
+    conn.execute(
+        "UPDATE categories SET name = 'Ferien Wallis' WHERE name LIKE 'Ferien%'"
+    )
+    conn.execute(
+        "INSERT INTO tags(name, color, action_text) VALUES ('Auto', '#fff', 'Tank')"
+    )
+    conn.execute(
+        "INSERT INTO savings_goals(name, target_amount, created_date, category, notes) VALUES ('Velo', 900, '2026-01-01', 'Sparen', 'E-Bike')"
+    )
+    conn.execute("UPDATE savings_goals SET notes = 'Gravel' WHERE name = 'Velo'")
+    conn.commit()
+
+    gepflegt = _bestand(conn)
+    trigramme = _trigramme(conn)
+    rebuild_search_index(conn)
+    assert _bestand(conn) == gepflegt
+    assert _trigramme(conn) == trigramme == [(r[0], r[3], r[4]) for r in gepflegt]
+    assert any(r[3] == "Ferien Wallis" for r in gepflegt)
+    assert not any(r[3] == "Ferien Tessin" for r in gepflegt)
+
+
+def test_praefix_umlaute_und_alle_woerter(conn):
+    model = TrackingModel(conn)
+    ids = lambda text: {
+        r.id for r in model.list_filtered(search_text=text)
+    }  # noqa: E731
+
+    assert ids("migro") == {1, 5}
+    assert ids("MIGROS") == {1}
+    assert ids("cafe") == {3}  # Kategorie "Café", ohne Akzent gesucht
+    assert ids("lebensmittel brot") == {2}  # Kategorie und Details zusammen
+    # Eingaben sind Wörter, keine FTS-Syntax: kein Fehler, kein ODER.
+    assert ids('"brot') == {2}
+    assert ids("brot OR lohn") == set()
+
+
+def test_teilwoerter_wie_frueher_bei_like(conn):
+    if not has_trigram_index(conn):
+        pytest.skip("SQLite ohne trigram-Tokenizer")
+    model = TrackingModel(conn)
+    ids = lambda text: {
+        r.id for r in model.list_filtered(search_text=text)
+    }  # noqa: E731
+
+    assert ids("gros") == {1}  # "Migros" mitten im Wort
+    assert ids("igro") == {1, 5}
+    assert ids("einkauf migros") == {1}  # Teilwort und Wortanfang zusammen
+    assert ids("bens brot") == {2}
+    assert ids("3") == set()  # zu kurz für Trigramme, kein Wortanfang
+
+    treffer = search(conn, "ebensmittel einkauf")
+    assert [(h.kind, h.ref_id) for h in treffer] == [(KIND_TRACKING, 1)]
+    assert treffer[0].rank == 0.0
+    gemischt = search(conn, "mig", [KIND_TRACKING])
+    assert {h.ref_id for h in gemischt} == {1, 5}
+    teilwort = search(conn, "igro", [KIND_TRACKING], limit=1)
+    assert len(teilwort) == 1
+
+
+def test_suche_ueber_alle_arten_nach_relevanz(conn):
+    conn.execute("INSERT INTO tags(name, color) VALUES ('Migros', '#fff')")
+    conn.execute(
+        "INSERT INTO savings_goals(name, target_amount, created_date, notes) VALUES ('Ferien', 500, '2026-01-01', 'Migros-Bons')"
+    )
+    conn.commit()
+
+    treffer = search(conn, "migros")
+    arten = {h.kind for h in treffer}
+    assert arten == {KIND_TRACKING, KIND_TAG, KIND_SAVINGS_GOAL}
+    assert [h.rank for h in treffer] == sorted(h.rank for h in treffer)
+    assert treffer[0].kind == KIND_TAG  # Treffer im kurzen Titel zuerst
+
+    kategorien = search(conn, "lebens", [KIND_CATEGORY, KIND_TRACKING])
+    assert {(h.kind, h.ref_id) for h in kategorien} >= {(KIND_TRACKING, 1)}
+
+
+def test_ohne_index_wie_bisher_per_like(conn, monkeypatch):
+    monkeypatch.setattr(search_index, "has_search_index", lambda _conn: False)
+    model = TrackingModel(conn)
+    # LIKE findet Teilwörter, aber keine Akzentvarianten.
+    assert {r.id for r in model.list_filtered(search_text="igro")} == {1, 5}
+    assert model.list_filtered(search_text="cafe") == []
+    treffer = search(conn, "igro", [KIND_TRACKING])
+    assert [h.ref_id for h in treffer] == [5, 1]  # neueste zuerst
+
+
+def test_match_query_ohne_wortzeichen():
+    assert match_query("  %%  ") is None
+    assert match_query("Coop 3.50") == '"coop"* "3"* "50"*'
+
+
+def test_reset_laesst_die_schattentabellen_stehen(conn, tmp_path):
+    mgmt = DatabaseManagementModel(str(tmp_path / "budget.db"), conn)
+    ok, _msg = mgmt.reset_database(create_backup=False, keep_user_data=False)
+    assert ok
+    assert conn.execute("SELECT COUNT(*) FROM tracking").fetchone()[0] == 0
+    rebuild = _bestand(conn)
+    rebuild_search_index(conn)
+    assert _bestand(conn) == rebuild
+    assert search(conn, "migros") == []
@@ -0,0 +1,172 @@
+"""Prozessweiter Einstellungs-Speicher mit Änderungsmeldung.
+
+``Settings()`` las bei jeder Konstruktion die Datei neu - im Modellcode oft
+mitten in Schleifen. Jetzt bedient ein Speicher neue Instanzen, bis sich die
+Datei ändert; ``save()`` meldet die geänderten Schlüssel.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import zipfile
+from types import SimpleNamespace
+
+import pytest
+
+import settings as settings_module
+from model import diagnostics
+from settings import (
+    Settings,
+    add_settings_listener,
+    clear_settings_cache,
+    remove_settings_listener,
+    settings_cache_stats,
+)
+
+
+@pytest.fixture
+def datei(tmp_path, monkeypatch):
+    # Frisch geschriebene Dateien werden sonst zwei Sekunden lang neu gelesen.
+    monkeypatch.setattr(settings_module, "_RACY_NS", 0)
+    clear_settings_cache()
+    pfad = tmp_path / "budgetmanager_settings.json"
+    pfad.write_text(json.dumps({"theme": "dark", "tab_order": [1, 0]}), "utf-8")
+    yield pfad
+    clear_settings_cache()
+
+
+def _lesezugriffe() -> int:
+    return settings_cache_stats()["disk_reads"]
+
+
+def test_zweite_instanz_liest_nicht_von_der_platte(datei):
+    vorher = _lesezugriffe()
+    erste = Settings(str(datei))
+    zweite = Settings(str(datei))
+    assert _lesezugriffe() == vorher + 1
+    assert zweite.get("theme") == "dark"
+    assert zweite.settings == erste.settings
+
+    # Verschachtelte Werte gehören jeder Instanz allein.
+    zweite.get("tab_order").append(9)
+    assert Settings(str(datei)).get("tab_order") == [1, 0]
+
+
+def test_speichern_meldet_schluessel_und_fuellt_den_speicher(datei):
+    gemeldet: list[frozenset] = []
+    add_settings_listener(gemeldet.append)
+    try:
+        Settings(str(datei)).set("theme", "light")
+    finally:
+        remove_settings_listener(gemeldet.append)
+
+    assert gemeldet == [frozenset({"theme"})]
+    vorher = _lesezugriffe()
+    assert Settings(str(datei)).get("theme") == "light"
+    assert _lesezugriffe() == vorher
+
+
+def test_eigener_stand_gilt_auch_frisch_geschrieben(datei, monkeypatch):
+    monkeypatch.setattr(settings_module, "_RACY_NS", 10**18)
+    Settings(str(datei)).set("theme", "light")
+    vorher = _lesezugriffe()
+    assert Settings(str(datei)).get("theme") == "light"
+    assert _lesezugriffe() == vorher
+
+    # Fremdes atomares Schreiben: neuer Inode, also neu gelesen.
+    fremd = datei.with_suffix(".tmp")
+    fremd.write_text(json.dumps({"theme": "dark"}), "utf-8")
+    os.replace(fremd, datei)
+    assert Settings(str(datei)).get("theme") == "dark"
+    assert _lesezugriffe() == vorher + 1
+
+
+def test_aenderung_von_aussen_wird_gelesen_und_gemeldet(datei):
+    Settings(str(datei))
+    gemeldet: list[frozenset] = []
+    add_settings_listener(gemeldet.append)
+    try:
+        datei.write_text(json.dumps({"theme": "dark", "recent_days": 30}), "utf-8")
+        stat = datei.stat()
+        os.utime(datei, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        vorher = _lesezugriffe()
+        assert Settings(str(datei)).recent_days == 30
+    finally:
+        remove_settings_listener(gemeldet.append)
+    assert _lesezugriffe() == vorher + 1
+    # tab_order fällt auf den Default zurück, recent_days ist neu.
+    assert gemeldet == [frozenset({"recent_days", "tab_order"})]
+
+
+def test_fehlerhafter_zuhoerer_bricht_speichern_nicht_ab(datei):
+    def kaputt(_changed):
+        raise RuntimeError("Widget gelöscht")
+
+    add_settings_listener(kaputt)
+    try:
+        Settings(str(datei)).set("recent_days", 30)
+    finally:
+        remove_settings_listener(kaputt)
+    assert Settings(str(datei)).recent_days == 30
+
+
+def test_relay_meldet_gesammelt_im_gui_thread(datei, monkeypatch):
+    monkeypatch.setenv("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtCore import QCoreApplication, QEvent, QEventLoop, QTimer
+    from PySide6.QtWidgets import QApplication
+
+    from views.main_window_settings import apply_changed_settings
+    from views.settings_relay import SettingsRelay
+
+    _app = QApplication.instance() or QApplication([])
+    relay = SettingsRelay()
+    gemeldet: list[tuple[frozenset, bool]] = []
+    relay.changed.connect(
+        lambda changed: gemeldet.append(
+            (changed, threading.current_thread() is threading.main_thread())
+        )
+    )
+    neu_gezeichnet: list[str] = []
+    fenster = SimpleNamespace(
+        settings=Settings(str(datei)),
+        budget_tab=SimpleNamespace(),
+        tracking_tab=SimpleNamespace(set_recent_days=neu_gezeichnet.append),
+        _schedule_refresh_all_tabs=lambda reason: neu_gezeichnet.append(reason),
+    )
+    relay.changed.connect(lambda changed: apply_changed_settings(fenster, changed))
+
+    Settings(str(datei)).set("theme", "light")
+    arbeiter = threading.Thread(
+        target=lambda: Settings(str(datei)).set_many(
+            {"recent_days": 30, "table_density": "Kompakt"}
+        )
+    )
+    arbeiter.start()
+    arbeiter.join()
+    assert gemeldet == []  # erst im Event-Loop
+
+    loop = QEventLoop()
+    QTimer.singleShot(50, loop.quit)
+    loop.exec()
+    assert gemeldet == [(frozenset({"theme", "recent_days", "table_density"}), True)]
+    # Das Fenster übernimmt den gespeicherten Stand und lädt neu.
+    assert fenster.settings.get("recent_days") == 30
+    assert neu_gezeichnet == [30, "settings changed"]
+
+    stats = settings_cache_stats()["listeners"]
+    relay.deleteLater()
+    QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+    assert settings_cache_stats()["listeners"] == stats - 1
+
+
+def test_diagnosebericht_zeigt_lesezugriffe(datei, tmp_path, monkeypatch):
+    monkeypatch.setenv("BUDGETMANAGER_APP_DIR", str(tmp_path))
+    Settings(str(datei))
+    report = diagnostics.create_diagnostic_report_zip(connection=None)
+    with zipfile.ZipFile(report) as zf:
+        stats = json.loads(zf.read("settings_cache.json"))
+    assert stats["available"] is True
+    assert stats["disk_reads"] >= 1
+    assert set(stats) >= {"disk_reads", "cache_hits", "saves"}
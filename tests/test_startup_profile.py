@@ -0,0 +1,114 @@
+"""Kaltstart: Startphasen, Importzeiten, verzögert ladende Tabs.
+
+Der Start baute alle Tabs samt Daten auf, bevor das Fenster erschien, und
+lud beim Import des Hauptfensters jeden Dialog und ``requests``. Jetzt lädt
+nur der sichtbare Tab; ``--startup-profile`` zeigt, wo die Zeit bleibt.
+"""
+
+from __future__ import annotations
+
+import builtins
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from model import startup_profile
+from model.migrations import migrate_all
+from model.typ_constants import TYP_EXPENSES
+
+
+@pytest.fixture
+def profil():
+    yield startup_profile
+    startup_profile.begin()  # Importmessung sicher abbauen
+
+
+def test_phasen_folgen_aufeinander(profil):
+    profil.begin()
+    profil.mark("qt_application")
+    profil.mark("settings")
+    daten = profil.finish()
+
+    namen = [p["phase"] for p in daten["phases"]]
+    assert namen == ["qt_application", "settings", "first_event_loop"]
+    starts = [p["start_ms"] for p in daten["phases"]]
+    assert starts == sorted(starts)
+    assert "imports" not in daten
+    assert profil.finish()["phases"] == daten["phases"]  # nur einmal
+
+
+def test_importzeiten_frischer_module(profil, tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("BUDGETMANAGER_APP_DIR", str(tmp_path / "app"))
+    paket = tmp_path / "src" / "kaltstart_probe"
+    paket.mkdir(parents=True)
+    (paket / "__init__.py").write_text("import kaltstart_probe_innen\n", "utf-8")
+    (tmp_path / "src" / "kaltstart_probe_innen.py").write_text("X = 1\n", "utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path / "src"))
+    original = builtins.__import__
+
+    profil.begin(import_timing=True)
+    try:
+        import kaltstart_probe  # noqa: F401
+    finally:
+        sys.modules.pop("kaltstart_probe", None)
+        sys.modules.pop("kaltstart_probe_innen", None)
+    daten = profil.finish()
+
+    assert builtins.__import__ is original
+    zeilen = {z["module"]: z for z in daten["imports"]["slowest"]}
+    aussen, innen = zeilen["kaltstart_probe"], zeilen["kaltstart_probe_innen"]
+    assert aussen["cumulative_ms"] >= innen["cumulative_ms"]
+    assert aussen["self_ms"] <= aussen["cumulative_ms"]
+    gespeichert = json.loads(open(daten["path"], encoding="utf-8").read())
+    assert gespeichert["phases"][-1]["phase"] == "first_event_loop"
+    assert "kaltstart_probe" in capsys.readouterr().err
+
+
+def test_verdeckter_tab_laedt_erst_beim_refresh(monkeypatch):
+    monkeypatch.setenv("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+
+    from views.tabs.tracking_tab import TrackingTab
+
+    _app = QApplication.instance() or QApplication([])
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    migrate_all(conn)
+    conn.execute(
+        "INSERT INTO tracking(date, typ, category, amount, details) "
+        "VALUES (date('now'), ?, 'Essen', -10, '')",
+        (TYP_EXPENSES,),
+    )
+    conn.commit()
+
+    tab = TrackingTab(conn, settings={}, defer_load=True)
+    assert tab.table_model.rowCount() == 0
+    tab.refresh()
+    assert tab.table_model.rowCount() == 1
+    conn.close()
+
+
+def test_tab_module_haengen_nicht_am_hauptfenster_import():
+    code = (
+        "import sys, views.main_window\n"
+        "vorher = [m for m in sys.modules if m.startswith('views.tabs.')]\n"
+        "import views.main_window_startup\n"
+        "nachher = [m for m in sys.modules if m.startswith('views.tabs.')]\n"
+        "print(len(vorher), len(nachher))\n"
+    )
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(__file__).resolve().parents[1],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+        timeout=120,
+    ).stdout.split()
+    assert out[0] == "0" and int(out[1]) > 0
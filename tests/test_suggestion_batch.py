@@ -0,0 +1,102 @@
+"""Budgetvorschläge für alle Kategorien in einem Durchgang.
+
+``compute_category_suggestion`` fragt Budget und Ist Monat für Monat einzeln
+ab. ``compute_suggestions`` lädt beides als Matrix und muss für jede
+Kategorie genau dasselbe Ergebnis liefern.
+"""
+
+from __future__ import annotations
+
+import random
+import sqlite3
+
+import pytest
+
+from model.budget_suggestion_engine import BudgetSuggestionEngine
+from model.migrations import migrate_all
+from model.typ_constants import TYP_EXPENSES, TYP_INCOME, TYP_SAVINGS
+
+
+@pytest.fixture
+def conn():
+    c = sqlite3.connect(":memory:")
+    migrate_all(c)
+    rnd = random.Random(11)
+    keys = [
+        (rnd.choice([TYP_EXPENSES, TYP_EXPENSES, TYP_SAVINGS, TYP_INCOME]), f"K{i}")
+        for i in range(60)
+    ]
+    budget, tracking = [], []
+    for typ, cat in keys:
+        c.execute(
+            "INSERT OR IGNORE INTO categories(typ, name, is_fix, is_recurring, "
+            "forecast_mode) VALUES (?,?,?,?,?)",
+            (
+                typ,
+                cat,
+                int(rnd.random() < 0.25),
+                int(rnd.random() < 0.25),
+                rnd.choice(["auto", "auto", "pot", "incremental", "normal"]),
+            ),
+        )
+        base = rnd.choice([40, 120, 300, 900])
+        active = rnd.random()
+        for y in range(2021, 2026):
+            for m in range(1, 13):
+                if rnd.random() < 0.85:
+                    budget.append((y, m, typ, cat, base))
+                if rnd.random() < active:
+                    sign = 1 if typ == TYP_INCOME else -1
+                    tracking.append(
+                        (
+                            f"{y}-{m:02d}-{rnd.randint(1, 28):02d}",
+                            typ,
+                            cat,
+                            sign * round(base * rnd.uniform(0.2, 1.7), 2),
+                        )
+                    )
+    c.executemany(
+        "INSERT INTO budget(year, month, typ, category, amount) VALUES (?,?,?,?,?)",
+        budget,
+    )
+    c.executemany(
+        "INSERT INTO tracking(date, typ, category, amount, details) "
+        "VALUES (?,?,?,?,'')",
+        tracking,
+    )
+    c.commit()
+    yield c, keys
+    c.close()
+
+
+@pytest.mark.parametrize("monthly_totals", [True, False])
+@pytest.mark.parametrize("months_back", [3, 6])
+def test_batch_wie_einzeln(conn, monthly_totals, months_back):
+    conn, keys = conn
+    engine = BudgetSuggestionEngine(conn)
+    engine._has_totals = monthly_totals
+    einzeln = {
+        key: engine.compute_category_suggestion(*key, 2025, 11, months_back=months_back)
+        for key in keys
+    }
+    batch = engine.compute_suggestions(keys, 2025, 11, months_back=months_back)
+    assert batch == einzeln
+    assert any(res is not None for res in batch.values())
+    assert engine._preload is None
+
+
+def test_batch_fragt_nicht_je_kategorie(conn):
+    conn, keys = conn
+    engine = BudgetSuggestionEngine(conn)
+    statements: list[str] = []
+    conn.set_trace_callback(statements.append)
+    engine.compute_suggestions(keys, 2025, 11, months_back=6)
+    conn.set_trace_callback(None)
+    # Budget, Ist, Kategorien (+ PRAGMA) und Datengrenze - unabhängig von
+    # der Zahl der Kategorien.
+    assert len(statements) <= 6
+
+
+def test_leere_liste():
+    engine = BudgetSuggestionEngine(sqlite3.connect(":memory:"))
+    assert engine.compute_suggestions([], 2025, 1) == {}
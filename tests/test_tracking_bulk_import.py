@@ -0,0 +1,189 @@
+"""Massenbuchung über ``TrackingModel.add_many``.
+
+Fixkosten-Buchungen und LifePlanner-Importe riefen ``add`` je Zeile auf:
+Tag-Abfrage, Sparziel-Abgleich und ein eigener Undo-Commit pro Buchung -
+im verschlüsselten Modus also eine Sicherung pro Zeile. ``add_many`` bucht
+den Stapel in einer Transaktion mit einem Commit und einer Undo-Gruppe.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from datetime import date
+
+import pytest
+
+from model.category_model import CategoryModel
+from model.lifeplanner_import_service import (
+    apply_imports,
+    default_draft,
+    load_import_records,
+)
+from model.migrations import migrate_all
+from model.savings_goals_model import SavingsGoalBoundsError, SavingsGoalsModel
+from model.tags_model import TagsModel
+from model.tracking_model import NewTrackingEntry, TrackingModel
+from model.typ_constants import TYP_EXPENSES, TYP_SAVINGS
+from utils.money import set_currency
+
+
+@pytest.fixture
+def conn():
+    c = sqlite3.connect(":memory:")
+    c.row_factory = sqlite3.Row
+    migrate_all(c)
+    c.commit()
+    yield c
+    c.close()
+
+
+def _anzahl(conn) -> int:
+    return int(conn.execute("SELECT COUNT(*) FROM tracking").fetchone()[0])
+
+
+def _commits(conn) -> list[str]:
+    statements: list[str] = []
+    conn.set_trace_callback(statements.append)
+    return statements
+
+
+def test_ids_in_reihenfolge_und_ein_commit(conn):
+    tracking = TrackingModel(conn)
+    tracking.add("2026-06-30", TYP_EXPENSES, "Miete", -1200)
+    statements = _commits(conn)
+
+    ids = tracking.add_many(
+        NewTrackingEntry(date(2026, 7, tag), TYP_EXPENSES, "Essen", -tag, f"#{tag}")
+        for tag in range(1, 31)
+    )
+
+    conn.set_trace_callback(None)
+    assert len(ids) == 30 and ids == sorted(ids)
+    rows = tracking.list_by_ids(ids)
+    assert {r.id: r.details for r in rows} == {
+        rid: f"#{tag}" for tag, rid in enumerate(ids, start=1)
+    }
+    assert sum(1 for s in statements if s.strip().upper() == "COMMIT") == 1
+    assert tracking.add_many([]) == []
+
+
+def test_feste_kategorie_tags_werden_mit_einem_join_angeheftet(conn):
+    category_id = CategoryModel(conn).create(TYP_EXPENSES, "Essen")
+    tags = TagsModel(conn)
+    tag_ids = {tags.create("Haushalt"), tags.create("UBS essen")}
+    tags.set_category_tags(category_id, sorted(tag_ids))
+
+    ids = TrackingModel(conn).add_many(
+        [
+            NewTrackingEntry("2026-07-01", TYP_EXPENSES, "Essen", -12.5),
+            NewTrackingEntry("2026-07-02", TYP_EXPENSES, "Kino", -20),
+            NewTrackingEntry("2026-07-03", TYP_EXPENSES, "Essen", -8),
+        ]
+    )
+
+    belegt = [{t["id"] for t in tags.get_tags_for_entry(rid)} for rid in ids]
+    assert belegt == [tag_ids, set(), tag_ids]
+
+
+def test_sparziele_erhalten_die_summe_je_kategorie(conn):
+    goal_id = SavingsGoalsModel(conn).create("Hochzeit", 1000, category="Hochzeit")
+
+    TrackingModel(conn).add_many(
+        [
+            NewTrackingEntry("2026-07-01", TYP_SAVINGS, "Hochzeit", 300),
+            NewTrackingEntry("2026-07-02", TYP_SAVINGS, "Hochzeit", 200),
+            NewTrackingEntry("2026-07-03", TYP_SAVINGS, "Hochzeit", -100),
+        ]
+    )
+
+    row = conn.execute(
+        "SELECT current_amount, contributed_amount, withdrawn_amount "
+        "FROM savings_goals WHERE id=?",
+        (goal_id,),
+    ).fetchone()
+    assert tuple(row) == (400.0, 500.0, 100.0)
+
+
+def test_ungueltiger_stapel_bucht_nichts(conn):
+    SavingsGoalsModel(conn).create("Hochzeit", 1000, category="Hochzeit")
+    tracking = TrackingModel(conn)
+
+    with pytest.raises(SavingsGoalBoundsError):
+        tracking.add_many(
+            [
+                NewTrackingEntry("2026-07-01", TYP_EXPENSES, "Essen", -10),
+                NewTrackingEntry("2026-07-02", TYP_SAVINGS, "Hochzeit", 600),
+                NewTrackingEntry("2026-07-03", TYP_SAVINGS, "Hochzeit", 600),
+            ]
+        )
+    with pytest.raises(ValueError):
+        tracking.add_many(
+            [
+                NewTrackingEntry("2026-07-01", TYP_EXPENSES, "Essen", -10),
+                NewTrackingEntry("2026-07-02", TYP_EXPENSES, "Essen", float("nan")),
+            ]
+        )
+
+    assert _anzahl(conn) == 0
+    assert not conn.in_transaction
+
+
+def test_ein_undo_nimmt_den_ganzen_stapel_zurueck(conn):
+    tracking = TrackingModel(conn)
+    goal_id = SavingsGoalsModel(conn).create("Hochzeit", 1000, category="Hochzeit")
+    tracking.add("2026-06-30", TYP_EXPENSES, "Miete", -1200)
+
+    tracking.add_many(
+        [
+            NewTrackingEntry("2026-07-01", TYP_EXPENSES, "Essen", -10),
+            NewTrackingEntry("2026-07-02", TYP_SAVINGS, "Hochzeit", 250),
+        ]
+    )
+    assert _anzahl(conn) == 3
+
+    assert tracking.undo.undo()
+    assert _anzahl(conn) == 1
+    current = conn.execute(
+        "SELECT current_amount FROM savings_goals WHERE id=?", (goal_id,)
+    ).fetchone()[0]
+    assert current == 0.0
+
+    assert tracking.undo.redo()
+    assert _anzahl(conn) == 3
+
+
+def test_lifeplanner_uebernimmt_mehrere_datensaetze_in_einem_rutsch(conn, tmp_path):
+    CategoryModel(conn).create(TYP_EXPENSES, "Füller")
+    set_currency("CHF")
+    path = tmp_path / "fpm_to_budgetmanager.jsonl"
+    lines = [json.dumps({"schema": "budgetmanager.import.manifest.v1"})]
+    for nr in range(1, 4):
+        lines.append(
+            json.dumps(
+                {
+                    "schema": "budgetmanager.import.v1",
+                    "operation": "upsert",
+                    "external_id": f"fpm:expense:{nr}",
+                    "source": "FPM",
+                    "date": f"2026-07-0{nr}",
+                    "amount": 10.0 * nr,
+                    "currency": "CHF",
+                    "category_path": "Hobby/Füller",
+                    "description": f"Stift {nr}",
+                    "counterparty": "Shop",
+                    "notes": "",
+                    "metadata": {},
+                }
+            )
+        )
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    records = load_import_records(conn, path)
+
+    results = apply_imports(conn, [(r, default_draft(conn, r)) for r in records])
+
+    assert [r.updated for r in results] == [False, False, False]
+    assert _anzahl(conn) == 3
+    assert {r.status for r in load_import_records(conn, path)} == {"imported"}
+    assert TrackingModel(conn).undo.undo()
+    assert _anzahl(conn) == 0
@@ -0,0 +1,119 @@
+"""Kompakte Buchungszeilen und spaltenweises Laden (``fetch_columns``).
+
+``TrackingRow`` war eine Dataclass mit ``__dict__`` und sofort geparstem
+Datum. Jetzt hat sie ``__slots__`` und parst das Datum erst beim Zugriff;
+Übersicht und Budgettabelle summieren über ``TrackingColumns`` ganz ohne
+Zeilenobjekte.
+"""
+
+from __future__ import annotations
+
+import pickle
+import random
+import sqlite3
+from dataclasses import FrozenInstanceError
+from datetime import date
+
+import pytest
+
+from model.migrations import migrate_all
+from model.overview_aggregation import (
+    aggregate_category_amounts,
+    aggregate_top_bookings,
+    typ_totals,
+)
+from model.tracking_model import TrackingColumns, TrackingModel, TrackingRow
+from model.typ_constants import TYP_EXPENSES, TYP_INCOME, TYP_SAVINGS, normalize_typ
+
+TYPEN = (TYP_EXPENSES, TYP_INCOME, TYP_SAVINGS)
+
+
+@pytest.fixture
+def conn():
+    c = sqlite3.connect(":memory:")
+    c.row_factory = sqlite3.Row
+    migrate_all(c)
+    rnd = random.Random(10)
+    c.executemany(
+        "INSERT INTO tracking(date, typ, category, amount, details) "
+        "VALUES (?,?,?,?,?)",
+        [
+            (
+                f"{rnd.randint(2024, 2025)}-{rnd.randint(1, 12):02d}-"
+                f"{rnd.randint(1, 28):02d}",
+                rnd.choice(TYPEN),
+                rnd.choice(["Miete", "Essen", "Lohn", " Velo ", ""]),
+                round(rnd.uniform(-80, 400), 2),
+                f"Notiz {i}",
+            )
+            for i in range(800)
+        ],
+    )
+    c.commit()
+    yield c
+    c.close()
+
+
+def test_zeile_ohne_dict_mit_spaetem_datum():
+    row = TrackingRow(7, "2026-03-14", TYP_EXPENSES, "Essen", -12.5, "Brot")
+    assert not hasattr(row, "__dict__")
+    assert row._d == "2026-03-14"  # noch nicht geparst
+    assert row.date == date(2026, 3, 14)
+    assert row._d == date(2026, 3, 14)  # einmal geparst, dann gemerkt
+    assert row.description == "Brot" and row.source == "manual"
+
+
+def test_zeile_bleibt_unveraenderlich_und_vergleichbar():
+    a = TrackingRow(1, "2026-01-02", TYP_INCOME, "Lohn", 5000.0, "")
+    b = TrackingRow(1, date(2026, 1, 2), TYP_INCOME, "Lohn", 5000.0, "")
+    assert a == b and hash(a) == hash(b)
+    assert a != TrackingRow(2, "2026-01-02", TYP_INCOME, "Lohn", 5000.0, "")
+    assert a.__eq__(a._key()) is NotImplemented
+    assert a != a._key() and a != "Lohn"
+    with pytest.raises(FrozenInstanceError):
+        a.amount = 1.0  # type: ignore[misc]
+    assert pickle.loads(pickle.dumps(a)) == a
+    assert "d=datetime.date(2026, 1, 2)" in repr(a)
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [{}, {"typ": TYP_EXPENSES}, {"year": 2025, "min_amount": 50.0}, {"categories": []}],
+)
+def test_spalten_wie_zeilen(conn, filters):
+    model = TrackingModel(conn)
+    rows = model.list_filtered(**filters)
+    cols = model.fetch_columns(**filters)
+    assert isinstance(cols, TrackingColumns)
+    assert list(cols.ids) == [r.id for r in rows]
+    assert list(cols.days) == [r.d.toordinal() for r in rows]
+    assert list(cols.months) == [r.d.year * 12 + r.d.month - 1 for r in rows]
+    assert list(cols.amounts) == [r.amount for r in rows]
+    assert [cols.typs[t] for t in cols.typ_codes] == [r.typ for r in rows]
+    assert [cols.categories[c] for c in cols.category_codes] == [
+        r.category for r in rows
+    ]
+
+
+def test_summen_wie_ueber_zeilen(conn):
+    model = TrackingModel(conn)
+    rows = model.list_filtered()
+    cols = model.fetch_columns()
+
+    erwartet: dict[tuple, float] = {}
+    for r in rows:
+        t = normalize_typ(r.typ)
+        amount = abs(r.amount) if t == TYP_EXPENSES else r.amount
+        key = (t, r.category, r.d.year, r.d.month)
+        erwartet[key] = erwartet.get(key, 0.0) + amount
+    assert cols.actual_sums(by_month=True) == pytest.approx(erwartet)
+
+    assert typ_totals(cols) == pytest.approx(typ_totals(rows))
+    assert aggregate_top_bookings(cols, top_n=3) == pytest.approx(
+        aggregate_top_bookings(rows, top_n=3)
+    )
+    assert aggregate_category_amounts(
+        cols, TYP_EXPENSES, top_n=2, other_label="Rest"
+    ) == pytest.approx(
+        aggregate_category_amounts(rows, TYP_EXPENSES, top_n=2, other_label="Rest")
+    )
@@ -0,0 +1,177 @@
+"""Seitenweises Laden der Tracking-Tabelle (Keyset auf ``(date, id)``).
+
+Die Tabelle legte bei jedem ``refresh()`` alle Treffer als Items an. Jetzt
+liest ``TrackingTableModel`` Seite für Seite über
+``TrackingModel.page_filtered`` und hält nur eine begrenzte Zahl Seiten.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import sqlite3
+
+import pytest
+
+from model.coverage_model import coverage_from_tracking_rows
+from model.migrations import migrate_all
+from model.tags_model import TagsModel
+from model.tracking_model import TrackingModel
+from model.typ_constants import TYP_EXPENSES, TYP_INCOME, TYP_SAVINGS
+
+TYPEN = (TYP_EXPENSES, TYP_INCOME, TYP_SAVINGS)
+
+
+@pytest.fixture
+def conn():
+    c = sqlite3.connect(":memory:")
+    c.row_factory = sqlite3.Row
+    migrate_all(c)
+    rnd = random.Random(8)
+    # Viele Buchungen am selben Tag: die Seitengrenze fällt mitten hinein.
+    c.executemany(
+        "INSERT INTO tracking(date, typ, category, amount, details) "
+        "VALUES (?,?,?,?,?)",
+        [
+            (
+                f"2025-{rnd.randint(1, 3):02d}-{rnd.randint(1, 5):02d}",
+                rnd.choice(TYPEN),
+                f"K{rnd.randint(1, 4)}",
+                round(rnd.uniform(-40, 300), 2),
+                f"Notiz {i}",
+            )
+            for i in range(1234)
+        ],
+    )
+    c.commit()
+    yield c
+    c.close()
+
+
+def _alle_seiten(model: TrackingModel, limit: int, **filters) -> list[int]:
+    ids: list[int] = []
+    after = None
+    while True:
+        page = model.page_filtered(after=after, limit=limit, **filters)
+        ids.extend(r.id for r in page.rows)
+        if page.cursor is None:
+            return ids
+        after = page.cursor
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {},
+        {"typ": TYP_EXPENSES},
+        {"categories": ["K1", "K3"], "date_from": "2025-02-01"},
+        {"search_text": "notiz 1", "min_amount": 10.0},
+        {"categories": []},
+    ],
+)
+def test_seiten_ergeben_dieselbe_liste(conn, filters):
+    model = TrackingModel(conn)
+    erwartet = [r.id for r in model.list_filtered(**filters)]
+    for limit in (1, 97, 500, 5000):
+        assert _alle_seiten(model, limit, **filters) == erwartet
+
+
+def test_summen_wie_ueber_alle_zeilen(conn):
+    model = TrackingModel(conn)
+    filters = {"date_to": "2025-02-28"}
+    zeilen = model.list_filtered(**filters)
+    gruppen = model.totals_filtered(**filters)
+    assert sum(g.count for g in gruppen) == len(zeilen)
+    alt = coverage_from_tracking_rows(zeilen)
+    neu = coverage_from_tracking_rows(gruppen)
+    assert neu.income == pytest.approx(alt.income)
+    assert neu.expenses == pytest.approx(alt.expenses)
+    assert neu.savings_by_category == pytest.approx(alt.savings_by_category)
+
+
+def test_spaete_seite_kostet_keinen_offset(conn):
+    model = TrackingModel(conn)
+    cursor = model.page_filtered(limit=1000).cursor
+    plan = " ".join(
+        str(row[-1])
+        for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM tracking "
+            "WHERE 1=1 AND (date, id) < (?, ?) ORDER BY date DESC, id DESC LIMIT 50",
+            cursor,
+        )
+    )
+    assert "OFFSET" not in plan.upper()
+    assert "USE TEMP B-TREE" not in plan.upper()
+
+
+def test_tag_namen_fuer_viele_eintraege(conn):
+    tags = TagsModel(conn)
+    a = tags.create_tag("Ferien")
+    b = tags.create_tag("Auto")
+    tags.set_entry_tags(1, [a, b])
+    tags.set_entry_tags(3, [a])
+    assert tags.tag_names_for_entries([1, 2, 3]) == {
+        1: ["Auto", "Ferien"],
+        3: ["Ferien"],
+    }
+
+
+@pytest.fixture
+def qapp():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    widgets = pytest.importorskip("PySide6.QtWidgets")
+    return widgets.QApplication.instance() or widgets.QApplication([])
+
+
+def _tabellenmodell(conn, **kwargs):
+    from model.category_model import CategoryModel
+    from views.tabs.tracking_table_model import TrackingTableModel
+
+    return TrackingTableModel(
+        TrackingModel(conn),
+        TagsModel(conn),
+        CategoryModel(conn),
+        headers=[str(i) for i in range(7)],
+        **kwargs,
+    )
+
+
+def test_fetch_more_laedt_seitenweise_und_bleibt_begrenzt(conn, qapp):
+    from PySide6.QtCore import QModelIndex, Qt
+
+    tabelle = _tabellenmodell(conn, page_size=100, max_pages=3)
+    tabelle.set_filters(typ=TYP_INCOME)
+    erwartet = TrackingModel(conn).list_filtered(typ=TYP_INCOME)
+    assert tabelle.rowCount() == 100
+    while tabelle.canFetchMore(QModelIndex()):
+        tabelle.fetchMore(QModelIndex())
+    assert tabelle.rowCount() == len(erwartet)
+    assert tabelle.loaded_pages() == 3
+
+    # Zurückscrollen liest die verdrängte Seite über ihren Startschlüssel neu.
+    gelesen = tabelle.pages_read
+    assert tabelle.row_at(5) == erwartet[5]
+    assert tabelle.data(tabelle.index(5, 6), Qt.DisplayRole) == str(erwartet[5].id)
+    assert tabelle.pages_read == gelesen + 1
+    assert tabelle.loaded_pages() == 3
+    assert [tabelle.row_at(i) for i in range(len(erwartet))] == erwartet
+
+
+def test_tabellenmodell_zeigt_tags_und_farben(conn, qapp):
+    from PySide6.QtCore import Qt
+    from PySide6.QtGui import QColor
+
+    tags = TagsModel(conn)
+    erster = TrackingModel(conn).list_filtered()[0]
+    tags.set_entry_tags(erster.id, [tags.create_tag("Ferien")])
+
+    tabelle = _tabellenmodell(conn)
+    tabelle.set_filters()
+    tabelle.set_colors({erster.typ: "#112233"}, "#ff0000")
+    assert tabelle.data(tabelle.index(0, 5), Qt.DisplayRole) == "Ferien"
+    brush = tabelle.data(tabelle.index(0, 1), Qt.ForegroundRole)
+    assert brush.color() == QColor("#112233")
+    negativ = next(i for i in range(tabelle.rowCount()) if tabelle.row_at(i).amount < 0)
+    assert tabelle.data(tabelle.index(negativ, 3), Qt.ForegroundRole).color() == (
+        QColor("#ff0000")
+    )
@@ -0,0 +1,143 @@
+"""Undo-Journal ohne eigenen Commit (``model.undo_redo_model``).
+
+``record_operation`` committete jede Operation selbst - im verschlüsselten
+Modus eine zweite Sicherung pro Buchung -, leerte bei jedem Aufruf den
+Redo-Stapel und kürzte den Undo-Stapel mit einem Scan über alle Gruppen.
+Jetzt läuft der Eintrag in der Transaktion der Änderung, gekürzt wird über
+die fortlaufende Gruppennummer, und Updates speichern nur geänderte Spalten.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+
+import pytest
+
+from model.migrations import migrate_all
+from model.tracking_model import TrackingModel
+from model.typ_constants import TYP_EXPENSES
+from model.undo_redo_model import UndoRedoModel, install_undo_journal
+
+
+@pytest.fixture
+def conn():
+    c = sqlite3.connect(":memory:")
+    c.row_factory = sqlite3.Row
+    migrate_all(c)
+    c.commit()
+    yield c
+    c.close()
+
+
+def _trace(conn) -> list[str]:
+    statements: list[str] = []
+    conn.set_trace_callback(statements.append)
+    return statements
+
+
+def _gruppen(conn) -> list[int]:
+    return [
+        int(r[0])
+        for r in conn.execute(
+            "SELECT DISTINCT group_seq FROM undo_stack ORDER BY group_seq"
+        )
+    ]
+
+
+def test_buchung_und_undo_eintrag_teilen_einen_commit(conn):
+    tracking = TrackingModel(conn)
+    statements = _trace(conn)
+
+    tracking.add("2026-07-01", TYP_EXPENSES, "Essen", -12.5)
+    row_id = tracking.add("2026-07-02", TYP_EXPENSES, "Essen", -8)
+    tracking.update(row_id, "2026-07-02", TYP_EXPENSES, "Essen", -9, "")
+    tracking.delete(row_id)
+
+    conn.set_trace_callback(None)
+    commits = [s for s in statements if s.strip().upper() == "COMMIT"]
+    assert len(commits) == 4
+    assert not any("DELETE FROM redo_stack" in s for s in statements)  # war leer
+    assert not conn.in_transaction
+    assert _gruppen(conn) == [1, 2, 3, 4]
+
+
+def test_kuerzen_ueber_die_gruppennummer(conn, monkeypatch):
+    monkeypatch.setattr(UndoRedoModel, "MAX_UNDO_ENTRIES", 3)
+    undo = UndoRedoModel(conn)
+    for nr in range(5):
+        gid = undo.new_group_id()
+        undo.record_operation("tags", "INSERT", None, {"id": nr}, group_id=gid)
+        undo.record_operation("tags", "INSERT", None, {"id": nr + 10}, group_id=gid)
+
+    assert _gruppen(conn) == [3, 4, 5]
+    assert conn.execute("SELECT COUNT(*) FROM undo_stack").fetchone()[0] == 6
+    plan = " ".join(
+        str(r[3])
+        for r in conn.execute(
+            "EXPLAIN QUERY PLAN DELETE FROM undo_stack WHERE group_seq <= 2"
+        )
+    )
+    assert "idx_undo_group_seq" in plan
+
+
+def test_update_speichert_nur_geaenderte_spalten(conn):
+    tracking = TrackingModel(conn)
+    row_id = tracking.add("2026-07-01", TYP_EXPENSES, "Essen", -12.5, "alt")
+
+    tracking.update(row_id, "2026-07-01", TYP_EXPENSES, "Essen", -12.5, "neu")
+
+    old_raw, new_raw = conn.execute(
+        "SELECT old_data, new_data FROM undo_stack ORDER BY id DESC LIMIT 1"
+    ).fetchone()
+    old_data, new_data = json.loads(old_raw), json.loads(new_raw)
+    assert set(old_data) == {
+        "id",
+        "details",
+        "typ",
+        "category",
+        "amount",
+        "savings_action",
+    }
+    assert (old_data["details"], new_data["details"]) == ("alt", "neu")
+
+    assert tracking.undo.undo()
+    assert tracking.list_by_ids([row_id])[0].details == "alt"
+    assert tracking.undo.redo()
+    assert tracking.list_by_ids([row_id])[0].details == "neu"
+    assert _gruppen(conn) == [1, 2]  # Redo erhält wieder die nächste Nummer
+
+
+def test_neuer_eintrag_leert_einen_vollen_redo_stapel(conn):
+    tracking = TrackingModel(conn)
+    tracking.add("2026-07-01", TYP_EXPENSES, "Essen", -12.5)
+    assert tracking.undo.undo()
+    assert tracking.undo.can_redo()
+
+    tracking.add("2026-07-02", TYP_EXPENSES, "Essen", -8)
+
+    assert not tracking.undo.can_redo()
+
+
+def test_migration_nummeriert_bestehende_gruppen():
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE undo_stack(id INTEGER PRIMARY KEY AUTOINCREMENT, "
+        "ts TEXT NOT NULL, group_id TEXT, table_name TEXT NOT NULL, "
+        "operation TEXT NOT NULL, old_data TEXT, new_data TEXT)"
+    )
+    conn.executemany(
+        "INSERT INTO undo_stack(ts, group_id, table_name, operation) "
+        "VALUES('2026-07-01', ?, 'tags', 'INSERT')",
+        [("b",), (None,), ("a",), ("b",), ("c",)],
+    )
+
+    install_undo_journal(conn)
+
+    seqs = [
+        tuple(r)
+        for r in conn.execute("SELECT group_id, group_seq FROM undo_stack ORDER BY id")
+    ]
+    assert seqs == [("b", 1), (None, 0), ("a", 2), ("b", 1), ("c", 3)]
+    install_undo_journal(conn)  # idempotent
+    conn.close()
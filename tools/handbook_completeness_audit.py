@@ -122,7 +122,7 @@ def run_audit() -> list[Check]:
         ),
         "Globale Suche": (
             "views/global_search_dialog.py",
-            ["class GlobalSearchDialog", "search_text=query"],
+            ["class GlobalSearchDialog", "search(self.conn, query"],
         ),
         "CSV/TXT/XLSX/PDF-Export": (
             "views/export_dialog.py",
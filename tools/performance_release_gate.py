@@ -1,24 +1,106 @@
 #!/usr/bin/env python3
-"""Reproduzierbares Performance-Gate mit einer grossen realistischen SQLite-DB."""
+"""Benchmark-Suite und Performance-Gate mit synthetischen Haushalten.
+
+Je Haushaltsgrösse (:data:`PROFILES`: Jahre × Kategorien × Buchungen, dazu
+Kategoriebaum, Tags, Sparziele, Daueraufträge, Budgetwarnungen und
+abgeschlossene Vorjahre) wird eine SQLite-DB erzeugt und jedes Szenario
+aus :data:`SCENARIOS` mehrfach gemessen - von Filtern und Übersicht über
+Buchungsdurchsatz, Vorschläge und Warnungen bis zu verschlüsselter
+Sicherung, Restore-Bundle, LifePlanner-Bridge, Migrationen aus alten
+Schema-Versionen und den Model-Aufrufen beim Aktualisieren der Tabs.
+
+Das Gate vergleicht die Messreihen mit einer gespeicherten Baseline
+derselben Maschine: Ein Szenario gilt als langsamer, wenn der
+Mann-Whitney-U-Test (einseitig) die Verschiebung signifikant findet UND
+der Median um mehr als ``--min-slowdown`` steigt. Fehlt die Baseline für
+ein Szenario, schlägt das Gate fehl, bis ``--update-baseline`` sie
+aufnimmt; ``--repeat`` muss gross genug sein, dass der Test ``--alpha``
+überhaupt erreichen kann. Die festen Sekundengrenzen der fünf
+ursprünglichen Abfragen (:data:`ABSOLUTE_LIMITS`) gelten weiter als
+Rückfallebene. Jeder Lauf wird an den JSON-Verlauf angehängt.
+
+    python tools/performance_release_gate.py --profile klein --update-baseline
+    python tools/performance_release_gate.py --profile klein
+"""
 from __future__ import annotations
 
 import argparse
-from datetime import date, timedelta
+from dataclasses import dataclass, replace
+from datetime import date, datetime, timedelta
 import json
+import math
 from pathlib import Path
+import platform
 import sqlite3
+import statistics
 import sys
 import tempfile
 import time
+from typing import Any, Callable
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
+from app_info import APP_NAME, APP_VERSION
+from model import crypto
+from model.bridge_outbox import forget as forget_outbox
+from model.budget_model import BudgetModel
 from model.budget_overview_model import BudgetOverviewModel
-from model.migrations import migrate_all
+from model.budget_suggestion_engine import BudgetSuggestionEngine
+from model.budget_warnings_model_extended import BudgetWarningsModelExtended
+from model.category_model import CategoryModel
+from model.lifeplanner_import_service import (
+    apply_imports,
+    default_draft,
+    export_fpm_expense_proposals,
+    export_savings_goals,
+    load_import_records,
+)
+from model.migrations import _set_db_version, migrate_all
+from model.query_cache import invalidate as invalidate_query_cache
+from model.month_close_model import MonthCloseModel
+from model.restore_bundle import create_bundle
+from model.savings_goals_model import SavingsGoalsModel
 from model.tracking_model import TrackingModel
 from model.typ_constants import TYP_EXPENSES, TYP_INCOME, TYP_SAVINGS
+from utils.money import set_currency
+
+LAST_YEAR = 2026
+BENCH_MONTH = 7
+ADD_BATCH = 200
+IMPORT_BATCH = 50
+MIGRATION_START_VERSIONS = (12, 18)
+DEFAULT_ARTIFACTS = Path("audit_artifacts")
+
+#: Feste Obergrenze des Medians in Sekunden, unabhängig von der Baseline.
+ABSOLUTE_LIMITS: dict[str, float] = {
+    "tracking_year_filter": 2.5,
+    "tracking_combined_filter": 1.5,
+    "overview_full_year": 2.5,
+    "category_carryover": 2.5,
+    "database_quick_check": 2.0,
+}
+
+
+@dataclass(frozen=True)
+class Household:
+    """Grösse eines synthetischen Haushalts."""
+
+    name: str
+    years: int
+    categories: int  # Blattkategorien über alle Typen
+    bookings: int
+    tags: int
+    savings_goals: int
+    recurring: int
+
+
+PROFILES: dict[str, Household] = {
+    "klein": Household("klein", 2, 24, 3_000, 6, 3, 4),
+    "mittel": Household("mittel", 5, 60, 20_000, 15, 8, 10),
+    "gross": Household("gross", 10, 100, 50_000, 30, 15, 20),
+}
 
 
 def _timed(label: str, fn):
@@ -27,25 +109,59 @@ def _timed(label: str, fn):
     return label, time.perf_counter() - started, value
 
 
-def _seed(conn: sqlite3.Connection, rows: int) -> dict[str, object]:
+def _category_name(typ: str, idx: int) -> str:
+    return f"{typ[:3]} Kategorie {idx + 1:03d}"
+
+
+def _seed(conn: sqlite3.Connection, household: Household) -> dict[str, object]:
     types = (TYP_EXPENSES, TYP_INCOME, TYP_SAVINGS)
+    first_year = LAST_YEAR - household.years + 1
     categories: list[tuple[str, str]] = []
-    for idx in range(100):
+    for idx in range(household.categories):
         typ = types[idx % len(types)]
-        categories.append((typ, f"{typ[:3]} Kategorie {idx + 1:03d}"))
+        categories.append((typ, _category_name(typ, idx)))
+    # Kategoriebaum: je Typ eine Gruppe auf acht Blätter.
+    groups = {
+        typ: [
+            f"{typ[:3]} Gruppe {g + 1:02d}"
+            for g in range(max(1, sum(1 for t, _n in categories if t == typ) // 8))
+        ]
+        for typ in types
+    }
 
     with conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO categories(typ,name,sort_order) VALUES(?,?,?)",
+            [
+                (typ, name, i)
+                for typ, names in groups.items()
+                for i, name in enumerate(names)
+            ],
+        )
+        group_ids = {
+            (str(r[0]), str(r[1])): int(r[2])
+            for r in conn.execute("SELECT typ, name, id FROM categories")
+        }
         conn.executemany(
             "INSERT OR IGNORE INTO categories("
             "typ,name,is_fix,is_recurring,recurring_day,parent_id,"
             "sort_order,forecast_mode) VALUES(?,?,?,?,?,?,?,?)",
             [
-                (typ, name, int(i % 7 == 0), int(i % 5 == 0), 25, None, i, "auto")
+                (
+                    typ,
+                    name,
+                    int(i % 7 == 0),
+                    int(i % 5 == 0),
+                    25,
+                    group_ids[(typ, groups[typ][i % len(groups[typ])])],
+                    i,
+                    "auto",
+                )
                 for i, (typ, name) in enumerate(categories)
             ],
         )
         budget_rows = []
-        for year in range(2017, 2027):
+        for year in range(first_year, LAST_YEAR + 1):
             for month in range(1, 13):
                 for idx, (typ, name) in enumerate(categories):
                     amount = 2500.0 if typ == TYP_INCOME else 80.0 + (idx % 20) * 15.0
@@ -56,11 +172,12 @@ def _seed(conn: sqlite3.Connection, rows: int) -> dict[str, object]:
             budget_rows,
         )
 
-        start = date(2017, 1, 1)
+        start = date(first_year, 1, 1)
+        span = (date(LAST_YEAR, 12, 31) - start).days + 1
         batch = []
-        for idx in range(rows):
+        for idx in range(household.bookings):
             typ, category = categories[idx % len(categories)]
-            day = start + timedelta(days=idx % 3652)
+            day = start + timedelta(days=idx % span)
             amount = (
                 3000.0 + (idx % 900) if typ == TYP_INCOME else 5.0 + (idx % 500) / 3.0
             )
@@ -89,15 +206,370 @@ def _seed(conn: sqlite3.Connection, rows: int) -> dict[str, object]:
                 "VALUES(?,?,?,?,?,?)",
                 batch,
             )
-        conn.execute("ANALYZE")
+
+        conn.executemany(
+            "INSERT OR IGNORE INTO tags(name) VALUES(?)",
+            [(f"Tag {n + 1:02d}",) for n in range(household.tags)],
+        )
+        tag_ids = [int(r[0]) for r in conn.execute("SELECT id FROM tags ORDER BY id")]
+        category_ids = [
+            int(r[0])
+            for r in conn.execute(
+                "SELECT id FROM categories WHERE parent_id IS NOT NULL ORDER BY id"
+            )
+        ]
+        if tag_ids:
+            conn.executemany(
+                "INSERT OR IGNORE INTO category_tags(category_id, tag_id) VALUES(?,?)",
+                [
+                    (cid, tag_ids[i % len(tag_ids)])
+                    for i, cid in enumerate(category_ids)
+                    if i % 4 == 0
+                ],
+            )
+            conn.execute(
+                "INSERT OR IGNORE INTO entry_tags(entry_id, tag_id) "
+                f"SELECT id, {tag_ids[0]} + id % {len(tag_ids)} FROM tracking "  # nosec B608
+                "WHERE id % 10 = 0"
+            )
+
+        conn.executemany(
+            "INSERT INTO recurring_transactions(typ, category, amount, details, "
+            "day_of_month, is_active, start_date, end_date, created_date, "
+            "last_booking_date) VALUES (?,?,?,?,?,1,?,NULL,?,NULL)",
+            [
+                (
+                    typ,
+                    name,
+                    50.0 + i,
+                    f"Dauerauftrag {i + 1}",
+                    1 + i % 28,
+                    f"{first_year}-01-01",
+                    f"{first_year}-01-01T00:00:00",
+                )
+                for i, (typ, name) in enumerate(
+                    [c for c in categories if c[0] != TYP_INCOME][: household.recurring]
+                )
+            ],
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO budget_warnings"
+            "(year, month, typ, category, threshold_percent, enabled) "
+            "VALUES (?,?,?,?,90,1)",
+            [
+                (LAST_YEAR, BENCH_MONTH, typ, name)
+                for typ, name in categories
+                if typ == TYP_EXPENSES
+            ],
+        )
+
+    savings = SavingsGoalsModel(conn)
+    savings_categories = [name for typ, name in categories if typ == TYP_SAVINGS]
+    for n, name in enumerate(savings_categories[: household.savings_goals]):
+        savings.create(f"Sparziel {n + 1}", 10_000.0 + n * 500, category=name)
+
+    # Langjährige Nutzer haben ihre Vorjahre abgeschlossen.
+    closing = MonthCloseModel(conn)
+    for year in range(first_year, LAST_YEAR):
+        for month in range(1, 13):
+            closing.mark_closed(year, month)
+    conn.execute("ANALYZE")
+    conn.commit()
     return {
-        "tracking_rows": rows,
+        "profile": household.name,
+        "tracking_rows": household.bookings,
         "budget_rows": len(budget_rows),
         "categories": len(categories),
+        "category_groups": sum(len(g) for g in groups.values()),
+        "tags": len(tag_ids),
+        "savings_goals": min(household.savings_goals, len(savings_categories)),
+        "years": household.years,
     }
 
 
-def run_benchmark(rows: int) -> dict[str, object]:
+# ── Szenarien ───────────────────────────────────────────────────
+
+
+class Bench:
+    """Gemeinsamer Zustand der Szenarien eines Laufs."""
+
+    def __init__(self, conn: sqlite3.Connection, db_path: Path, tmp: Path):
+        self.conn = conn
+        self.db_path = db_path
+        self.tmp = tmp
+        self.tracking = TrackingModel(conn)
+        self.overview = BudgetOverviewModel(conn)
+        self.expense_categories = [
+            value
+            for _label, value in CategoryModel(conn).list_for_tracking_dropdown(
+                TYP_EXPENSES
+            )
+        ]
+        self.counter = 0
+        self._mark = 0
+        self._import_path = tmp / "bridge_inbox.jsonl"
+        self._outboxes = ("savings_goals.jsonl", "fpm.jsonl")
+        self._enc: tuple[Path, bytes] | None = None
+        self._migration_conn: sqlite3.Connection | None = None
+
+    # -- Buchungsdurchsatz
+    def add_setup(self) -> None:
+        row = self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM tracking").fetchone()
+        self._mark = int(row[0])
+
+    def add_run(self) -> int:
+        for i in range(ADD_BATCH):
+            self.tracking.add(
+                date(LAST_YEAR, BENCH_MONTH, 1 + i % 28),
+                TYP_EXPENSES,
+                self.expense_categories[i % len(self.expense_categories)],
+                -(5.0 + i % 50),
+                f"Durchsatz {i}",
+            )
+        return ADD_BATCH
+
+    def add_teardown(self) -> None:
+        self.conn.execute("DELETE FROM tracking WHERE id > ?", (self._mark,))
+        self.conn.commit()
+
+    # -- Tabs
+    def tab_refresh(self) -> int:
+        """Die Model-Aufrufe, mit denen die Tabs nach einer Änderung neu laden."""
+        size = len(
+            self.tracking.list_filtered(
+                date_from=f"{LAST_YEAR}-{BENCH_MONTH:02d}-01",
+                date_to=f"{LAST_YEAR}-{BENCH_MONTH:02d}-31",
+            )
+        )
+        budget = BudgetModel(self.conn)
+        for typ in (TYP_EXPENSES, TYP_INCOME, TYP_SAVINGS):
+            size += len(budget.get_matrix(LAST_YEAR, typ))
+        size += len(self.overview.get_monthly_overview(LAST_YEAR))
+        size += len(CategoryModel(self.conn).list_tree())
+        size += len(SavingsGoalsModel(self.conn).list_all())
+        return size
+
+    # -- Vorschläge und Warnungen
+    def suggestions(self) -> int:
+        engine = BudgetSuggestionEngine(self.conn)
+        keys = [(TYP_EXPENSES, name) for name in self.expense_categories]
+        result = engine.compute_suggestions(keys, LAST_YEAR, BENCH_MONTH)
+        return sum(1 for value in result.values() if value is not None)
+
+    def warnings(self) -> int:
+        model = BudgetWarningsModelExtended(self.conn)
+        return len(model.check_warnings_extended(LAST_YEAR, BENCH_MONTH))
+
+    # -- Verschlüsselte Sicherung
+    def encrypted_save(self) -> int:
+        key, salt = crypto.generate_db_key(), crypto.generate_salt()
+        target = self.tmp / "bench.enc"
+        crypto.save_memory_db(self.conn, target, key, salt)
+        self._enc = (target, key)
+        return target.stat().st_size
+
+    def encrypted_load(self) -> int:
+        if self._enc is None:
+            self.encrypted_save()
+        assert self._enc is not None
+        target, key = self._enc
+        restored = crypto.decrypt_db_from_file(target, key)
+        try:
+            return int(restored.execute("SELECT COUNT(*) FROM tracking").fetchone()[0])
+        finally:
+            restored.close()
+
+    # -- Restore-Bundle
+    def bundle(self) -> int:
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        out = create_bundle(
+            source_db=self.db_path,
+            out_path=self.tmp / "bench.bmr",
+            app=APP_NAME,
+            app_version=APP_VERSION,
+            note="Benchmark",
+        )
+        return Path(out).stat().st_size
+
+    # -- LifePlanner-Bridge
+    def bridge_export_setup(self) -> None:
+        # Ohne gemerkten Stand vergliche der Export mit der vorhandenen Datei
+        # und schriebe ab dem zweiten Lauf nichts mehr.
+        forget_outbox(self.conn)
+        for name in self._outboxes:
+            (self.tmp / name).unlink(missing_ok=True)
+
+    def bridge_export(self) -> int:
+        goals_name, fpm_name = self._outboxes
+        goals = export_savings_goals(self.conn, self.tmp / goals_name)
+        proposals = export_fpm_expense_proposals(self.conn, self.tmp / fpm_name)
+        if {goals.mode, proposals.mode} != {"rewritten"}:
+            raise RuntimeError("bridge_export hat nicht geschrieben")
+        return goals.count + proposals.count
+
+    def bridge_import_setup(self) -> None:
+        self.counter += 1
+        lines = [json.dumps({"schema": "budgetmanager.import.manifest.v1"})]
+        for nr in range(IMPORT_BATCH):
+            category = self.expense_categories[nr % len(self.expense_categories)]
+            lines.append(
+                json.dumps(
+                    {
+                        "schema": "budgetmanager.import.v1",
+                        "operation": "upsert",
+                        "external_id": f"bench:{self.counter}:{nr}",
+                        "source": "FPM",
+                        "date": f"{LAST_YEAR}-{BENCH_MONTH:02d}-{1 + nr % 28:02d}",
+                        "amount": 10.0 + nr,
+                        "currency": "CHF",
+                        "category_path": f"Benchmark/{category}",
+                        "description": f"Import {nr}",
+                        "counterparty": "Shop",
+                        "notes": "",
+                        "metadata": {},
+                    },
+                    ensure_ascii=False,
+                )
+            )
+        self._import_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    def bridge_import(self) -> int:
+        records = load_import_records(self.conn, self._import_path)
+        drafts = [(r, default_draft(self.conn, r)) for r in records]
+        return len(apply_imports(self.conn, drafts))
+
+    # -- Migrationen
+    def migration_setup(self, version: int) -> None:
+        copy = sqlite3.connect(":memory:")
+        copy.row_factory = sqlite3.Row
+        self.conn.backup(copy)
+        _set_db_version(copy, version)
+        copy.commit()
+        self._migration_conn = copy
+
+    def migration_run(self) -> int:
+        assert self._migration_conn is not None
+        info = migrate_all(self._migration_conn)
+        return len(info["migrations_applied"])
+
+    def migration_teardown(self) -> None:
+        if self._migration_conn is not None:
+            self._migration_conn.close()
+            self._migration_conn = None
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    run: Callable[[Bench], Any]
+    setup: Callable[[Bench], None] | None = None
+    teardown: Callable[[Bench], None] | None = None
+    needs_crypto: bool = False
+
+
+def _migration(version: int) -> Scenario:
+    return Scenario(
+        f"migration_from_v{version}",
+        Bench.migration_run,
+        setup=lambda b: b.migration_setup(version),
+        teardown=Bench.migration_teardown,
+    )
+
+
+SCENARIOS: tuple[Scenario, ...] = (
+    Scenario(
+        "tracking_year_filter", lambda b: b.tracking.list_filtered(year=LAST_YEAR)
+    ),
+    Scenario(
+        "tracking_combined_filter",
+        lambda b: b.tracking.list_filtered(
+            typ=TYP_EXPENSES,
+            categories=[
+                "Aus Kategorie 001",
+                "Aus Kategorie 004",
+                "Aus Kategorie 007",
+            ],
+            date_from=f"{LAST_YEAR - 1}-01-01",
+            date_to=f"{LAST_YEAR}-12-31",
+            search_text="Benchmark",
+        ),
+    ),
+    Scenario(
+        "overview_full_year", lambda b: b.overview.get_monthly_overview(LAST_YEAR)
+    ),
+    Scenario(
+        "category_carryover",
+        lambda b: b.overview.get_category_carryover_view(
+            LAST_YEAR, BENCH_MONTH, TYP_EXPENSES
+        ),
+    ),
+    Scenario(
+        "database_quick_check",
+        lambda b: b.conn.execute("PRAGMA quick_check(1)").fetchone(),
+    ),
+    Scenario("tab_refresh", Bench.tab_refresh),
+    Scenario(
+        "tracking_add_throughput",
+        Bench.add_run,
+        setup=Bench.add_setup,
+        teardown=Bench.add_teardown,
+    ),
+    Scenario("suggestions", Bench.suggestions),
+    Scenario("budget_warnings", Bench.warnings),
+    Scenario("encrypted_save", Bench.encrypted_save, needs_crypto=True),
+    Scenario("encrypted_load", Bench.encrypted_load, needs_crypto=True),
+    Scenario("restore_bundle", Bench.bundle),
+    Scenario("bridge_export", Bench.bridge_export, setup=Bench.bridge_export_setup),
+    Scenario("bridge_import", Bench.bridge_import, setup=Bench.bridge_import_setup),
+    *(_migration(v) for v in MIGRATION_START_VERSIONS),
+)
+
+
+def _size(value: Any) -> int:
+    if isinstance(value, int):
+        return value
+    if value is None:
+        return 0
+    try:
+        return len(value)
+    except TypeError:
+        return 1
+
+
+def _measure(bench: Bench, scenario: Scenario, repeat: int) -> tuple[list[float], int]:
+    samples: list[float] = []
+    size = 0
+    for _ in range(repeat):
+        # Jede Wiederholung misst kalt, nicht den Treffer im Abfrage-Cache.
+        invalidate_query_cache(bench.conn)
+        if scenario.setup is not None:
+            scenario.setup(bench)
+        try:
+            _, elapsed, value = _timed(scenario.name, lambda: scenario.run(bench))
+        finally:
+            if scenario.teardown is not None:
+                scenario.teardown(bench)
+        samples.append(elapsed)
+        size = _size(value)
+    return samples, size
+
+
+def run_benchmark(
+    rows: int | None = None,
+    *,
+    household: Household | None = None,
+    repeat: int = 1,
+    only: set[str] | None = None,
+) -> dict[str, object]:
+    """Erzeugt den Haushalt und misst die Szenarien.
+
+    ``rows`` überschreibt die Buchungszahl; ohne ``household`` wird das
+    Profil ``gross`` verwendet.
+    """
+    household = household or PROFILES["gross"]
+    if rows is not None:
+        household = replace(household, bookings=rows)
+    set_currency("CHF")
     with tempfile.TemporaryDirectory(prefix="budgetmanager_perf_") as tmp:
         db_path = Path(tmp) / "performance.db"
         conn = sqlite3.connect(db_path)
@@ -106,84 +578,208 @@ def run_benchmark(rows: int) -> dict[str, object]:
         conn.execute("PRAGMA journal_mode=WAL")
         migrate_all(conn, str(db_path), str(Path(tmp) / "backups"))
 
-        _, seed_seconds, seeded = _timed("seed", lambda: _seed(conn, rows))
-        tracking = TrackingModel(conn)
-        overview = BudgetOverviewModel(conn)
-        timings: dict[str, float] = {}
+        _, seed_seconds, seeded = _timed("seed", lambda: _seed(conn, household))
+        bench = Bench(conn, db_path, Path(tmp))
+        samples: dict[str, list[float]] = {}
         result_sizes: dict[str, int] = {}
+        skipped: list[str] = []
+        for scenario in SCENARIOS:
+            if only is not None and scenario.name not in only:
+                continue
+            if scenario.needs_crypto and not crypto.is_crypto_available():
+                skipped.append(scenario.name)
+                continue
+            samples[scenario.name], result_sizes[scenario.name] = _measure(
+                bench, scenario, max(1, repeat)
+            )
+        database_bytes = db_path.stat().st_size
+        forget_outbox(conn)
+        conn.close()
+    return {
+        "profile": household.name,
+        "rows": household.bookings,
+        "repeat": max(1, repeat),
+        "seed_seconds": round(seed_seconds, 4),
+        "database_bytes": database_bytes,
+        "seeded": seeded,
+        "samples_seconds": {k: [round(v, 6) for v in s] for k, s in samples.items()},
+        "timings_seconds": {
+            k: round(statistics.median(s), 4) for k, s in samples.items()
+        },
+        "result_sizes": result_sizes,
+        "skipped": skipped,
+    }
 
-        label, elapsed, value = _timed(
-            "tracking_year_filter", lambda: tracking.list_filtered(year=2026)
-        )
-        timings[label] = elapsed
-        result_sizes[label] = len(value)
-
-        label, elapsed, value = _timed(
-            "tracking_combined_filter",
-            lambda: tracking.list_filtered(
-                typ=TYP_EXPENSES,
-                categories=[
-                    "Aus Kategorie 001",
-                    "Aus Kategorie 004",
-                    "Aus Kategorie 007",
-                ],
-                date_from="2025-01-01",
-                date_to="2026-12-31",
-                search_text="Benchmark",
-            ),
-        )
-        timings[label] = elapsed
-        result_sizes[label] = len(value)
 
-        label, elapsed, value = _timed(
-            "overview_full_year", lambda: overview.get_monthly_overview(2026)
-        )
-        timings[label] = elapsed
-        result_sizes[label] = len(value)
+# ── Vergleich mit der Baseline ──────────────────────────────────
 
-        label, elapsed, value = _timed(
-            "category_carryover",
-            lambda: overview.get_category_carryover_view(2026, 7, TYP_EXPENSES),
-        )
-        timings[label] = elapsed
-        result_sizes[label] = len(value)
 
-        label, elapsed, value = _timed(
-            "database_quick_check",
-            lambda: conn.execute("PRAGMA quick_check(1)").fetchone(),
-        )
-        timings[label] = elapsed
-        result_sizes[label] = 1 if value else 0
+def mann_whitney_slower(current: list[float], baseline: list[float]) -> float:
+    """Einseitiger p-Wert für "``current`` ist langsamer als ``baseline``".
 
-        conn.close()
-        return {
-            "rows": rows,
-            "seed_seconds": round(seed_seconds, 4),
-            "database_bytes": db_path.stat().st_size,
-            "seeded": seeded,
-            "timings_seconds": {k: round(v, 4) for k, v in timings.items()},
-            "result_sizes": result_sizes,
+    Mann-Whitney-U mit Normalapproximation, Bindungs- und
+    Stetigkeitskorrektur; verteilungsfrei, also robust gegen Ausreisser
+    einzelner Läufe.
+    """
+    n1, n2 = len(current), len(baseline)
+    if not n1 or not n2:
+        return 1.0
+    pooled = sorted([(v, 0) for v in current] + [(v, 1) for v in baseline])
+    ranks = [0.0] * len(pooled)
+    ties = 0.0
+    i = 0
+    while i < len(pooled):
+        j = i
+        while j + 1 < len(pooled) and pooled[j + 1][0] == pooled[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        t = j - i + 1
+        ties += t**3 - t
+        i = j + 1
+    rank_sum = sum(r for r, (_v, side) in zip(ranks, pooled) if side == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def min_p_value(n1: int, n2: int) -> float:
+    """Kleinster p-Wert, den :func:`mann_whitney_slower` bei n1/n2 liefern kann."""
+    if n1 < 1 or n2 < 1:
+        return 1.0
+    return mann_whitney_slower(
+        [float(n2 + i) for i in range(n1)], [float(i) for i in range(n2)]
+    )
+
+
+def compare(
+    samples: dict[str, list[float]],
+    baseline: dict[str, list[float]],
+    *,
+    alpha: float,
+    min_slowdown: float,
+) -> dict[str, dict[str, object]]:
+    """Vergleicht Messreihen je Szenario mit der Baseline.
+
+    ``status``: ``"regression"``, ``"faster"``, ``"ok"``, ``"new"``
+    (keine Baseline für das Szenario) oder ``"underpowered"`` (zu wenige
+    Messungen, als dass der Test ``alpha`` erreichen könnte).
+    """
+    out: dict[str, dict[str, object]] = {}
+    for name, current in samples.items():
+        base = baseline.get(name) or []
+        median = statistics.median(current)
+        if not base:
+            out[name] = {"status": "new", "median": round(median, 6)}
+            continue
+        base_median = statistics.median(base)
+        ratio = median / base_median if base_median > 0 else 1.0
+        p_slower = mann_whitney_slower(current, base)
+        p_faster = mann_whitney_slower(base, current)
+        if min_p_value(len(current), len(base)) >= alpha:
+            status = "underpowered"
+        elif p_slower < alpha and ratio > 1 + min_slowdown:
+            status = "regression"
+        elif p_faster < alpha and ratio < 1 / (1 + min_slowdown):
+            status = "faster"
+        else:
+            status = "ok"
+        out[name] = {
+            "status": status,
+            "median": round(median, 6),
+            "baseline_median": round(base_median, 6),
+            "ratio": round(ratio, 3),
+            "p_value": round(p_slower, 5),
         }
+    return out
 
 
-def main() -> int:
+def _environment() -> dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "app_version": APP_VERSION,
+    }
+
+
+def _load_baseline(path: Path) -> dict[str, list[float]]:
+    if not path.exists():
+        return {}
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return {
+        str(name): [float(v) for v in values]
+        for name, values in dict(data.get("samples_seconds") or {}).items()
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser()
-    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="mittel")
+    parser.add_argument("--rows", type=int, help="Buchungszahl des Profils ersetzen")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=[s.name for s in SCENARIOS],
+        help="nur dieses Szenario (mehrfach möglich)",
+    )
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument(
+        "--history",
+        type=Path,
+        default=DEFAULT_ARTIFACTS / "performance_history.jsonl",
+    )
     parser.add_argument(
         "--json-out",
         type=Path,
-        default=Path("audit_artifacts/performance_gate.json"),
-    )
-    parser.add_argument("--max-year-filter", type=float, default=2.5)
-    parser.add_argument("--max-combined-filter", type=float, default=1.5)
-    parser.add_argument("--max-overview", type=float, default=2.5)
-    parser.add_argument("--max-carryover", type=float, default=2.5)
-    parser.add_argument("--max-quick-check", type=float, default=2.0)
-    args = parser.parse_args()
-    if args.rows < 1_000 or args.rows > 1_000_000:
+        default=DEFAULT_ARTIFACTS / "performance_gate.json",
+    )
+    parser.add_argument("--alpha", type=float, default=0.01)
+    parser.add_argument("--min-slowdown", type=float, default=0.2)
+    parser.add_argument(
+        "--max-year-filter",
+        type=float,
+        default=ABSOLUTE_LIMITS["tracking_year_filter"],
+    )
+    parser.add_argument(
+        "--max-combined-filter",
+        type=float,
+        default=ABSOLUTE_LIMITS["tracking_combined_filter"],
+    )
+    parser.add_argument(
+        "--max-overview", type=float, default=ABSOLUTE_LIMITS["overview_full_year"]
+    )
+    parser.add_argument(
+        "--max-carryover", type=float, default=ABSOLUTE_LIMITS["category_carryover"]
+    )
+    parser.add_argument(
+        "--max-quick-check",
+        type=float,
+        default=ABSOLUTE_LIMITS["database_quick_check"],
+    )
+    args = parser.parse_args(argv)
+    if args.rows is not None and not 1_000 <= args.rows <= 1_000_000:
         raise SystemExit("--rows muss zwischen 1000 und 1000000 liegen")
-
-    result = run_benchmark(args.rows)
+    if args.repeat < 1:
+        raise SystemExit("--repeat muss mindestens 1 sein")
+    if min_p_value(args.repeat, args.repeat) >= args.alpha:
+        needed = args.repeat
+        while min_p_value(needed, needed) >= args.alpha:
+            needed += 1
+        raise SystemExit(
+            f"--repeat {args.repeat} kann alpha={args.alpha} nie erreichen; "
+            f"mindestens {needed} Wiederholungen"
+        )
+    baseline_path = args.baseline or (
+        DEFAULT_ARTIFACTS / f"performance_baseline_{args.profile}.json"
+    )
     limits = {
         "tracking_year_filter": args.max_year_filter,
         "tracking_combined_filter": args.max_combined_filter,
@@ -191,23 +787,95 @@ def main() -> int:
         "category_carryover": args.max_carryover,
         "database_quick_check": args.max_quick_check,
     }
-    errors = [
-        f"{name}: {result['timings_seconds'][name]:.4f}s > {limit:.4f}s"
+
+    result = run_benchmark(
+        args.rows,
+        household=PROFILES[args.profile],
+        repeat=args.repeat,
+        only=set(args.scenario) if args.scenario else None,
+    )
+    samples = result["samples_seconds"]
+    timings = result["timings_seconds"]
+    assert isinstance(samples, dict) and isinstance(timings, dict)
+    baseline = _load_baseline(baseline_path)
+    if not baseline and not args.update_baseline:
+        print(
+            f"WARNUNG: keine Baseline unter {baseline_path} - ohne Vergleich "
+            "schlägt das Gate fehl; zuerst mit --update-baseline messen.",
+            file=sys.stderr,
+        )
+    comparison = compare(
+        samples,
+        baseline,
+        alpha=args.alpha,
+        min_slowdown=args.min_slowdown,
+    )
+    errors: list[str] = []
+    for name, entry in sorted(comparison.items()):
+        if entry["status"] == "regression":
+            errors.append(
+                f"{name}: Median {entry['median']:.4f}s statt "
+                f"{entry['baseline_median']:.4f}s (p={entry['p_value']})"
+            )
+        elif entry["status"] == "new" and not args.update_baseline:
+            errors.append(f"{name}: keine Baseline ({baseline_path})")
+        elif entry["status"] == "underpowered" and not args.update_baseline:
+            errors.append(f"{name}: zu wenige Messungen für alpha={args.alpha}")
+    errors.extend(
+        f"{name}: {float(timings[name]):.4f}s > {limit:.4f}s"
         for name, limit in limits.items()
-        if float(result["timings_seconds"][name]) > limit
-    ]
-    result["limits_seconds"] = limits
-    result["passed"] = not errors
-    result["errors"] = errors
+        if name in timings and float(timings[name]) > limit
+    )
+    result.update(
+        {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "environment": _environment(),
+            "baseline": str(baseline_path),
+            "comparison": comparison,
+            "limits_seconds": limits,
+            "passed": not errors,
+            "errors": errors,
+        }
+    )
+
     args.json_out.parent.mkdir(parents=True, exist_ok=True)
     args.json_out.write_text(
         json.dumps(result, ensure_ascii=False, indent=2, sort_keys=True) + "\n",
         encoding="utf-8",
     )
-    print(json.dumps(result, ensure_ascii=False, sort_keys=True))
+    args.history.parent.mkdir(parents=True, exist_ok=True)
+    with args.history.open("a", encoding="utf-8") as history:
+        history.write(json.dumps(result, ensure_ascii=False, sort_keys=True) + "\n")
+    if args.update_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        merged = _load_baseline(baseline_path)
+        merged.update(samples)
+        baseline_path.write_text(
+            json.dumps(
+                {
+                    "profile": args.profile,
+                    "timestamp": result["timestamp"],
+                    "environment": result["environment"],
+                    "samples_seconds": merged,
+                },
+                ensure_ascii=False,
+                indent=2,
+                sort_keys=True,
+            )
+            + "\n",
+            encoding="utf-8",
+        )
+        print(f"Baseline gespeichert: {baseline_path}")
+
+    for name, entry in sorted(comparison.items()):
+        ratio = entry.get("ratio")
+        print(
+            f"{name:28s} {entry['median']:9.4f}s  {entry['status']}"
+            + (f"  x{ratio}" if ratio is not None else "")
+        )
     if errors:
         print("Performance-Gate FEHLGESCHLAGEN")
-        for error in errors:
+        for error in result["errors"]:
             print(f"- {error}")
         return 1
     print("Performance-Gate BESTANDEN")
@@ -23,7 +23,6 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, Tuple
 
-import requests
 from packaging import version as _version
 
 
@@ -298,6 +297,8 @@ def fetch_manifest(
     """
     from urllib.parse import urlparse
 
+    import requests  # ~90 ms Importzeit, erst beim Abruf laden
+
     from updater.manifest_signing import (
         SIGNATURE_SUFFIX,
         verify_manifest_signature,
@@ -355,6 +356,8 @@ def sha256_file(path: Path) -> str:
 
 
 def download_file(url: str, dest: Path, timeout_s: int = 30) -> None:
+    import requests
+
     dest.parent.mkdir(parents=True, exist_ok=True)
     with requests.get(url, stream=True, timeout=timeout_s) as r:
         r.raise_for_status()
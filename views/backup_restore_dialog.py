@@ -23,9 +23,12 @@ from PySide6.QtWidgets import (
     QInputDialog,
     QApplication,
     QLineEdit,
+    QCheckBox,
 )
 
 from model.app_paths import resolve_in_app, configured_backups_dir
+from model.backup_store import REPOSITORY_DIRNAME, BackupStore
+from model.restore_bundle import BundleIntegrityError
 from model.file_permissions import secure_dir, secure_file
 from utils.icons import get_icon
 
@@ -90,12 +93,23 @@ class BackupRestoreDialog(QDialog):
         self.btn_import.setIcon(get_icon("📁"))
         self.btn_delete = QPushButton(tr("btn.backup_loeschen"))
         self.btn_delete.setIcon(get_icon("🗑"))
+        self.btn_verify = QPushButton(tr("backup.btn_verify"))
+        self.btn_verify.setIcon(get_icon("✓"))
         self.btn_close = QPushButton(tr("btn.close"))
         self.btn_close.setIcon(get_icon("✗"))
 
         # Liste der Backups
         self.backup_list = QListWidget()
 
+        # Auto-Backups als .bmr oder im deduplizierenden Repository
+        self.chk_repository = QCheckBox(tr("backup.repository_toggle"))
+        self.chk_repository.setChecked(
+            bool(settings.get("auto_backup_repository", False))
+            if settings is not None
+            else False
+        )
+        self.chk_repository.setEnabled(settings is not None)
+
         # Layout
         info_label = QLabel(
             trf(
@@ -135,6 +149,7 @@ class BackupRestoreDialog(QDialog):
         btn_layout2 = QHBoxLayout()
         btn_layout2.addWidget(self.btn_export)
         btn_layout2.addWidget(self.btn_import)
+        btn_layout2.addWidget(self.btn_verify)
         btn_layout2.addStretch()
 
         layout = QVBoxLayout()
@@ -146,6 +161,7 @@ class BackupRestoreDialog(QDialog):
         layout.addWidget(self.backup_list)
         layout.addLayout(btn_layout1)
         layout.addLayout(btn_layout2)
+        layout.addWidget(self.chk_repository)
         layout.addSpacing(10)
         layout.addWidget(self.btn_close)
         self.setLayout(layout)
@@ -156,6 +172,8 @@ class BackupRestoreDialog(QDialog):
         self.btn_export.clicked.connect(self.export_backup)
         self.btn_import.clicked.connect(self.import_backup)
         self.btn_delete.clicked.connect(self.delete_backup)
+        self.btn_verify.clicked.connect(self.verify_backup)
+        self.chk_repository.toggled.connect(self._set_repository_backups)
         # Schließen bedeutet: keine Änderungen an der aktiven DB → reject()
         self.btn_close.clicked.connect(self.reject)
 
@@ -197,23 +215,52 @@ class BackupRestoreDialog(QDialog):
                     seen.add(p)
                     backups.append(p)
 
+        # Schnappschüsse im Repository: Eintrag ist das Manifest, die Grösse
+        # die der gesicherten Datenbank.
+        entries = [(p, p.name, p.stat().st_size) for p in backups]
+        wanted = "enc" if self.encrypted_session is not None else "db"
+        store = self._repository()
+        for snapshot in store.list_snapshots():
+            if snapshot.get("encryption") == wanted:
+                manifest = store.snapshot_dir / f"{snapshot['id']}.json"
+                name = f"{REPOSITORY_DIRNAME}/{snapshot['id']}"
+                entries.append((manifest, name, int(snapshot.get("size") or 0)))
+
         # Neueste zuerst (mtime)
-        backups.sort(key=lambda p: p.stat().st_mtime, reverse=True)
+        entries.sort(key=lambda e: e[0].stat().st_mtime, reverse=True)
 
-        for backup in backups:
-            size = backup.stat().st_size / 1024  # KB
+        for backup, name, size_bytes in entries:
+            size = size_bytes / 1024  # KB
             mod_time = datetime.fromtimestamp(backup.stat().st_mtime)
 
-            item_text = (
-                f"{backup.name} ({size:.1f} KB, {mod_time.strftime('%d.%m.%Y %H:%M')})"
-            )
+            item_text = f"{name} ({size:.1f} KB, {mod_time.strftime('%d.%m.%Y %H:%M')})"
             item = QListWidgetItem(item_text)
             item.setData(Qt.UserRole, str(backup))
             self.backup_list.addItem(item)
 
-        if backups:
+        if entries:
             self.backup_list.setCurrentRow(0)
 
+    def _repository(self) -> BackupStore:
+        return BackupStore(self.backup_dir / REPOSITORY_DIRNAME)
+
+    def _snapshot_id(self, backup_path: Path) -> str | None:
+        """ID, falls ``backup_path`` ein Manifest im Repository ist."""
+        store = self._repository()
+        if backup_path.parent == store.snapshot_dir and backup_path.suffix == ".json":
+            return backup_path.stem
+        return None
+
+    def _repository_key(self) -> bytes | None:
+        """Schlüssel für versiegelte Schnappschüsse des aktiven Kontos."""
+        if self.encrypted_session is None:
+            return None
+        return self.encrypted_session.db_key
+
+    def _set_repository_backups(self, enabled: bool) -> None:
+        if self.settings is not None:
+            self.settings.set("auto_backup_repository", bool(enabled))
+
     def _require_auth(self, action: str) -> bool:
         """Code-Abfrage vor Export/Import/Restore (v2.2.10), gemeinsame
         Implementierung seit v2.2.16 (K4) in views.reauth. Eine erfolgreiche
@@ -314,7 +361,30 @@ class BackupRestoreDialog(QDialog):
             return
 
         backup_path = Path(item.data(Qt.UserRole))
-        self.restore_external_path(backup_path)
+        snapshot_id = self._snapshot_id(backup_path)
+        if snapshot_id is None:
+            self.restore_external_path(backup_path)
+            return
+
+        # Schnappschuss als geprüftes .bmr auspacken und den normalen Ablauf
+        # nehmen: Optionen, Sicherheitskopie und Konto-Regeln gelten genauso.
+        if not self._require_auth("restore"):
+            return
+        tmp_dir = self.backup_dir / "_tmp_restore"
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        secure_dir(tmp_dir)
+        bundle = tmp_dir / f"repository_{snapshot_id}{BMR_EXT}"
+        try:
+            self._repository().export_bundle(
+                snapshot_id, bundle, db_key=self._repository_key()
+            )
+            self.restore_external_path(bundle)
+        except (BundleIntegrityError, OSError, ValueError) as e:
+            QMessageBox.critical(
+                self, tr("msg.error"), trf("backup_restore.restore_failed", err=str(e))
+            )
+        finally:
+            bundle.unlink(missing_ok=True)
 
     def _ask_restore_options(self, backup_path: Path) -> tuple[bool, bool] | None:
         """Fragt Restore-Bestätigung und optionale Zusatzdaten ab.
@@ -414,11 +484,17 @@ class BackupRestoreDialog(QDialog):
             return
 
         backup_path = Path(item.data(Qt.UserRole))
+        snapshot_id = self._snapshot_id(backup_path)
+        default_name = (
+            backup_path.name
+            if snapshot_id is None
+            else f"budgetmanager_backup_{snapshot_id}{BMR_EXT}"
+        )
 
         file_path, _ = QFileDialog.getSaveFileName(
             self,
             tr("backup.backup_export_title"),
-            str(Path.home() / backup_path.name),
+            str(Path.home() / default_name),
             tr("backup.backup_filter"),
         )
 
@@ -426,7 +502,12 @@ class BackupRestoreDialog(QDialog):
             return
 
         try:
-            shutil.copy2(backup_path, file_path)
+            if snapshot_id is None:
+                shutil.copy2(backup_path, file_path)
+            else:
+                self._repository().export_bundle(
+                    snapshot_id, file_path, db_key=self._repository_key()
+                )
             show_info(
                 self,
                 tr("backup.import_success_title"),
@@ -664,6 +745,7 @@ class BackupRestoreDialog(QDialog):
         import json
         import zipfile
         from model.app_paths import data_dir
+        from model.encrypted_journal import discard_journal
         from model.user_model import _users_file_path
         from model.restore_bundle import (
             MAX_DB_BYTES,
@@ -811,6 +893,8 @@ class BackupRestoreDialog(QDialog):
 
                 rollback_db.unlink(missing_ok=True)
                 rollback_users.unlink(missing_ok=True)
+                if dest_db.suffix == ".enc":
+                    discard_journal(dest_db)
                 self._full_account_restore = True
                 logger.info(
                     "Vollständiges Konto-Backup transaktional wiederhergestellt: %s + users.json",
@@ -864,6 +948,11 @@ class BackupRestoreDialog(QDialog):
                 src_conn.backup(self.conn)
             finally:
                 src_conn.close()
+            # Seitenkopie zählt SQLite nicht als Änderung - zwischengespeicherte
+            # Summen gehören noch zur alten DB.
+            from model.query_cache import invalidate
+
+            invalidate(self.conn)
             return
 
         # encrypted mode
@@ -933,14 +1022,14 @@ class BackupRestoreDialog(QDialog):
             except Exception:
                 src_conn = sqlite3.connect(str(src))
 
+            # Seitenweise kopieren statt Dump + executescript: kein SQL-Parsen,
+            # kein Neuaufbau der Indizes.
+            mem_conn = sqlite3.connect(":memory:")
+            mem_conn.row_factory = sqlite3.Row
             try:
-                dump_sql = "\n".join(src_conn.iterdump())
+                src_conn.backup(mem_conn)
             finally:
                 src_conn.close()
-
-            mem_conn = sqlite3.connect(":memory:")
-            mem_conn.row_factory = sqlite3.Row
-            mem_conn.executescript(dump_sql)
             mem_conn.execute("PRAGMA foreign_keys = ON;")
             mem_conn.execute("PRAGMA busy_timeout = 10000;")
 
@@ -1063,6 +1152,38 @@ class BackupRestoreDialog(QDialog):
             self.exit_requested = True
             QApplication.quit()
 
+    def verify_backup(self):
+        """Prüft ein .bmr oder einen Schnappschuss vollständig, ohne Restore."""
+        item = self.backup_list.currentItem()
+        if not item:
+            show_info(self, tr("msg.info"), tr("backup.select_backup"))
+            return
+
+        backup_path = Path(item.data(Qt.UserRole))
+        snapshot_id = self._snapshot_id(backup_path)
+        if snapshot_id is None and backup_path.suffix.lower() != BMR_EXT:
+            show_info(self, tr("msg.info"), tr("backup.verify_unsupported"))
+            return
+
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            if snapshot_id is None:
+                from model.restore_bundle import verify_bundle
+
+                verify_bundle(backup_path)
+                name = backup_path.name
+            else:
+                self._repository().verify(snapshot_id, db_key=self._repository_key())
+                name = f"{REPOSITORY_DIRNAME}/{snapshot_id}"
+        except (BundleIntegrityError, OSError, ValueError) as e:
+            QApplication.restoreOverrideCursor()
+            show_warning(self, tr("msg.warning"), trf("backup.verify_failed", error=e))
+            return
+        QApplication.restoreOverrideCursor()
+        show_info(
+            self, tr("backup.verify_ok_title"), trf("backup.verify_ok", name=name)
+        )
+
     def delete_backup(self):
         item = self.backup_list.currentItem()
         if not item:
@@ -1082,7 +1203,11 @@ class BackupRestoreDialog(QDialog):
             return
 
         try:
-            backup_path.unlink()
+            snapshot_id = self._snapshot_id(backup_path)
+            if snapshot_id is None:
+                backup_path.unlink()
+            else:
+                self._repository().delete_snapshot(snapshot_id)
             self.refresh_backup_list()
         except Exception as e:
             QMessageBox.critical(
@@ -1084,7 +1084,7 @@ class BudgetAdjustmentDialog(QDialog):
                 parent = self.parent()
                 if parent is not None and hasattr(parent, "_schedule_refresh_all_tabs"):
                     # fmt: off
-                    parent._schedule_refresh_all_tabs(reason="budget adjustment applied")
+                    parent._schedule_refresh_all_tabs(reason="budget adjustment applied", data_only=True)
                     # fmt: on
                 elif parent is not None and hasattr(parent, "_refresh_all_tabs"):
                     QTimer.singleShot(0, parent._refresh_all_tabs)
@@ -1222,6 +1222,11 @@ class CategoriesTab(QWidget):
     quick_add_requested = Signal()
     categories_changed = Signal()
 
+    # Tabellen, deren Änderung ein Neuladen nötig macht (siehe ChangeBus).
+    DATA_DEPENDENCIES = frozenset(
+        {"categories", "category_tags", "tags", "budget", "tracking"}
+    )
+
     def __init__(self, conn: sqlite3.Connection, parent=None):
         super().__init__(parent)
         lay = QVBoxLayout(self)
@@ -0,0 +1,95 @@
+"""Qt-Anbindung des Rechendienstes (``model.background_compute``).
+
+Der Rechendienst ruft zurück, wo gerechnet wurde - im Arbeits-Thread. Von
+dort darf kein Widget angefasst werden. :class:`QtComputeService` reicht
+jedes Ergebnis deshalb über ein Signal weiter; Qt stellt es als
+Warteschlangen-Aufruf im GUI-Thread zu, und erst dort wird noch einmal
+geprüft, ob der Auftrag inzwischen überholt ist.
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+from typing import Any, Callable
+
+from PySide6.QtCore import QObject, Signal, Slot
+
+from model.background_compute import ComputeResult, ComputeService
+
+logger = logging.getLogger(__name__)
+
+
+class QtComputeService(QObject):
+    """Rechendienst für Tabs; Rückrufe laufen im GUI-Thread."""
+
+    _delivered = Signal(object)
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        parent: QObject | None = None,
+        *,
+        max_workers: int | None = None,
+    ) -> None:
+        super().__init__(parent)
+        kwargs = {} if max_workers is None else {"max_workers": max_workers}
+        self.service = ComputeService(conn, **kwargs)
+        self._handlers: dict[
+            tuple[str, int],
+            tuple[Callable[[Any], None], Callable[[BaseException], None] | None],
+        ] = {}
+        self._delivered.connect(self._deliver)
+
+    def submit(
+        self,
+        channel: str,
+        fn: Callable[[sqlite3.Connection], Any],
+        on_result: Callable[[Any], None],
+        *,
+        on_error: Callable[[BaseException], None] | None = None,
+    ) -> bool:
+        """Rechnet ``fn`` im Hintergrund; ``False`` heisst: selbst rechnen.
+
+        Das ist der Fall nach :meth:`shutdown` und solange auf der
+        Haupt-Connection eine Transaktion offen ist.
+        """
+        if not self.service.can_submit():
+            return False
+        generation = self.service.submit(channel, fn, self._delivered.emit)
+        # Ältere Aufträge des Kanals kommen nicht mehr an (siehe _deliver).
+        for key in [k for k in self._handlers if k[0] == channel]:
+            del self._handlers[key]
+        self._handlers[(channel, generation)] = (on_result, on_error)
+        return True
+
+    def cancel(self, channel: str) -> None:
+        self.service.cancel(channel)
+        for key in [k for k in self._handlers if k[0] == channel]:
+            del self._handlers[key]
+
+    @Slot(object)
+    def _deliver(self, result: ComputeResult) -> None:
+        handlers = self._handlers.pop((result.channel, result.generation), None)
+        if handlers is None or not self.service.is_current(
+            result.channel, result.generation
+        ):
+            return
+        on_result, on_error = handlers
+        if result.error is None:
+            on_result(result.value)
+        elif on_error is not None:
+            on_error(result.error)
+        else:
+            logger.warning(
+                "Hintergrundberechnung %s fehlgeschlagen: %s",
+                result.channel,
+                result.error,
+            )
+
+    def stats(self) -> dict[str, int | str]:
+        return self.service.stats()
+
+    def shutdown(self) -> None:
+        self._handlers.clear()
+        self.service.shutdown()
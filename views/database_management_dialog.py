@@ -49,6 +49,7 @@ class DatabaseManagementDialog(QDialog):
         conn=None,
         encrypted: bool = False,
         active_user=None,
+        encrypted_session=None,
     ):
         # v2.2.16 (K4): active_user fuer die Sicherheitsabfrage vor dem Reset –
         # der Reset lief bisher an der Re-Auth aus v2.2.10 vorbei.
@@ -58,6 +59,7 @@ class DatabaseManagementDialog(QDialog):
         self.encrypted = (
             encrypted  # True = verschlüsselter Modus (db_path zeigt auf .enc)
         )
+        self.encrypted_session = encrypted_session  # EncryptedSession oder None
         self.model = DatabaseManagementModel(db_path, conn=conn)
         self.data_changed = (
             False  # Wird True nach Reset/Bereinigung → main_window refresht Tabs
@@ -356,6 +358,11 @@ class DatabaseManagementDialog(QDialog):
                             str(users_file), str(bdir / f"users_pre_reset_{stamp}.json")
                         )
                         if self.encrypted:
+                            # Commits seit dem letzten Snapshot stehen nur im
+                            # Journal - erst vollständig speichern, dann ist
+                            # die Kopie der .enc allein die ganze DB.
+                            if self.encrypted_session is not None:
+                                self.encrypted_session.save()
                             enc_p = Path(self.db_path)
                             if enc_p.exists():
                                 shutil.copy2(
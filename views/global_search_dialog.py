@@ -24,6 +24,13 @@ from views.ui_colors import ui_colors
 from model.tracking_model import TrackingModel
 from model.category_model import CategoryModel
 from model.budget_model import BudgetModel
+from model.search_index import (
+    KIND_CATEGORY,
+    KIND_SAVINGS_GOAL,
+    KIND_TAG,
+    KIND_TRACKING,
+    search,
+)
 from utils.i18n import tr, trf, display_typ, db_typ_from_display
 from model.typ_constants import TYP_INCOME, TYP_EXPENSES, TYP_SAVINGS
 
@@ -131,9 +138,10 @@ class GlobalSearchDialog(QDialog):
         results = []
 
         # === TRACKING DURCHSUCHEN ===
+        # Volltextindex (Wortanfänge, nach Relevanz); ohne FTS5 per LIKE.
         if scope in [tr("search.everywhere"), tr("tab.tracking")]:
-            rows = self.tracking.list_filtered(search_text=query)
-            for r in rows:
+            hits = search(self.conn, query, [KIND_TRACKING], limit=500)
+            for r in self.tracking.list_by_ids([h.ref_id for h in hits]):
                 results.append(
                     {
                         "type": tr("search.type_tracking"),
@@ -147,24 +155,48 @@ class GlobalSearchDialog(QDialog):
 
         # === KATEGORIEN DURCHSUCHEN ===
         if scope in [tr("search.everywhere"), tr("tab.categories")]:
-            for typ in [TYP_EXPENSES, TYP_INCOME, TYP_SAVINGS]:
-                for c in self.cats.list(typ):
-                    if query in c.name.lower():
-                        flags = []
-                        if c.is_fix:
-                            flags.append(tr("tracking.title.fixcosts"))
-                        if c.is_recurring:
-                            flags.append(tr("lbl.recurring"))
-                        results.append(
-                            {
-                                "type": tr("search.type_category"),
-                                "source": typ,
-                                "category": c.name,
-                                "details": ", ".join(flags) if flags else "-",
-                                "value": "-",
-                                "color": QColor(ui_colors(self).accent),
-                            }
-                        )
+            hits = search(self.conn, query, [KIND_CATEGORY])
+            by_name = {
+                (typ, c.name): c
+                for typ in {h.typ for h in hits}
+                for c in self.cats.list(typ)
+            }
+            for hit in hits:
+                c = by_name.get((hit.typ, hit.title))
+                if c is None:
+                    continue
+                flags = []
+                if c.is_fix:
+                    flags.append(tr("tracking.title.fixcosts"))
+                if c.is_recurring:
+                    flags.append(tr("lbl.recurring"))
+                results.append(
+                    {
+                        "type": tr("search.type_category"),
+                        "source": hit.typ,
+                        "category": c.name,
+                        "details": ", ".join(flags) if flags else "-",
+                        "value": "-",
+                        "color": QColor(ui_colors(self).accent),
+                    }
+                )
+
+        # === TAGS UND SPARZIELE DURCHSUCHEN ===
+        if scope == tr("search.everywhere"):
+            for hit in search(self.conn, query, [KIND_TAG, KIND_SAVINGS_GOAL]):
+                is_tag = hit.kind == KIND_TAG
+                results.append(
+                    {
+                        "type": tr(
+                            "search.type_tag" if is_tag else "search.type_savings_goal"
+                        ),
+                        "source": "-",
+                        "category": hit.title,
+                        "details": hit.body or "-",
+                        "value": "-",
+                        "color": None,
+                    }
+                )
 
         # === BUDGET DURCHSUCHEN ===
         if scope in [tr("search.everywhere"), tr("tab.budget")]:
@@ -227,6 +259,8 @@ class GlobalSearchDialog(QDialog):
             tab_key = "tracking"
         elif tr("search.type_category") in type_text:
             tab_key = "categories"
+        elif tr("search.type_savings_goal") in type_text:
+            tab_key = "savings"
         else:
             tab_key = None
 
@@ -35,6 +35,7 @@ from model.lifeplanner_import_service import (
     ImportRecord,
     LifePlannerImportError,
     apply_import,
+    apply_imports,
     default_bridge_path,
     default_draft,
     load_import_records,
@@ -603,6 +604,7 @@ class LifePlannerImportDialog(QDialog):
         imported = 0
         updated = 0
         errors: list[str] = []
+        items: list[tuple[ImportRecord, ImportDraft]] = []
         for external_id in ids:
             record = self._records_by_id.get(external_id)
             if record is None or record.status not in {
@@ -614,12 +616,25 @@ class LifePlannerImportDialog(QDialog):
             draft = self._prepare_draft(record)
             if draft is None:
                 continue
+            items.append((record, draft))
+        # Erst alles in einem Rutsch (ein Commit, eine Undo-Gruppe); scheitert
+        # ein Datensatz, einzeln nachbuchen, damit jeder Fehler zuordenbar ist.
+        try:
+            results = apply_imports(self.conn, items)
+        except (ValueError, sqlite3.Error) as exc:
+            logger.info("LifePlanner batch import fell back to single records: %s", exc)
+            results = []
+        else:
+            items = []
+        imported += len(results)
+        updated += sum(int(result.updated) for result in results)
+        for record, draft in items:
             try:
                 result = apply_import(self.conn, record, draft)
                 imported += 1
                 updated += int(result.updated)
             except Exception as exc:
-                logger.exception("LifePlanner import failed for %s", external_id)
+                logger.exception("LifePlanner import failed for %s", record.external_id)
                 errors.append(f"{record.description}: {exc}")
         self.imported_count += imported
         self.reload()
@@ -5,16 +5,15 @@ import logging
 import os
 import sqlite3
 import sys
+import time
 from datetime import date
 from pathlib import Path
 
-from PySide6.QtCore import Qt, QTimer, QUrl, QPoint, QProcess, QSize
+from PySide6.QtCore import Qt, QTimer, QUrl, QPoint, QProcess, Signal
 from PySide6.QtGui import (
     QAction,
-    QActionGroup,
     QIcon,
     QKeySequence,
-    QShortcut,
     QDesktopServices,
 )
 from PySide6.QtWidgets import (
@@ -26,63 +25,40 @@ from PySide6.QtWidgets import (
     QDialog,
     QVBoxLayout,
     QLabel,
-    QDialogButtonBox,
     QApplication,
     QPushButton,
     QFrame,
     QTableWidget,
-    QPlainTextEdit,
     QToolBar,
-    QToolButton,
     QWidget,
     QHBoxLayout,
     QButtonGroup,
     QSizePolicy,
-    QLineEdit,
 )
 
-from app_info import APP_NAME, APP_VERSION, app_window_title, app_version_label
+from app_info import APP_NAME, app_window_title, app_version_label
 from model.app_paths import (
-    resolve_in_app,
     data_dir,
     configured_db_path,
     configured_backups_dir,
 )
 from model.budget_warnings_model_extended import BudgetWarningsModelExtended
 from model.category_model import CategoryModel
+from model.change_bus import ChangeBus, DataChange
 from model.shortcuts_config import load_shortcuts, default_key
 from model.undo_redo_model import UndoRedoModel
 from settings import Settings
 from utils.icons import get_icon
 from utils.i18n import tr, trf, display_security_label
 from theme_manager import ThemeManager
-from views.account_management_dialog import AccountManagementDialog
-from views.backup_restore_dialog import BackupRestoreDialog
 from views.help_launcher import (
     help_file_candidates,
     install_help_corner_button,
     open_help_file,
 )
 from views.help_menu import build_help_menu
-from views.budget_adjustment_dialog import BudgetAdjustmentDialog
 from views.category_manager_dialog import CategoryManagerDialog
-from views.export_dialog import ExportDialog
-from views.favorites_dashboard_dialog import FavoritesDashboardDialog
-from views.global_search_dialog import GlobalSearchDialog
-from views.lifeplanner_import_dialog import LifePlannerImportDialog
-from views.quick_add_dialog import QuickAddDialog
-from views.savings_goals_dialog import SavingsGoalsDialog
-from views.shortcuts_dialog import ShortcutsDialog
-from views.tabs.budget_tab import BudgetTab
-from views.tabs.cockpit_tab import CockpitTab
-from views.tabs.categories_tab import CategoriesTab
-from views.tabs.overview_tab import OverviewTab
 from utils.defensive_log import uebersprungen as _uebersprungen
-from views.tabs.overview_savings_panel import OverviewSavingsPanel
-from views.tabs.tracking_tab import TrackingTab
-from views.tags_manager_dialog import TagsManagerDialog
-from views.update_dialog import UpdateDialog
-from updater.common import clear_startup_check_result, read_startup_check_result
 
 logger = logging.getLogger(__name__)
 
@@ -91,6 +67,10 @@ from views.main_window_dialogs import AboutDialog, LogViewerDialog
 
 
 class MainWindow(QMainWindow):
+    # Speicherstatus kommt aus dem Schreib-Thread der verschlüsselten Session;
+    # das Signal bringt ihn in den GUI-Thread.
+    _save_status_changed = Signal(str)
+
     def __init__(self, conn: sqlite3.Connection, *, active_user=None, user_model=None):
         super().__init__()
         self.conn = conn
@@ -117,6 +97,19 @@ class MainWindow(QMainWindow):
         # auslösen, obwohl Python selbst keine Exception wirft.
         self._refresh_all_tabs_pending = False
         self._refresh_all_tabs_running = False
+        self._refresh_all_tabs_full = False
+
+        # Änderungsbus: Trigger protokollieren, welche Tabellen und Monate
+        # geschrieben wurden. Verdeckte Tabs werden nur als veraltet markiert
+        # und erst beim Anzeigen neu geladen - und nur, wenn ihre Daten
+        # betroffen sind.
+        try:
+            self.change_bus: ChangeBus | None = ChangeBus(conn)
+        except sqlite3.Error as exc:
+            logger.warning("Änderungsbus nicht verfügbar: %s", exc)
+            self.change_bus = None
+        self._dirty_tabs: set[int] = set()
+        self.tab_refresh_timings: dict[str, float] = {}
 
         # Undo/Redo
         self.undo_redo = UndoRedoModel(conn)
@@ -139,13 +132,10 @@ class MainWindow(QMainWindow):
         self._apply_tab_position()
         self._apply_tab_bar_visibility()
 
-        # Tab-Widgets erstellen
-        self.cockpit_tab = CockpitTab(conn, settings=self.settings)
-        self.budget_tab = BudgetTab(conn)
-        self.categories_tab = CategoriesTab(conn)
-        self.tracking_tab = TrackingTab(conn, settings=self.settings)
-        self.overview_tab = OverviewTab(conn, settings=self.settings)
-        self.savings_tab = OverviewSavingsPanel(conn)
+        # Tab-Widgets, Rechendienst und Tab-Signale (views.main_window_startup)
+        from views.main_window_startup import build_tabs
+
+        build_tabs(self, conn)
 
         # Reiter „Konto" – zentraler Hub (Konto, Speicherort, Backup, Zurücksetzen).
         # encrypted_mode anhand des aktiven Users (verschlüsselter Login).
@@ -157,53 +147,6 @@ class MainWindow(QMainWindow):
             encrypted_mode=(self._active_user is not None),
         )
 
-        # Schnelleingabe-Signals von Tabs verbinden
-        self.cockpit_tab.quick_add_requested.connect(self._show_quick_add)
-        self.cockpit_tab.fixcost_requested.connect(self._tracking_add_fixcosts)
-        self.cockpit_tab.favorites_requested.connect(self._show_favorites_dashboard)
-        self.cockpit_tab.savings_requested.connect(self._show_savings_goals)
-        self.cockpit_tab.goto_budget_requested.connect(
-            lambda: self._goto_tab(self.budget_tab)
-        )
-        self.cockpit_tab.goto_tracking_requested.connect(
-            lambda: self._goto_tab(self.tracking_tab)
-        )
-        self.cockpit_tab.goto_overview_requested.connect(
-            lambda: self._goto_tab(self.overview_tab)
-        )
-        self.cockpit_tab.goto_savings_requested.connect(
-            lambda: self._goto_tab(self.savings_tab)
-        )
-        self.cockpit_tab.budget_warnings_requested.connect(
-            lambda: self._check_budget_warnings()
-        )
-        self.budget_tab.quick_add_requested.connect(self._show_quick_add)
-        self.budget_tab.savings_goals_requested.connect(self._show_savings_goals)
-        self.categories_tab.quick_add_requested.connect(self._show_quick_add)
-        self.overview_tab.quick_add_requested.connect(self._show_quick_add)
-
-        # "Vorschläge"-Button in der Übersicht soll den Budgetwarner öffnen
-        try:
-            self.overview_tab.budget_warnings_requested.connect(
-                self._check_budget_warnings_from_overview
-            )
-        except Exception as e:
-            logger.debug("%s", e)
-        try:
-            self.overview_tab.budget_edit_requested.connect(
-                self._open_budget_editor_from_overview
-            )
-        except Exception as e:
-            logger.debug("%s", e)
-
-        # Settings-Checkboxen mit Settings synchronisieren
-        if hasattr(self.budget_tab, "chk_autosave"):
-            self.budget_tab.chk_autosave.toggled.connect(self._on_autosave_changed)
-        if hasattr(self.budget_tab, "chk_ask_due"):
-            self.budget_tab.chk_ask_due.toggled.connect(self._on_ask_due_changed)
-        if hasattr(self.budget_tab, "budget_data_changed"):
-            self.budget_tab.budget_data_changed.connect(self._update_undo_redo_actions)
-
         # Tab-Definitionen (Index -> Widget, Name)
         # Tab-Labels: keys statt eingefrorenem tr()-String (fuer retranslate_ui)
         self._tab_label_keys = {
@@ -270,18 +213,27 @@ class MainWindow(QMainWindow):
         # Globale Shortcuts
         self._setup_shortcuts()
 
-        # Einstellungen auf Tabs anwenden
+        # Einstellungen auf Tabs anwenden und spätere Änderungen nachführen
+        from views.main_window_settings import watch_settings
+
         self._apply_settings_to_tabs()
+        watch_settings(self)
 
         # Aktuelles Jahr setzen
         self._set_current_year()
 
-        # Theme anwenden
-        self._apply_theme()
+        # Theme anwenden. Ohne _apply_theme(): Die Tabs haben noch nichts
+        # geladen, der Starttab lädt gleich danach mit den Theme-Farben.
+        self.theme_manager.apply_theme()
+        self._apply_modern_shell_style()
 
         # Übersicht-Subtabs (Dashboard/Verlauf/…) gemäß Settings ein-/ausblenden
         self._apply_overview_subtabs_from_settings()
 
+        start_tab = self.tabs.currentWidget()
+        if start_tab is not None:
+            self._refresh_tab_timed(start_tab, reason="Start")
+
         # Bei Bedarf beim Start alle Tabs aktualisieren
         if self.settings.refresh_on_start:
             self._refresh_all_tabs()
@@ -1203,20 +1155,9 @@ class MainWindow(QMainWindow):
 
     def _apply_settings_to_tabs(self):
         """Wendet Einstellungen auf die Tabs an"""
-        # Budget-Tab
-        if hasattr(self.budget_tab, "chk_autosave"):
-            self.budget_tab.chk_autosave.setChecked(self.settings.auto_save)
-
-        if hasattr(self.budget_tab, "chk_ask_due"):
-            self.budget_tab.chk_ask_due.setChecked(self.settings.ask_due)
-        if hasattr(self.budget_tab, "set_category_drag_enabled"):
-            self.budget_tab.set_category_drag_enabled(
-                bool(self.settings.get("budget_overview_drag_drop", True))
-            )
+        from views.main_window_settings import apply_settings_to_tabs
 
-        # Tracking-Tab
-        if hasattr(self.tracking_tab, "set_recent_days"):
-            self.tracking_tab.set_recent_days(self.settings.recent_days)
+        apply_settings_to_tabs(self)
 
     def _on_autosave_changed(self, checked: bool):
         """Speichert Auto-Save Einstellung wenn Checkbox geändert wird"""
@@ -1631,21 +1572,23 @@ class MainWindow(QMainWindow):
         self.theme_manager.apply_theme()
         self._apply_modern_shell_style()
 
-        # Nach Theme-Wechsel: Typ-Farben/Badges neu anwenden
+        # Nach Theme-Wechsel: Typ-Farben/Badges neu anwenden - sofort nur im
+        # sichtbaren Tab. Cockpit und Sparziele laden bei jedem Anzeigen neu,
+        # Tracking und Übersicht werden als veraltet markiert.
+        current = self.tabs.currentWidget() if hasattr(self, "tabs") else None
         try:
-            if hasattr(self, "cockpit_tab") and hasattr(self.cockpit_tab, "refresh"):
+            if hasattr(self, "cockpit_tab") and self.cockpit_tab is current:
                 self.cockpit_tab.refresh()
-            if hasattr(self, "tracking_tab") and hasattr(self.tracking_tab, "refresh"):
-                self.tracking_tab.refresh()
-            if hasattr(self, "overview_tab"):
-                if hasattr(self.overview_tab, "refresh_data"):
-                    self.overview_tab.refresh_data()
-                elif hasattr(self.overview_tab, "refresh"):
-                    self.overview_tab.refresh()
-            if hasattr(self, "savings_tab") and hasattr(self.savings_tab, "refresh"):
+            if hasattr(self, "savings_tab") and self.savings_tab is current:
                 self.savings_tab.refresh()
+            for name in ("tracking_tab", "overview_tab"):
+                tab = getattr(self, name, None)
+                if tab is current and tab is not None:
+                    self._refresh_tab_timed(tab, reason="Theme")
+                elif tab is not None:
+                    self._dirty_tabs.add(id(tab))
         except Exception as e:
-            logger.debug("if hasattr(self, 'tracking_tab') and hasattr(self.: %s", e)
+            logger.debug("Theme-Refresh der Tabs: %s", e)
 
     # ------------------------------------------------------------
     # Bearbeiten-Menü (dynamisch je nach aktivem Tab)
@@ -1864,15 +1807,70 @@ class MainWindow(QMainWindow):
             )
 
     def _refresh_current_tab_safe(self) -> None:
-        """Aktualisiert den aktuell sichtbaren Tab (robust, ohne UI-Crash)."""
+        """Aktualisiert den aktuell sichtbaren Tab (robust, ohne UI-Crash).
+
+        Tabs mit ``DATA_DEPENDENCIES`` laden nur neu, wenn seit ihrem letzten
+        Laden eine ihrer Tabellen geschrieben wurde; alle anderen wie bisher
+        bei jedem Wechsel.
+        """
         try:
+            self._mark_dirty_tabs(self._drain_changes())
             tab = self.tabs.currentWidget()
-            self._refresh_tab_widget(tab)
+            if tab is None:
+                return
+            if id(tab) in self._dirty_tabs or not hasattr(tab, "DATA_DEPENDENCIES"):
+                self._refresh_tab_timed(tab, reason="Tabwechsel")
         except Exception:
             import traceback
 
             traceback.print_exc()
 
+    def _drain_changes(self) -> DataChange:
+        """Holt die seit dem letzten Aufruf protokollierten Änderungen."""
+        bus = getattr(self, "change_bus", None)
+        return bus.drain() if bus is not None else DataChange.all()
+
+    @staticmethod
+    def _tab_affected(tab, change: DataChange) -> bool:
+        """Ob ``change`` die Daten von ``tab`` berührt.
+
+        Tabs ohne ``DATA_DEPENDENCIES`` gelten immer als betroffen; Tabs mit
+        eigener Feinlogik (z.B. Jahr im Budget-Tab) entscheiden selbst.
+        """
+        if hasattr(tab, "is_affected_by"):
+            return bool(tab.is_affected_by(change))
+        deps = getattr(tab, "DATA_DEPENDENCIES", None)
+        return True if deps is None else change.touches(deps)
+
+    def _mark_dirty_tabs(self, change: DataChange) -> None:
+        if not change:
+            return
+        for tab in self._data_tabs():
+            if self._tab_affected(tab, change):
+                self._dirty_tabs.add(id(tab))
+
+    def _data_tabs(self) -> list:
+        return [
+            tab
+            for tab in (
+                getattr(self, "budget_tab", None),
+                getattr(self, "categories_tab", None),
+                getattr(self, "tracking_tab", None),
+                getattr(self, "overview_tab", None),
+            )
+            if tab is not None
+        ]
+
+    def _refresh_tab_timed(self, tab, *, reason: str = "") -> None:
+        """Lädt ``tab`` neu, nimmt ihn aus den veralteten und misst die Dauer."""
+        self._dirty_tabs.discard(id(tab))
+        started = time.perf_counter()
+        self._refresh_tab_widget(tab)
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        name = type(tab).__name__
+        self.tab_refresh_timings[name] = elapsed_ms
+        logger.info("Tab-Refresh %s: %.1f ms (%s)", name, elapsed_ms, reason)
+
     def _refresh_tab_widget(self, tab) -> None:
         """Versucht verschiedene Refresh-Methoden (Abwärtskompatibel)."""
         if tab is None:
@@ -2151,12 +2149,12 @@ class MainWindow(QMainWindow):
 
     def _undo_global(self) -> None:
         if self.undo_redo.undo():
-            self._schedule_refresh_all_tabs(reason="undo")
+            self._schedule_refresh_all_tabs(reason="undo", data_only=True)
         self._update_undo_redo_actions()
 
     def _redo_global(self) -> None:
         if self.undo_redo.redo():
-            self._schedule_refresh_all_tabs(reason="redo")
+            self._schedule_refresh_all_tabs(reason="redo", data_only=True)
         self._update_undo_redo_actions()
 
     def _set_current_year(self):
@@ -2178,84 +2176,9 @@ class MainWindow(QMainWindow):
 
     def _show_db_info(self):
         """Zeigt Datenbank-Informationen und Migrations-Status"""
-        from model.migrations import get_migration_info, CURRENT_VERSION
-        import os
-        from pathlib import Path
-        from model.app_paths import resolve_in_app
+        from views.main_window_dialogs import show_db_info
 
-        try:
-            # Aktive DB-Datei (für Anzeige & Größe)
-            encrypted_session = getattr(self, "_encrypted_session", None)
-            if encrypted_session is not None:
-                active_file = Path(encrypted_session.enc_path)
-            else:
-                active_file = configured_db_path(self.settings.database_path)
-
-            # Migrations-Info
-            migration_info = get_migration_info(self.conn)
-
-            # Statistiken via Model (kein raw SQL in View)
-            from model.database_management_model import DatabaseManagementModel
-
-            db_stats = DatabaseManagementModel(
-                str(active_file), conn=self.conn
-            ).get_database_statistics()
-
-            db_size = db_stats.get("db_size_kb", 0)
-            tables = db_stats.get("tables", [])
-            budget_count = db_stats.get(tr("lbl.budgeteintraege"), 0)
-            tracking_count = db_stats.get("Buchungen", 0)
-            category_count = db_stats.get(tr("tab.categories"), 0)
-            savings_count = db_stats.get(tr("dlg.savings_goals"), 0)
-            years_b = [str(y) for y in db_stats.get("years_budget", [])]
-            years_t = [str(y) for y in db_stats.get("years_tracking", [])]
-
-            # Dialog aufbauen
-            info = f"""{tr('db.info.title_html')}
-
-<p><b>{tr('db.info.file')}:</b> {active_file.name}<br>
-<b>{tr('db.info.path')}:</b> {active_file}<br>
-<b>{tr('db.info.size')}:</b> {db_size:.1f} KB<br>
-<b>{tr('db.info.schema')}:</b> {migration_info['current_version']} / {CURRENT_VERSION}</p>
-
-<h4>{tr('db.info.migration_status')}</h4>
-<p>"""
-
-            if migration_info["needs_migration"]:
-                info += f"<span style='color: orange;'>{tr('db.info.migration_needed')}</span><br>"
-                if migration_info["missing_tables"]:
-                    info += f"<b>{tr('db.info.missing_tables')}:</b> {', '.join(migration_info['missing_tables'])}"
-            else:
-                info += f"<span style='color: green;'>{tr('db.info.current')}</span>"
-
-            no_years = tr("db.info.no_years")
-            info += f"""</p>
-
-<h4>{tr('db.info.data_stats')}</h4>
-<ul>
-<li>{tr('db.info.categories')}: {category_count}</li>
-<li>{tr('db.info.budget_entries')}: {budget_count}</li>
-<li>{tr('db.info.tracking_entries')}: {tracking_count}</li>
-<li>{tr('db.info.savings_goals')}: {savings_count}</li>
-</ul>
-
-<p><b>{tr('db.info.budget_years')}:</b> {', '.join(years_b) if years_b else no_years}<br>
-<b>{tr('db.info.tracking_years')}:</b> {', '.join(years_t) if years_t else no_years}</p>
-
-<h4>{tr('db.info.available_tables')} ({len(tables)})</h4>
-<p><small>{', '.join(tables)}</small></p>
-"""
-
-            msg = QMessageBox(self)
-            msg.setWindowTitle(tr("dlg.db_info"))
-            msg.setTextFormat(Qt.RichText)
-            msg.setText(info)
-            msg.exec()
-
-        except Exception as e:
-            show_warning(
-                self, tr("dlg.hinweis"), trf("msg.fehler_beim_laden_der", e=str(e))
-            )
+        show_db_info(self)
 
     def _show_log_file(self, *, path: Path, title_key: str) -> None:
         """Öffnet eine Logdatei in einem eigenen Dialog statt im Systemeditor."""
@@ -2466,6 +2389,8 @@ class MainWindow(QMainWindow):
 
     def _show_account_management(self):
         """Zeigt den Kontoverwaltungs-Dialog."""
+        from views.account_management_dialog import AccountManagementDialog
+
         if not self._active_user or not self._user_model:
             show_info(
                 self,
@@ -2561,6 +2486,8 @@ class MainWindow(QMainWindow):
 
     def _show_shortcuts(self):
         """Zeigt Tastenkürzel-Übersicht (F1)"""
+        from views.shortcuts_dialog import ShortcutsDialog
+
         dialog = ShortcutsDialog(self, settings=self.settings)
         dialog.exec()
 
@@ -2584,25 +2511,31 @@ class MainWindow(QMainWindow):
 
     def _show_lifeplanner_imports(self):
         """Öffnet die sichere FPM/LifePlanner-Review-Inbox."""
+        from views.lifeplanner_import_dialog import LifePlannerImportDialog
+
         dialog = LifePlannerImportDialog(self.conn, self)
         dialog.exec()
         if dialog.imported_count:
             self._save_encrypted_session()
-            self._schedule_refresh_all_tabs(reason="lifeplanner_import", delay_ms=0)
+            self._schedule_refresh_all_tabs(
+                reason="lifeplanner_import", delay_ms=0, data_only=True
+            )
         self._update_lifeplanner_import_badge()
 
     def _show_quick_add(self):
         """Zeigt Schnelleingabe-Dialog (Strg+N)"""
+        from views.quick_add_dialog import QuickAddDialog
+
         dialog = QuickAddDialog(self.conn, self)
         if dialog.exec() == QDialog.Accepted:
             self._save_encrypted_session()
-            # Tracking-Tab aktualisieren
-            if hasattr(self.tracking_tab, "refresh"):
-                self.tracking_tab.refresh()
+            self._schedule_refresh_all_tabs(reason="quick add", data_only=True)
             self.statusBar().showMessage(tr("lbl.eintrag_hinzugefuegt"), 2000)
 
     def _show_global_search(self):
         """Zeigt Globale Suche (Strg+F)"""
+        from views.global_search_dialog import GlobalSearchDialog
+
         dialog = GlobalSearchDialog(self.conn, self)
         if dialog.exec() and dialog.selected_result:
             tab_key = dialog.selected_result.get("tab")
@@ -2610,6 +2543,7 @@ class MainWindow(QMainWindow):
                 "budget": self.budget_tab,
                 "tracking": self.tracking_tab,
                 "categories": self.categories_tab,
+                "savings": self.savings_tab,
             }
             widget = tab_map.get(tab_key)
             if widget:
@@ -2617,25 +2551,20 @@ class MainWindow(QMainWindow):
 
     def _show_export(self):
         """Zeigt Export-Dialog (Strg+E)"""
+        from views.export_dialog import ExportDialog
+
         dialog = ExportDialog(self.conn, self)
         dialog.exec()
 
     def _show_savings_goals(self):
         """Zeigt Sparziele-Dialog (NEU v0.16)"""
+        from views.savings_goals_dialog import SavingsGoalsDialog
+
         dialog = SavingsGoalsDialog(self, self.conn)
         dialog.exec()
         self._save_encrypted_session()
-        # Nach Schließen: alle relevanten Einstiege aktualisieren.
-        for widget in (
-            getattr(self, "savings_tab", None),
-            getattr(self, "overview_tab", None),
-            getattr(self, "tracking_tab", None),
-        ):
-            try:
-                if widget is not None and hasattr(widget, "refresh"):
-                    widget.refresh()
-            except Exception as exc:
-                logger.debug("Sparziel-Refresh nach Dialog fehlgeschlagen: %s", exc)
+        # Nach Schließen: betroffene Tabs laut Änderungsbus aktualisieren.
+        self._schedule_refresh_all_tabs(reason="savings goals closed", data_only=True)
 
     def _schedule_startup_auto_backup(self, *, delay_ms: int = 1200) -> None:
         """Plant die einmalige Start-Backup-Pruefung Qt-sicher ein.
@@ -2753,15 +2682,31 @@ class MainWindow(QMainWindow):
 
                     _s_path = _get_settings_path()
                     _u_path = _users_file_path()
-                    create_bundle(
-                        source_db=src_db,
-                        out_path=backup_path,
-                        app=APP_NAME,
-                        app_version=APP_VERSION,
-                        note="AutoBackup",
-                        settings_path=_s_path if _s_path.exists() else None,
-                        users_json_path=_u_path if _u_path.exists() else None,
-                    )
+                    if self.settings.get("auto_backup_repository", False):
+                        from model.backup_store import REPOSITORY_DIRNAME, BackupStore
+
+                        result = BackupStore(
+                            backup_dir / REPOSITORY_DIRNAME
+                        ).snapshot_file(
+                            src_db,
+                            app=APP_NAME,
+                            app_version=APP_VERSION,
+                            note="AutoBackup",
+                            settings_path=_s_path if _s_path.exists() else None,
+                            users_json_path=_u_path if _u_path.exists() else None,
+                            db_key=getattr(encrypted_session, "db_key", None),
+                        )
+                        backup_name = f"{REPOSITORY_DIRNAME}/{result.snapshot_id}"
+                    else:
+                        create_bundle(
+                            source_db=src_db,
+                            out_path=backup_path,
+                            app=APP_NAME,
+                            app_version=APP_VERSION,
+                            note="AutoBackup",
+                            settings_path=_s_path if _s_path.exists() else None,
+                            users_json_path=_u_path if _u_path.exists() else None,
+                        )
 
                     self.settings.set("last_auto_backup", datetime.now().isoformat())
                     logger.info("Auto-Backup erstellt: %s", backup_name)
@@ -2784,12 +2729,19 @@ class MainWindow(QMainWindow):
                         logger.debug("Altes Backup gelöscht: %s", old.name)
                     except Exception as e:
                         logger.debug("%s", e)
+                from model.backup_store import REPOSITORY_DIRNAME, BackupStore
+
+                repository = backup_dir / REPOSITORY_DIRNAME
+                if repository.is_dir():
+                    BackupStore(repository).prune(keep_n)
 
         except Exception as exc:
             logger.warning("Auto-Backup fehlgeschlagen: %s", exc)
 
     def _show_backup_restore(self):
         """Zeigt Backup & Restore Dialog (NEU v0.16)"""
+        from views.backup_restore_dialog import BackupRestoreDialog
+
         encrypted_session = getattr(self, "_encrypted_session", None)
         db_path = None
         if encrypted_session is None:
@@ -2846,6 +2798,7 @@ class MainWindow(QMainWindow):
             conn=self.conn,
             active_user=self._active_user,
             encrypted=encrypted_session is not None,
+            encrypted_session=encrypted_session,
         )
         result = dialog.exec()
 
@@ -2868,17 +2821,23 @@ class MainWindow(QMainWindow):
         dialog = CategoryManagerDialog(self, conn=self.conn)
         dialog.categories_changed.connect(self._refresh_current_tab)
         dialog.exec()
-        # Nach Schließen: Alle Tabs aktualisieren
-        self._schedule_refresh_all_tabs(reason="category manager closed")
+        # Nach Schließen: betroffene Tabs laut Änderungsbus aktualisieren
+        self._schedule_refresh_all_tabs(
+            reason="category manager closed", data_only=True
+        )
 
     def _show_tags_manager(self):
         """Öffnet den Tags-Manager (v2.4.0)"""
+        from views.tags_manager_dialog import TagsManagerDialog
+
         dialog = TagsManagerDialog(self.conn, self)
         dialog.exec()
 
     def _show_favorites_dashboard(self):
         """Öffnet das Favoriten-Dashboard (v2.4.0)"""
         # Jahr/Monat aus Budget-Tab wenn vorhanden, sonst heute
+        from views.favorites_dashboard_dialog import FavoritesDashboardDialog
+
         try:
             year = (
                 int(self.budget_tab.year_spin.value())
@@ -2934,8 +2893,9 @@ class MainWindow(QMainWindow):
 
     def _check_budget_warnings(self, year: int | None = None, month: int | None = None):
         """Prüft Budgetwarnungen und zeigt Anpassungsdialog (v2.4.0)"""
+        from views.budget_adjustment_dialog import BudgetAdjustmentDialog
+
         from datetime import date
-        from PySide6.QtWidgets import QMessageBox
 
         # Jahr/Monat möglichst aus der UI ableiten, damit "Extras → Budgetwarnungen"
         # dasselbe zeigt wie die Übersicht (kein "nur über Klick in Übersicht").
@@ -3002,7 +2962,9 @@ class MainWindow(QMainWindow):
         # die QTableWidget-Zeilen neu auf. Wird das direkt nach einem Menü-Klick
         # oder Dialog-Exec gemacht, kann Qt6/Shiboken beim Zerstören alter
         # Zellobjekte nativ aborten. Deshalb immer in den nächsten Event-Loop-Tick.
-        self._schedule_refresh_all_tabs(reason="budget warnings dialog closed")
+        self._schedule_refresh_all_tabs(
+            reason="budget warnings dialog closed", data_only=True
+        )
 
     def _check_budget_warnings_from_overview(self):
         """Öffnet Budgetwarner mit Jahr/Monat aus der Übersicht."""
@@ -3067,6 +3029,8 @@ class MainWindow(QMainWindow):
         timer.start(max(0, int(delay_ms)))
 
     def _start_startup_update_check(self) -> None:
+        from updater.common import clear_startup_check_result
+
         if self._startup_update_proc is not None:
             return
         if getattr(self, "_is_closing", False):
@@ -3095,43 +3059,14 @@ class MainWindow(QMainWindow):
             logger.debug("Startup-Update-Check: %s", data)
 
     def _on_startup_update_finished(self, _exit_code: int, _status) -> None:
-        self._startup_update_proc = None
-        if getattr(self, "_is_closing", False):
-            return
-        res = read_startup_check_result()
-        if not res.get("available"):
-            if res.get("error"):
-                logger.debug(
-                    "Startup-Update-Check ohne Hinweis beendet: %s", res.get("error")
-                )
-            return
-        if self._startup_update_prompt_shown:
-            return
-        self._startup_update_prompt_shown = True
+        from views.main_window_startup import on_startup_update_finished
 
-        remote = str(res.get("remote") or "")
-        current = str(res.get("current") or APP_VERSION)
-        self.statusBar().showMessage(
-            trf("update.startup_status_available", version=remote), 10000
-        )
-
-        msg = QMessageBox(self)
-        msg.setIcon(QMessageBox.Information)
-        msg.setWindowTitle(tr("update.startup_available_title"))
-        msg.setText(
-            trf("update.startup_available_text", current=current, remote=remote)
-        )
-        msg.setInformativeText(tr("update.startup_available_info"))
-        btn_update = msg.addButton(
-            tr("update.startup_btn_open"), QMessageBox.AcceptRole
-        )
-        msg.addButton(tr("update.startup_btn_later"), QMessageBox.RejectRole)
-        msg.exec()
-        if msg.clickedButton() is btn_update:
-            self._show_update_dialog()
+        on_startup_update_finished(self)
 
     def _show_update_dialog(self):
         """Öffnet standalone den Modul-Updater, im Host den zentralen Updater."""
+        from views.update_dialog import UpdateDialog
+
         if os.environ.get("LIFEPLANNER_CENTRAL_UPDATER", "").strip().lower() in {
             "1",
             "true",
@@ -3148,7 +3083,7 @@ class MainWindow(QMainWindow):
         dialog.exec()
 
     def _schedule_refresh_all_tabs(
-        self, *, reason: str = "", delay_ms: int = 0
+        self, *, reason: str = "", delay_ms: int = 0, data_only: bool = False
     ) -> None:
         """Plant einen kompletten Tab-Refresh stabil im Qt-Eventloop.
 
@@ -3157,7 +3092,12 @@ class MainWindow(QMainWindow):
         löscht dann QTableWidgetItems/Editoren (`setRowCount(0)`) und kann unter
         PySide6/Qt6 nativ in Shiboken aborten. Der verzögerte Refresh läuft erst,
         wenn Dialog/Menu vollständig abgebaut sind.
+
+        ``data_only=True`` heisst: Anlass war eine reine Datenänderung (Undo,
+        Redo, Import). Dann lädt nur neu, was laut Änderungsbus betroffen ist.
         """
+        if not data_only:
+            self._refresh_all_tabs_full = True
         if getattr(self, "_refresh_all_tabs_pending", False):
             return
         self._refresh_all_tabs_pending = True
@@ -3166,35 +3106,44 @@ class MainWindow(QMainWindow):
             self._refresh_all_tabs_pending = False
             if getattr(self, "_is_closing", False):
                 return
-            self._refresh_all_tabs()
+            self._refresh_all_tabs(data_only=not self._refresh_all_tabs_full)
 
         try:
             logger.debug("Voll-Refresh geplant (%s).", reason)
             QTimer.singleShot(max(0, int(delay_ms)), _run)
         except Exception:
             self._refresh_all_tabs_pending = False
-            self._refresh_all_tabs()
+            self._refresh_all_tabs(data_only=data_only)
 
-    def _refresh_all_tabs(self):
+    def _refresh_all_tabs(self, *, data_only: bool = False):
         """Aktualisiert alle Tabs nach Änderungen.
 
         Wichtig: Tabs implementieren nicht einheitlich `load()`.
         Für Stabilität bevorzugen wir `refresh()` und fallen auf `load()` zurück.
+
+        Sofort neu geladen wird nur der sichtbare Tab; die übrigen werden als
+        veraltet markiert und beim nächsten Anzeigen geladen. Mit
+        ``data_only=True`` nur die Tabs, deren Tabellen sich laut Änderungsbus
+        geändert haben. Ein sichtbarer Tab ohne ``DATA_DEPENDENCIES``
+        (Cockpit, Sparziele) lädt bei jeder Änderung neu.
         """
         if getattr(self, "_refresh_all_tabs_running", False):
             self._schedule_refresh_all_tabs(
-                reason="reentrant refresh skipped", delay_ms=0
+                reason="reentrant refresh skipped", delay_ms=0, data_only=data_only
             )
             return
         self._refresh_all_tabs_running = True
+        self._refresh_all_tabs_full = False
         try:
-            for tab in [
-                self.budget_tab,
-                self.categories_tab,
-                self.tracking_tab,
-                self.overview_tab,
-            ]:
-                self._refresh_tab_widget(tab)
+            change = self._drain_changes()
+            change = change if data_only else DataChange.all()
+            self._mark_dirty_tabs(change)
+            current = self.tabs.currentWidget()
+            if current is not None and (
+                id(current) in self._dirty_tabs
+                or (change and not hasattr(current, "DATA_DEPENDENCIES"))
+            ):
+                self._refresh_tab_timed(current, reason="Voll-Refresh")
         except Exception:
             # Refresh darf nie die UI killen, aber wir wollen wenigstens eine Spur im Terminal.
             import traceback
@@ -3331,6 +3280,7 @@ class MainWindow(QMainWindow):
             self._save_widget_before_leave(
                 getattr(self, "budget_tab", None), reason=tr("btn.close")
             )
+            self._stop_compute_service()
             self._is_closing = True
             event.accept()
             return
@@ -3338,6 +3288,7 @@ class MainWindow(QMainWindow):
         # In Tests / headless: blockierenden Bestätigungsdialog überspringen.
         # exec() würde ohne Display ewig warten und den Prozess aufhängen.
         if getattr(self, "_suppress_close_confirm", False):
+            self._stop_compute_service()
             self._is_closing = True
             event.accept()
             return
@@ -3355,15 +3306,52 @@ class MainWindow(QMainWindow):
             self._save_widget_before_leave(
                 getattr(self, "budget_tab", None), reason=tr("btn.close")
             )
+            self._stop_compute_service()
             self._is_closing = True
             event.accept()
         elif reply == QMessageBox.Discard:
+            self._stop_compute_service()
             self._is_closing = True
             event.accept()
         else:  # Cancel
             self._is_closing = False
             event.ignore()
 
+    def _stop_compute_service(self) -> None:
+        """Beendet den Rechendienst, bevor die Haupt-Connection schliesst."""
+        service = getattr(self, "compute_service", None)
+        if service is None:
+            return
+        self.compute_service = None
+        for tab in (self.cockpit_tab, self.overview_tab):
+            tab.compute_service = None
+        service.shutdown()
+
+    def attach_save_status(self, session) -> None:
+        """Zeigt den Speicherstatus einer verschlüsselten Session in der Statusleiste."""
+        if getattr(self, "_status_save_label", None) is not None:
+            return
+        label = QLabel()
+        self._status_save_label = label
+        self._save_status_changed.connect(self._on_save_status_changed)
+        if not session.add_save_status_listener(self._save_status_changed.emit):
+            return
+        self.statusBar().addPermanentWidget(label)
+        self._on_save_status_changed(session.save_status)
+
+    def _on_save_status_changed(self, status: str) -> None:
+        label = getattr(self, "_status_save_label", None)
+        if label is None:
+            return
+        texts = {
+            "pending": "status.save_pending",
+            "saving": "status.save_saving",
+            "saved": "status.save_saved",
+            "error": "status.save_error",
+        }
+        key = texts.get(status)
+        label.setText(tr(key) if key else "")
+
     def _save_encrypted_session(self):
         """Speichert verschlüsselte DB-Session falls vorhanden."""
         session = getattr(self, "_encrypted_session", None)
@@ -9,14 +9,15 @@ from PySide6.QtWidgets import (
     QDialog,
     QDialogButtonBox,
     QLabel,
+    QMessageBox,
     QPlainTextEdit,
     QVBoxLayout,
 )
 
 from app_info import APP_NAME, APP_VERSION, app_version_label
+from model.app_paths import configured_db_path
 from utils.i18n import tr, trf
 from utils.notifications import show_warning
-from views.update_dialog import UpdateDialog
 
 
 class AboutDialog(QDialog):
@@ -68,6 +69,8 @@ class AboutDialog(QDialog):
                     tr("lifeplanner_import.central_updater"),
                 )
                 return
+            from views.update_dialog import UpdateDialog
+
             dlg = UpdateDialog(self.parent() or self)
             dlg.exec()
         except Exception as e:
@@ -130,3 +133,82 @@ class LogViewerDialog(QDialog):
         layout.addWidget(buttons)
 
         self.resize(900, 600)
+
+
+def show_db_info(window) -> None:
+    """Zeigt Datenbank-Informationen und Migrations-Status"""
+    from model.migrations import get_migration_info, CURRENT_VERSION
+
+    try:
+        # Aktive DB-Datei (für Anzeige & Größe)
+        encrypted_session = getattr(window, "_encrypted_session", None)
+        if encrypted_session is not None:
+            active_file = Path(encrypted_session.enc_path)
+        else:
+            active_file = configured_db_path(window.settings.database_path)
+
+        # Migrations-Info
+        migration_info = get_migration_info(window.conn)
+
+        # Statistiken via Model (kein raw SQL in View)
+        from model.database_management_model import DatabaseManagementModel
+
+        db_stats = DatabaseManagementModel(
+            str(active_file), conn=window.conn
+        ).get_database_statistics()
+
+        db_size = db_stats.get("db_size_kb", 0)
+        tables = db_stats.get("tables", [])
+        budget_count = db_stats.get(tr("lbl.budgeteintraege"), 0)
+        tracking_count = db_stats.get("Buchungen", 0)
+        category_count = db_stats.get(tr("tab.categories"), 0)
+        savings_count = db_stats.get(tr("dlg.savings_goals"), 0)
+        years_b = [str(y) for y in db_stats.get("years_budget", [])]
+        years_t = [str(y) for y in db_stats.get("years_tracking", [])]
+
+        # Dialog aufbauen
+        info = f"""{tr('db.info.title_html')}
+
+<p><b>{tr('db.info.file')}:</b> {active_file.name}<br>
+<b>{tr('db.info.path')}:</b> {active_file}<br>
+<b>{tr('db.info.size')}:</b> {db_size:.1f} KB<br>
+<b>{tr('db.info.schema')}:</b> {migration_info['current_version']} / {CURRENT_VERSION}</p>
+
+<h4>{tr('db.info.migration_status')}</h4>
+<p>"""
+
+        if migration_info["needs_migration"]:
+            info += f"<span style='color: orange;'>{tr('db.info.migration_needed')}</span><br>"
+            if migration_info["missing_tables"]:
+                info += f"<b>{tr('db.info.missing_tables')}:</b> {', '.join(migration_info['missing_tables'])}"
+        else:
+            info += f"<span style='color: green;'>{tr('db.info.current')}</span>"
+
+        no_years = tr("db.info.no_years")
+        info += f"""</p>
+
+<h4>{tr('db.info.data_stats')}</h4>
+<ul>
+<li>{tr('db.info.categories')}: {category_count}</li>
+<li>{tr('db.info.budget_entries')}: {budget_count}</li>
+<li>{tr('db.info.tracking_entries')}: {tracking_count}</li>
+<li>{tr('db.info.savings_goals')}: {savings_count}</li>
+</ul>
+
+<p><b>{tr('db.info.budget_years')}:</b> {', '.join(years_b) if years_b else no_years}<br>
+<b>{tr('db.info.tracking_years')}:</b> {', '.join(years_t) if years_t else no_years}</p>
+
+<h4>{tr('db.info.available_tables')} ({len(tables)})</h4>
+<p><small>{', '.join(tables)}</small></p>
+"""
+
+        msg = QMessageBox(window)
+        msg.setWindowTitle(tr("dlg.db_info"))
+        msg.setTextFormat(Qt.RichText)
+        msg.setText(info)
+        msg.exec()
+
+    except Exception as e:
+        show_warning(
+            window, tr("dlg.hinweis"), trf("msg.fehler_beim_laden_der", e=str(e))
+        )
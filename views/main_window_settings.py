@@ -12,15 +12,92 @@ from PySide6.QtWidgets import QDialog
 
 from app_info import app_version_label
 from model.shortcuts_config import save_shortcuts
-from settings_dialog import SettingsDialog
+from settings import Settings
 from utils.i18n import tr, trf
 from utils.notifications import show_info
+from views.settings_relay import SettingsRelay
 
 logger = logging.getLogger(__name__)
 
+#: Schlüssel, die :func:`apply_settings_to_tabs` in Widgets überträgt.
+_TAB_KEYS = frozenset(
+    {"auto_save", "ask_due", "budget_overview_drag_drop", "recent_days"}
+)
+#: Schlüssel, die erst beim Neuladen der Tabs wirken.
+_VIEW_KEYS = frozenset(
+    {
+        "currency",
+        "number_format",
+        "warn_budget_overrun",
+        "budget_suggestion_months",
+        "table_density",
+        "highlight_fixcosts",
+        "carryover_start_month",
+        "carryover_start_year",
+        "budget_zero_balance_rule",
+        "budget_surplus_strategy",
+    }
+)
+
+
+def apply_settings_to_tabs(self) -> None:
+    """Wendet Einstellungen auf die Tabs an"""
+    # Budget-Tab
+    if hasattr(self.budget_tab, "chk_autosave"):
+        self.budget_tab.chk_autosave.setChecked(self.settings.auto_save)
+
+    if hasattr(self.budget_tab, "chk_ask_due"):
+        self.budget_tab.chk_ask_due.setChecked(self.settings.ask_due)
+    if hasattr(self.budget_tab, "set_category_drag_enabled"):
+        self.budget_tab.set_category_drag_enabled(
+            bool(self.settings.get("budget_overview_drag_drop", True))
+        )
+
+    # Tracking-Tab
+    if hasattr(self.tracking_tab, "set_recent_days"):
+        self.tracking_tab.set_recent_days(self.settings.recent_days)
+
+
+def watch_settings(self) -> SettingsRelay:
+    """Meldet das Fenster für gespeicherte Einstellungsänderungen an."""
+    relay = SettingsRelay(self)
+    relay.changed.connect(lambda changed: apply_changed_settings(self, changed))
+    self._settings_relay = relay
+    return relay
+
+
+def apply_changed_settings(self, changed: frozenset) -> None:
+    """Wendet gespeicherte Änderungen an, gleich wer sie gespeichert hat.
+
+    Der Einstellungsdialog wendet seine Werte selbst an; hierher kommen auch
+    Änderungen aus Tabs, aus anderen ``Settings()``-Instanzen und von aussen
+    (zweite Instanz der App, Handbearbeitung). ``self.settings`` übernimmt
+    zuerst den gespeicherten Stand, damit sein nächstes ``save()`` ihn nicht
+    zurückschreibt.
+    """
+    if getattr(self, "_is_closing", False):
+        return
+    saved = Settings(str(self.settings.settings_file)).settings
+    for key in changed:
+        if key in saved:
+            self.settings.settings[key] = saved[key]
+        else:
+            self.settings.settings.pop(key, None)
+    if changed & {"currency", "number_format"}:
+        from utils.money import set_currency, set_number_format
+
+        set_currency(self.settings.get("currency", "CHF"))
+        set_number_format(self.settings.get("number_format", "swiss"))
+    if changed & _TAB_KEYS:
+        apply_settings_to_tabs(self)
+    if changed & _VIEW_KEYS:
+        self._schedule_refresh_all_tabs(reason="settings changed")
+
 
 def show_settings(self) -> None:
     """Zeigt Einstellungen-Dialog"""
+    from settings_dialog import SettingsDialog
+
     is_encrypted = (
         hasattr(self, "_encrypted_session") and self._encrypted_session is not None
     )
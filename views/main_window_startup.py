@@ -0,0 +1,138 @@
+"""Aufbau und Start-Aufgaben des Hauptfensters.
+
+Ausgelagert wie ``views.main_window_settings``: ``MainWindow`` ruft die
+Funktionen mit sich selbst auf. Die Tab-Module hängen an diesem Modul, nicht
+an ``views.main_window``; geladen werden sie trotzdem bei jedem Start, weil
+:func:`build_tabs` alle Tabs erstellt. ``main()`` misst ihren Import als
+eigene Startphase (``tab_modules_import``).
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+
+from PySide6.QtWidgets import QMessageBox
+
+from app_info import APP_VERSION
+from utils.i18n import tr, trf
+from views.compute_bridge import QtComputeService
+from views.tabs.budget_tab import BudgetTab
+from views.tabs.categories_tab import CategoriesTab
+from views.tabs.cockpit_tab import CockpitTab
+from views.tabs.overview_savings_panel import OverviewSavingsPanel
+from views.tabs.overview_tab import OverviewTab
+from views.tabs.tracking_tab import TrackingTab
+
+logger = logging.getLogger(__name__)
+
+
+def build_tabs(window, conn: sqlite3.Connection) -> None:
+    """Erstellt die Daten-Tabs, den Rechendienst und verbindet die Tab-Signale."""
+    # Tab-Widgets erstellen. Sie laden ihre Daten erst beim ersten
+    # Anzeigen (Datentabs als veraltet markiert); der Start wartet nur auf
+    # den sichtbaren Tab, geladen am Ende des Aufbaus.
+    window.cockpit_tab = CockpitTab(conn, settings=window.settings, defer_load=True)
+    window.budget_tab = BudgetTab(conn, defer_load=True)
+    window.categories_tab = CategoriesTab(conn)
+    window.tracking_tab = TrackingTab(conn, settings=window.settings, defer_load=True)
+    window.overview_tab = OverviewTab(conn, settings=window.settings, defer_load=True)
+    window.savings_tab = OverviewSavingsPanel(conn)
+    for tab in (window.budget_tab, window.tracking_tab, window.overview_tab):
+        window._dirty_tabs.add(id(tab))
+
+    # Rechendienst: Budget-Ampel im Cockpit und KPI-Daten der Übersicht
+    # rechnen auf eigenen Lese-Connections im Hintergrund
+    # (model.background_compute); ohne ihn wie bisher im GUI-Thread.
+    window.compute_service = None
+    if window.settings.get("background_compute", True):
+        try:
+            window.compute_service = QtComputeService(conn, window)
+        except sqlite3.Error as exc:
+            logger.warning("Rechendienst nicht verfügbar: %s", exc)
+        else:
+            window.cockpit_tab.compute_service = window.compute_service
+            window.overview_tab.compute_service = window.compute_service
+
+    # Schnelleingabe-Signals von Tabs verbinden
+    window.cockpit_tab.quick_add_requested.connect(window._show_quick_add)
+    window.cockpit_tab.fixcost_requested.connect(window._tracking_add_fixcosts)
+    window.cockpit_tab.favorites_requested.connect(window._show_favorites_dashboard)
+    window.cockpit_tab.savings_requested.connect(window._show_savings_goals)
+    window.cockpit_tab.goto_budget_requested.connect(
+        lambda: window._goto_tab(window.budget_tab)
+    )
+    window.cockpit_tab.goto_tracking_requested.connect(
+        lambda: window._goto_tab(window.tracking_tab)
+    )
+    window.cockpit_tab.goto_overview_requested.connect(
+        lambda: window._goto_tab(window.overview_tab)
+    )
+    window.cockpit_tab.goto_savings_requested.connect(
+        lambda: window._goto_tab(window.savings_tab)
+    )
+    window.cockpit_tab.budget_warnings_requested.connect(
+        lambda: window._check_budget_warnings()
+    )
+    window.budget_tab.quick_add_requested.connect(window._show_quick_add)
+    window.budget_tab.savings_goals_requested.connect(window._show_savings_goals)
+    window.categories_tab.quick_add_requested.connect(window._show_quick_add)
+    window.overview_tab.quick_add_requested.connect(window._show_quick_add)
+
+    # "Vorschläge"-Button in der Übersicht soll den Budgetwarner öffnen
+    try:
+        window.overview_tab.budget_warnings_requested.connect(
+            window._check_budget_warnings_from_overview
+        )
+    except Exception as e:
+        logger.debug("%s", e)
+    try:
+        window.overview_tab.budget_edit_requested.connect(
+            window._open_budget_editor_from_overview
+        )
+    except Exception as e:
+        logger.debug("%s", e)
+
+    # Settings-Checkboxen mit Settings synchronisieren
+    if hasattr(window.budget_tab, "chk_autosave"):
+        window.budget_tab.chk_autosave.toggled.connect(window._on_autosave_changed)
+    if hasattr(window.budget_tab, "chk_ask_due"):
+        window.budget_tab.chk_ask_due.toggled.connect(window._on_ask_due_changed)
+    if hasattr(window.budget_tab, "budget_data_changed"):
+        window.budget_tab.budget_data_changed.connect(window._update_undo_redo_actions)
+
+
+def on_startup_update_finished(window) -> None:
+    """Zeigt nach dem Update-Check im Hintergrund ggf. den Update-Hinweis."""
+    from updater.common import read_startup_check_result
+
+    window._startup_update_proc = None
+    if getattr(window, "_is_closing", False):
+        return
+    res = read_startup_check_result()
+    if not res.get("available"):
+        if res.get("error"):
+            logger.debug(
+                "Startup-Update-Check ohne Hinweis beendet: %s", res.get("error")
+            )
+        return
+    if window._startup_update_prompt_shown:
+        return
+    window._startup_update_prompt_shown = True
+
+    remote = str(res.get("remote") or "")
+    current = str(res.get("current") or APP_VERSION)
+    window.statusBar().showMessage(
+        trf("update.startup_status_available", version=remote), 10000
+    )
+
+    msg = QMessageBox(window)
+    msg.setIcon(QMessageBox.Information)
+    msg.setWindowTitle(tr("update.startup_available_title"))
+    msg.setText(trf("update.startup_available_text", current=current, remote=remote))
+    msg.setInformativeText(tr("update.startup_available_info"))
+    btn_update = msg.addButton(tr("update.startup_btn_open"), QMessageBox.AcceptRole)
+    msg.addButton(tr("update.startup_btn_later"), QMessageBox.RejectRole)
+    msg.exec()
+    if msg.clickedButton() is btn_update:
+        window._show_update_dialog()
@@ -0,0 +1,49 @@
+"""Qt-Anbindung der Einstellungsmeldungen (``settings.add_settings_listener``).
+
+``settings`` meldet geänderte Schlüssel in dem Thread, der gespeichert oder
+die geänderte Datei gelesen hat - das kann ein Arbeits-Thread sein.
+:class:`SettingsRelay` reicht die Meldung über ein Signal in den GUI-Thread
+und fasst alles, was bis zum nächsten Event-Loop-Durchlauf eintrifft, zu
+einer Meldung zusammen: Der Einstellungsdialog speichert Dutzende Schlüssel
+einzeln, die Oberfläche soll sie einmal anwenden.
+"""
+
+from __future__ import annotations
+
+from PySide6.QtCore import QObject, QTimer, Signal, Slot
+
+from settings import add_settings_listener, remove_settings_listener
+
+
+class SettingsRelay(QObject):
+    """Meldet geänderte Einstellungsschlüssel gesammelt im GUI-Thread.
+
+    Solange das Objekt lebt, ist es bei ``settings`` angemeldet; beim
+    Zerstören (etwa mit dem Elternfenster) meldet es sich ab.
+    """
+
+    changed = Signal(object)
+    _received = Signal(object)
+
+    def __init__(self, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._pending: set[str] = set()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._flush)
+        self._received.connect(self._collect)
+        listener = self._received.emit
+        add_settings_listener(listener)
+        self.destroyed.connect(lambda *_: remove_settings_listener(listener))
+
+    @Slot(object)
+    def _collect(self, changed: frozenset) -> None:
+        self._pending.update(changed)
+        self._timer.start()
+
+    @Slot()
+    def _flush(self) -> None:
+        changed, self._pending = frozenset(self._pending), set()
+        if changed:
+            self.changed.emit(changed)
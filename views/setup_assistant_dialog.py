@@ -1178,7 +1178,7 @@ class SetupAssistantDialog(QDialog):
             self._update_nav()
             (
                 self.main_window._schedule_refresh_all_tabs(
-                    reason="setup assistant changed data"
+                    reason="setup assistant changed data", data_only=True
                 )
                 if hasattr(self.main_window, "_schedule_refresh_all_tabs")
                 else self.main_window._refresh_all_tabs()
@@ -1482,7 +1482,7 @@ class SetupAssistantDialog(QDialog):
             if hasattr(self.main_window, "_refresh_all_tabs"):
                 (
                     self.main_window._schedule_refresh_all_tabs(
-                        reason="setup assistant changed data"
+                        reason="setup assistant changed data", data_only=True
                     )
                     if hasattr(self.main_window, "_schedule_refresh_all_tabs")
                     else self.main_window._refresh_all_tabs()
@@ -1608,7 +1608,7 @@ class SetupAssistantDialog(QDialog):
             if hasattr(self.main_window, "_refresh_all_tabs"):
                 (
                     self.main_window._schedule_refresh_all_tabs(
-                        reason="setup assistant changed data"
+                        reason="setup assistant changed data", data_only=True
                     )
                     if hasattr(self.main_window, "_schedule_refresh_all_tabs")
                     else self.main_window._refresh_all_tabs()
@@ -1692,7 +1692,7 @@ class SetupAssistantDialog(QDialog):
             if hasattr(self.main_window, "_refresh_all_tabs"):
                 (
                     self.main_window._schedule_refresh_all_tabs(
-                        reason="setup assistant changed data"
+                        reason="setup assistant changed data", data_only=True
                     )
                     if hasattr(self.main_window, "_schedule_refresh_all_tabs")
                     else self.main_window._refresh_all_tabs()
@@ -1783,7 +1783,7 @@ class SetupAssistantDialog(QDialog):
                 try:
                     (
                         self.main_window._schedule_refresh_all_tabs(
-                            reason="setup assistant changed data"
+                            reason="setup assistant changed data", data_only=True
                         )
                         if hasattr(self.main_window, "_schedule_refresh_all_tabs")
                         else self.main_window._refresh_all_tabs()
@@ -1889,7 +1889,7 @@ class SetupAssistantDialog(QDialog):
             show_info(self, tr("msg.info"), tr("setup.kategorien_wurden_geloescht"))
             (
                 self.main_window._schedule_refresh_all_tabs(
-                    reason="setup assistant changed data"
+                    reason="setup assistant changed data", data_only=True
                 )
                 if hasattr(self.main_window, "_schedule_refresh_all_tabs")
                 else self.main_window._refresh_all_tabs()
@@ -793,13 +793,13 @@ class StartupWizard(QDialog):
         except Exception:
             src_conn = sqlite3.connect(str(src_db))
 
+        # Seitenweise kopieren statt Dump + executescript: kein SQL-Parsen,
+        # kein Neuaufbau der Indizes.
+        mem_conn = sqlite3.connect(":memory:")
         try:
-            dump_sql = "\n".join(src_conn.iterdump())
+            src_conn.backup(mem_conn)
         finally:
             src_conn.close()
-
-        mem_conn = sqlite3.connect(":memory:")
-        mem_conn.executescript(dump_sql)
         mem_conn.execute("PRAGMA foreign_keys = ON;")
         mem_conn.execute("PRAGMA busy_timeout = 10000;")
 
@@ -39,7 +39,10 @@ from model.typ_constants import (
 from utils.icons import get_icon
 from utils.i18n import display_typ, db_typ_from_display, tr_category_name
 from model.category_model import CategoryModel, Category
+from model.category_tree import CategoryTree
 from model.budget_model import BudgetModel
+from model.profiling import profiled
+from model.change_bus import DataChange
 from model.favorites_model import FavoritesModel
 from model.budget_warnings_model_extended import BudgetWarningsModelExtended
 from model.budget_modes import (
@@ -250,7 +253,10 @@ class BudgetTab(QWidget):
     # Signal: Kontextueller Einstieg in Sparziele (Budget gehört zum Plan)
     savings_goals_requested = Signal()
 
-    def __init__(self, conn: sqlite3.Connection):
+    # Tabellen, deren Änderung ein Neuladen nötig macht (siehe ChangeBus).
+    DATA_DEPENDENCIES = frozenset({"budget", "categories", "tracking", "favorites"})
+
+    def __init__(self, conn: sqlite3.Connection, *, defer_load: bool = False):
         super().__init__()
         self.conn = conn
         self.cats = CategoryModel(conn)
@@ -268,6 +274,10 @@ class BudgetTab(QWidget):
 
         # Cache: (typ, cat) -> {month:int -> buffer(float)}
         self._buffer_cache: dict[tuple[str, str], dict[int, float]] = {}
+        # Zeilenaufbau je Typ, gültig für genau einen Kategorienbaum
+        # (siehe _build_tree_flat).
+        self._layout_tree: CategoryTree | None = None
+        self._layouts: dict[str, tuple[list[dict], dict[str, list[str]]]] = {}
 
         self.year_spin = QSpinBox()
         self.year_spin.setRange(2000, 2100)
@@ -432,7 +442,9 @@ class BudgetTab(QWidget):
         self.btn_savings_goals.clicked.connect(self.savings_goals_requested.emit)
         self.btn_income_13.clicked.connect(self.open_13th_salary_dialog)
 
-        self.load()
+        # Verdeckt gestartet: Das Hauptfenster lädt beim ersten Anzeigen.
+        if not defer_load:
+            self.load()
 
     def _apply_stable_column_widths(self) -> None:
         """Fixiert Budgetspalten, damit Settings-/Theme-Refresh nichts verschiebt."""
@@ -785,37 +797,47 @@ class BudgetTab(QWidget):
           totals_by_name: dict[name][month] -> total (buffer + subtree)
           buffer_by_name: dict[name][month] -> own buffer (DB value)
         """
-        items = self.cats.list(typ)
-        nodes = self.cats.build_tree(items)
-
-        # id->name for path
-        by_id: dict[int, Category] = {c.id: c for c in items}
+        # Struktur (Reihenfolge, Tiefe, Pfade) hängt nur am Kategorienbaum und
+        # wird hier gemerkt, solange er gilt; neu gerechnet werden je Laden nur
+        # die Summen. Der Baum ist unveränderlich und wird nach jedem
+        # Schreiben neu gebaut - seine Identität ist sein Versionsstand.
+        tree = self.cats.tree()
+        if tree is not self._layout_tree:
+            self._layout_tree, self._layouts = tree, {}
+        if typ not in self._layouts:
+            self._layouts[typ] = self._tree_layout(typ)
+        layout, direct_children_by_name = self._layouts[typ]
+        flat = [dict(row) for row in layout]
 
-        totals_by_name: dict[str, dict[int, float]] = {}
         buffer_by_name: dict[str, dict[int, float]] = {}
-        has_children_name: dict[str, bool] = {}
-        direct_children_by_name: dict[str, list[str]] = {}
+        for row in flat:
+            own_matrix = matrix.get(row["name"], {})
+            buffer_by_name[row["name"]] = {
+                m: float(own_matrix.get(m, 0.0)) for m in range(1, 13)
+            }
 
-        def compute(node) -> dict[int, float]:
-            c: Category = node["cat"]
-            own = {m: float(matrix.get(c.name, {}).get(m, 0.0)) for m in range(1, 13)}
-            total = dict(own)
-            for ch in node["children"]:
-                ct = compute(ch)
+        # Vorordnung rückwärts: Kinder stehen vor ihren Eltern.
+        totals_by_name: dict[str, dict[int, float]] = {}
+        for row in reversed(flat):
+            total = dict(buffer_by_name[row["name"]])
+            for child in direct_children_by_name[row["name"]]:
+                ct = totals_by_name[child]
                 for m in range(1, 13):
-                    total[m] = float(total.get(m, 0.0)) + float(ct.get(m, 0.0))
-            totals_by_name[c.name] = total
-            buffer_by_name[c.name] = own
-            has_children_name[c.name] = bool(node["children"])
-            direct_children_by_name[c.name] = [
-                ch["cat"].name for ch in node["children"]
-            ]
-            return total
-
-        for n in nodes:
-            compute(n)
+                    total[m] += ct[m]
+            totals_by_name[row["name"]] = total
+
+        return (
+            flat,
+            totals_by_name,
+            buffer_by_name,
+            {name: list(ch) for name, ch in direct_children_by_name.items()},
+        )
 
+    def _tree_layout(self, typ: str) -> tuple[list[dict], dict[str, list[str]]]:
+        """Zeilen des Budgetbaums in Vorordnung plus direkte Kinder je Name."""
+        nodes = self.cats.build_tree(self.cats.list(typ))
         flat: list[dict] = []
+        direct_children_by_name: dict[str, list[str]] = {}
 
         def walk(children, depth: int, path_parts: list[str]):
             for n in children:
@@ -832,10 +854,13 @@ class BudgetTab(QWidget):
                         "recurring_day": int(c.recurring_day or 1),
                     }
                 )
+                direct_children_by_name[c.name] = [
+                    ch["cat"].name for ch in n["children"]
+                ]
                 walk(n["children"], depth + 1, cur_path)
 
         walk(nodes, 0, [])
-        return flat, totals_by_name, buffer_by_name, direct_children_by_name
+        return flat, direct_children_by_name
 
     # ═══════════════════════════════════════════════════════════════════════
     # NEUE FUNKTIONEN V2.3.0
@@ -1440,9 +1465,18 @@ class BudgetTab(QWidget):
                 QTimer.singleShot(0, self.load)
 
     # Einheitliches API: MainWindow kann beim Tab-Wechsel `refresh()` nutzen.
+    @profiled("tab.budget.refresh")
     def refresh(self) -> None:
         self.load()
 
+    def is_affected_by(self, change: DataChange) -> bool:
+        """Änderungen nach dem angezeigten Jahr wirken nicht zurück.
+
+        Überträge fliessen nur vorwärts; eine Buchung im nächsten Jahr ändert
+        an dieser Tabelle nichts.
+        """
+        return change.touches_until(self.DATA_DEPENDENCIES, self.year_spin.value())
+
     # -----------------------------
     # Parent recalculation helpers
     # -----------------------------
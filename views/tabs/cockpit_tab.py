@@ -3,6 +3,7 @@ from __future__ import annotations
 import logging
 import os
 import sqlite3
+from dataclasses import dataclass
 from datetime import date
 from typing import Iterable
 
@@ -32,6 +33,7 @@ from PySide6.QtWidgets import (
 )
 
 from model.favorites_model import FavoritesModel
+from model.profiling import profiled
 from model.savings_goals_model import SavingsGoalsModel, STATUS_SAVING, STATUS_RELEASED
 from model.budget_warnings_model_extended import BudgetWarningsModelExtended
 from model.pot_reserve_model import PotReserveModel
@@ -73,6 +75,161 @@ _COCKPIT_DEFAULT_PANEL_COLUMNS = {
 }
 
 
+@dataclass(frozen=True)
+class _BudgetWarning:
+    """Eine Zeile der Budget-Ampel, noch ohne Übersetzung und Formatierung.
+
+    ``kind``: ``"exceeded"`` (Schwelle überschritten), ``"learning"``
+    (Lernvorschlag ohne Budget), ``"pot_overdrawn"`` oder ``"budget_missing"``.
+    """
+
+    kind: str
+    typ: str
+    category: str
+    budget: float
+    spent: float
+    percent_used: float = 0.0
+    exceed_count: int = 0
+    suggestion: float | None = None
+
+
+def _collect_budget_warnings(
+    conn: sqlite3.Connection,
+    y: int,
+    m: int,
+    *,
+    lookback_months: int,
+    co_start: int,
+    co_year: int,
+    warnings_model: BudgetWarningsModelExtended | None = None,
+) -> list[_BudgetWarning]:
+    """Inhalt der Budget-Ampel; liest nur über ``conn`` und fasst kein Qt an.
+
+    Läuft deshalb auch im Rechendienst (``model.background_compute``).
+    Einstellungen liest der Aufrufer vorher im GUI-Thread.
+    """
+    excs = []
+    try:
+        if warnings_model is None:
+            warnings_model = BudgetWarningsModelExtended(conn)
+        excs = warnings_model.check_warnings_extended(
+            y, m, lookback_months=lookback_months
+        )
+    except Exception as e:
+        logger.debug("budget_warnings: %s", e)
+        excs = []
+
+    excs = sorted(
+        excs,
+        key=lambda e: float(getattr(e, "percent_used", 0.0) or 0.0),
+        reverse=True,
+    )
+    out: list[_BudgetWarning] = []
+    seen_keys: set[tuple[str, str]] = set()
+    for exc in excs[:10]:
+        sug = getattr(exc, "suggestion", None)
+        _typ = str(getattr(exc, "typ", ""))
+        _cat = str(getattr(exc, "category", ""))
+        seen_keys.add((_typ, _cat))
+        out.append(
+            _BudgetWarning(
+                "exceeded",
+                _typ,
+                _cat,
+                float(getattr(exc, "budget", 0.0) or 0.0),
+                float(getattr(exc, "spent", 0.0) or 0.0),
+                float(getattr(exc, "percent_used", 0.0) or 0.0),
+                int(getattr(exc, "exceed_count", 0) or 0),
+                float(sug) if sug else None,
+            )
+        )
+    # Tracking-only/Lernmodus und POT-Rückstellungen zusätzlich sichtbar machen.
+    # BudgetWarningsModel arbeitet primär schwellenbasiert; Kategorien ohne
+    # Budget oder POTs mit Jahres-/Topfrest müssen trotzdem im Cockpit melden.
+    if len(out) < 10:
+        try:
+            from model.budget_overview_model import BudgetOverviewModel
+
+            overview = BudgetOverviewModel(conn)
+            learn = overview.get_tracking_budget_suggestions(
+                year=y, current_month=m, show_in_report=True
+            )
+            for sug in learn:
+                key = (
+                    str(getattr(sug, "typ", "")),
+                    str(getattr(sug, "category", "")),
+                )
+                if key in seen_keys or not key[1]:
+                    continue
+                out.append(
+                    _BudgetWarning(
+                        "learning",
+                        key[0],
+                        key[1],
+                        0.0,
+                        _year_to_date_spent(conn, y, m, key[0], key[1]),
+                        suggestion=float(getattr(sug, "suggested_amount", 0.0) or 0.0),
+                    )
+                )
+                seen_keys.add(key)
+                if len(out) >= 10:
+                    break
+        except Exception as exc:
+            logger.debug("cockpit learning warnings: %s", exc)
+
+    if len(out) < 10:
+        try:
+            pot_model = PotReserveModel(conn)
+            cats = conn.execute(
+                "SELECT typ, name FROM categories WHERE typ=? ORDER BY name",
+                (TYP_EXPENSES,),
+            ).fetchall()
+            for typ, cat in cats:
+                key = (str(typ), str(cat))
+                if key in seen_keys:
+                    continue
+                st = pot_model.status(
+                    y, m, key[0], key[1], start_month=co_start, start_year=co_year
+                )
+                if st is None:
+                    continue
+                if not (st.is_overdrawn or (not st.has_budget and st.spent > 0.01)):
+                    continue
+                out.append(
+                    _BudgetWarning(
+                        "pot_overdrawn" if st.has_budget else "budget_missing",
+                        key[0],
+                        key[1],
+                        float(st.cap),
+                        float(st.spent),
+                    )
+                )
+                seen_keys.add(key)
+                if len(out) >= 10:
+                    break
+        except Exception as exc:
+            logger.debug("cockpit pot warnings: %s", exc)
+    return out
+
+
+def _year_to_date_spent(
+    conn: sqlite3.Connection, y: int, m: int, typ: str, category: str
+) -> float:
+    """Summe Jan..Monat für Cockpit-Hinweise ohne Budget."""
+    try:
+        last_day = __import__("calendar").monthrange(int(y), int(m))[1]
+        start = f"{int(y):04d}-01-01"
+        end = f"{int(y):04d}-{int(m):02d}-{last_day:02d}"
+        row = conn.execute(
+            "SELECT COALESCE(SUM(amount),0) FROM tracking WHERE typ=? AND category=? AND date>=? AND date<=?",
+            (typ, category, start, end),
+        ).fetchone()
+        val = float(row[0] if row and row[0] is not None else 0.0)
+        return abs(val) if typ != TYP_INCOME else val
+    except Exception:
+        return 0.0
+
+
 class _Card(QFrame):
     def __init__(
         self,
@@ -185,16 +342,26 @@ class CockpitTab(QWidget):
     # v2.2.22: EINE Wahrheit fuer Presets – utils/cockpit_presets.py
     COCKPIT_PRESETS = _cp.PRESETS
 
-    def __init__(self, conn: sqlite3.Connection, settings: Settings | None = None):
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        settings: Settings | None = None,
+        *,
+        defer_load: bool = False,
+    ):
         super().__init__()
         self.conn = conn
         self.settings = settings or Settings()
         _cp.materialize_initial(self.settings)
         self._ensure_budget_warnings_panel_visible()
         self._warnings_model_ext = None  # lazy: BudgetWarningsModelExtended
+        # Rechendienst (views.compute_bridge); setzt das Hauptfenster.
+        self.compute_service = None
         self._panel_widgets: dict[str, QWidget] = {}
         self._setup_ui()
-        self.refresh()
+        # Verdeckt gestartet: Das Hauptfenster lädt beim ersten Anzeigen.
+        if not defer_load:
+            self.refresh()
 
     def _ensure_budget_warnings_panel_visible(self) -> None:
         """Budgetwarnungen im Cockpit sichtbar halten (Alt-Migration).
@@ -588,6 +755,7 @@ class CockpitTab(QWidget):
         _cp.apply_preset(self.settings, preset)
         self._apply_panel_visibility()
 
+    @profiled("tab.cockpit.refresh")
     def refresh(self) -> None:
         today = date.today()
         y, m = today.year, today.month
@@ -1087,149 +1255,102 @@ class CockpitTab(QWidget):
         Nutzt dieselbe Engine wie der Budget-Anpassungsdialog
         (BudgetWarningsModelExtended). Zeigt überschrittene Budgets, nach
         Auslastung absteigend, inkl. vorgeschlagenem Budget.
+
+        Mit Rechendienst (``compute_service``) rechnen Historie, Lern- und
+        Topf-Hinweise im Hintergrund; die Tabelle folgt, sobald sie fertig
+        sind. Ohne ihn - und während einer offenen Transaktion - wie bisher
+        sofort.
         """
-        excs = []
         try:
-            if self._warnings_model_ext is None:
-                self._warnings_model_ext = BudgetWarningsModelExtended(self.conn)
-            try:
-                from settings import Settings
-
-                lookback = int(Settings().get("budget_suggestion_months", 3) or 3)
-            except Exception:
-                lookback = 3
-            excs = self._warnings_model_ext.check_warnings_extended(
-                y, m, lookback_months=lookback
+            from settings import Settings
+
+            lookback = int(Settings().get("budget_suggestion_months", 3) or 3)
+        except Exception:
+            lookback = 3
+        try:
+            co_start = int(self.settings.get("carryover_start_month", 1) or 1)
+            co_year_raw = int(self.settings.get("carryover_start_year", 0) or 0)
+            co_year = co_year_raw if co_year_raw > 0 else y
+        except Exception:
+            co_start, co_year = 1, y
+
+        def collect(conn: sqlite3.Connection) -> list[_BudgetWarning]:
+            return _collect_budget_warnings(
+                conn,
+                y,
+                m,
+                lookback_months=lookback,
+                co_start=co_start,
+                co_year=co_year,
             )
-        except Exception as e:
-            logger.debug("budget_warnings: %s", e)
-            excs = []
 
-        excs = sorted(
-            excs,
-            key=lambda e: float(getattr(e, "percent_used", 0.0) or 0.0),
-            reverse=True,
+        service = self.compute_service
+        if service is not None and service.submit(
+            "cockpit.budget_warnings",
+            collect,
+            self._apply_budget_warnings,
+            on_error=self._on_budget_warnings_failed,
+        ):
+            return
+        if self._warnings_model_ext is None:
+            self._warnings_model_ext = BudgetWarningsModelExtended(self.conn)
+        self._show_budget_warnings(
+            _collect_budget_warnings(
+                self.conn,
+                y,
+                m,
+                lookback_months=lookback,
+                co_start=co_start,
+                co_year=co_year,
+                warnings_model=self._warnings_model_ext,
+            )
         )
+
+    def _apply_budget_warnings(self, warnings: list[_BudgetWarning]) -> None:
+        """Ergebnis aus dem Rechendienst übernehmen (GUI-Thread)."""
+        self._show_budget_warnings(warnings)
+        self._refresh_section_states()
+        self._apply_panel_visibility()
+
+    def _on_budget_warnings_failed(self, exc: BaseException) -> None:
+        logger.debug("budget_warnings (Hintergrund): %s", exc)
+        self._apply_budget_warnings([])
+
+    def _show_budget_warnings(self, warnings: list[_BudgetWarning]) -> None:
         rows = []
-        seen_keys: set[tuple[str, str]] = set()
-        for exc in excs[:10]:
-            pct = float(getattr(exc, "percent_used", 0.0) or 0.0)
-            cnt = int(getattr(exc, "exceed_count", 0) or 0)
-            auslastung = f"{pct:.0f}%" + (f" ({cnt}×)" if cnt > 1 else "")
-            sug = getattr(exc, "suggestion", None)
-            empfehlung = format_money(float(sug)) if sug else "—"
-            _typ = str(getattr(exc, "typ", ""))
-            _cat = str(getattr(exc, "category", ""))
-            seen_keys.add((_typ, _cat))
+        for w in warnings:
+            if w.kind == "exceeded":
+                auslastung = f"{w.percent_used:.0f}%" + (
+                    f" ({w.exceed_count}×)" if w.exceed_count > 1 else ""
+                )
+                empfehlung = format_money(w.suggestion) if w.suggestion else "—"
+            elif w.kind == "learning":
+                auslastung = tr("cockpit.learning_suggestion")
+                empfehlung = format_money(w.suggestion or 0.0)
+            else:
+                auslastung = tr(
+                    "cockpit.pot_overdrawn"
+                    if w.kind == "pot_overdrawn"
+                    else "cockpit.budget_missing"
+                )
+                empfehlung = tr("cockpit.set_budget")
             rows.append(
                 [
-                    display_typ(_typ),
-                    _cat,
-                    format_money(float(getattr(exc, "budget", 0.0) or 0.0)),
-                    format_money(float(getattr(exc, "spent", 0.0) or 0.0)),
+                    display_typ(w.typ),
+                    w.category,
+                    format_money(w.budget),
+                    format_money(w.spent),
                     auslastung,
                     empfehlung,
                 ]
             )
-        # Tracking-only/Lernmodus und POT-Rückstellungen zusätzlich sichtbar machen.
-        # BudgetWarningsModel arbeitet primär schwellenbasiert; Kategorien ohne
-        # Budget oder POTs mit Jahres-/Topfrest müssen trotzdem im Cockpit melden.
-        if len(rows) < 10:
-            try:
-                from model.budget_overview_model import BudgetOverviewModel
-
-                overview = BudgetOverviewModel(self.conn)
-                learn = overview.get_tracking_budget_suggestions(
-                    year=y, current_month=m, show_in_report=True
-                )
-                for sug in learn:
-                    key = (
-                        str(getattr(sug, "typ", "")),
-                        str(getattr(sug, "category", "")),
-                    )
-                    if key in seen_keys or not key[1]:
-                        continue
-                    spent = self._year_to_date_spent(y, m, key[0], key[1])
-                    rows.append(
-                        [
-                            display_typ(key[0]),
-                            key[1],
-                            format_money(0.0),
-                            format_money(spent),
-                            tr("cockpit.learning_suggestion"),
-                            format_money(
-                                float(getattr(sug, "suggested_amount", 0.0) or 0.0)
-                            ),
-                        ]
-                    )
-                    seen_keys.add(key)
-                    if len(rows) >= 10:
-                        break
-            except Exception as exc:
-                logger.debug("cockpit learning warnings: %s", exc)
-
-        if len(rows) < 10:
-            try:
-                pot_model = PotReserveModel(self.conn)
-                try:
-                    co_start = int(self.settings.get("carryover_start_month", 1) or 1)
-                    co_year_raw = int(self.settings.get("carryover_start_year", 0) or 0)
-                    co_year = co_year_raw if co_year_raw > 0 else y
-                except Exception:
-                    co_start, co_year = 1, y
-                cats = self.conn.execute(
-                    "SELECT typ, name FROM categories WHERE typ=? ORDER BY name",
-                    (TYP_EXPENSES,),
-                ).fetchall()
-                for typ, cat in cats:
-                    key = (str(typ), str(cat))
-                    if key in seen_keys:
-                        continue
-                    st = pot_model.status(
-                        y, m, key[0], key[1], start_month=co_start, start_year=co_year
-                    )
-                    if st is None:
-                        continue
-                    if not (st.is_overdrawn or (not st.has_budget and st.spent > 0.01)):
-                        continue
-                    rows.append(
-                        [
-                            display_typ(key[0]),
-                            key[1],
-                            format_money(st.cap),
-                            format_money(st.spent),
-                            (
-                                tr("cockpit.pot_overdrawn")
-                                if st.has_budget
-                                else tr("cockpit.budget_missing")
-                            ),
-                            tr("cockpit.set_budget"),
-                        ]
-                    )
-                    seen_keys.add(key)
-                    if len(rows) >= 10:
-                        break
-            except Exception as exc:
-                logger.debug("cockpit pot warnings: %s", exc)
-
         self._set_table_rows(
             self.tbl_budget_warnings, rows, tr("cockpit.empty_budget_warnings")
         )
 
     def _year_to_date_spent(self, y: int, m: int, typ: str, category: str) -> float:
         """Summe Jan..Monat für Cockpit-Hinweise ohne Budget."""
-        try:
-            last_day = __import__("calendar").monthrange(int(y), int(m))[1]
-            start = f"{int(y):04d}-01-01"
-            end = f"{int(y):04d}-{int(m):02d}-{last_day:02d}"
-            row = self.conn.execute(
-                "SELECT COALESCE(SUM(amount),0) FROM tracking WHERE typ=? AND category=? AND date>=? AND date<=?",
-                (typ, category, start, end),
-            ).fetchone()
-            val = float(row[0] if row and row[0] is not None else 0.0)
-            return abs(val) if typ != TYP_INCOME else val
-        except Exception:
-            return 0.0
+        return _year_to_date_spent(self.conn, y, m, typ, category)
 
     def _refresh_missing(self, y: int, m: int) -> None:
         rows = []
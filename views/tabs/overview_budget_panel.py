@@ -713,11 +713,10 @@ class OverviewBudgetPanel(QObject):
         if months:
             d1, _ = _month_range(months[0][0], months[0][1])
             _, d2 = _month_range(months[-1][0], months[-1][1])
-            all_rows = track.get_entries_in_range(d1, d2, tag_id=tag_id)
-            cache: dict[tuple[int, int], list] = {}
-            for tr_row in all_rows:
-                key = (tr_row.date.year, tr_row.date.month)
-                cache.setdefault(key, []).append(tr_row)
+            columns = track.fetch_columns(date_from=d1, date_to=d2, tag_id=tag_id)
+            cache: dict[tuple[str, int, int], float] = {}
+            for (t, _cat, y, m), value in columns.actual_sums(by_month=True).items():
+                cache[(t, y, m)] = cache.get((t, y, m), 0.0) + value
         else:
             cache = {}
 
@@ -728,16 +727,8 @@ class OverviewBudgetPanel(QObject):
                 except Exception:
                     bsum = 0.0
 
-                trows = cache.get((y, m), [])
-                if typ == TYP_INCOME:
-                    asum = sum(r.amount for r in trows if _norm(r.typ) == typ)
-                    rest = asum - bsum
-                elif typ == TYP_EXPENSES:
-                    asum = sum(abs(r.amount) for r in trows if _norm(r.typ) == typ)
-                    rest = bsum - asum
-                else:
-                    asum = sum(r.amount for r in trows if _norm(r.typ) == typ)
-                    rest = bsum - asum
+                asum = cache.get((_norm(typ), y, m), 0.0)
+                rest = asum - bsum if typ == TYP_INCOME else bsum - asum
 
                 cell = QTableWidgetItem(
                     trf(
@@ -1171,21 +1162,18 @@ class OverviewBudgetPanel(QObject):
         wanted_months = {int(m) for m in months}
         actual: dict[str, float] = {}
         try:
-            rows = TrackingModel(self.conn).list_filtered(
+            columns = TrackingModel(self.conn).fetch_columns(
                 year=int(year), tag_id=int(tag_id)
             )
         except Exception as exc:
             logger.warning("tag actuals load failed: %s", exc)
             return actual
 
-        for r in rows:
-            if int(r.date.month) not in wanted_months:
-                continue
-            t = _norm(r.typ)
-            if t != typ_db:
+        sums = columns.actual_sums(by_month=True)
+        for (t, category, _y, month), value in sums.items():
+            if month not in wanted_months or t != typ_db:
                 continue
-            amt = abs(float(r.amount)) if t == TYP_EXPENSES else float(r.amount)
-            actual[r.category] = actual.get(r.category, 0.0) + amt
+            actual[category] = actual.get(category, 0.0) + value
         return actual
 
     def _collect_main_cat_data(
@@ -1208,15 +1196,12 @@ class OverviewBudgetPanel(QObject):
             from model.tracking_model import TrackingModel
 
             track = TrackingModel(self.conn)
-            rows = track.get_entries_in_range(date_from, date_to, tag_id=tag_id)
+            columns = track.fetch_columns(
+                date_from=date_from, date_to=date_to, tag_id=tag_id
+            )
+            actual_raw: dict[tuple[str, str], float] = columns.actual_sums()
         except Exception:
-            rows = []
-
-        actual_raw: dict[tuple[str, str], float] = {}
-        for r in rows:
-            t = _norm(r.typ)
-            amt = abs(float(r.amount)) if t == TYP_EXPENSES else float(r.amount)
-            actual_raw[(t, r.category)] = actual_raw.get((t, r.category), 0.0) + amt
+            actual_raw = {}
 
         return budget_raw, actual_raw
 
@@ -44,6 +44,7 @@ from PySide6.QtWidgets import (
 
 from model.typ_constants import TYP_INCOME, TYP_EXPENSES, TYP_SAVINGS
 from model.budget_overview_model import BudgetOverviewModel
+from model.overview_aggregation import typ_totals
 from utils.i18n import tr, display_typ, db_typ_from_display, trf
 from utils.money import format_money as format_chf
 from views.ui_colors import ui_colors
@@ -293,11 +294,10 @@ class OverviewKpiPanel(QWidget):
 
     def refresh_kpis(self, rows: list, budget_sums: dict[str, float]) -> None:
         """KPI-Cards und Progress-Bars aktualisieren."""
-        total_income = sum(r.amount for r in rows if _norm(r.typ) == TYP_INCOME)
-        total_expenses = sum(
-            abs(r.amount) for r in rows if _norm(r.typ) == TYP_EXPENSES
-        )
-        total_savings = sum(r.amount for r in rows if _norm(r.typ) == TYP_SAVINGS)
+        totals = typ_totals(rows)
+        total_income = totals[TYP_INCOME]
+        total_expenses = totals[TYP_EXPENSES]
+        total_savings = totals[TYP_SAVINGS]
         # Bilanz im BudgetManager-Sinn: Einkommen minus Ausgaben minus Ersparnisse.
         # Ersparnisse sind zwar positiv fürs Vermögen, blockieren aber den freien
         # Einkommenstopf des Monats und müssen deshalb in der freien Bilanz raus.
@@ -387,11 +387,10 @@ class OverviewKpiPanel(QWidget):
 
         _cc = ui_colors(self)
 
-        income_actual = sum(r.amount for r in rows if _norm(r.typ) == TYP_INCOME)
-        expense_actual = sum(
-            abs(r.amount) for r in rows if _norm(r.typ) == TYP_EXPENSES
-        )
-        savings_actual = sum(r.amount for r in rows if _norm(r.typ) == TYP_SAVINGS)
+        totals = typ_totals(rows)
+        income_actual = totals[TYP_INCOME]
+        expense_actual = totals[TYP_EXPENSES]
+        savings_actual = totals[TYP_SAVINGS]
 
         # Budget-Daten — bereichsbezogen.
         # Wird budget_sums (über die Monate des gewählten Zeitraums summiert)
@@ -37,6 +37,7 @@ from PySide6.QtWidgets import (
 )
 
 from model.savings_goals_model import SavingsGoalsModel
+from model.profiling import profiled
 from utils.i18n import tr, trf
 from utils.money import format_money as format_chf
 from views.ui_colors import ui_colors
@@ -114,6 +115,7 @@ class OverviewSavingsPanel(QWidget):
 
     # ── Daten laden ─────────────────────────────────────────────────────────
 
+    @profiled("tab.overview.savings.refresh")
     def refresh(self) -> None:
         """Sparzieldaten neu laden und Tabelle aktualisieren."""
         try:
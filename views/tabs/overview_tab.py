@@ -44,8 +44,9 @@ from PySide6.QtWidgets import (
 )
 
 from model.budget_model import BudgetModel
+from model.profiling import profiled
 from model.typ_constants import TYP_INCOME, TYP_EXPENSES, TYP_SAVINGS, normalize_typ
-from model.tracking_model import TrackingModel
+from model.tracking_model import TrackingColumns, TrackingModel
 from model.category_model import CategoryModel
 from model.tags_model import TagsModel
 from model.savings_goals_model import SavingsGoalsModel
@@ -101,6 +102,34 @@ from model.typ_constants import (
 )
 
 
+def _budget_sums_by_typ(
+    budget: BudgetModel, date_from: date, date_to: date
+) -> dict[str, float]:
+    months = _months_between(date_from, date_to)
+    out = {TYP_INCOME: 0.0, TYP_EXPENSES: 0.0, TYP_SAVINGS: 0.0}
+    try:
+        raw = budget.sum_by_typ_range(months)
+        for typ, val in raw.items():
+            t = _norm_typ(typ)
+            out[t] = out.get(t, 0.0) + val
+    except Exception as e:
+        logger.debug("budget_sums_by_typ: %s", e)
+    return out
+
+
+def _load_kpi_data(
+    conn: sqlite3.Connection, date_from: date, date_to: date, tag_id
+) -> tuple[TrackingColumns, dict[str, float]]:
+    """Buchungsspalten und Budget-Summen für KPIs und Diagramme.
+
+    Liest nur über ``conn`` - läuft im Rechendienst auf dessen Lese-Connection.
+    """
+    rows = TrackingModel(conn).fetch_columns(
+        date_from=date_from, date_to=date_to, tag_id=tag_id
+    )
+    return rows, _budget_sums_by_typ(BudgetModel(conn), date_from, date_to)
+
+
 # ── OverviewTab ──────────────────────────────────────────────────────────────
 
 
@@ -111,7 +140,27 @@ class OverviewTab(QWidget):
     budget_warnings_requested = Signal()
     budget_edit_requested = Signal(str, str, int, int)  # typ, category, year, month
 
-    def __init__(self, conn: sqlite3.Connection, settings: Settings | None = None):
+    # Tabellen, deren Änderung ein Neuladen nötig macht (siehe ChangeBus).
+    DATA_DEPENDENCIES = frozenset(
+        {
+            "tracking",
+            "budget",
+            "categories",
+            "tags",
+            "entry_tags",
+            "savings_goals",
+            "budget_warnings",
+            "suggestion_accepted",
+        }
+    )
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        settings: Settings | None = None,
+        *,
+        defer_load: bool = False,
+    ):
         super().__init__()
         self.conn = conn
         self.settings = settings or Settings()
@@ -123,11 +172,12 @@ class OverviewTab(QWidget):
         self.tags = TagsModel(conn)
         self.savings = SavingsGoalsModel(conn)
         self.budget_overview = BudgetOverviewModel(conn)
+        # Rechendienst (views.compute_bridge); setzt das Hauptfenster.
+        self.compute_service = None
 
         # Kategorie-Caches (werden in _load_categories() befüllt)
         self._cat_caches: dict = {}
         self._tag_name_to_id: dict[str, int] = {}
-        self._descendant_name_cache: dict = {}
 
         # Refresh-Timer
         self._refresh_timer = QTimer(self)
@@ -137,7 +187,9 @@ class OverviewTab(QWidget):
 
         self._setup_ui()
         self._connect_signals()
-        QTimer.singleShot(100, self.refresh_data)
+        # Verdeckt gestartet: Das Hauptfenster lädt beim ersten Anzeigen.
+        if not defer_load:
+            QTimer.singleShot(100, self.refresh_data)
 
     # ── Subtab-Visibility API (für MainWindow) ──────────────────────────────
 
@@ -456,23 +508,20 @@ class OverviewTab(QWidget):
         # Tracking-Rows einmal laden (gemeinsam genutzt). Der optionale Tag-Filter
         # läuft im TrackingModel über entry_tags, damit alle Panels dieselbe Basis
         # verwenden und kein Panel versehentlich ungefilterte Buchungen nachlädt.
-        try:
-            rows = self.track.get_entries_in_range(date_from, date_to, tag_id=tag_id)
-        except Exception as e:
-            logger.warning("tracking rows load: %s", e)
-            rows = []
-
-        # Budget-Summen für Progress-Bars
-        budget_sums = self._budget_sums_by_typ_for_range(date_from, date_to)
-
-        # ── KPI-Panel ──
-        try:
-            self.kpi_panel.refresh_kpis(rows, budget_sums)
-            self.kpi_panel.refresh_charts(
-                rows, year, month_idx, date_from, date_to, budget_sums=budget_sums
-            )
-        except Exception as e:
-            logger.warning("kpi_panel refresh: %s", e)
+        # KPIs und Diagramme brauchen nur Summen: spaltenweise statt je Zeile
+        # ein Objekt. Mit Rechendienst lädt ein Hintergrund-Thread, und die
+        # Karten folgen, sobald er fertig ist.
+        kpi_args = (year, month_idx, date_from, date_to)
+        service = self.compute_service
+        if service is None or not service.submit(
+            "overview.kpis",
+            lambda conn: _load_kpi_data(conn, date_from, date_to, tag_id),
+            lambda data: self._apply_kpi_data(*data, *kpi_args),
+            on_error=lambda exc: self._load_kpi_data_now(
+                date_from, date_to, tag_id, kpi_args
+            ),
+        ):
+            self._load_kpi_data_now(date_from, date_to, tag_id, kpi_args)
 
         # ── Budget-Panel ──
         try:
@@ -521,6 +570,7 @@ class OverviewTab(QWidget):
         except Exception as e:
             logger.warning("right_panel load: %s", e)
 
+    @profiled("tab.overview.refresh")
     def refresh(self) -> None:
         """Kompatibilität: MainWindow ruft refresh() beim Tab-Wechsel."""
         self.refresh_data()
@@ -555,7 +605,6 @@ class OverviewTab(QWidget):
             "parent": parent,
             "all": cats,
         }
-        self._descendant_name_cache = {}
 
         # Kategorie-Combo im rechten Panel aktualisieren
         self.right_panel.update_categories(tr("lbl.all"), [c["name"] for c in cats])
@@ -582,62 +631,54 @@ class OverviewTab(QWidget):
         self.right_panel.update_tags(tag_map)
 
     def _build_cat_tree(self) -> dict:
-        """Baut einen Dict {(typ, cat_name): set_of_all_descendants} für Hierarchie-Filter."""
-        tree = {}
-        id_to_name_typ = self._cat_caches.get("id_to_name_typ", {})
-        children = self._cat_caches.get("children", {})
-
-        def _descendants(cid: int) -> set[str]:
-            key = id_to_name_typ.get(cid, ("", ""))
-            result = {key[1]} if key[1] else set()
-            for ch in children.get(cid, []):
-                result |= _descendants(int(ch))
-            return result
-
-        for cid, (typ, name) in id_to_name_typ.items():
-            if name:
-                desc = _descendants(cid)
-                tree[(typ, name)] = desc
-        return tree
+        """Dict {(typ, cat_name): set_of_all_descendants} für Hierarchie-Filter.
+
+        Kommt aus dem gemerkten Kategorienbaum; wird nur nach Änderungen neu
+        berechnet, nicht bei jedem Filterwechsel.
+        """
+        return self.categories.tree().subtree_names()
 
     def _get_descendant_names(self, typ: str, selected_name: str) -> set[str]:
-        key = (typ, selected_name)
-        if key in self._descendant_name_cache:
-            return self._descendant_name_cache[key]
-        name_to_id = self._cat_caches.get("name_to_id", {})
-        children = self._cat_caches.get("children", {})
-        id_to_name_typ = self._cat_caches.get("id_to_name_typ", {})
-
-        cid = name_to_id.get(key)
-        if cid is None:
-            return set()
-
-        result: set[str] = set()
-
-        def _collect(c: int) -> None:
-            _, n = id_to_name_typ.get(c, ("", ""))
-            if n:
-                result.add(n)
-            for ch in children.get(c, []):
-                _collect(int(ch))
-
-        _collect(cid)
-        self._descendant_name_cache[key] = result
-        return result
+        return set(self._build_cat_tree().get((typ, selected_name), ()))
 
     def _budget_sums_by_typ_for_range(
         self, date_from: date, date_to: date
     ) -> dict[str, float]:
-        months = _months_between(date_from, date_to)
-        out = {TYP_INCOME: 0.0, TYP_EXPENSES: 0.0, TYP_SAVINGS: 0.0}
+        return _budget_sums_by_typ(self.budget, date_from, date_to)
+
+    def _load_kpi_data_now(
+        self, date_from: date, date_to: date, tag_id, kpi_args: tuple
+    ) -> None:
+        """KPI-Daten synchron laden - ohne Rechendienst oder wenn er scheiterte."""
+        try:
+            rows = self.track.fetch_columns(
+                date_from=date_from, date_to=date_to, tag_id=tag_id
+            )
+        except Exception as e:
+            logger.warning("tracking rows load: %s", e)
+            rows = []
+
+        # Budget-Summen für Progress-Bars
+        budget_sums = self._budget_sums_by_typ_for_range(date_from, date_to)
+        self._apply_kpi_data(rows, budget_sums, *kpi_args)
+
+    def _apply_kpi_data(
+        self,
+        rows,
+        budget_sums: dict[str, float],
+        year: int,
+        month_idx: int,
+        date_from: date,
+        date_to: date,
+    ) -> None:
+        # ── KPI-Panel ──
         try:
-            raw = self.budget.sum_by_typ_range(months)
-            for typ, val in raw.items():
-                t = _norm_typ(typ)
-                out[t] = out.get(t, 0.0) + val
+            self.kpi_panel.refresh_kpis(rows, budget_sums)
+            self.kpi_panel.refresh_charts(
+                rows, year, month_idx, date_from, date_to, budget_sums=budget_sums
+            )
         except Exception as e:
-            logger.debug("budget_sums_by_typ: %s", e)
-        return out
+            logger.warning("kpi_panel refresh: %s", e)
 
     # ── Interaktion ──────────────────────────────────────────────────────────
 
@@ -781,7 +822,7 @@ class OverviewTab(QWidget):
                     win = self.window()
                     if win is not None and hasattr(win, "_schedule_refresh_all_tabs"):
                         win._schedule_refresh_all_tabs(
-                            reason="overview suggestions applied"
+                            reason="overview suggestions applied", data_only=True
                         )
                     elif win is not None and hasattr(win, "_refresh_all_tabs"):
                         QTimer.singleShot(0, win._refresh_all_tabs)
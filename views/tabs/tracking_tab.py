@@ -6,7 +6,7 @@ import logging
 logger = logging.getLogger(__name__)
 import sqlite3
 import calendar
-from datetime import date
+from datetime import date, timedelta
 
 from PySide6.QtCore import Qt, QTimer
 from PySide6.QtWidgets import (
@@ -17,6 +17,7 @@ from PySide6.QtWidgets import (
     QCheckBox,
     QTableWidget,
     QTableWidgetItem,
+    QTableView,
     QAbstractItemView,
     QMessageBox,
     QDialog,
@@ -34,10 +35,10 @@ from PySide6.QtWidgets import (
 )
 
 from model.category_model import CategoryModel
+from model.profiling import profiled
 from model.tags_model import TagsModel
-from views.type_color_helper import apply_tracking_type_colors
 from views.delegates.badge_delegate import BadgeDelegate
-from model.tracking_model import TrackingModel
+from model.tracking_model import NewTrackingEntry, TrackingModel, TrackingRow
 from model.budget_model import BudgetModel
 from model.savings_goals_model import SavingsGoalBoundsError, SavingsGoalsModel
 
@@ -50,7 +51,8 @@ from views.savings_goal_messages import show_savings_goal_bounds_warning
 from utils.i18n import tr, trf
 from model.typ_constants import TYP_EXPENSES, TYP_INCOME, TYP_SAVINGS
 from model.coverage_model import coverage_from_tracking_rows, CoverageResult
-from utils.i18n import display_typ, db_typ_from_display
+from utils.i18n import display_typ
+from views.tabs.tracking_table_model import TrackingTableModel
 
 
 def _months_de() -> list[str]:
@@ -58,10 +60,24 @@ def _months_de() -> list[str]:
 
 
 class TrackingTab(QWidget):
-    def __init__(self, conn: sqlite3.Connection, settings=None):
+    # Tabellen, deren Änderung ein Neuladen nötig macht (siehe ChangeBus).
+    DATA_DEPENDENCIES = frozenset(
+        {
+            "tracking",
+            "entry_tags",
+            "tags",
+            "categories",
+            "savings_goals",
+            "recurring_transactions",
+        }
+    )
+
+    def __init__(self, conn: sqlite3.Connection, settings=None, *, defer_load=False):
         super().__init__()
         self.conn = conn
         self.settings = settings
+        # Verdeckt gestartet: Das Hauptfenster lädt beim ersten Anzeigen.
+        self._load_deferred = bool(defer_load)
         try:
             self.recent_days = (
                 30 if int(getattr(settings, "recent_days", 14)) == 30 else 14
@@ -163,10 +179,14 @@ class TrackingTab(QWidget):
         # Wenn keine aktiven Ziele existieren, bleibt der Bereich komplett ausgeblendet.
         self.savings_panel = self._build_savings_panel()
 
-        # Tabelle
-        self.table = QTableWidget(0, 7)
-        self.table.setHorizontalHeaderLabels(
-            [
+        # Tabelle: Die Buchungen kommen seitenweise aus der DB
+        # (TrackingTableModel), statt bei jedem refresh() alle Treffer als
+        # Items anzulegen.
+        self.table_model = TrackingTableModel(
+            self.model,
+            self.tags_model,
+            self.cats,
+            headers=[
                 tr("header.date"),
                 tr("header.type"),
                 tr("header.category"),
@@ -174,23 +194,20 @@ class TrackingTab(QWidget):
                 tr("header.description"),
                 tr("header.tags"),
                 tr("auto.views_tabs_tracking_tab.119_id_db302b9b"),
-            ]
-        )
-
-        # Accessibility: Header-Tooltips
-        _hdr = self.table.horizontalHeader()
-        for _i, _tip in enumerate(
-            [
+            ],
+            # Accessibility: Header-Tooltips
+            header_tips=[
                 tr("tracking.tip.col_date"),
                 tr("tracking.tip.col_type"),
                 tr("tracking.tip.col_category"),
                 tr("tracking.tip.col_amount"),
                 tr("tracking.tip.col_details"),
                 tr("header.tags"),
-            ]
-        ):
-            if _i < self.table.columnCount():
-                self.table.horizontalHeaderItem(_i).setToolTip(_tip)
+            ],
+            parent=self,
+        )
+        self.table = QTableView()
+        self.table.setModel(self.table_model)
         # Badge/Pillen Darstellung für Typ-Spalte
         self._badge_delegate = BadgeDelegate(
             self.table, color_map=self.settings.get("type_colors", {})
@@ -302,7 +319,8 @@ class TrackingTab(QWidget):
 
         self.table.doubleClicked.connect(lambda _: self.edit())
 
-        self.refresh()
+        if not self._load_deferred:
+            self.refresh()
 
     def _apply_stable_column_widths(self) -> None:
         """Fixiert Hauptspalten, damit Tabellenbreiten nach Settings-Reload stabil bleiben."""
@@ -706,10 +724,10 @@ class TrackingTab(QWidget):
 
     def _set_tags_for_selected(self):
         """Dialog zum Setzen von Tags für den ausgewählten Eintrag."""
-        sel = self.table.currentRow()
-        if sel < 0:
+        row = self._selected_row()
+        if row is None:
             return
-        entry_id = int(self.table.item(sel, 6).text())
+        entry_id = int(row.id)
 
         all_tags = self.tags_model.list_all()
         if not all_tags:
@@ -722,12 +740,8 @@ class TrackingTab(QWidget):
 
         current_tags = self.tags_model.get_tags_for_entry(entry_id)
         current_ids = {t["id"] for t in current_tags}
-        row_typ = (
-            db_typ_from_display(self.table.item(sel, 1).text())
-            if self.table.item(sel, 1)
-            else ""
-        )
-        row_cat = self.table.item(sel, 2).text() if self.table.item(sel, 2) else ""
+        row_typ = str(row.typ)
+        row_cat = str(row.category)
         fixed_ids = set(self.tags_model.get_tag_ids_for_category_name(row_typ, row_cat))
         current_ids |= fixed_ids
 
@@ -769,9 +783,7 @@ class TrackingTab(QWidget):
                     new_ids.append(item.data(Qt.UserRole))
             self.tags_model.set_entry_tags(entry_id, new_ids)
             try:
-                current_details = (
-                    self.table.item(sel, 4).text() if self.table.item(sel, 4) else ""
-                )
+                current_details = str(row.details)
                 if not current_details.strip():
                     action_details = self.tags_model.render_action_texts(
                         new_ids,
@@ -791,22 +803,12 @@ class TrackingTab(QWidget):
 
     def _duplicate_selected(self):
         """Dupliziert den ausgewählten Eintrag (mit heutigem Datum)."""
-        row_id = self._selected_id()
-        if row_id is None:
+        row = self._selected_row()
+        if row is None:
             return
-        r = self.table.currentRow()
-        typ = self.table.item(r, 1).text()
-        cat = self.table.item(r, 2).text()
-        amt_txt = (
-            self.table.item(r, 3).text().replace("'", "").replace(",", ".").strip()
-        )
-        try:
-            amt = float(amt_txt)
-        except Exception:
-            amt = 0.0
-        details = self.table.item(r, 4).text() if self.table.item(r, 4) else ""
+        row_id = int(row.id)
         new_id = self.model.add(
-            date.today(), db_typ_from_display(typ), cat, amt, details
+            date.today(), str(row.typ), str(row.category), row.amount, row.details
         )
         try:
             self.tags_model.set_entry_tags(
@@ -831,17 +833,15 @@ class TrackingTab(QWidget):
         self.filter_search.clear()
         self.chk_recent.setChecked(False)
 
-    def _selected_id(self) -> int | None:
-        r = self.table.currentRow()
-        if r < 0:
-            return None
-        it = self.table.item(r, 6)
-        if not it:
-            return None
-        try:
-            return int(it.text())
-        except Exception:
+    def _selected_row(self) -> TrackingRow | None:
+        index = self.table.currentIndex()
+        if not index.isValid():
             return None
+        return self.table_model.row_at(index.row())
+
+    def _selected_id(self) -> int | None:
+        row = self._selected_row()
+        return int(row.id) if row is not None else None
 
     def set_recent_days(self, days: int):
         """Setzt den Zeitraum für den Quick-Filter (nur 14 oder 30)."""
@@ -853,7 +853,7 @@ class TrackingTab(QWidget):
             )
         )
         # Wenn Quick-Filter aktiv ist, sofort neu laden
-        if self.chk_recent.isChecked():
+        if self.chk_recent.isChecked() and not self._load_deferred:
             self.refresh()
 
     def _format_coverage_suggestion(self, result: CoverageResult) -> str:
@@ -973,12 +973,15 @@ class TrackingTab(QWidget):
                     expanded.append(str(name))
         return expanded or [category]
 
+    @profiled("tab.tracking.refresh")
     def refresh(self):
         """Lädt Daten mit aktiven Filtern"""
+        self._load_deferred = False
 
         # Quick Filter: Letzte 14 Tage
         if self.chk_recent.isChecked():
-            rows = self.model.list_recent_sorted(self.recent_days)
+            cutoff = date.today() - timedelta(days=int(self.recent_days))
+            filters: dict = {"date_from": cutoff}
         else:
             # Erweiterte Filter verwenden
             typ = self._current_filter_typ_db() if not self._is_all_typ() else None
@@ -1005,7 +1008,7 @@ class TrackingTab(QWidget):
             # Tag-Filter
             tag_id = self.filter_tag.currentData()
 
-            rows = self.model.list_filtered(
+            filters = dict(
                 typ=typ,
                 category=None,
                 categories=categories,
@@ -1017,48 +1020,23 @@ class TrackingTab(QWidget):
                 tag_id=tag_id,
             )
 
-        # Tabelle füllen
-        self.table.setRowCount(0)
+        # Tabelle: erste Seite laden, den Rest holt die Ansicht beim Scrollen.
+        self.table_model.set_filters(**filters)
+
+        # Summen über alle Treffer direkt in SQL, ohne die Buchungen zu laden.
+        groups = self.model.totals_filtered(**filters)
+        count = 0
         total_ausgaben = 0.0
         total_einkommen = 0.0
         total_ersparnisse = 0.0
-
-        for r in rows:
-            i = self.table.rowCount()
-            self.table.insertRow(i)
-            self.table.setItem(i, 0, QTableWidgetItem(r.d.strftime("%d.%m.%Y")))
-            self.table.setItem(i, 1, QTableWidgetItem(display_typ(str(r.typ))))
-            # v2.2.1 (Bericht-Punkt 4): Kurzlabel in der Zelle, voller Pfad
-            # "Parent › Kind" als Tooltip – konsistent zur Schnellerfassung
-            # und ohne überbreite Kategorie-Spalte bei tiefen Hierarchien.
-            _cat_name = str(r.category)
-            _cat_full = self.cats.display_with_parent(str(r.typ), _cat_name)
-            _cat_item = QTableWidgetItem(_cat_name)
-            if _cat_full != _cat_name:
-                _cat_item.setToolTip(_cat_full)
-            self.table.setItem(i, 2, _cat_item)
-            a = QTableWidgetItem(format_chf(float(r.amount)))
-            a.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            self.table.setItem(i, 3, a)
-            self.table.setItem(i, 4, QTableWidgetItem(str(r.details)))
-            try:
-                _tags = self.tags_model.get_tags_for_entry(int(r.id))
-                _tag_txt = ", ".join(
-                    str(t.get("name", "")) for t in _tags if str(t.get("name", ""))
-                )
-            except Exception as exc:
-                logger.debug("entry tags display: %s", exc)
-                _tag_txt = ""
-            self.table.setItem(i, 5, QTableWidgetItem(_tag_txt))
-            self.table.setItem(i, 6, QTableWidgetItem(str(r.id)))
-
-            # Summen berechnen
-            if r.typ == TYP_EXPENSES:
-                total_ausgaben += r.amount
-            elif r.typ == TYP_INCOME:
-                total_einkommen += r.amount
-            elif r.typ == TYP_SAVINGS:
-                total_ersparnisse += r.amount
+        for g in groups:
+            count += g.count
+            if g.typ == TYP_EXPENSES:
+                total_ausgaben += g.amount
+            elif g.typ == TYP_INCOME:
+                total_einkommen += g.amount
+            elif g.typ == TYP_SAVINGS:
+                total_ersparnisse += g.amount
 
         self._apply_stable_column_widths()
 
@@ -1066,14 +1044,14 @@ class TrackingTab(QWidget):
         saldo = total_einkommen - total_ausgaben - total_ersparnisse
         summary_text = trf(
             "tracking.summary",
-            count=len(rows),
+            count=count,
             income=format_money(total_einkommen),
             expenses=format_money(total_ausgaben),
             savings=format_money(total_ersparnisse),
             balance=format_money(saldo),
         )
         self.lbl_summary.setText(summary_text)
-        self._update_tracking_coverage_warning(rows)
+        self._update_tracking_coverage_warning(groups)
         self._refresh_savings_panel()
         # Typ- und Negativfarben anwenden (vom Theme Manager holen)
         type_colors = {}
@@ -1100,12 +1078,12 @@ class TrackingTab(QWidget):
             negative_color = _uc.negative
 
         try:
-            apply_tracking_type_colors(self.table, type_colors, negative_color)
+            self.table_model.set_colors(type_colors, negative_color)
             if hasattr(self, "_badge_delegate") and self._badge_delegate is not None:
                 self._badge_delegate.set_colors(type_colors)
                 self.table.viewport().update()
         except Exception as e:
-            logger.debug("apply_tracking_type_colors(self.table, type_colors: %s", e)
+            logger.debug("table_model.set_colors(type_colors: %s", e)
 
     def add(self):
         """Neue Buchung erfassen.
@@ -1403,16 +1381,14 @@ class TrackingTab(QWidget):
         final_month = dlg_book.current_month() or (year, month)
         _f, _r, _o, skipped_existing, skipped_zero = self._collect_pending(*final_month)
 
-        inserted = 0
         skipped_zero_book = 0
-        from model.crypto import coalesced_commits
-
-        with coalesced_commits(self.conn):
-            for it in to_book:
-                if abs(float(it.amount)) < 1e-9:
-                    skipped_zero_book += 1
-                    continue
-                self.model.add(
+        entries: list[NewTrackingEntry] = []
+        for it in to_book:
+            if abs(float(it.amount)) < 1e-9:
+                skipped_zero_book += 1
+                continue
+            entries.append(
+                NewTrackingEntry(
                     it.d,
                     it.typ,
                     it.category,
@@ -1420,7 +1396,9 @@ class TrackingTab(QWidget):
                     it.details,
                     source=getattr(it, "source", "manual"),
                 )
-                inserted += 1
+            )
+        # Ein Commit und eine Undo-Gruppe für den ganzen Monat.
+        inserted = len(self.model.add_many(entries))
 
         show_info(
             self,
@@ -1441,18 +1419,12 @@ class TrackingTab(QWidget):
             show_info(self, tr("msg.info"), tr("msg.no_selection"))
             return
 
-        r = self.table.currentRow()
-        d = self.table.item(r, 0).text()
-        typ = self.table.item(r, 1).text()
-        cat = self.table.item(r, 2).text()
-        amt_txt = (
-            self.table.item(r, 3).text().replace("'", "").replace(",", ".").strip()
-        )
-        try:
-            amt = float(amt_txt)
-        except Exception:
-            amt = 0.0
-        details = self.table.item(r, 4).text() if self.table.item(r, 4) else ""
+        row = self._selected_row()
+        d = row.d.strftime("%d.%m.%Y")
+        typ = display_typ(str(row.typ))
+        cat = str(row.category)
+        amt = float(row.amount)
+        details = str(row.details)
 
         try:
             tag_ids = [
@@ -1487,8 +1459,11 @@ class TrackingTab(QWidget):
         if row_id is None:
             show_info(self, tr("msg.info"), tr("msg.no_selection"))
             return
-        r = self.table.currentRow()
-        summary = f"{self.table.item(r,0).text()} | {self.table.item(r,1).text()} | {self.table.item(r,2).text()} | {self.table.item(r,3).text()}"
+        row = self._selected_row()
+        summary = (
+            f"{row.d.strftime('%d.%m.%Y')} | {display_typ(str(row.typ))} | "
+            f"{row.category} | {format_chf(float(row.amount))}"
+        )
         if (
             QMessageBox.question(
                 self,
@@ -0,0 +1,229 @@
+"""Tabellenmodell der Tracking-Ansicht mit seitenweisem Nachladen.
+
+Die Tracking-Tabelle war ein ``QTableWidget``, das bei jedem ``refresh()``
+alle Treffer als Items anlegte - mit einer Tag-Abfrage je Zeile. Bei
+zehntausenden Buchungen kostete das Sekunden und viel Speicher.
+
+Dieses Modell lädt über :meth:`TrackingModel.page_filtered` Seite für Seite
+(Keyset auf ``(date, id)``), sobald die Ansicht über ``canFetchMore`` /
+``fetchMore`` danach fragt. Im Speicher bleiben höchstens ``max_pages``
+Seiten; eine verdrängte Seite wird beim nächsten Zugriff über ihren
+gemerkten Startschlüssel neu gelesen. Die Filter bleiben gesetzt, bis
+:meth:`set_filters` neue bringt.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import OrderedDict
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PySide6.QtGui import QBrush, QColor
+
+from model.tracking_model import TrackingRow
+from utils.i18n import display_typ
+from utils.money import format_short as format_chf
+
+logger = logging.getLogger(__name__)
+
+COL_DATE, COL_TYPE, COL_CATEGORY, COL_AMOUNT, COL_DETAILS, COL_TAGS, COL_ID = range(7)
+COLUMN_COUNT = 7
+
+#: Zeilen je Abfrage; klein genug für einen Bildschirm-Scroll ohne Ruckeln.
+DEFAULT_PAGE_SIZE = 500
+#: Seiten im Speicher (20 × 500 = 10'000 Zeilen), unabhängig von der Trefferzahl.
+DEFAULT_MAX_PAGES = 20
+
+
+class TrackingTableModel(QAbstractTableModel):
+    """Gefilterte Buchungen, neueste zuerst, seitenweise aus der DB."""
+
+    def __init__(
+        self,
+        tracking_model,
+        tags_model,
+        category_model,
+        headers: list[str],
+        header_tips: list[str] | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        max_pages: int = DEFAULT_MAX_PAGES,
+        parent=None,
+    ):
+        super().__init__(parent)
+        self._tracking = tracking_model
+        self._tags = tags_model
+        self._cats = category_model
+        self._headers = list(headers)
+        self._header_tips = list(header_tips or [])
+        self.page_size = max(1, int(page_size))
+        self.max_pages = max(1, int(max_pages))
+        self._filters: dict = {}
+        # Startschlüssel je geladener Seite (Seite 0 beginnt vorne).
+        self._starts: list[tuple[str, int] | None] = []
+        self._pages: OrderedDict[int, list[tuple[TrackingRow, str]]] = OrderedDict()
+        self._next: tuple[str, int] | None = None
+        self._more = False
+        self._rows = 0
+        self._paths: dict[tuple[str, str], str] = {}
+        self._type_colors: dict[str, QBrush] = {}
+        self._negative: QBrush | None = None
+        self.pages_read = 0
+
+    # ── Filter & Laden ───────────────────────────────────────────────
+
+    def set_filters(self, **filters) -> None:
+        """Setzt neue Filter (wie :meth:`TrackingModel.list_filtered`) und
+        lädt die erste Seite."""
+        self.beginResetModel()
+        self._filters = dict(filters)
+        self._starts = []
+        self._pages.clear()
+        self._next = None
+        self._more = True
+        self._rows = 0
+        self._paths.clear()
+        self.endResetModel()
+        if self.canFetchMore(QModelIndex()):
+            self.fetchMore(QModelIndex())
+
+    def reload(self) -> None:
+        """Liest mit den aktuellen Filtern neu (nach Änderungen an Daten)."""
+        self.set_filters(**self._filters)
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and self._more
+
+    def fetchMore(self, parent=QModelIndex()) -> None:
+        if parent.isValid() or not self._more:
+            return
+        start = self._next
+        rows, cursor = self._read_page(start)
+        self._more = cursor is not None
+        self._next = cursor
+        if not rows:
+            return
+        k = len(self._starts)
+        self.beginInsertRows(QModelIndex(), self._rows, self._rows + len(rows) - 1)
+        self._starts.append(start)
+        self._remember(k, rows)
+        self._rows += len(rows)
+        self.endInsertRows()
+
+    def _read_page(
+        self, after: tuple[str, int] | None
+    ) -> tuple[list[tuple[TrackingRow, str]], tuple[str, int] | None]:
+        page = self._tracking.page_filtered(
+            after=after, limit=self.page_size, **self._filters
+        )
+        self.pages_read += 1
+        try:
+            tags = self._tags.tag_names_for_entries([r.id for r in page.rows])
+        except AttributeError as exc:
+            logger.debug("Tags je Seite: %s", exc)
+            tags = {}
+        rows = [(r, ", ".join(tags.get(r.id, ()))) for r in page.rows]
+        return rows, page.cursor
+
+    def _remember(self, k: int, rows: list[tuple[TrackingRow, str]]) -> None:
+        self._pages[k] = rows
+        self._pages.move_to_end(k)
+        while len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+
+    def _entry(self, row: int) -> tuple[TrackingRow, str] | None:
+        if not 0 <= row < self._rows:
+            return None
+        k, offset = divmod(row, self.page_size)
+        page = self._pages.get(k)
+        if page is None:
+            page, _cursor = self._read_page(self._starts[k])
+            self._remember(k, page)
+        else:
+            self._pages.move_to_end(k)
+        # Nach einer Änderung ausserhalb des Modells kann die Seite kürzer sein.
+        return page[offset] if offset < len(page) else None
+
+    def row_at(self, row: int) -> TrackingRow | None:
+        """Die Buchung in Zeile ``row`` (oder ``None``)."""
+        entry = self._entry(row)
+        return entry[0] if entry else None
+
+    def loaded_pages(self) -> int:
+        """Seiten, die gerade im Speicher liegen."""
+        return len(self._pages)
+
+    # ── Darstellung ──────────────────────────────────────────────────
+
+    def set_colors(
+        self, type_colors: dict[str, str], negative_color: str | None = None
+    ) -> None:
+        """Typ- und Negativfarben wie ``apply_tracking_type_colors``."""
+        self._type_colors = {
+            str(k): QBrush(QColor(v)) for k, v in (type_colors or {}).items() if v
+        }
+        self._negative = QBrush(QColor(negative_color)) if negative_color else None
+        if self._rows:
+            self.dataChanged.emit(
+                self.index(0, 0),
+                self.index(self._rows - 1, COLUMN_COUNT - 1),
+                [Qt.ForegroundRole],
+            )
+
+    def _category_path(self, typ: str, category: str) -> str:
+        key = (typ, category)
+        if key not in self._paths:
+            self._paths[key] = self._cats.display_with_parent(typ, category)
+        return self._paths[key]
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._rows
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else COLUMN_COUNT
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation != Qt.Horizontal or not 0 <= section < COLUMN_COUNT:
+            return None
+        if role == Qt.DisplayRole and section < len(self._headers):
+            return self._headers[section]
+        if role == Qt.ToolTipRole and section < len(self._header_tips):
+            return self._header_tips[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        entry = self._entry(index.row())
+        if entry is None:
+            return None
+        r, tags = entry
+        col = index.column()
+        if role == Qt.DisplayRole:
+            if col == COL_DATE:
+                return r.d.strftime("%d.%m.%Y")
+            if col == COL_TYPE:
+                return display_typ(str(r.typ))
+            if col == COL_CATEGORY:
+                return str(r.category)
+            if col == COL_AMOUNT:
+                return format_chf(float(r.amount))
+            if col == COL_DETAILS:
+                return str(r.details)
+            if col == COL_TAGS:
+                return tags
+            if col == COL_ID:
+                return str(r.id)
+        elif role == Qt.ToolTipRole and col == COL_CATEGORY:
+            # Kurzlabel in der Zelle, voller Pfad "Parent › Kind" als Tooltip.
+            full = self._category_path(str(r.typ), str(r.category))
+            return full if full != r.category else None
+        elif role == Qt.TextAlignmentRole and col == COL_AMOUNT:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        elif role == Qt.ForegroundRole:
+            if col == COL_TYPE:
+                return self._type_colors.get(str(r.typ)) or self._type_colors.get(
+                    display_typ(str(r.typ))
+                )
+            if col == COL_AMOUNT and self._negative is not None and r.amount < 0:
+                return self._negative
+        return None